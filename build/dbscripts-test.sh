@@ -0,0 +1,106 @@
+#!/bin/sh
+
+# Runs the tests of the database scripts on a local PostgreSQL. Needs a
+# server, so it is not part of the validations.
+
+SRCDIR="$(dirname "$0")/.."
+TEST_DB="ovirt_dwh_dbscripts_test"
+
+die() {
+	local m="$1"
+	echo "FATAL: ${m}" >&2
+	exit 1
+}
+
+usage() {
+	cat << __EOF__
+Usage $0:
+
+    -S HOST        - PostgreSQL host (default: localhost)
+    -P PORT        - PostgreSQL port (default: 5432)
+    -U USER        - PostgreSQL user allowed to create databases
+                     (default: postgres), the password is taken from
+                     PGPASSWORD or ~/.pgpass
+    -v             - verbose output
+
+    -h --help      - this help message
+
+Create an history database named ${TEST_DB} from packaging/dbscripts,
+and run every build/dbscripts-tests/*.sql in it. A test raises an
+exception when it fails, and rolls back what it changed. Exits with an
+error when any test fails.
+__EOF__
+}
+
+while getopts ":S:P:U:v" opt; do
+	case $opt in
+		S) TEST_DB_HOST="$OPTARG"
+		;;
+		P) TEST_DB_PORT="$OPTARG"
+		;;
+		U) TEST_DB_USER="$OPTARG"
+		;;
+		v) VERBOSE=1
+		;;
+		\?) usage && exit
+		;;
+		:) die "-$OPTARG requires an argument"
+		;;
+	esac
+done
+
+TEST_DB_HOST="${TEST_DB_HOST:-localhost}"
+TEST_DB_PORT="${TEST_DB_PORT:-5432}"
+TEST_DB_USER="${TEST_DB_USER:-postgres}"
+TEST_TMP="$(mktemp -d)"
+
+dbpsql() {
+	local database="$1"
+	shift
+	psql \
+	${VERBOSE+-e} \
+	-X \
+	-q \
+	-v ON_ERROR_STOP=1 \
+	-h "${TEST_DB_HOST}" \
+	-p "${TEST_DB_PORT}" \
+	-U "${TEST_DB_USER}" \
+	-d "${database}" \
+	-w \
+	"$@"
+}
+
+cleanup_test() {
+	dbpsql postgres -c "DROP DATABASE IF EXISTS ${TEST_DB}" > /dev/null 2>&1
+	rm -rf "${TEST_TMP}"
+}
+trap cleanup_test 0
+
+echo "Creating ${TEST_DB}"
+dbpsql postgres -c "SET client_min_messages TO warning" -c "DROP DATABASE IF EXISTS ${TEST_DB}" || die "Cannot drop ${TEST_DB}"
+dbpsql postgres -c "CREATE DATABASE ${TEST_DB} TEMPLATE template0 ENCODING 'UTF8'" || die "Cannot create ${TEST_DB}"
+"${SRCDIR}/packaging/dbscripts/schema.sh" \
+	-s "${TEST_DB_HOST}" \
+	-p "${TEST_DB_PORT}" \
+	-u "${TEST_DB_USER}" \
+	-d "${TEST_DB}" \
+	-l "${TEST_TMP}/schema.log" \
+	-m "${TEST_TMP}/schema.md5" \
+	-c apply \
+	> /dev/null \
+	|| {
+		cat "${TEST_TMP}/schema.log" >&2
+		die "Cannot create the history schema"
+	}
+
+for test in "${SRCDIR}"/build/dbscripts-tests/*.sql; do
+	if dbpsql "${TEST_DB}" -f "${test}" > "${TEST_TMP}/test.log" 2>&1; then
+		echo "ok   $(basename "${test}")"
+	else
+		echo "FAIL $(basename "${test}")"
+		cat "${TEST_TMP}/test.log"
+		FAILED=1
+	fi
+done
+
+[ -z "${FAILED}" ] || die "Tests failed"
@@ -0,0 +1,57 @@
+-- The attributes of the VM samples kept by a retention rebuild of
+-- vm_samples_history are still the ones of the samples, not the nulls
+-- left in them by the vm_samples_attributes trigger.
+begin;
+
+insert into vm_samples_history(
+	history_datetime,
+	vm_id,
+	vm_status,
+	vm_ip,
+	vm_client_ip,
+	current_user_name
+)
+select
+	now() - interval '3 hours' + n * interval '1 hour',
+	'00000000-0000-0000-0000-000000000001',
+	1,
+	'10.0.0.' || n,
+	'10.1.0.1',
+	'user' || n
+from generate_series(0, 2) n;
+
+create function pg_temp.vm_attributes()
+returns text
+as $$
+	select string_agg(
+		vm_ip || ' ' || vm_client_ip || ' ' || current_user_name,
+		', '
+		order by history_datetime
+	)
+	from vm_samples_history_view
+	where vm_id = '00000000-0000-0000-0000-000000000001'
+$$
+language sql;
+
+do $$
+begin
+	if pg_temp.vm_attributes() is distinct from
+		'10.0.0.0 10.1.0.1 user0, 10.0.0.1 10.1.0.1 user1, 10.0.0.2 10.1.0.1 user2'
+	then
+		raise exception 'attributes before the rebuild: %', pg_temp.vm_attributes();
+	end if;
+end; $$;
+
+-- keeps the last two samples
+select history_table_rebuild('vm_samples_history', now() - interval '150 minutes');
+
+do $$
+begin
+	if pg_temp.vm_attributes() is distinct from
+		'10.0.0.1 10.1.0.1 user1, 10.0.0.2 10.1.0.1 user2'
+	then
+		raise exception 'attributes after the rebuild: %', pg_temp.vm_attributes();
+	end if;
+end; $$;
+
+rollback;
@@ -20,6 +20,8 @@ import routines.Numeric;
 import routines.DataOperation;
 import routines.TalendDataGenerator;
 import routines.RoutineHistoryETL;
+import routines.RoutineMetrics;
+import routines.RoutineWorkerPool;
 import routines.TalendString;
 import routines.StringHandling;
 import routines.Relational;
@@ -41,6 +43,12 @@ import java.io.ObjectInputStream;
 import java.io.IOException;
 import java.util.Comparator;
 
+//the import part of tJava_1
+//import java.util.List;
+
+//the import part of tJava_2
+//import java.util.List;
+
 @SuppressWarnings("unused")
 /**
  * Job: AggregationToDaily Purpose: <br>
@@ -855,6 +863,28 @@ public class AggregationToDaily implements TalendJob {
 		talendLogs_LOGS_onSubJobError(exception, errorComponent, globalMap);
 	}
 
+	public void tJava_1_error(Exception exception, String errorComponent,
+			final java.util.Map<String, Object> globalMap)
+			throws TalendException {
+
+		end_Hash.put(errorComponent, System.currentTimeMillis());
+
+		((java.util.Map) threadLocal.get()).put("status", "failure");
+
+		tJava_1_onSubJobError(exception, errorComponent, globalMap);
+	}
+
+	public void tJava_2_error(Exception exception, String errorComponent,
+			final java.util.Map<String, Object> globalMap)
+			throws TalendException {
+
+		end_Hash.put(errorComponent, System.currentTimeMillis());
+
+		((java.util.Map) threadLocal.get()).put("status", "failure");
+
+		tJava_2_onSubJobError(exception, errorComponent, globalMap);
+	}
+
 	public void tJDBCInput_2_onSubJobError(Exception exception,
 			String errorComponent, final java.util.Map<String, Object> globalMap)
 			throws TalendException {
@@ -998,6 +1028,28 @@ public class AggregationToDaily implements TalendJob {
 
 	}
 
+	public void tJava_1_onSubJobError(Exception exception,
+			String errorComponent, final java.util.Map<String, Object> globalMap)
+			throws TalendException {
+
+		resumeUtil.addLog("SYSTEM_LOG", "NODE:" + errorComponent, "", Thread
+				.currentThread().getId() + "", "FATAL", "",
+				exception.getMessage(),
+				ResumeUtil.getExceptionStackTrace(exception), "");
+
+	}
+
+	public void tJava_2_onSubJobError(Exception exception,
+			String errorComponent, final java.util.Map<String, Object> globalMap)
+			throws TalendException {
+
+		resumeUtil.addLog("SYSTEM_LOG", "NODE:" + errorComponent, "", Thread
+				.currentThread().getId() + "", "FATAL", "",
+				exception.getMessage(),
+				ResumeUtil.getExceptionStackTrace(exception), "");
+
+	}
+
 	public static class row7Struct implements
 			routines.system.IPersistableRow<row7Struct> {
 		final static byte[] commonByteArrayLock_OVIRT_ENGINE_DWH_AggregationToDaily = new byte[0];
@@ -17579,6 +17631,8 @@ public class AggregationToDaily implements TalendJob {
 				ok_Hash.put("tPrejob_1", true);
 				end_Hash.put("tPrejob_1", System.currentTimeMillis());
 
+				tJava_1Process(globalMap);
+
 				tJDBCConnection_1Process(globalMap);
 
 				/**
@@ -17801,6 +17855,8 @@ public class AggregationToDaily implements TalendJob {
 
 				tRowGenerator_1Process(globalMap);
 
+				tJava_2Process(globalMap);
+
 				/**
 				 * [tPostjob_1 end ] stop
 				 */
@@ -24416,6 +24472,202 @@ public class AggregationToDaily implements TalendJob {
 		globalMap.put("talendLogs_LOGS_SUBPROCESS_STATE", 1);
 	}
 
+	public void tJava_1Process(final java.util.Map<String, Object> globalMap)
+			throws TalendException {
+		globalMap.put("tJava_1_SUBPROCESS_STATE", 0);
+
+		final boolean execStat = this.execStat;
+
+		String iterateId = "";
+
+		String currentComponent = "";
+		java.util.Map<String, Object> resourceMap = new java.util.HashMap<String, Object>();
+
+		try {
+
+			String currentMethodName = new java.lang.Exception()
+					.getStackTrace()[0].getMethodName();
+			boolean resumeIt = currentMethodName.equals(resumeEntryMethodName);
+			if (resumeEntryMethodName == null || resumeIt || globalResumeTicket) {// start
+																				// the
+																				// resume
+				globalResumeTicket = true;
+
+				/**
+				 * [tJava_1 begin ] start
+				 */
+
+				ok_Hash.put("tJava_1", false);
+				start_Hash.put("tJava_1", System.currentTimeMillis());
+
+				currentComponent = "tJava_1";
+
+				int tos_count_tJava_1 = 0;
+
+				RoutineMetrics.jobStarted(jobName);
+
+				/**
+				 * [tJava_1 begin ] stop
+				 */
+
+				/**
+				 * [tJava_1 main ] start
+				 */
+
+				currentComponent = "tJava_1";
+
+				tos_count_tJava_1++;
+
+				/**
+				 * [tJava_1 main ] stop
+				 */
+
+				/**
+				 * [tJava_1 end ] start
+				 */
+
+				currentComponent = "tJava_1";
+
+				ok_Hash.put("tJava_1", true);
+				end_Hash.put("tJava_1", System.currentTimeMillis());
+
+				/**
+				 * [tJava_1 end ] stop
+				 */
+			}// end the resume
+
+		} catch (java.lang.Exception e) {
+
+			TalendException te = new TalendException(e, currentComponent,
+					globalMap);
+
+			throw te;
+		} catch (java.lang.Error error) {
+
+			throw error;
+		} finally {
+
+			try {
+
+				/**
+				 * [tJava_1 finally ] start
+				 */
+
+				currentComponent = "tJava_1";
+
+				/**
+				 * [tJava_1 finally ] stop
+				 */
+			} catch (java.lang.Exception e) {
+				// ignore
+			} catch (java.lang.Error error) {
+				// ignore
+			}
+			resourceMap = null;
+		}
+
+		globalMap.put("tJava_1_SUBPROCESS_STATE", 1);
+	}
+
+	public void tJava_2Process(final java.util.Map<String, Object> globalMap)
+			throws TalendException {
+		globalMap.put("tJava_2_SUBPROCESS_STATE", 0);
+
+		final boolean execStat = this.execStat;
+
+		String iterateId = "";
+
+		String currentComponent = "";
+		java.util.Map<String, Object> resourceMap = new java.util.HashMap<String, Object>();
+
+		try {
+
+			String currentMethodName = new java.lang.Exception()
+					.getStackTrace()[0].getMethodName();
+			boolean resumeIt = currentMethodName.equals(resumeEntryMethodName);
+			if (resumeEntryMethodName == null || resumeIt || globalResumeTicket) {// start
+																				// the
+																				// resume
+				globalResumeTicket = true;
+
+				/**
+				 * [tJava_2 begin ] start
+				 */
+
+				ok_Hash.put("tJava_2", false);
+				start_Hash.put("tJava_2", System.currentTimeMillis());
+
+				currentComponent = "tJava_2";
+
+				int tos_count_tJava_2 = 0;
+
+				RoutineMetrics.jobDone(jobName, globalMap,
+						System.currentTimeMillis() - startTime,
+						"failure".equals(status) ? 1 : 0);
+
+				/**
+				 * [tJava_2 begin ] stop
+				 */
+
+				/**
+				 * [tJava_2 main ] start
+				 */
+
+				currentComponent = "tJava_2";
+
+				tos_count_tJava_2++;
+
+				/**
+				 * [tJava_2 main ] stop
+				 */
+
+				/**
+				 * [tJava_2 end ] start
+				 */
+
+				currentComponent = "tJava_2";
+
+				ok_Hash.put("tJava_2", true);
+				end_Hash.put("tJava_2", System.currentTimeMillis());
+
+				/**
+				 * [tJava_2 end ] stop
+				 */
+			}// end the resume
+
+		} catch (java.lang.Exception e) {
+
+			TalendException te = new TalendException(e, currentComponent,
+					globalMap);
+
+			throw te;
+		} catch (java.lang.Error error) {
+
+			throw error;
+		} finally {
+
+			try {
+
+				/**
+				 * [tJava_2 finally ] start
+				 */
+
+				currentComponent = "tJava_2";
+
+				/**
+				 * [tJava_2 finally ] stop
+				 */
+			} catch (java.lang.Exception e) {
+				// ignore
+			} catch (java.lang.Error error) {
+				// ignore
+			}
+			resourceMap = null;
+		}
+
+		globalMap.put("tJava_2_SUBPROCESS_STATE", 1);
+	}
+
 	public String resuming_logs_dir_path = null;
 	public String resuming_checkpoint_path = null;
 	public String parent_part_launcher = null;
@@ -24707,7 +24959,7 @@ public class AggregationToDaily implements TalendJob {
 		this.globalResumeTicket = false;// to run others jobs
 
 		runningThreadCount.add(1);
-		new Thread() {
+		RoutineWorkerPool.execute(new Runnable() {
 			public void run() {
 				java.util.Map threadRunResultMap = new java.util.HashMap();
 				threadRunResultMap.put("errorCode", null);
@@ -24750,10 +25002,10 @@ public class AggregationToDaily implements TalendJob {
 					runningThreadCount.add(-1);
 				}
 			}
-		}.start();
+		});
 
 		runningThreadCount.add(1);
-		new Thread() {
+		RoutineWorkerPool.execute(new Runnable() {
 			public void run() {
 				java.util.Map threadRunResultMap = new java.util.HashMap();
 				threadRunResultMap.put("errorCode", null);
@@ -24796,10 +25048,10 @@ public class AggregationToDaily implements TalendJob {
 					runningThreadCount.add(-1);
 				}
 			}
-		}.start();
+		});
 
 		runningThreadCount.add(1);
-		new Thread() {
+		RoutineWorkerPool.execute(new Runnable() {
 			public void run() {
 				java.util.Map threadRunResultMap = new java.util.HashMap();
 				threadRunResultMap.put("errorCode", null);
@@ -24842,10 +25094,10 @@ public class AggregationToDaily implements TalendJob {
 					runningThreadCount.add(-1);
 				}
 			}
-		}.start();
+		});
 
 		runningThreadCount.add(1);
-		new Thread() {
+		RoutineWorkerPool.execute(new Runnable() {
 			public void run() {
 				java.util.Map threadRunResultMap = new java.util.HashMap();
 				threadRunResultMap.put("errorCode", null);
@@ -24888,10 +25140,10 @@ public class AggregationToDaily implements TalendJob {
 					runningThreadCount.add(-1);
 				}
 			}
-		}.start();
+		});
 
 		runningThreadCount.add(1);
-		new Thread() {
+		RoutineWorkerPool.execute(new Runnable() {
 			public void run() {
 				java.util.Map threadRunResultMap = new java.util.HashMap();
 				threadRunResultMap.put("errorCode", null);
@@ -24934,10 +25186,10 @@ public class AggregationToDaily implements TalendJob {
 					runningThreadCount.add(-1);
 				}
 			}
-		}.start();
+		});
 
 		runningThreadCount.add(1);
-		new Thread() {
+		RoutineWorkerPool.execute(new Runnable() {
 			public void run() {
 				java.util.Map threadRunResultMap = new java.util.HashMap();
 				threadRunResultMap.put("errorCode", null);
@@ -24980,10 +25232,10 @@ public class AggregationToDaily implements TalendJob {
 					runningThreadCount.add(-1);
 				}
 			}
-		}.start();
+		});
 
 		runningThreadCount.add(1);
-		new Thread() {
+		RoutineWorkerPool.execute(new Runnable() {
 			public void run() {
 				java.util.Map threadRunResultMap = new java.util.HashMap();
 				threadRunResultMap.put("errorCode", null);
@@ -25026,10 +25278,10 @@ public class AggregationToDaily implements TalendJob {
 					runningThreadCount.add(-1);
 				}
 			}
-		}.start();
+		});
 
 		runningThreadCount.add(1);
-		new Thread() {
+		RoutineWorkerPool.execute(new Runnable() {
 			public void run() {
 				java.util.Map threadRunResultMap = new java.util.HashMap();
 				threadRunResultMap.put("errorCode", null);
@@ -25072,7 +25324,7 @@ public class AggregationToDaily implements TalendJob {
 					runningThreadCount.add(-1);
 				}
 			}
-		}.start();
+		});
 
 		while (runningThreadCount.getCount() > 0) {
 			try {
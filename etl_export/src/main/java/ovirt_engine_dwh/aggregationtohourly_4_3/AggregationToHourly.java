@@ -20,6 +20,8 @@ import routines.Numeric;
 import routines.DataOperation;
 import routines.TalendDataGenerator;
 import routines.RoutineHistoryETL;
+import routines.RoutineMetrics;
+import routines.RoutineWorkerPool;
 import routines.TalendString;
 import routines.StringHandling;
 import routines.Relational;
@@ -41,6 +43,12 @@ import java.io.ObjectInputStream;
 import java.io.IOException;
 import java.util.Comparator;
 
+//the import part of tJava_1
+//import java.util.List;
+
+//the import part of tJava_2
+//import java.util.List;
+
 @SuppressWarnings("unused")
 /**
  * Job: AggregationToHourly Purpose: <br>
@@ -877,6 +885,28 @@ public class AggregationToHourly implements TalendJob {
 		talendLogs_LOGS_onSubJobError(exception, errorComponent, globalMap);
 	}
 
+	public void tJava_1_error(Exception exception, String errorComponent,
+			final java.util.Map<String, Object> globalMap)
+			throws TalendException {
+
+		end_Hash.put(errorComponent, System.currentTimeMillis());
+
+		((java.util.Map) threadLocal.get()).put("status", "failure");
+
+		tJava_1_onSubJobError(exception, errorComponent, globalMap);
+	}
+
+	public void tJava_2_error(Exception exception, String errorComponent,
+			final java.util.Map<String, Object> globalMap)
+			throws TalendException {
+
+		end_Hash.put(errorComponent, System.currentTimeMillis());
+
+		((java.util.Map) threadLocal.get()).put("status", "failure");
+
+		tJava_2_onSubJobError(exception, errorComponent, globalMap);
+	}
+
 	public void tJDBCInput_2_onSubJobError(Exception exception,
 			String errorComponent, final java.util.Map<String, Object> globalMap)
 			throws TalendException {
@@ -1031,6 +1061,28 @@ public class AggregationToHourly implements TalendJob {
 
 	}
 
+	public void tJava_1_onSubJobError(Exception exception,
+			String errorComponent, final java.util.Map<String, Object> globalMap)
+			throws TalendException {
+
+		resumeUtil.addLog("SYSTEM_LOG", "NODE:" + errorComponent, "", Thread
+				.currentThread().getId() + "", "FATAL", "",
+				exception.getMessage(),
+				ResumeUtil.getExceptionStackTrace(exception), "");
+
+	}
+
+	public void tJava_2_onSubJobError(Exception exception,
+			String errorComponent, final java.util.Map<String, Object> globalMap)
+			throws TalendException {
+
+		resumeUtil.addLog("SYSTEM_LOG", "NODE:" + errorComponent, "", Thread
+				.currentThread().getId() + "", "FATAL", "",
+				exception.getMessage(),
+				ResumeUtil.getExceptionStackTrace(exception), "");
+
+	}
+
 	public static class row7Struct implements
 			routines.system.IPersistableRow<row7Struct> {
 		final static byte[] commonByteArrayLock_OVIRT_ENGINE_DWH_AggregationToHourly = new byte[0];
@@ -9451,7 +9503,7 @@ public class AggregationToHourly implements TalendJob {
 				java.sql.Statement stmt_tJDBCInput_4 = conn_tJDBCInput_4
 						.createStatement();
 
-				String dbquery_tJDBCInput_4 = "SELECT \n  history_id, \n  history_datetime, \n  vm_id, \n  vm_status, \n  seconds_in_status, \n  cpu_usage_percent, \n  memory_usage_percent, \n  user_cpu_usage_percent, \n  system_cpu_usage_percent,\n  vm_ip, \n  current_user_id,\n  user_logged_in_to_guest,\n  currently_running_on_host, \n  vm_configuration_version, \n  current_host_configuration_version,\n  memory_buffered_kb,\n  memory_cached_kb\nFROM vm_samples_history\nWHERE history_datetime >= '"
+				String dbquery_tJDBCInput_4 = "SELECT \n  history_id, \n  history_datetime, \n  vm_id, \n  vm_status, \n  seconds_in_status, \n  cpu_usage_percent, \n  memory_usage_percent, \n  user_cpu_usage_percent, \n  system_cpu_usage_percent,\n  vm_ip, \n  current_user_id,\n  user_logged_in_to_guest,\n  currently_running_on_host, \n  vm_configuration_version, \n  current_host_configuration_version,\n  memory_buffered_kb,\n  memory_cached_kb\nFROM vm_samples_history_view\nWHERE history_datetime >= '"
 						+ new SimpleDateFormat("yyyy-MM-dd HH:mm:ss.SSSSSSZ")
 								.format(context.lastHourAggr)
 						+ "'\nAND history_datetime < '"
@@ -17655,6 +17707,8 @@ public class AggregationToHourly implements TalendJob {
 				ok_Hash.put("tPrejob_1", true);
 				end_Hash.put("tPrejob_1", System.currentTimeMillis());
 
+				tJava_1Process(globalMap);
+
 				tJDBCConnection_1Process(globalMap);
 
 				/**
@@ -18373,6 +18427,8 @@ public class AggregationToHourly implements TalendJob {
 
 				tRowGenerator_1Process(globalMap);
 
+				tJava_2Process(globalMap);
+
 				/**
 				 * [tPostjob_1 end ] stop
 				 */
@@ -23173,7 +23229,7 @@ public class AggregationToHourly implements TalendJob {
 				java.sql.Statement stmt_tJDBCInput_10 = conn_tJDBCInput_10
 						.createStatement();
 
-				String dbquery_tJDBCInput_10 = "SELECT \n  history_id,\n  history_datetime,\n  current_user_id,\n  current_user_name,\n  cast(user_logged_in_to_guest as int),\n  vm_id,\n  seconds_in_status,\n  cpu_usage_percent,\n  memory_usage_percent,\n  user_cpu_usage_percent,\n  system_cpu_usage_percent,\n  vm_ip,\n  vm_client_ip,\n  currently_running_on_host,\n  vm_configuration_version,\n  current_host_configuration_version\nFROM vm_samples_history\nWHERE vm_status = 1\nAND history_datetime >= '"
+				String dbquery_tJDBCInput_10 = "SELECT \n  history_id,\n  history_datetime,\n  current_user_id,\n  current_user_name,\n  cast(user_logged_in_to_guest as int),\n  vm_id,\n  seconds_in_status,\n  cpu_usage_percent,\n  memory_usage_percent,\n  user_cpu_usage_percent,\n  system_cpu_usage_percent,\n  vm_ip,\n  vm_client_ip,\n  currently_running_on_host,\n  vm_configuration_version,\n  current_host_configuration_version\nFROM vm_samples_history_view\nWHERE vm_status = 1\nAND history_datetime >= '"
 						+ new SimpleDateFormat("yyyy-MM-dd HH:mm:ss.SSSSSSZ")
 								.format(context.lastHourAggr)
 						+ "'\nAND history_datetime < '"
@@ -24947,6 +25003,202 @@ public class AggregationToHourly implements TalendJob {
 		globalMap.put("talendLogs_LOGS_SUBPROCESS_STATE", 1);
 	}
 
+	public void tJava_1Process(final java.util.Map<String, Object> globalMap)
+			throws TalendException {
+		globalMap.put("tJava_1_SUBPROCESS_STATE", 0);
+
+		final boolean execStat = this.execStat;
+
+		String iterateId = "";
+
+		String currentComponent = "";
+		java.util.Map<String, Object> resourceMap = new java.util.HashMap<String, Object>();
+
+		try {
+
+			String currentMethodName = new java.lang.Exception()
+					.getStackTrace()[0].getMethodName();
+			boolean resumeIt = currentMethodName.equals(resumeEntryMethodName);
+			if (resumeEntryMethodName == null || resumeIt || globalResumeTicket) {// start
+																				// the
+																				// resume
+				globalResumeTicket = true;
+
+				/**
+				 * [tJava_1 begin ] start
+				 */
+
+				ok_Hash.put("tJava_1", false);
+				start_Hash.put("tJava_1", System.currentTimeMillis());
+
+				currentComponent = "tJava_1";
+
+				int tos_count_tJava_1 = 0;
+
+				RoutineMetrics.jobStarted(jobName);
+
+				/**
+				 * [tJava_1 begin ] stop
+				 */
+
+				/**
+				 * [tJava_1 main ] start
+				 */
+
+				currentComponent = "tJava_1";
+
+				tos_count_tJava_1++;
+
+				/**
+				 * [tJava_1 main ] stop
+				 */
+
+				/**
+				 * [tJava_1 end ] start
+				 */
+
+				currentComponent = "tJava_1";
+
+				ok_Hash.put("tJava_1", true);
+				end_Hash.put("tJava_1", System.currentTimeMillis());
+
+				/**
+				 * [tJava_1 end ] stop
+				 */
+			}// end the resume
+
+		} catch (java.lang.Exception e) {
+
+			TalendException te = new TalendException(e, currentComponent,
+					globalMap);
+
+			throw te;
+		} catch (java.lang.Error error) {
+
+			throw error;
+		} finally {
+
+			try {
+
+				/**
+				 * [tJava_1 finally ] start
+				 */
+
+				currentComponent = "tJava_1";
+
+				/**
+				 * [tJava_1 finally ] stop
+				 */
+			} catch (java.lang.Exception e) {
+				// ignore
+			} catch (java.lang.Error error) {
+				// ignore
+			}
+			resourceMap = null;
+		}
+
+		globalMap.put("tJava_1_SUBPROCESS_STATE", 1);
+	}
+
+	public void tJava_2Process(final java.util.Map<String, Object> globalMap)
+			throws TalendException {
+		globalMap.put("tJava_2_SUBPROCESS_STATE", 0);
+
+		final boolean execStat = this.execStat;
+
+		String iterateId = "";
+
+		String currentComponent = "";
+		java.util.Map<String, Object> resourceMap = new java.util.HashMap<String, Object>();
+
+		try {
+
+			String currentMethodName = new java.lang.Exception()
+					.getStackTrace()[0].getMethodName();
+			boolean resumeIt = currentMethodName.equals(resumeEntryMethodName);
+			if (resumeEntryMethodName == null || resumeIt || globalResumeTicket) {// start
+																				// the
+																				// resume
+				globalResumeTicket = true;
+
+				/**
+				 * [tJava_2 begin ] start
+				 */
+
+				ok_Hash.put("tJava_2", false);
+				start_Hash.put("tJava_2", System.currentTimeMillis());
+
+				currentComponent = "tJava_2";
+
+				int tos_count_tJava_2 = 0;
+
+				RoutineMetrics.jobDone(jobName, globalMap,
+						System.currentTimeMillis() - startTime,
+						"failure".equals(status) ? 1 : 0);
+
+				/**
+				 * [tJava_2 begin ] stop
+				 */
+
+				/**
+				 * [tJava_2 main ] start
+				 */
+
+				currentComponent = "tJava_2";
+
+				tos_count_tJava_2++;
+
+				/**
+				 * [tJava_2 main ] stop
+				 */
+
+				/**
+				 * [tJava_2 end ] start
+				 */
+
+				currentComponent = "tJava_2";
+
+				ok_Hash.put("tJava_2", true);
+				end_Hash.put("tJava_2", System.currentTimeMillis());
+
+				/**
+				 * [tJava_2 end ] stop
+				 */
+			}// end the resume
+
+		} catch (java.lang.Exception e) {
+
+			TalendException te = new TalendException(e, currentComponent,
+					globalMap);
+
+			throw te;
+		} catch (java.lang.Error error) {
+
+			throw error;
+		} finally {
+
+			try {
+
+				/**
+				 * [tJava_2 finally ] start
+				 */
+
+				currentComponent = "tJava_2";
+
+				/**
+				 * [tJava_2 finally ] stop
+				 */
+			} catch (java.lang.Exception e) {
+				// ignore
+			} catch (java.lang.Error error) {
+				// ignore
+			}
+			resourceMap = null;
+		}
+
+		globalMap.put("tJava_2_SUBPROCESS_STATE", 1);
+	}
+
 	public String resuming_logs_dir_path = null;
 	public String resuming_checkpoint_path = null;
 	public String parent_part_launcher = null;
@@ -25238,7 +25490,7 @@ public class AggregationToHourly implements TalendJob {
 		this.globalResumeTicket = false;// to run others jobs
 
 		runningThreadCount.add(1);
-		new Thread() {
+		RoutineWorkerPool.execute(new Runnable() {
 			public void run() {
 				java.util.Map threadRunResultMap = new java.util.HashMap();
 				threadRunResultMap.put("errorCode", null);
@@ -25281,10 +25533,10 @@ public class AggregationToHourly implements TalendJob {
 					runningThreadCount.add(-1);
 				}
 			}
-		}.start();
+		});
 
 		runningThreadCount.add(1);
-		new Thread() {
+		RoutineWorkerPool.execute(new Runnable() {
 			public void run() {
 				java.util.Map threadRunResultMap = new java.util.HashMap();
 				threadRunResultMap.put("errorCode", null);
@@ -25327,10 +25579,10 @@ public class AggregationToHourly implements TalendJob {
 					runningThreadCount.add(-1);
 				}
 			}
-		}.start();
+		});
 
 		runningThreadCount.add(1);
-		new Thread() {
+		RoutineWorkerPool.execute(new Runnable() {
 			public void run() {
 				java.util.Map threadRunResultMap = new java.util.HashMap();
 				threadRunResultMap.put("errorCode", null);
@@ -25373,10 +25625,10 @@ public class AggregationToHourly implements TalendJob {
 					runningThreadCount.add(-1);
 				}
 			}
-		}.start();
+		});
 
 		runningThreadCount.add(1);
-		new Thread() {
+		RoutineWorkerPool.execute(new Runnable() {
 			public void run() {
 				java.util.Map threadRunResultMap = new java.util.HashMap();
 				threadRunResultMap.put("errorCode", null);
@@ -25419,10 +25671,10 @@ public class AggregationToHourly implements TalendJob {
 					runningThreadCount.add(-1);
 				}
 			}
-		}.start();
+		});
 
 		runningThreadCount.add(1);
-		new Thread() {
+		RoutineWorkerPool.execute(new Runnable() {
 			public void run() {
 				java.util.Map threadRunResultMap = new java.util.HashMap();
 				threadRunResultMap.put("errorCode", null);
@@ -25465,10 +25717,10 @@ public class AggregationToHourly implements TalendJob {
 					runningThreadCount.add(-1);
 				}
 			}
-		}.start();
+		});
 
 		runningThreadCount.add(1);
-		new Thread() {
+		RoutineWorkerPool.execute(new Runnable() {
 			public void run() {
 				java.util.Map threadRunResultMap = new java.util.HashMap();
 				threadRunResultMap.put("errorCode", null);
@@ -25511,10 +25763,10 @@ public class AggregationToHourly implements TalendJob {
 					runningThreadCount.add(-1);
 				}
 			}
-		}.start();
+		});
 
 		runningThreadCount.add(1);
-		new Thread() {
+		RoutineWorkerPool.execute(new Runnable() {
 			public void run() {
 				java.util.Map threadRunResultMap = new java.util.HashMap();
 				threadRunResultMap.put("errorCode", null);
@@ -25557,10 +25809,10 @@ public class AggregationToHourly implements TalendJob {
 					runningThreadCount.add(-1);
 				}
 			}
-		}.start();
+		});
 
 		runningThreadCount.add(1);
-		new Thread() {
+		RoutineWorkerPool.execute(new Runnable() {
 			public void run() {
 				java.util.Map threadRunResultMap = new java.util.HashMap();
 				threadRunResultMap.put("errorCode", null);
@@ -25603,7 +25855,7 @@ public class AggregationToHourly implements TalendJob {
 					runningThreadCount.add(-1);
 				}
 			}
-		}.start();
+		});
 
 		while (runningThreadCount.getCount() > 0) {
 			try {
@@ -21,6 +21,7 @@ import routines.DataOperation;
 import routines.TalendDataGenerator;
 import routines.TalendString;
 import routines.RoutineHistoryETL;
+import routines.RoutineHistoryDelete;
 import routines.StringHandling;
 import routines.Relational;
 import routines.TalendDate;
@@ -2427,7 +2428,8 @@ public class DeleteTimeKeepingJob implements TalendJob {
 
 				int tos_count_tJava_1 = 0;
 
-				if (context.deleteMore == 0) {
+				if (context.deleteMore == 0
+						&& !RoutineHistoryDelete.pending()) {
 					if (context.dwhAggregationDebug.equals("true"))
 						System.out.print(TalendDate.formatDate(
 								"yyyy-MM-dd HH:mm:ss", context.runTime)
@@ -2438,14 +2440,9 @@ public class DeleteTimeKeepingJob implements TalendJob {
 							context.runDeleteTime, "HH"), context.runTime,
 							"SSS"));
 				} else {
-					if (context.dwhAggregationDebug.equals("true")
-							&& ((context.timesDeleteRun % context.deleteIncrement) == 1))
-						System.out
-								.print("Samples SQL Limit: "
-										+ (((context.timesDeleteRun - (context.timesDeleteRun % context.deleteIncrement))
-												/ context.deleteIncrement + 1) * context.deleteMultiplier)
-										+ "\n");
-					Thread.sleep(5000);
+					Thread.sleep(RoutineHistoryDelete
+							.pause((java.sql.Connection) globalMap
+									.get("conn_tJDBCConnection_1")));
 				}
 
 				/**
@@ -21,6 +21,9 @@ import routines.DataOperation;
 import routines.TalendDataGenerator;
 import routines.TalendString;
 import routines.RoutineHistoryETL;
+import routines.RoutineMetrics;
+import routines.RoutineHistoryDelete;
+import routines.RoutineWorkerPool;
 import routines.StringHandling;
 import routines.Relational;
 import routines.TalendDate;
@@ -41,6 +44,12 @@ import java.io.ObjectInputStream;
 import java.io.IOException;
 import java.util.Comparator;
 
+//the import part of tJava_1
+//import java.util.List;
+
+//the import part of tJava_2
+//import java.util.List;
+
 @SuppressWarnings("unused")
 /**
  * Job: HistoryDelete Purpose: <br>
@@ -963,6 +972,39 @@ public class HistoryDelete implements TalendJob {
 		talendLogs_LOGS_onSubJobError(exception, errorComponent, globalMap);
 	}
 
+	public void tPostjob_1_error(Exception exception, String errorComponent,
+			final java.util.Map<String, Object> globalMap)
+			throws TalendException {
+
+		end_Hash.put(errorComponent, System.currentTimeMillis());
+
+		((java.util.Map) threadLocal.get()).put("status", "failure");
+
+		tPostjob_1_onSubJobError(exception, errorComponent, globalMap);
+	}
+
+	public void tJava_1_error(Exception exception, String errorComponent,
+			final java.util.Map<String, Object> globalMap)
+			throws TalendException {
+
+		end_Hash.put(errorComponent, System.currentTimeMillis());
+
+		((java.util.Map) threadLocal.get()).put("status", "failure");
+
+		tJava_1_onSubJobError(exception, errorComponent, globalMap);
+	}
+
+	public void tJava_2_error(Exception exception, String errorComponent,
+			final java.util.Map<String, Object> globalMap)
+			throws TalendException {
+
+		end_Hash.put(errorComponent, System.currentTimeMillis());
+
+		((java.util.Map) threadLocal.get()).put("status", "failure");
+
+		tJava_2_onSubJobError(exception, errorComponent, globalMap);
+	}
+
 	public void tJDBCInput_2_onSubJobError(Exception exception,
 			String errorComponent, final java.util.Map<String, Object> globalMap)
 			throws TalendException {
@@ -1249,6 +1291,39 @@ public class HistoryDelete implements TalendJob {
 
 	}
 
+	public void tPostjob_1_onSubJobError(Exception exception,
+			String errorComponent, final java.util.Map<String, Object> globalMap)
+			throws TalendException {
+
+		resumeUtil.addLog("SYSTEM_LOG", "NODE:" + errorComponent, "", Thread
+				.currentThread().getId() + "", "FATAL", "",
+				exception.getMessage(),
+				ResumeUtil.getExceptionStackTrace(exception), "");
+
+	}
+
+	public void tJava_1_onSubJobError(Exception exception,
+			String errorComponent, final java.util.Map<String, Object> globalMap)
+			throws TalendException {
+
+		resumeUtil.addLog("SYSTEM_LOG", "NODE:" + errorComponent, "", Thread
+				.currentThread().getId() + "", "FATAL", "",
+				exception.getMessage(),
+				ResumeUtil.getExceptionStackTrace(exception), "");
+
+	}
+
+	public void tJava_2_onSubJobError(Exception exception,
+			String errorComponent, final java.util.Map<String, Object> globalMap)
+			throws TalendException {
+
+		resumeUtil.addLog("SYSTEM_LOG", "NODE:" + errorComponent, "", Thread
+				.currentThread().getId() + "", "FATAL", "",
+				exception.getMessage(),
+				ResumeUtil.getExceptionStackTrace(exception), "");
+
+	}
+
 	public static class row5Struct implements
 			routines.system.IPersistableRow<row5Struct> {
 		final static byte[] commonByteArrayLock_OVIRT_ENGINE_DWH_HistoryDelete = new byte[0];
@@ -1478,15 +1553,9 @@ public class HistoryDelete implements TalendJob {
 				java.sql.Statement stmt_tJDBCInput_2 = conn_tJDBCInput_2
 						.createStatement();
 
-				String dbquery_tJDBCInput_2 = "SELECT history_id\nFROM host_samples_history\nWHERE history_datetime < '"
-						+ new SimpleDateFormat("yyyy-MM-dd HH:mm:ss.SSSSSSZ")
-								.format(TalendDate.addDate(context.runTime,
-										context.hoursToKeepSamples * -1, "HH"))
-						+ "'"
-						+ "limit "
-						+ ((context.timesDeleteRun - (context.timesDeleteRun % context.deleteIncrement))
-								/ context.deleteIncrement + 1)
-						* context.deleteMultiplier;
+				String dbquery_tJDBCInput_2 = RoutineHistoryDelete.selectQuery(context,
+						"host_samples_history", TalendDate.addDate(context.runTime,
+								context.hoursToKeepSamples * -1, "HH"));
 
 				globalMap.put("tJDBCInput_2_QUERY", dbquery_tJDBCInput_2);
 
@@ -1609,6 +1678,8 @@ public class HistoryDelete implements TalendJob {
 						nb_line_deleted_tJDBCOutput_2);
 				globalMap.put("tJDBCOutput_2_NB_LINE_REJECTED",
 						nb_line_rejected_tJDBCOutput_2);
+				RoutineHistoryDelete.batchDone(connection_tJDBCOutput_2,
+						"host_samples_history", nb_line_deleted_tJDBCOutput_2);
 
 				ok_Hash.put("tJDBCOutput_2", true);
 				end_Hash.put("tJDBCOutput_2", System.currentTimeMillis());
@@ -1893,15 +1964,9 @@ public class HistoryDelete implements TalendJob {
 				java.sql.Statement stmt_tJDBCInput_3 = conn_tJDBCInput_3
 						.createStatement();
 
-				String dbquery_tJDBCInput_3 = "SELECT history_id\nFROM host_interface_samples_history\nWHERE history_datetime < '"
-						+ new SimpleDateFormat("yyyy-MM-dd HH:mm:ss.SSSSSSZ")
-								.format(TalendDate.addDate(context.runTime,
-										context.hoursToKeepSamples * -1, "HH"))
-						+ "'"
-						+ "limit "
-						+ ((context.timesDeleteRun - (context.timesDeleteRun % context.deleteIncrement))
-								/ context.deleteIncrement + 1)
-						* context.deleteMultiplier;
+				String dbquery_tJDBCInput_3 = RoutineHistoryDelete.selectQuery(context,
+						"host_interface_samples_history", TalendDate.addDate(context.runTime,
+								context.hoursToKeepSamples * -1, "HH"));
 
 				globalMap.put("tJDBCInput_3_QUERY", dbquery_tJDBCInput_3);
 
@@ -2024,6 +2089,8 @@ public class HistoryDelete implements TalendJob {
 						nb_line_deleted_tJDBCOutput_3);
 				globalMap.put("tJDBCOutput_3_NB_LINE_REJECTED",
 						nb_line_rejected_tJDBCOutput_3);
+				RoutineHistoryDelete.batchDone(connection_tJDBCOutput_3,
+						"host_interface_samples_history", nb_line_deleted_tJDBCOutput_3);
 
 				ok_Hash.put("tJDBCOutput_3", true);
 				end_Hash.put("tJDBCOutput_3", System.currentTimeMillis());
@@ -2307,15 +2374,9 @@ public class HistoryDelete implements TalendJob {
 				java.sql.Statement stmt_tJDBCInput_4 = conn_tJDBCInput_4
 						.createStatement();
 
-				String dbquery_tJDBCInput_4 = "SELECT history_id\nFROM vm_samples_history\nWHERE history_datetime < '"
-						+ new SimpleDateFormat("yyyy-MM-dd HH:mm:ss.SSSSSSZ")
-								.format(TalendDate.addDate(context.runTime,
-										context.hoursToKeepSamples * -1, "HH"))
-						+ "'"
-						+ "limit "
-						+ ((context.timesDeleteRun - (context.timesDeleteRun % context.deleteIncrement))
-								/ context.deleteIncrement + 1)
-						* context.deleteMultiplier;
+				String dbquery_tJDBCInput_4 = RoutineHistoryDelete.selectQuery(context,
+						"vm_samples_history", TalendDate.addDate(context.runTime,
+								context.hoursToKeepSamples * -1, "HH"));
 
 				globalMap.put("tJDBCInput_4_QUERY", dbquery_tJDBCInput_4);
 
@@ -2438,6 +2499,8 @@ public class HistoryDelete implements TalendJob {
 						nb_line_deleted_tJDBCOutput_4);
 				globalMap.put("tJDBCOutput_4_NB_LINE_REJECTED",
 						nb_line_rejected_tJDBCOutput_4);
+				RoutineHistoryDelete.batchDone(connection_tJDBCOutput_4,
+						"vm_samples_history", nb_line_deleted_tJDBCOutput_4);
 
 				ok_Hash.put("tJDBCOutput_4", true);
 				end_Hash.put("tJDBCOutput_4", System.currentTimeMillis());
@@ -2722,15 +2785,9 @@ public class HistoryDelete implements TalendJob {
 				java.sql.Statement stmt_tJDBCInput_5 = conn_tJDBCInput_5
 						.createStatement();
 
-				String dbquery_tJDBCInput_5 = "SELECT history_id\nFROM vm_interface_samples_history\nWHERE history_datetime < '"
-						+ new SimpleDateFormat("yyyy-MM-dd HH:mm:ss.SSSSSSZ")
-								.format(TalendDate.addDate(context.runTime,
-										context.hoursToKeepSamples * -1, "HH"))
-						+ "'"
-						+ "limit "
-						+ ((context.timesDeleteRun - (context.timesDeleteRun % context.deleteIncrement))
-								/ context.deleteIncrement + 1)
-						* context.deleteMultiplier;
+				String dbquery_tJDBCInput_5 = RoutineHistoryDelete.selectQuery(context,
+						"vm_interface_samples_history", TalendDate.addDate(context.runTime,
+								context.hoursToKeepSamples * -1, "HH"));
 
 				globalMap.put("tJDBCInput_5_QUERY", dbquery_tJDBCInput_5);
 
@@ -2853,6 +2910,8 @@ public class HistoryDelete implements TalendJob {
 						nb_line_deleted_tJDBCOutput_5);
 				globalMap.put("tJDBCOutput_5_NB_LINE_REJECTED",
 						nb_line_rejected_tJDBCOutput_5);
+				RoutineHistoryDelete.batchDone(connection_tJDBCOutput_5,
+						"vm_interface_samples_history", nb_line_deleted_tJDBCOutput_5);
 
 				ok_Hash.put("tJDBCOutput_5", true);
 				end_Hash.put("tJDBCOutput_5", System.currentTimeMillis());
@@ -3136,11 +3195,9 @@ public class HistoryDelete implements TalendJob {
 				java.sql.Statement stmt_tJDBCInput_7 = conn_tJDBCInput_7
 						.createStatement();
 
-				String dbquery_tJDBCInput_7 = "SELECT history_id\nFROM host_hourly_history\nWHERE history_datetime < '"
-						+ new SimpleDateFormat("yyyy-MM-dd HH:mm:ss.SSSSSSZ")
-								.format(TalendDate.addDate(context.runTime,
-										context.hoursToKeepHourly * -1, "HH"))
-						+ "'" + context.limitRows;
+				String dbquery_tJDBCInput_7 = RoutineHistoryDelete.selectQuery(context,
+						"host_hourly_history", TalendDate.addDate(context.runTime,
+								context.hoursToKeepHourly * -1, "HH"));
 
 				globalMap.put("tJDBCInput_7_QUERY", dbquery_tJDBCInput_7);
 
@@ -3263,6 +3320,8 @@ public class HistoryDelete implements TalendJob {
 						nb_line_deleted_tJDBCOutput_7);
 				globalMap.put("tJDBCOutput_7_NB_LINE_REJECTED",
 						nb_line_rejected_tJDBCOutput_7);
+				RoutineHistoryDelete.batchDone(connection_tJDBCOutput_7,
+						"host_hourly_history", nb_line_deleted_tJDBCOutput_7);
 
 				ok_Hash.put("tJDBCOutput_7", true);
 				end_Hash.put("tJDBCOutput_7", System.currentTimeMillis());
@@ -3547,11 +3606,9 @@ public class HistoryDelete implements TalendJob {
 				java.sql.Statement stmt_tJDBCInput_8 = conn_tJDBCInput_8
 						.createStatement();
 
-				String dbquery_tJDBCInput_8 = "SELECT history_id\nFROM host_interface_hourly_history\nWHERE history_datetime < '"
-						+ new SimpleDateFormat("yyyy-MM-dd HH:mm:ss.SSSSSSZ")
-								.format(TalendDate.addDate(context.runTime,
-										context.hoursToKeepHourly * -1, "HH"))
-						+ "'" + context.limitRows;
+				String dbquery_tJDBCInput_8 = RoutineHistoryDelete.selectQuery(context,
+						"host_interface_hourly_history", TalendDate.addDate(context.runTime,
+								context.hoursToKeepHourly * -1, "HH"));
 
 				globalMap.put("tJDBCInput_8_QUERY", dbquery_tJDBCInput_8);
 
@@ -3674,6 +3731,8 @@ public class HistoryDelete implements TalendJob {
 						nb_line_deleted_tJDBCOutput_8);
 				globalMap.put("tJDBCOutput_8_NB_LINE_REJECTED",
 						nb_line_rejected_tJDBCOutput_8);
+				RoutineHistoryDelete.batchDone(connection_tJDBCOutput_8,
+						"host_interface_hourly_history", nb_line_deleted_tJDBCOutput_8);
 
 				ok_Hash.put("tJDBCOutput_8", true);
 				end_Hash.put("tJDBCOutput_8", System.currentTimeMillis());
@@ -3957,11 +4016,9 @@ public class HistoryDelete implements TalendJob {
 				java.sql.Statement stmt_tJDBCInput_9 = conn_tJDBCInput_9
 						.createStatement();
 
-				String dbquery_tJDBCInput_9 = "SELECT history_id\nFROM vm_hourly_history\nWHERE history_datetime < '"
-						+ new SimpleDateFormat("yyyy-MM-dd HH:mm:ss.SSSSSSZ")
-								.format(TalendDate.addDate(context.runTime,
-										context.hoursToKeepHourly * -1, "HH"))
-						+ "'" + context.limitRows;
+				String dbquery_tJDBCInput_9 = RoutineHistoryDelete.selectQuery(context,
+						"vm_hourly_history", TalendDate.addDate(context.runTime,
+								context.hoursToKeepHourly * -1, "HH"));
 
 				globalMap.put("tJDBCInput_9_QUERY", dbquery_tJDBCInput_9);
 
@@ -4084,6 +4141,8 @@ public class HistoryDelete implements TalendJob {
 						nb_line_deleted_tJDBCOutput_9);
 				globalMap.put("tJDBCOutput_9_NB_LINE_REJECTED",
 						nb_line_rejected_tJDBCOutput_9);
+				RoutineHistoryDelete.batchDone(connection_tJDBCOutput_9,
+						"vm_hourly_history", nb_line_deleted_tJDBCOutput_9);
 
 				ok_Hash.put("tJDBCOutput_9", true);
 				end_Hash.put("tJDBCOutput_9", System.currentTimeMillis());
@@ -4368,11 +4427,9 @@ public class HistoryDelete implements TalendJob {
 				java.sql.Statement stmt_tJDBCInput_10 = conn_tJDBCInput_10
 						.createStatement();
 
-				String dbquery_tJDBCInput_10 = "SELECT history_id\nFROM vm_interface_hourly_history\nWHERE history_datetime < '"
-						+ new SimpleDateFormat("yyyy-MM-dd HH:mm:ss.SSSSSSZ")
-								.format(TalendDate.addDate(context.runTime,
-										context.hoursToKeepHourly * -1, "HH"))
-						+ "'" + context.limitRows;
+				String dbquery_tJDBCInput_10 = RoutineHistoryDelete.selectQuery(context,
+						"vm_interface_hourly_history", TalendDate.addDate(context.runTime,
+								context.hoursToKeepHourly * -1, "HH"));
 
 				globalMap.put("tJDBCInput_10_QUERY", dbquery_tJDBCInput_10);
 
@@ -4495,6 +4552,8 @@ public class HistoryDelete implements TalendJob {
 						nb_line_deleted_tJDBCOutput_10);
 				globalMap.put("tJDBCOutput_10_NB_LINE_REJECTED",
 						nb_line_rejected_tJDBCOutput_10);
+				RoutineHistoryDelete.batchDone(connection_tJDBCOutput_10,
+						"vm_interface_hourly_history", nb_line_deleted_tJDBCOutput_10);
 
 				ok_Hash.put("tJDBCOutput_10", true);
 				end_Hash.put("tJDBCOutput_10", System.currentTimeMillis());
@@ -4779,15 +4838,9 @@ public class HistoryDelete implements TalendJob {
 				java.sql.Statement stmt_tJDBCInput_11 = conn_tJDBCInput_11
 						.createStatement();
 
-				String dbquery_tJDBCInput_11 = "SELECT history_id\nFROM storage_domain_samples_history\nWHERE history_datetime < '"
-						+ new SimpleDateFormat("yyyy-MM-dd HH:mm:ss.SSSSSSZ")
-								.format(TalendDate.addDate(context.runTime,
-										context.hoursToKeepSamples * -1, "HH"))
-						+ "'"
-						+ "limit "
-						+ ((context.timesDeleteRun - (context.timesDeleteRun % context.deleteIncrement))
-								/ context.deleteIncrement + 1)
-						* context.deleteMultiplier;
+				String dbquery_tJDBCInput_11 = RoutineHistoryDelete.selectQuery(context,
+						"storage_domain_samples_history", TalendDate.addDate(context.runTime,
+								context.hoursToKeepSamples * -1, "HH"));
 
 				globalMap.put("tJDBCInput_11_QUERY", dbquery_tJDBCInput_11);
 
@@ -4910,6 +4963,8 @@ public class HistoryDelete implements TalendJob {
 						nb_line_deleted_tJDBCOutput_11);
 				globalMap.put("tJDBCOutput_11_NB_LINE_REJECTED",
 						nb_line_rejected_tJDBCOutput_11);
+				RoutineHistoryDelete.batchDone(connection_tJDBCOutput_11,
+						"storage_domain_samples_history", nb_line_deleted_tJDBCOutput_11);
 
 				ok_Hash.put("tJDBCOutput_11", true);
 				end_Hash.put("tJDBCOutput_11", System.currentTimeMillis());
@@ -5194,11 +5249,9 @@ public class HistoryDelete implements TalendJob {
 				java.sql.Statement stmt_tJDBCInput_12 = conn_tJDBCInput_12
 						.createStatement();
 
-				String dbquery_tJDBCInput_12 = "SELECT history_id\nFROM storage_domain_hourly_history\nWHERE history_datetime < '"
-						+ new SimpleDateFormat("yyyy-MM-dd HH:mm:ss.SSSSSSZ")
-								.format(TalendDate.addDate(context.runTime,
-										context.hoursToKeepHourly * -1, "HH"))
-						+ "'" + context.limitRows;
+				String dbquery_tJDBCInput_12 = RoutineHistoryDelete.selectQuery(context,
+						"storage_domain_hourly_history", TalendDate.addDate(context.runTime,
+								context.hoursToKeepHourly * -1, "HH"));
 
 				globalMap.put("tJDBCInput_12_QUERY", dbquery_tJDBCInput_12);
 
@@ -5321,6 +5374,8 @@ public class HistoryDelete implements TalendJob {
 						nb_line_deleted_tJDBCOutput_12);
 				globalMap.put("tJDBCOutput_12_NB_LINE_REJECTED",
 						nb_line_rejected_tJDBCOutput_12);
+				RoutineHistoryDelete.batchDone(connection_tJDBCOutput_12,
+						"storage_domain_hourly_history", nb_line_deleted_tJDBCOutput_12);
 
 				ok_Hash.put("tJDBCOutput_12", true);
 				end_Hash.put("tJDBCOutput_12", System.currentTimeMillis());
@@ -5604,15 +5659,9 @@ public class HistoryDelete implements TalendJob {
 				java.sql.Statement stmt_tJDBCInput_13 = conn_tJDBCInput_13
 						.createStatement();
 
-				String dbquery_tJDBCInput_13 = "SELECT history_id\nFROM vm_disk_samples_history\nWHERE history_datetime < '"
-						+ new SimpleDateFormat("yyyy-MM-dd HH:mm:ss.SSSSSSZ")
-								.format(TalendDate.addDate(context.runTime,
-										context.hoursToKeepSamples * -1, "HH"))
-						+ "'"
-						+ "limit "
-						+ ((context.timesDeleteRun - (context.timesDeleteRun % context.deleteIncrement))
-								/ context.deleteIncrement + 1)
-						* context.deleteMultiplier;
+				String dbquery_tJDBCInput_13 = RoutineHistoryDelete.selectQuery(context,
+						"vm_disk_samples_history", TalendDate.addDate(context.runTime,
+								context.hoursToKeepSamples * -1, "HH"));
 
 				globalMap.put("tJDBCInput_13_QUERY", dbquery_tJDBCInput_13);
 
@@ -5735,6 +5784,8 @@ public class HistoryDelete implements TalendJob {
 						nb_line_deleted_tJDBCOutput_13);
 				globalMap.put("tJDBCOutput_13_NB_LINE_REJECTED",
 						nb_line_rejected_tJDBCOutput_13);
+				RoutineHistoryDelete.batchDone(connection_tJDBCOutput_13,
+						"vm_disk_samples_history", nb_line_deleted_tJDBCOutput_13);
 
 				ok_Hash.put("tJDBCOutput_13", true);
 				end_Hash.put("tJDBCOutput_13", System.currentTimeMillis());
@@ -6018,11 +6069,9 @@ public class HistoryDelete implements TalendJob {
 				java.sql.Statement stmt_tJDBCInput_14 = conn_tJDBCInput_14
 						.createStatement();
 
-				String dbquery_tJDBCInput_14 = "SELECT history_id\nFROM vm_disk_hourly_history\nWHERE history_datetime < '"
-						+ new SimpleDateFormat("yyyy-MM-dd HH:mm:ss.SSSSSSZ")
-								.format(TalendDate.addDate(context.runTime,
-										context.hoursToKeepHourly * -1, "HH"))
-						+ "'" + context.limitRows;
+				String dbquery_tJDBCInput_14 = RoutineHistoryDelete.selectQuery(context,
+						"vm_disk_hourly_history", TalendDate.addDate(context.runTime,
+								context.hoursToKeepHourly * -1, "HH"));
 
 				globalMap.put("tJDBCInput_14_QUERY", dbquery_tJDBCInput_14);
 
@@ -6145,6 +6194,8 @@ public class HistoryDelete implements TalendJob {
 						nb_line_deleted_tJDBCOutput_14);
 				globalMap.put("tJDBCOutput_14_NB_LINE_REJECTED",
 						nb_line_rejected_tJDBCOutput_14);
+				RoutineHistoryDelete.batchDone(connection_tJDBCOutput_14,
+						"vm_disk_hourly_history", nb_line_deleted_tJDBCOutput_14);
 
 				ok_Hash.put("tJDBCOutput_14", true);
 				end_Hash.put("tJDBCOutput_14", System.currentTimeMillis());
@@ -6429,11 +6480,9 @@ public class HistoryDelete implements TalendJob {
 				java.sql.Statement stmt_tJDBCInput_16 = conn_tJDBCInput_16
 						.createStatement();
 
-				String dbquery_tJDBCInput_16 = "SELECT history_id\nFROM storage_domain_daily_history\nWHERE history_datetime < '"
-						+ new SimpleDateFormat("yyyy-MM-dd HH:mm:ss.SSSSSSZ")
-								.format(TalendDate.addDate(context.runTime,
-										context.hoursToKeepDaily * -1, "HH"))
-						+ "'" + context.limitRows;
+				String dbquery_tJDBCInput_16 = RoutineHistoryDelete.selectQuery(context,
+						"storage_domain_daily_history", TalendDate.addDate(context.runTime,
+								context.hoursToKeepDaily * -1, "HH"));
 
 				globalMap.put("tJDBCInput_16_QUERY", dbquery_tJDBCInput_16);
 
@@ -6556,6 +6605,8 @@ public class HistoryDelete implements TalendJob {
 						nb_line_deleted_tJDBCOutput_16);
 				globalMap.put("tJDBCOutput_16_NB_LINE_REJECTED",
 						nb_line_rejected_tJDBCOutput_16);
+				RoutineHistoryDelete.batchDone(connection_tJDBCOutput_16,
+						"storage_domain_daily_history", nb_line_deleted_tJDBCOutput_16);
 
 				ok_Hash.put("tJDBCOutput_16", true);
 				end_Hash.put("tJDBCOutput_16", System.currentTimeMillis());
@@ -6839,11 +6890,9 @@ public class HistoryDelete implements TalendJob {
 				java.sql.Statement stmt_tJDBCInput_17 = conn_tJDBCInput_17
 						.createStatement();
 
-				String dbquery_tJDBCInput_17 = "SELECT history_id\nFROM host_daily_history\nWHERE history_datetime < '"
-						+ new SimpleDateFormat("yyyy-MM-dd HH:mm:ss.SSSSSSZ")
-								.format(TalendDate.addDate(context.runTime,
-										context.hoursToKeepDaily * -1, "HH"))
-						+ "'" + context.limitRows;
+				String dbquery_tJDBCInput_17 = RoutineHistoryDelete.selectQuery(context,
+						"host_daily_history", TalendDate.addDate(context.runTime,
+								context.hoursToKeepDaily * -1, "HH"));
 
 				globalMap.put("tJDBCInput_17_QUERY", dbquery_tJDBCInput_17);
 
@@ -6966,6 +7015,8 @@ public class HistoryDelete implements TalendJob {
 						nb_line_deleted_tJDBCOutput_17);
 				globalMap.put("tJDBCOutput_17_NB_LINE_REJECTED",
 						nb_line_rejected_tJDBCOutput_17);
+				RoutineHistoryDelete.batchDone(connection_tJDBCOutput_17,
+						"host_daily_history", nb_line_deleted_tJDBCOutput_17);
 
 				ok_Hash.put("tJDBCOutput_17", true);
 				end_Hash.put("tJDBCOutput_17", System.currentTimeMillis());
@@ -7250,11 +7301,9 @@ public class HistoryDelete implements TalendJob {
 				java.sql.Statement stmt_tJDBCInput_18 = conn_tJDBCInput_18
 						.createStatement();
 
-				String dbquery_tJDBCInput_18 = "SELECT history_id\nFROM host_interface_daily_history\nWHERE history_datetime < '"
-						+ new SimpleDateFormat("yyyy-MM-dd HH:mm:ss.SSSSSSZ")
-								.format(TalendDate.addDate(context.runTime,
-										context.hoursToKeepDaily * -1, "HH"))
-						+ "'" + context.limitRows;
+				String dbquery_tJDBCInput_18 = RoutineHistoryDelete.selectQuery(context,
+						"host_interface_daily_history", TalendDate.addDate(context.runTime,
+								context.hoursToKeepDaily * -1, "HH"));
 
 				globalMap.put("tJDBCInput_18_QUERY", dbquery_tJDBCInput_18);
 
@@ -7377,6 +7426,8 @@ public class HistoryDelete implements TalendJob {
 						nb_line_deleted_tJDBCOutput_18);
 				globalMap.put("tJDBCOutput_18_NB_LINE_REJECTED",
 						nb_line_rejected_tJDBCOutput_18);
+				RoutineHistoryDelete.batchDone(connection_tJDBCOutput_18,
+						"host_interface_daily_history", nb_line_deleted_tJDBCOutput_18);
 
 				ok_Hash.put("tJDBCOutput_18", true);
 				end_Hash.put("tJDBCOutput_18", System.currentTimeMillis());
@@ -7660,11 +7711,9 @@ public class HistoryDelete implements TalendJob {
 				java.sql.Statement stmt_tJDBCInput_19 = conn_tJDBCInput_19
 						.createStatement();
 
-				String dbquery_tJDBCInput_19 = "SELECT history_id\nFROM vm_daily_history\nWHERE history_datetime < '"
-						+ new SimpleDateFormat("yyyy-MM-dd HH:mm:ss.SSSSSSZ")
-								.format(TalendDate.addDate(context.runTime,
-										context.hoursToKeepDaily * -1, "HH"))
-						+ "'" + context.limitRows;
+				String dbquery_tJDBCInput_19 = RoutineHistoryDelete.selectQuery(context,
+						"vm_daily_history", TalendDate.addDate(context.runTime,
+								context.hoursToKeepDaily * -1, "HH"));
 
 				globalMap.put("tJDBCInput_19_QUERY", dbquery_tJDBCInput_19);
 
@@ -7787,6 +7836,8 @@ public class HistoryDelete implements TalendJob {
 						nb_line_deleted_tJDBCOutput_19);
 				globalMap.put("tJDBCOutput_19_NB_LINE_REJECTED",
 						nb_line_rejected_tJDBCOutput_19);
+				RoutineHistoryDelete.batchDone(connection_tJDBCOutput_19,
+						"vm_daily_history", nb_line_deleted_tJDBCOutput_19);
 
 				ok_Hash.put("tJDBCOutput_19", true);
 				end_Hash.put("tJDBCOutput_19", System.currentTimeMillis());
@@ -8071,11 +8122,9 @@ public class HistoryDelete implements TalendJob {
 				java.sql.Statement stmt_tJDBCInput_20 = conn_tJDBCInput_20
 						.createStatement();
 
-				String dbquery_tJDBCInput_20 = "SELECT history_id\nFROM vm_interface_daily_history\nWHERE history_datetime < '"
-						+ new SimpleDateFormat("yyyy-MM-dd HH:mm:ss.SSSSSSZ")
-								.format(TalendDate.addDate(context.runTime,
-										context.hoursToKeepDaily * -1, "HH"))
-						+ "'" + context.limitRows;
+				String dbquery_tJDBCInput_20 = RoutineHistoryDelete.selectQuery(context,
+						"vm_interface_daily_history", TalendDate.addDate(context.runTime,
+								context.hoursToKeepDaily * -1, "HH"));
 
 				globalMap.put("tJDBCInput_20_QUERY", dbquery_tJDBCInput_20);
 
@@ -8198,6 +8247,8 @@ public class HistoryDelete implements TalendJob {
 						nb_line_deleted_tJDBCOutput_20);
 				globalMap.put("tJDBCOutput_20_NB_LINE_REJECTED",
 						nb_line_rejected_tJDBCOutput_20);
+				RoutineHistoryDelete.batchDone(connection_tJDBCOutput_20,
+						"vm_interface_daily_history", nb_line_deleted_tJDBCOutput_20);
 
 				ok_Hash.put("tJDBCOutput_20", true);
 				end_Hash.put("tJDBCOutput_20", System.currentTimeMillis());
@@ -8481,11 +8532,9 @@ public class HistoryDelete implements TalendJob {
 				java.sql.Statement stmt_tJDBCInput_21 = conn_tJDBCInput_21
 						.createStatement();
 
-				String dbquery_tJDBCInput_21 = "SELECT history_id\nFROM vm_disk_daily_history\nWHERE history_datetime < '"
-						+ new SimpleDateFormat("yyyy-MM-dd HH:mm:ss.SSSSSSZ")
-								.format(TalendDate.addDate(context.runTime,
-										context.hoursToKeepDaily * -1, "HH"))
-						+ "'" + context.limitRows;
+				String dbquery_tJDBCInput_21 = RoutineHistoryDelete.selectQuery(context,
+						"vm_disk_daily_history", TalendDate.addDate(context.runTime,
+								context.hoursToKeepDaily * -1, "HH"));
 
 				globalMap.put("tJDBCInput_21_QUERY", dbquery_tJDBCInput_21);
 
@@ -8608,6 +8657,8 @@ public class HistoryDelete implements TalendJob {
 						nb_line_deleted_tJDBCOutput_21);
 				globalMap.put("tJDBCOutput_21_NB_LINE_REJECTED",
 						nb_line_rejected_tJDBCOutput_21);
+				RoutineHistoryDelete.batchDone(connection_tJDBCOutput_21,
+						"vm_disk_daily_history", nb_line_deleted_tJDBCOutput_21);
 
 				ok_Hash.put("tJDBCOutput_21", true);
 				end_Hash.put("tJDBCOutput_21", System.currentTimeMillis());
@@ -8719,6 +8770,8 @@ public class HistoryDelete implements TalendJob {
 				ok_Hash.put("tPrejob_1", true);
 				end_Hash.put("tPrejob_1", System.currentTimeMillis());
 
+				tJava_1Process(globalMap);
+
 				tJDBCConnection_1Process(globalMap);
 
 				/**
@@ -9112,15 +9165,9 @@ public class HistoryDelete implements TalendJob {
 				java.sql.Statement stmt_tJDBCInput_22 = conn_tJDBCInput_22
 						.createStatement();
 
-				String dbquery_tJDBCInput_22 = "SELECT history_id\nFROM vm_disks_usage_samples_history\nWHERE history_datetime < '"
-						+ new SimpleDateFormat("yyyy-MM-dd HH:mm:ss.SSSSSSZ")
-								.format(TalendDate.addDate(context.runTime,
-										context.hoursToKeepSamples * -1, "HH"))
-						+ "'"
-						+ "limit "
-						+ ((context.timesDeleteRun - (context.timesDeleteRun % context.deleteIncrement))
-								/ context.deleteIncrement + 1)
-						* context.deleteMultiplier;
+				String dbquery_tJDBCInput_22 = RoutineHistoryDelete.selectQuery(context,
+						"vm_disks_usage_samples_history", TalendDate.addDate(context.runTime,
+								context.hoursToKeepSamples * -1, "HH"));
 
 				globalMap.put("tJDBCInput_22_QUERY", dbquery_tJDBCInput_22);
 
@@ -9243,6 +9290,8 @@ public class HistoryDelete implements TalendJob {
 						nb_line_deleted_tJDBCOutput_22);
 				globalMap.put("tJDBCOutput_22_NB_LINE_REJECTED",
 						nb_line_rejected_tJDBCOutput_22);
+				RoutineHistoryDelete.batchDone(connection_tJDBCOutput_22,
+						"vm_disks_usage_samples_history", nb_line_deleted_tJDBCOutput_22);
 
 				ok_Hash.put("tJDBCOutput_22", true);
 				end_Hash.put("tJDBCOutput_22", System.currentTimeMillis());
@@ -9527,11 +9576,9 @@ public class HistoryDelete implements TalendJob {
 				java.sql.Statement stmt_tJDBCInput_23 = conn_tJDBCInput_23
 						.createStatement();
 
-				String dbquery_tJDBCInput_23 = "SELECT history_id\nFROM vm_disks_usage_hourly_history\nWHERE history_datetime < '"
-						+ new SimpleDateFormat("yyyy-MM-dd HH:mm:ss.SSSSSSZ")
-								.format(TalendDate.addDate(context.runTime,
-										context.hoursToKeepHourly * -1, "HH"))
-						+ "'" + context.limitRows;
+				String dbquery_tJDBCInput_23 = RoutineHistoryDelete.selectQuery(context,
+						"vm_disks_usage_hourly_history", TalendDate.addDate(context.runTime,
+								context.hoursToKeepHourly * -1, "HH"));
 
 				globalMap.put("tJDBCInput_23_QUERY", dbquery_tJDBCInput_23);
 
@@ -9654,6 +9701,8 @@ public class HistoryDelete implements TalendJob {
 						nb_line_deleted_tJDBCOutput_23);
 				globalMap.put("tJDBCOutput_23_NB_LINE_REJECTED",
 						nb_line_rejected_tJDBCOutput_23);
+				RoutineHistoryDelete.batchDone(connection_tJDBCOutput_23,
+						"vm_disks_usage_hourly_history", nb_line_deleted_tJDBCOutput_23);
 
 				ok_Hash.put("tJDBCOutput_23", true);
 				end_Hash.put("tJDBCOutput_23", System.currentTimeMillis());
@@ -9938,11 +9987,9 @@ public class HistoryDelete implements TalendJob {
 				java.sql.Statement stmt_tJDBCInput_24 = conn_tJDBCInput_24
 						.createStatement();
 
-				String dbquery_tJDBCInput_24 = "SELECT history_id\nFROM vm_disks_usage_daily_history\nWHERE history_datetime < '"
-						+ new SimpleDateFormat("yyyy-MM-dd HH:mm:ss.SSSSSSZ")
-								.format(TalendDate.addDate(context.runTime,
-										context.hoursToKeepDaily * -1, "HH"))
-						+ "'" + context.limitRows;
+				String dbquery_tJDBCInput_24 = RoutineHistoryDelete.selectQuery(context,
+						"vm_disks_usage_daily_history", TalendDate.addDate(context.runTime,
+								context.hoursToKeepDaily * -1, "HH"));
 
 				globalMap.put("tJDBCInput_24_QUERY", dbquery_tJDBCInput_24);
 
@@ -10065,6 +10112,8 @@ public class HistoryDelete implements TalendJob {
 						nb_line_deleted_tJDBCOutput_24);
 				globalMap.put("tJDBCOutput_24_NB_LINE_REJECTED",
 						nb_line_rejected_tJDBCOutput_24);
+				RoutineHistoryDelete.batchDone(connection_tJDBCOutput_24,
+						"vm_disks_usage_daily_history", nb_line_deleted_tJDBCOutput_24);
 
 				ok_Hash.put("tJDBCOutput_24", true);
 				end_Hash.put("tJDBCOutput_24", System.currentTimeMillis());
@@ -10349,11 +10398,9 @@ public class HistoryDelete implements TalendJob {
 				java.sql.Statement stmt_tJDBCInput_25 = conn_tJDBCInput_25
 						.createStatement();
 
-				String dbquery_tJDBCInput_25 = "SELECT history_id\nFROM statistics_vms_users_usage_hourly\nWHERE history_datetime < '"
-						+ new SimpleDateFormat("yyyy-MM-dd HH:mm:ss.SSSSSSZ")
-								.format(TalendDate.addDate(context.runTime,
-										context.hoursToKeepHourly * -1, "HH"))
-						+ "'" + context.limitRows;
+				String dbquery_tJDBCInput_25 = RoutineHistoryDelete.selectQuery(context,
+						"statistics_vms_users_usage_hourly", TalendDate.addDate(context.runTime,
+								context.hoursToKeepHourly * -1, "HH"));
 
 				globalMap.put("tJDBCInput_25_QUERY", dbquery_tJDBCInput_25);
 
@@ -10476,6 +10523,8 @@ public class HistoryDelete implements TalendJob {
 						nb_line_deleted_tJDBCOutput_25);
 				globalMap.put("tJDBCOutput_25_NB_LINE_REJECTED",
 						nb_line_rejected_tJDBCOutput_25);
+				RoutineHistoryDelete.batchDone(connection_tJDBCOutput_25,
+						"statistics_vms_users_usage_hourly", nb_line_deleted_tJDBCOutput_25);
 
 				ok_Hash.put("tJDBCOutput_25", true);
 				end_Hash.put("tJDBCOutput_25", System.currentTimeMillis());
@@ -10760,11 +10809,9 @@ public class HistoryDelete implements TalendJob {
 				java.sql.Statement stmt_tJDBCInput_26 = conn_tJDBCInput_26
 						.createStatement();
 
-				String dbquery_tJDBCInput_26 = "SELECT history_id\nFROM statistics_vms_users_usage_daily\nWHERE history_datetime < '"
-						+ new SimpleDateFormat("yyyy-MM-dd HH:mm:ss.SSSSSSZ")
-								.format(TalendDate.addDate(context.runTime,
-										context.hoursToKeepDaily * -1, "HH"))
-						+ "'" + context.limitRows;
+				String dbquery_tJDBCInput_26 = RoutineHistoryDelete.selectQuery(context,
+						"statistics_vms_users_usage_daily", TalendDate.addDate(context.runTime,
+								context.hoursToKeepDaily * -1, "HH"));
 
 				globalMap.put("tJDBCInput_26_QUERY", dbquery_tJDBCInput_26);
 
@@ -10887,6 +10934,8 @@ public class HistoryDelete implements TalendJob {
 						nb_line_deleted_tJDBCOutput_26);
 				globalMap.put("tJDBCOutput_26_NB_LINE_REJECTED",
 						nb_line_rejected_tJDBCOutput_26);
+				RoutineHistoryDelete.batchDone(connection_tJDBCOutput_26,
+						"statistics_vms_users_usage_daily", nb_line_deleted_tJDBCOutput_26);
 
 				ok_Hash.put("tJDBCOutput_26", true);
 				end_Hash.put("tJDBCOutput_26", System.currentTimeMillis());
@@ -11591,6 +11640,299 @@ public class HistoryDelete implements TalendJob {
 		globalMap.put("talendLogs_LOGS_SUBPROCESS_STATE", 1);
 	}
 
+	public void tPostjob_1Process(final java.util.Map<String, Object> globalMap)
+			throws TalendException {
+		globalMap.put("tPostjob_1_SUBPROCESS_STATE", 0);
+
+		final boolean execStat = this.execStat;
+
+		String iterateId = "";
+
+		String currentComponent = "";
+		java.util.Map<String, Object> resourceMap = new java.util.HashMap<String, Object>();
+
+		try {
+
+			String currentMethodName = new java.lang.Exception()
+					.getStackTrace()[0].getMethodName();
+			boolean resumeIt = currentMethodName.equals(resumeEntryMethodName);
+			if (resumeEntryMethodName == null || resumeIt || globalResumeTicket) {// start
+																				// the
+																				// resume
+				globalResumeTicket = true;
+
+				/**
+				 * [tPostjob_1 begin ] start
+				 */
+
+				ok_Hash.put("tPostjob_1", false);
+				start_Hash.put("tPostjob_1", System.currentTimeMillis());
+
+				currentComponent = "tPostjob_1";
+
+				int tos_count_tPostjob_1 = 0;
+
+				/**
+				 * [tPostjob_1 begin ] stop
+				 */
+
+				/**
+				 * [tPostjob_1 main ] start
+				 */
+
+				currentComponent = "tPostjob_1";
+
+				tos_count_tPostjob_1++;
+
+				/**
+				 * [tPostjob_1 main ] stop
+				 */
+
+				/**
+				 * [tPostjob_1 end ] start
+				 */
+
+				currentComponent = "tPostjob_1";
+
+				ok_Hash.put("tPostjob_1", true);
+				end_Hash.put("tPostjob_1", System.currentTimeMillis());
+
+				tJava_2Process(globalMap);
+
+				/**
+				 * [tPostjob_1 end ] stop
+				 */
+			}// end the resume
+
+		} catch (java.lang.Exception e) {
+
+			TalendException te = new TalendException(e, currentComponent,
+					globalMap);
+
+			throw te;
+		} catch (java.lang.Error error) {
+
+			throw error;
+		} finally {
+
+			try {
+
+				/**
+				 * [tPostjob_1 finally ] start
+				 */
+
+				currentComponent = "tPostjob_1";
+
+				/**
+				 * [tPostjob_1 finally ] stop
+				 */
+			} catch (java.lang.Exception e) {
+				// ignore
+			} catch (java.lang.Error error) {
+				// ignore
+			}
+			resourceMap = null;
+		}
+
+		globalMap.put("tPostjob_1_SUBPROCESS_STATE", 1);
+	}
+
+	public void tJava_1Process(final java.util.Map<String, Object> globalMap)
+			throws TalendException {
+		globalMap.put("tJava_1_SUBPROCESS_STATE", 0);
+
+		final boolean execStat = this.execStat;
+
+		String iterateId = "";
+
+		String currentComponent = "";
+		java.util.Map<String, Object> resourceMap = new java.util.HashMap<String, Object>();
+
+		try {
+
+			String currentMethodName = new java.lang.Exception()
+					.getStackTrace()[0].getMethodName();
+			boolean resumeIt = currentMethodName.equals(resumeEntryMethodName);
+			if (resumeEntryMethodName == null || resumeIt || globalResumeTicket) {// start
+																				// the
+																				// resume
+				globalResumeTicket = true;
+
+				/**
+				 * [tJava_1 begin ] start
+				 */
+
+				ok_Hash.put("tJava_1", false);
+				start_Hash.put("tJava_1", System.currentTimeMillis());
+
+				currentComponent = "tJava_1";
+
+				int tos_count_tJava_1 = 0;
+
+				RoutineMetrics.jobStarted(jobName);
+
+				/**
+				 * [tJava_1 begin ] stop
+				 */
+
+				/**
+				 * [tJava_1 main ] start
+				 */
+
+				currentComponent = "tJava_1";
+
+				tos_count_tJava_1++;
+
+				/**
+				 * [tJava_1 main ] stop
+				 */
+
+				/**
+				 * [tJava_1 end ] start
+				 */
+
+				currentComponent = "tJava_1";
+
+				ok_Hash.put("tJava_1", true);
+				end_Hash.put("tJava_1", System.currentTimeMillis());
+
+				/**
+				 * [tJava_1 end ] stop
+				 */
+			}// end the resume
+
+		} catch (java.lang.Exception e) {
+
+			TalendException te = new TalendException(e, currentComponent,
+					globalMap);
+
+			throw te;
+		} catch (java.lang.Error error) {
+
+			throw error;
+		} finally {
+
+			try {
+
+				/**
+				 * [tJava_1 finally ] start
+				 */
+
+				currentComponent = "tJava_1";
+
+				/**
+				 * [tJava_1 finally ] stop
+				 */
+			} catch (java.lang.Exception e) {
+				// ignore
+			} catch (java.lang.Error error) {
+				// ignore
+			}
+			resourceMap = null;
+		}
+
+		globalMap.put("tJava_1_SUBPROCESS_STATE", 1);
+	}
+
+	public void tJava_2Process(final java.util.Map<String, Object> globalMap)
+			throws TalendException {
+		globalMap.put("tJava_2_SUBPROCESS_STATE", 0);
+
+		final boolean execStat = this.execStat;
+
+		String iterateId = "";
+
+		String currentComponent = "";
+		java.util.Map<String, Object> resourceMap = new java.util.HashMap<String, Object>();
+
+		try {
+
+			String currentMethodName = new java.lang.Exception()
+					.getStackTrace()[0].getMethodName();
+			boolean resumeIt = currentMethodName.equals(resumeEntryMethodName);
+			if (resumeEntryMethodName == null || resumeIt || globalResumeTicket) {// start
+																				// the
+																				// resume
+				globalResumeTicket = true;
+
+				/**
+				 * [tJava_2 begin ] start
+				 */
+
+				ok_Hash.put("tJava_2", false);
+				start_Hash.put("tJava_2", System.currentTimeMillis());
+
+				currentComponent = "tJava_2";
+
+				int tos_count_tJava_2 = 0;
+
+				RoutineMetrics.jobDone(jobName, globalMap,
+						System.currentTimeMillis() - startTime,
+						"failure".equals(status) ? 1 : 0);
+
+				/**
+				 * [tJava_2 begin ] stop
+				 */
+
+				/**
+				 * [tJava_2 main ] start
+				 */
+
+				currentComponent = "tJava_2";
+
+				tos_count_tJava_2++;
+
+				/**
+				 * [tJava_2 main ] stop
+				 */
+
+				/**
+				 * [tJava_2 end ] start
+				 */
+
+				currentComponent = "tJava_2";
+
+				ok_Hash.put("tJava_2", true);
+				end_Hash.put("tJava_2", System.currentTimeMillis());
+
+				/**
+				 * [tJava_2 end ] stop
+				 */
+			}// end the resume
+
+		} catch (java.lang.Exception e) {
+
+			TalendException te = new TalendException(e, currentComponent,
+					globalMap);
+
+			throw te;
+		} catch (java.lang.Error error) {
+
+			throw error;
+		} finally {
+
+			try {
+
+				/**
+				 * [tJava_2 finally ] start
+				 */
+
+				currentComponent = "tJava_2";
+
+				/**
+				 * [tJava_2 finally ] stop
+				 */
+			} catch (java.lang.Exception e) {
+				// ignore
+			} catch (java.lang.Error error) {
+				// ignore
+			}
+			resourceMap = null;
+		}
+
+		globalMap.put("tJava_2_SUBPROCESS_STATE", 1);
+	}
+
 	public String resuming_logs_dir_path = null;
 	public String resuming_checkpoint_path = null;
 	public String parent_part_launcher = null;
@@ -11923,7 +12265,7 @@ public class HistoryDelete implements TalendJob {
 		this.globalResumeTicket = false;// to run others jobs
 
 		runningThreadCount.add(1);
-		new Thread() {
+		RoutineWorkerPool.execute(new Runnable() {
 			public void run() {
 				java.util.Map threadRunResultMap = new java.util.HashMap();
 				threadRunResultMap.put("errorCode", null);
@@ -11966,10 +12308,10 @@ public class HistoryDelete implements TalendJob {
 					runningThreadCount.add(-1);
 				}
 			}
-		}.start();
+		});
 
 		runningThreadCount.add(1);
-		new Thread() {
+		RoutineWorkerPool.execute(new Runnable() {
 			public void run() {
 				java.util.Map threadRunResultMap = new java.util.HashMap();
 				threadRunResultMap.put("errorCode", null);
@@ -12012,10 +12354,10 @@ public class HistoryDelete implements TalendJob {
 					runningThreadCount.add(-1);
 				}
 			}
-		}.start();
+		});
 
 		runningThreadCount.add(1);
-		new Thread() {
+		RoutineWorkerPool.execute(new Runnable() {
 			public void run() {
 				java.util.Map threadRunResultMap = new java.util.HashMap();
 				threadRunResultMap.put("errorCode", null);
@@ -12058,10 +12400,10 @@ public class HistoryDelete implements TalendJob {
 					runningThreadCount.add(-1);
 				}
 			}
-		}.start();
+		});
 
 		runningThreadCount.add(1);
-		new Thread() {
+		RoutineWorkerPool.execute(new Runnable() {
 			public void run() {
 				java.util.Map threadRunResultMap = new java.util.HashMap();
 				threadRunResultMap.put("errorCode", null);
@@ -12104,10 +12446,10 @@ public class HistoryDelete implements TalendJob {
 					runningThreadCount.add(-1);
 				}
 			}
-		}.start();
+		});
 
 		runningThreadCount.add(1);
-		new Thread() {
+		RoutineWorkerPool.execute(new Runnable() {
 			public void run() {
 				java.util.Map threadRunResultMap = new java.util.HashMap();
 				threadRunResultMap.put("errorCode", null);
@@ -12150,10 +12492,10 @@ public class HistoryDelete implements TalendJob {
 					runningThreadCount.add(-1);
 				}
 			}
-		}.start();
+		});
 
 		runningThreadCount.add(1);
-		new Thread() {
+		RoutineWorkerPool.execute(new Runnable() {
 			public void run() {
 				java.util.Map threadRunResultMap = new java.util.HashMap();
 				threadRunResultMap.put("errorCode", null);
@@ -12196,10 +12538,10 @@ public class HistoryDelete implements TalendJob {
 					runningThreadCount.add(-1);
 				}
 			}
-		}.start();
+		});
 
 		runningThreadCount.add(1);
-		new Thread() {
+		RoutineWorkerPool.execute(new Runnable() {
 			public void run() {
 				java.util.Map threadRunResultMap = new java.util.HashMap();
 				threadRunResultMap.put("errorCode", null);
@@ -12242,10 +12584,10 @@ public class HistoryDelete implements TalendJob {
 					runningThreadCount.add(-1);
 				}
 			}
-		}.start();
+		});
 
 		runningThreadCount.add(1);
-		new Thread() {
+		RoutineWorkerPool.execute(new Runnable() {
 			public void run() {
 				java.util.Map threadRunResultMap = new java.util.HashMap();
 				threadRunResultMap.put("errorCode", null);
@@ -12288,10 +12630,10 @@ public class HistoryDelete implements TalendJob {
 					runningThreadCount.add(-1);
 				}
 			}
-		}.start();
+		});
 
 		runningThreadCount.add(1);
-		new Thread() {
+		RoutineWorkerPool.execute(new Runnable() {
 			public void run() {
 				java.util.Map threadRunResultMap = new java.util.HashMap();
 				threadRunResultMap.put("errorCode", null);
@@ -12334,10 +12676,10 @@ public class HistoryDelete implements TalendJob {
 					runningThreadCount.add(-1);
 				}
 			}
-		}.start();
+		});
 
 		runningThreadCount.add(1);
-		new Thread() {
+		RoutineWorkerPool.execute(new Runnable() {
 			public void run() {
 				java.util.Map threadRunResultMap = new java.util.HashMap();
 				threadRunResultMap.put("errorCode", null);
@@ -12380,10 +12722,10 @@ public class HistoryDelete implements TalendJob {
 					runningThreadCount.add(-1);
 				}
 			}
-		}.start();
+		});
 
 		runningThreadCount.add(1);
-		new Thread() {
+		RoutineWorkerPool.execute(new Runnable() {
 			public void run() {
 				java.util.Map threadRunResultMap = new java.util.HashMap();
 				threadRunResultMap.put("errorCode", null);
@@ -12426,10 +12768,10 @@ public class HistoryDelete implements TalendJob {
 					runningThreadCount.add(-1);
 				}
 			}
-		}.start();
+		});
 
 		runningThreadCount.add(1);
-		new Thread() {
+		RoutineWorkerPool.execute(new Runnable() {
 			public void run() {
 				java.util.Map threadRunResultMap = new java.util.HashMap();
 				threadRunResultMap.put("errorCode", null);
@@ -12472,10 +12814,10 @@ public class HistoryDelete implements TalendJob {
 					runningThreadCount.add(-1);
 				}
 			}
-		}.start();
+		});
 
 		runningThreadCount.add(1);
-		new Thread() {
+		RoutineWorkerPool.execute(new Runnable() {
 			public void run() {
 				java.util.Map threadRunResultMap = new java.util.HashMap();
 				threadRunResultMap.put("errorCode", null);
@@ -12518,10 +12860,10 @@ public class HistoryDelete implements TalendJob {
 					runningThreadCount.add(-1);
 				}
 			}
-		}.start();
+		});
 
 		runningThreadCount.add(1);
-		new Thread() {
+		RoutineWorkerPool.execute(new Runnable() {
 			public void run() {
 				java.util.Map threadRunResultMap = new java.util.HashMap();
 				threadRunResultMap.put("errorCode", null);
@@ -12564,10 +12906,10 @@ public class HistoryDelete implements TalendJob {
 					runningThreadCount.add(-1);
 				}
 			}
-		}.start();
+		});
 
 		runningThreadCount.add(1);
-		new Thread() {
+		RoutineWorkerPool.execute(new Runnable() {
 			public void run() {
 				java.util.Map threadRunResultMap = new java.util.HashMap();
 				threadRunResultMap.put("errorCode", null);
@@ -12610,10 +12952,10 @@ public class HistoryDelete implements TalendJob {
 					runningThreadCount.add(-1);
 				}
 			}
-		}.start();
+		});
 
 		runningThreadCount.add(1);
-		new Thread() {
+		RoutineWorkerPool.execute(new Runnable() {
 			public void run() {
 				java.util.Map threadRunResultMap = new java.util.HashMap();
 				threadRunResultMap.put("errorCode", null);
@@ -12656,10 +12998,10 @@ public class HistoryDelete implements TalendJob {
 					runningThreadCount.add(-1);
 				}
 			}
-		}.start();
+		});
 
 		runningThreadCount.add(1);
-		new Thread() {
+		RoutineWorkerPool.execute(new Runnable() {
 			public void run() {
 				java.util.Map threadRunResultMap = new java.util.HashMap();
 				threadRunResultMap.put("errorCode", null);
@@ -12702,10 +13044,10 @@ public class HistoryDelete implements TalendJob {
 					runningThreadCount.add(-1);
 				}
 			}
-		}.start();
+		});
 
 		runningThreadCount.add(1);
-		new Thread() {
+		RoutineWorkerPool.execute(new Runnable() {
 			public void run() {
 				java.util.Map threadRunResultMap = new java.util.HashMap();
 				threadRunResultMap.put("errorCode", null);
@@ -12748,10 +13090,10 @@ public class HistoryDelete implements TalendJob {
 					runningThreadCount.add(-1);
 				}
 			}
-		}.start();
+		});
 
 		runningThreadCount.add(1);
-		new Thread() {
+		RoutineWorkerPool.execute(new Runnable() {
 			public void run() {
 				java.util.Map threadRunResultMap = new java.util.HashMap();
 				threadRunResultMap.put("errorCode", null);
@@ -12794,10 +13136,10 @@ public class HistoryDelete implements TalendJob {
 					runningThreadCount.add(-1);
 				}
 			}
-		}.start();
+		});
 
 		runningThreadCount.add(1);
-		new Thread() {
+		RoutineWorkerPool.execute(new Runnable() {
 			public void run() {
 				java.util.Map threadRunResultMap = new java.util.HashMap();
 				threadRunResultMap.put("errorCode", null);
@@ -12840,10 +13182,10 @@ public class HistoryDelete implements TalendJob {
 					runningThreadCount.add(-1);
 				}
 			}
-		}.start();
+		});
 
 		runningThreadCount.add(1);
-		new Thread() {
+		RoutineWorkerPool.execute(new Runnable() {
 			public void run() {
 				java.util.Map threadRunResultMap = new java.util.HashMap();
 				threadRunResultMap.put("errorCode", null);
@@ -12886,10 +13228,10 @@ public class HistoryDelete implements TalendJob {
 					runningThreadCount.add(-1);
 				}
 			}
-		}.start();
+		});
 
 		runningThreadCount.add(1);
-		new Thread() {
+		RoutineWorkerPool.execute(new Runnable() {
 			public void run() {
 				java.util.Map threadRunResultMap = new java.util.HashMap();
 				threadRunResultMap.put("errorCode", null);
@@ -12932,10 +13274,10 @@ public class HistoryDelete implements TalendJob {
 					runningThreadCount.add(-1);
 				}
 			}
-		}.start();
+		});
 
 		runningThreadCount.add(1);
-		new Thread() {
+		RoutineWorkerPool.execute(new Runnable() {
 			public void run() {
 				java.util.Map threadRunResultMap = new java.util.HashMap();
 				threadRunResultMap.put("errorCode", null);
@@ -12978,7 +13320,7 @@ public class HistoryDelete implements TalendJob {
 					runningThreadCount.add(-1);
 				}
 			}
-		}.start();
+		});
 
 		while (runningThreadCount.getCount() > 0) {
 			try {
@@ -12990,6 +13332,19 @@ public class HistoryDelete implements TalendJob {
 
 		this.globalResumeTicket = true;// to run tPostJob
 
+		try {
+			errorCode = null;
+			tPostjob_1Process(globalMap);
+			if (!"failure".equals(status)) {
+				status = "end";
+			}
+		} catch (TalendException e_tPostjob_1) {
+			globalMap.put("tPostjob_1_SUBPROCESS_STATE", -1);
+
+			e_tPostjob_1.printStackTrace();
+
+		}
+
 		end = System.currentTimeMillis();
 
 		if (watch) {
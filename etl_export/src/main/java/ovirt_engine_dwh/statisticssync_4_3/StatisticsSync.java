@@ -20,6 +20,8 @@ import routines.Numeric;
 import routines.DataOperation;
 import routines.TalendDataGenerator;
 import routines.RoutineHistoryETL;
+import routines.RoutineMetrics;
+import routines.RoutineWorkerPool;
 import routines.TalendString;
 import routines.StringHandling;
 import routines.Relational;
@@ -41,6 +43,12 @@ import java.io.ObjectInputStream;
 import java.io.IOException;
 import java.util.Comparator;
 
+//the import part of tJava_1
+//import java.util.List;
+
+//the import part of tJava_2
+//import java.util.List;
+
 @SuppressWarnings("unused")
 /**
  * Job: StatisticsSync Purpose: <br>
@@ -829,6 +837,39 @@ public class StatisticsSync implements TalendJob {
 		talendLogs_LOGS_onSubJobError(exception, errorComponent, globalMap);
 	}
 
+	public void tPostjob_1_error(Exception exception, String errorComponent,
+			final java.util.Map<String, Object> globalMap)
+			throws TalendException {
+
+		end_Hash.put(errorComponent, System.currentTimeMillis());
+
+		((java.util.Map) threadLocal.get()).put("status", "failure");
+
+		tPostjob_1_onSubJobError(exception, errorComponent, globalMap);
+	}
+
+	public void tJava_1_error(Exception exception, String errorComponent,
+			final java.util.Map<String, Object> globalMap)
+			throws TalendException {
+
+		end_Hash.put(errorComponent, System.currentTimeMillis());
+
+		((java.util.Map) threadLocal.get()).put("status", "failure");
+
+		tJava_1_onSubJobError(exception, errorComponent, globalMap);
+	}
+
+	public void tJava_2_error(Exception exception, String errorComponent,
+			final java.util.Map<String, Object> globalMap)
+			throws TalendException {
+
+		end_Hash.put(errorComponent, System.currentTimeMillis());
+
+		((java.util.Map) threadLocal.get()).put("status", "failure");
+
+		tJava_2_onSubJobError(exception, errorComponent, globalMap);
+	}
+
 	public void tJDBCInput_4_onSubJobError(Exception exception,
 			String errorComponent, final java.util.Map<String, Object> globalMap)
 			throws TalendException {
@@ -1027,6 +1068,39 @@ public class StatisticsSync implements TalendJob {
 
 	}
 
+	public void tPostjob_1_onSubJobError(Exception exception,
+			String errorComponent, final java.util.Map<String, Object> globalMap)
+			throws TalendException {
+
+		resumeUtil.addLog("SYSTEM_LOG", "NODE:" + errorComponent, "", Thread
+				.currentThread().getId() + "", "FATAL", "",
+				exception.getMessage(),
+				ResumeUtil.getExceptionStackTrace(exception), "");
+
+	}
+
+	public void tJava_1_onSubJobError(Exception exception,
+			String errorComponent, final java.util.Map<String, Object> globalMap)
+			throws TalendException {
+
+		resumeUtil.addLog("SYSTEM_LOG", "NODE:" + errorComponent, "", Thread
+				.currentThread().getId() + "", "FATAL", "",
+				exception.getMessage(),
+				ResumeUtil.getExceptionStackTrace(exception), "");
+
+	}
+
+	public void tJava_2_onSubJobError(Exception exception,
+			String errorComponent, final java.util.Map<String, Object> globalMap)
+			throws TalendException {
+
+		resumeUtil.addLog("SYSTEM_LOG", "NODE:" + errorComponent, "", Thread
+				.currentThread().getId() + "", "FATAL", "",
+				exception.getMessage(),
+				ResumeUtil.getExceptionStackTrace(exception), "");
+
+	}
+
 	public static class storage_historyStruct implements
 			routines.system.IPersistableRow<storage_historyStruct> {
 		final static byte[] commonByteArrayLock_OVIRT_ENGINE_DWH_StatisticsSync = new byte[0];
@@ -1794,8 +1868,13 @@ public class StatisticsSync implements TalendJob {
 
 				int nb_line_tJDBCInput_4 = 0;
 				java.sql.Connection conn_tJDBCInput_4 = null;
-				conn_tJDBCInput_4 = (java.sql.Connection) globalMap
-						.get("conn_tJDBCConnection_1");
+				conn_tJDBCInput_4 = RoutineWorkerPool.readConnection(
+						(java.sql.Connection) globalMap
+								.get("conn_tJDBCConnection_1"),
+						context.ovirtEngineDbDriverClass,
+						context.ovirtEngineDbJdbcConnection,
+						context.ovirtEngineDbUser,
+						context.ovirtEngineDbPassword);
 
 				java.sql.Statement stmt_tJDBCInput_4 = conn_tJDBCInput_4
 						.createStatement();
@@ -4040,8 +4119,13 @@ public class StatisticsSync implements TalendJob {
 
 				int nb_line_tJDBCInput_5 = 0;
 				java.sql.Connection conn_tJDBCInput_5 = null;
-				conn_tJDBCInput_5 = (java.sql.Connection) globalMap
-						.get("conn_tJDBCConnection_1");
+				conn_tJDBCInput_5 = RoutineWorkerPool.readConnection(
+						(java.sql.Connection) globalMap
+								.get("conn_tJDBCConnection_1"),
+						context.ovirtEngineDbDriverClass,
+						context.ovirtEngineDbJdbcConnection,
+						context.ovirtEngineDbUser,
+						context.ovirtEngineDbPassword);
 
 				java.sql.Statement stmt_tJDBCInput_5 = conn_tJDBCInput_5
 						.createStatement();
@@ -5975,8 +6059,13 @@ public class StatisticsSync implements TalendJob {
 
 				int nb_line_tJDBCInput_8 = 0;
 				java.sql.Connection conn_tJDBCInput_8 = null;
-				conn_tJDBCInput_8 = (java.sql.Connection) globalMap
-						.get("conn_tJDBCConnection_1");
+				conn_tJDBCInput_8 = RoutineWorkerPool.readConnection(
+						(java.sql.Connection) globalMap
+								.get("conn_tJDBCConnection_1"),
+						context.ovirtEngineDbDriverClass,
+						context.ovirtEngineDbJdbcConnection,
+						context.ovirtEngineDbUser,
+						context.ovirtEngineDbPassword);
 
 				java.sql.Statement stmt_tJDBCInput_8 = conn_tJDBCInput_8
 						.createStatement();
@@ -8499,8 +8588,13 @@ public class StatisticsSync implements TalendJob {
 
 				int nb_line_tJDBCInput_10 = 0;
 				java.sql.Connection conn_tJDBCInput_10 = null;
-				conn_tJDBCInput_10 = (java.sql.Connection) globalMap
-						.get("conn_tJDBCConnection_1");
+				conn_tJDBCInput_10 = RoutineWorkerPool.readConnection(
+						(java.sql.Connection) globalMap
+								.get("conn_tJDBCConnection_1"),
+						context.ovirtEngineDbDriverClass,
+						context.ovirtEngineDbJdbcConnection,
+						context.ovirtEngineDbUser,
+						context.ovirtEngineDbPassword);
 
 				java.sql.Statement stmt_tJDBCInput_10 = conn_tJDBCInput_10
 						.createStatement();
@@ -11095,8 +11189,13 @@ public class StatisticsSync implements TalendJob {
 
 				int nb_line_tJDBCInput_12 = 0;
 				java.sql.Connection conn_tJDBCInput_12 = null;
-				conn_tJDBCInput_12 = (java.sql.Connection) globalMap
-						.get("conn_tJDBCConnection_1");
+				conn_tJDBCInput_12 = RoutineWorkerPool.readConnection(
+						(java.sql.Connection) globalMap
+								.get("conn_tJDBCConnection_1"),
+						context.ovirtEngineDbDriverClass,
+						context.ovirtEngineDbJdbcConnection,
+						context.ovirtEngineDbUser,
+						context.ovirtEngineDbPassword);
 
 				java.sql.Statement stmt_tJDBCInput_12 = conn_tJDBCInput_12
 						.createStatement();
@@ -13073,8 +13172,13 @@ public class StatisticsSync implements TalendJob {
 
 				int nb_line_tJDBCInput_18 = 0;
 				java.sql.Connection conn_tJDBCInput_18 = null;
-				conn_tJDBCInput_18 = (java.sql.Connection) globalMap
-						.get("conn_tJDBCConnection_1");
+				conn_tJDBCInput_18 = RoutineWorkerPool.readConnection(
+						(java.sql.Connection) globalMap
+								.get("conn_tJDBCConnection_1"),
+						context.ovirtEngineDbDriverClass,
+						context.ovirtEngineDbJdbcConnection,
+						context.ovirtEngineDbUser,
+						context.ovirtEngineDbPassword);
 
 				java.sql.Statement stmt_tJDBCInput_18 = conn_tJDBCInput_18
 						.createStatement();
@@ -14116,6 +14220,8 @@ public class StatisticsSync implements TalendJob {
 				ok_Hash.put("tPrejob_1", true);
 				end_Hash.put("tPrejob_1", System.currentTimeMillis());
 
+				tJava_1Process(globalMap);
+
 				tJDBCConnection_1Process(globalMap);
 
 				/**
@@ -15594,6 +15700,299 @@ public class StatisticsSync implements TalendJob {
 		globalMap.put("talendLogs_LOGS_SUBPROCESS_STATE", 1);
 	}
 
+	public void tPostjob_1Process(final java.util.Map<String, Object> globalMap)
+			throws TalendException {
+		globalMap.put("tPostjob_1_SUBPROCESS_STATE", 0);
+
+		final boolean execStat = this.execStat;
+
+		String iterateId = "";
+
+		String currentComponent = "";
+		java.util.Map<String, Object> resourceMap = new java.util.HashMap<String, Object>();
+
+		try {
+
+			String currentMethodName = new java.lang.Exception()
+					.getStackTrace()[0].getMethodName();
+			boolean resumeIt = currentMethodName.equals(resumeEntryMethodName);
+			if (resumeEntryMethodName == null || resumeIt || globalResumeTicket) {// start
+																				// the
+																				// resume
+				globalResumeTicket = true;
+
+				/**
+				 * [tPostjob_1 begin ] start
+				 */
+
+				ok_Hash.put("tPostjob_1", false);
+				start_Hash.put("tPostjob_1", System.currentTimeMillis());
+
+				currentComponent = "tPostjob_1";
+
+				int tos_count_tPostjob_1 = 0;
+
+				/**
+				 * [tPostjob_1 begin ] stop
+				 */
+
+				/**
+				 * [tPostjob_1 main ] start
+				 */
+
+				currentComponent = "tPostjob_1";
+
+				tos_count_tPostjob_1++;
+
+				/**
+				 * [tPostjob_1 main ] stop
+				 */
+
+				/**
+				 * [tPostjob_1 end ] start
+				 */
+
+				currentComponent = "tPostjob_1";
+
+				ok_Hash.put("tPostjob_1", true);
+				end_Hash.put("tPostjob_1", System.currentTimeMillis());
+
+				tJava_2Process(globalMap);
+
+				/**
+				 * [tPostjob_1 end ] stop
+				 */
+			}// end the resume
+
+		} catch (java.lang.Exception e) {
+
+			TalendException te = new TalendException(e, currentComponent,
+					globalMap);
+
+			throw te;
+		} catch (java.lang.Error error) {
+
+			throw error;
+		} finally {
+
+			try {
+
+				/**
+				 * [tPostjob_1 finally ] start
+				 */
+
+				currentComponent = "tPostjob_1";
+
+				/**
+				 * [tPostjob_1 finally ] stop
+				 */
+			} catch (java.lang.Exception e) {
+				// ignore
+			} catch (java.lang.Error error) {
+				// ignore
+			}
+			resourceMap = null;
+		}
+
+		globalMap.put("tPostjob_1_SUBPROCESS_STATE", 1);
+	}
+
+	public void tJava_1Process(final java.util.Map<String, Object> globalMap)
+			throws TalendException {
+		globalMap.put("tJava_1_SUBPROCESS_STATE", 0);
+
+		final boolean execStat = this.execStat;
+
+		String iterateId = "";
+
+		String currentComponent = "";
+		java.util.Map<String, Object> resourceMap = new java.util.HashMap<String, Object>();
+
+		try {
+
+			String currentMethodName = new java.lang.Exception()
+					.getStackTrace()[0].getMethodName();
+			boolean resumeIt = currentMethodName.equals(resumeEntryMethodName);
+			if (resumeEntryMethodName == null || resumeIt || globalResumeTicket) {// start
+																				// the
+																				// resume
+				globalResumeTicket = true;
+
+				/**
+				 * [tJava_1 begin ] start
+				 */
+
+				ok_Hash.put("tJava_1", false);
+				start_Hash.put("tJava_1", System.currentTimeMillis());
+
+				currentComponent = "tJava_1";
+
+				int tos_count_tJava_1 = 0;
+
+				RoutineMetrics.jobStarted(jobName);
+
+				/**
+				 * [tJava_1 begin ] stop
+				 */
+
+				/**
+				 * [tJava_1 main ] start
+				 */
+
+				currentComponent = "tJava_1";
+
+				tos_count_tJava_1++;
+
+				/**
+				 * [tJava_1 main ] stop
+				 */
+
+				/**
+				 * [tJava_1 end ] start
+				 */
+
+				currentComponent = "tJava_1";
+
+				ok_Hash.put("tJava_1", true);
+				end_Hash.put("tJava_1", System.currentTimeMillis());
+
+				/**
+				 * [tJava_1 end ] stop
+				 */
+			}// end the resume
+
+		} catch (java.lang.Exception e) {
+
+			TalendException te = new TalendException(e, currentComponent,
+					globalMap);
+
+			throw te;
+		} catch (java.lang.Error error) {
+
+			throw error;
+		} finally {
+
+			try {
+
+				/**
+				 * [tJava_1 finally ] start
+				 */
+
+				currentComponent = "tJava_1";
+
+				/**
+				 * [tJava_1 finally ] stop
+				 */
+			} catch (java.lang.Exception e) {
+				// ignore
+			} catch (java.lang.Error error) {
+				// ignore
+			}
+			resourceMap = null;
+		}
+
+		globalMap.put("tJava_1_SUBPROCESS_STATE", 1);
+	}
+
+	public void tJava_2Process(final java.util.Map<String, Object> globalMap)
+			throws TalendException {
+		globalMap.put("tJava_2_SUBPROCESS_STATE", 0);
+
+		final boolean execStat = this.execStat;
+
+		String iterateId = "";
+
+		String currentComponent = "";
+		java.util.Map<String, Object> resourceMap = new java.util.HashMap<String, Object>();
+
+		try {
+
+			String currentMethodName = new java.lang.Exception()
+					.getStackTrace()[0].getMethodName();
+			boolean resumeIt = currentMethodName.equals(resumeEntryMethodName);
+			if (resumeEntryMethodName == null || resumeIt || globalResumeTicket) {// start
+																				// the
+																				// resume
+				globalResumeTicket = true;
+
+				/**
+				 * [tJava_2 begin ] start
+				 */
+
+				ok_Hash.put("tJava_2", false);
+				start_Hash.put("tJava_2", System.currentTimeMillis());
+
+				currentComponent = "tJava_2";
+
+				int tos_count_tJava_2 = 0;
+
+				RoutineMetrics.jobDone(jobName, globalMap,
+						System.currentTimeMillis() - startTime,
+						"failure".equals(status) ? 1 : 0);
+
+				/**
+				 * [tJava_2 begin ] stop
+				 */
+
+				/**
+				 * [tJava_2 main ] start
+				 */
+
+				currentComponent = "tJava_2";
+
+				tos_count_tJava_2++;
+
+				/**
+				 * [tJava_2 main ] stop
+				 */
+
+				/**
+				 * [tJava_2 end ] start
+				 */
+
+				currentComponent = "tJava_2";
+
+				ok_Hash.put("tJava_2", true);
+				end_Hash.put("tJava_2", System.currentTimeMillis());
+
+				/**
+				 * [tJava_2 end ] stop
+				 */
+			}// end the resume
+
+		} catch (java.lang.Exception e) {
+
+			TalendException te = new TalendException(e, currentComponent,
+					globalMap);
+
+			throw te;
+		} catch (java.lang.Error error) {
+
+			throw error;
+		} finally {
+
+			try {
+
+				/**
+				 * [tJava_2 finally ] start
+				 */
+
+				currentComponent = "tJava_2";
+
+				/**
+				 * [tJava_2 finally ] stop
+				 */
+			} catch (java.lang.Exception e) {
+				// ignore
+			} catch (java.lang.Error error) {
+				// ignore
+			}
+			resourceMap = null;
+		}
+
+		globalMap.put("tJava_2_SUBPROCESS_STATE", 1);
+	}
+
 	public String resuming_logs_dir_path = null;
 	public String resuming_checkpoint_path = null;
 	public String parent_part_launcher = null;
@@ -15921,7 +16320,7 @@ public class StatisticsSync implements TalendJob {
 		this.globalResumeTicket = false;// to run others jobs
 
 		runningThreadCount.add(1);
-		new Thread() {
+		RoutineWorkerPool.executeSampling(new Runnable() {
 			public void run() {
 				java.util.Map threadRunResultMap = new java.util.HashMap();
 				threadRunResultMap.put("errorCode", null);
@@ -15964,10 +16363,10 @@ public class StatisticsSync implements TalendJob {
 					runningThreadCount.add(-1);
 				}
 			}
-		}.start();
+		});
 
 		runningThreadCount.add(1);
-		new Thread() {
+		RoutineWorkerPool.executeSampling(new Runnable() {
 			public void run() {
 				java.util.Map threadRunResultMap = new java.util.HashMap();
 				threadRunResultMap.put("errorCode", null);
@@ -16010,10 +16409,10 @@ public class StatisticsSync implements TalendJob {
 					runningThreadCount.add(-1);
 				}
 			}
-		}.start();
+		});
 
 		runningThreadCount.add(1);
-		new Thread() {
+		RoutineWorkerPool.executeSampling(new Runnable() {
 			public void run() {
 				java.util.Map threadRunResultMap = new java.util.HashMap();
 				threadRunResultMap.put("errorCode", null);
@@ -16056,10 +16455,10 @@ public class StatisticsSync implements TalendJob {
 					runningThreadCount.add(-1);
 				}
 			}
-		}.start();
+		});
 
 		runningThreadCount.add(1);
-		new Thread() {
+		RoutineWorkerPool.executeSampling(new Runnable() {
 			public void run() {
 				java.util.Map threadRunResultMap = new java.util.HashMap();
 				threadRunResultMap.put("errorCode", null);
@@ -16102,10 +16501,10 @@ public class StatisticsSync implements TalendJob {
 					runningThreadCount.add(-1);
 				}
 			}
-		}.start();
+		});
 
 		runningThreadCount.add(1);
-		new Thread() {
+		RoutineWorkerPool.executeSampling(new Runnable() {
 			public void run() {
 				java.util.Map threadRunResultMap = new java.util.HashMap();
 				threadRunResultMap.put("errorCode", null);
@@ -16148,10 +16547,10 @@ public class StatisticsSync implements TalendJob {
 					runningThreadCount.add(-1);
 				}
 			}
-		}.start();
+		});
 
 		runningThreadCount.add(1);
-		new Thread() {
+		RoutineWorkerPool.executeSampling(new Runnable() {
 			public void run() {
 				java.util.Map threadRunResultMap = new java.util.HashMap();
 				threadRunResultMap.put("errorCode", null);
@@ -16194,7 +16593,7 @@ public class StatisticsSync implements TalendJob {
 					runningThreadCount.add(-1);
 				}
 			}
-		}.start();
+		});
 
 		while (runningThreadCount.getCount() > 0) {
 			try {
@@ -16206,6 +16605,19 @@ public class StatisticsSync implements TalendJob {
 
 		this.globalResumeTicket = true;// to run tPostJob
 
+		try {
+			errorCode = null;
+			tPostjob_1Process(globalMap);
+			if (!"failure".equals(status)) {
+				status = "end";
+			}
+		} catch (TalendException e_tPostjob_1) {
+			globalMap.put("tPostjob_1_SUBPROCESS_STATE", -1);
+
+			e_tPostjob_1.printStackTrace();
+
+		}
+
 		end = System.currentTimeMillis();
 
 		if (watch) {
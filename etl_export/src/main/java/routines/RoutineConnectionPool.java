@@ -0,0 +1,373 @@
+package routines;
+
+import java.lang.reflect.InvocationHandler;
+import java.lang.reflect.InvocationTargetException;
+import java.lang.reflect.Method;
+import java.lang.reflect.Proxy;
+import java.sql.Connection;
+import java.sql.DriverManager;
+import java.sql.SQLException;
+import java.text.SimpleDateFormat;
+import java.util.Date;
+import java.util.HashMap;
+import java.util.LinkedList;
+import java.util.Map;
+import java.util.Properties;
+import java.util.concurrent.Semaphore;
+import java.util.concurrent.TimeUnit;
+
+/*
+ * Pools the connections of the ETL jobs to the engine and history
+ * databases.
+ *
+ * Every database, by url and user, has at most
+ * org.ovirt.engine.dwh.dbPool.size connections besides the shared ones.
+ * Closing a connection taken from the pool gives it back, rolled back and
+ * in auto commit, instead of closing it, so that the jobs closing their
+ * connections every run do not connect again. A connection given back is
+ * checked to be valid before being taken again, and is replaced when it
+ * is not. One found invalid while taken is closed when given back.
+ * Waiting for a connection of a database whose connections are all taken,
+ * and connecting, fail after org.ovirt.engine.dwh.dbPool.timeout seconds.
+ *
+ * The connections shared by name by the jobs, with SharedDBConnection, are
+ * taken with getSharedConnection. They are kept for as long as the jobs
+ * run, so they are not counted in the size of the pool, which bounds only
+ * the connections taken and given back while the jobs run, such as the
+ * ones of the worker threads.
+ *
+ * The connections to PostgreSQL keep the server side prepared statements
+ * of up to org.ovirt.engine.dwh.dbPool.statementCache queries, 0 to not
+ * keep any. They are kept as long as the connection, so the statements of
+ * the jobs are not planned again every sample cycle. Parameters in the url
+ * take precedence.
+ */
+public class RoutineConnectionPool {
+
+    private static final String PROPERTY = "org.ovirt.engine.dwh.dbPool";
+
+    private static class Pool {
+
+        final Semaphore permits;
+        final LinkedList<Connection> idle = new LinkedList<Connection>();
+
+        Pool(int size) {
+            permits = new Semaphore(size, true);
+        }
+    }
+
+    private static boolean configured;
+    private static int size;
+    private static int timeout;
+    private static int statementCache;
+
+    private static final Map<String, Pool> pools = new HashMap<String, Pool>();
+
+    private static void log(String message) {
+        System.out.print(
+            new SimpleDateFormat("yyyy-MM-dd HH:mm:ss").format(new Date()) +
+            " Connection pool " + message + "\n"
+        );
+    }
+
+    private static synchronized void configure() {
+        if (configured) {
+            return;
+        }
+        configured = true;
+
+        size = Math.max(1, Integer.getInteger(PROPERTY + ".size", 10));
+        timeout = Math.max(1, Integer.getInteger(PROPERTY + ".timeout", 30));
+        statementCache = Math.max(0, Integer.getInteger(PROPERTY + ".statementCache", 256));
+        DriverManager.setLoginTimeout(timeout);
+        log(
+            "of " + size + " connections per database, waiting " + timeout + " seconds" +
+            (statementCache > 0 ? ", caching " + statementCache + " statements per connection" : "")
+        );
+    }
+
+    private static synchronized Pool getPool(String url, String user) {
+        configure();
+        String key = user + "@" + url;
+        Pool pool = pools.get(key);
+        if (pool == null) {
+            pool = new Pool(size);
+            pools.put(key, pool);
+        }
+        return pool;
+    }
+
+    private static void closeQuietly(Connection connection) {
+        try {
+            connection.close();
+        } catch (SQLException e) {
+            // ignore
+        }
+    }
+
+    private static Connection connect(String driver, String url, String user, String password, String name)
+            throws ClassNotFoundException, SQLException {
+        Class.forName(driver);
+        Properties info = new Properties();
+        if (user != null) {
+            info.setProperty("user", user);
+        }
+        if (password != null) {
+            info.setProperty("password", password);
+        }
+        if (url.startsWith("jdbc:postgresql:")) {
+            info.setProperty("preparedStatementCacheQueries", Integer.toString(statementCache));
+            if (statementCache == 0) {
+                info.setProperty("prepareThreshold", "0");
+            }
+        }
+        return RoutineSqlProfile.wrap(DriverManager.getConnection(url, info), name);
+    }
+
+    private static void giveBack(Pool pool, Connection connection, boolean broken, boolean counted) {
+        try {
+            if (broken) {
+                closeQuietly(connection);
+            } else if (!connection.isClosed()) {
+                if (!connection.getAutoCommit()) {
+                    connection.rollback();
+                    connection.setAutoCommit(true);
+                }
+                if (connection.isReadOnly()) {
+                    connection.setReadOnly(false);
+                }
+                connection.clearWarnings();
+                synchronized (pool) {
+                    pool.idle.addFirst(connection);
+                }
+            }
+        } catch (SQLException e) {
+            closeQuietly(connection);
+        } finally {
+            if (counted) {
+                pool.permits.release();
+            }
+        }
+    }
+
+    private static class PooledConnectionHandler implements InvocationHandler {
+
+        private final Pool pool;
+        private final Connection connection;
+        private final boolean counted;
+        private boolean closed;
+        private boolean broken;
+
+        PooledConnectionHandler(Pool pool, Connection connection, boolean counted) {
+            this.pool = pool;
+            this.connection = connection;
+            this.counted = counted;
+        }
+
+        @Override
+        public Object invoke(Object proxy, Method method, Object[] args) throws Throwable {
+            String name = method.getName();
+            if (method.getDeclaringClass() == Object.class) {
+                if (name.equals("equals")) {
+                    return proxy == args[0];
+                }
+                if (name.equals("hashCode")) {
+                    return System.identityHashCode(proxy);
+                }
+                return method.invoke(connection, args);
+            }
+            synchronized (this) {
+                if (name.equals("close")) {
+                    if (!closed) {
+                        closed = true;
+                        giveBack(pool, connection, broken, counted);
+                    }
+                    return null;
+                }
+                if (name.equals("isClosed")) {
+                    return closed || connection.isClosed();
+                }
+                if (closed) {
+                    if (name.equals("isValid")) {
+                        return false;
+                    }
+                    throw new SQLException("Connection is closed");
+                }
+            }
+            Object result;
+            try {
+                result = method.invoke(connection, args);
+            } catch (InvocationTargetException e) {
+                throw e.getCause();
+            }
+            // an invalid connection is closed when given back, instead of
+            // waiting for its rollback
+            if (name.equals("isValid") && Boolean.FALSE.equals(result)) {
+                synchronized (this) {
+                    broken = true;
+                }
+            }
+            return result;
+        }
+    }
+
+    private static void release(Pool pool, boolean counted) {
+        if (counted) {
+            pool.permits.release();
+        }
+    }
+
+    private static Connection take(
+        Pool pool,
+        String driver,
+        String url,
+        String user,
+        String password,
+        String name,
+        boolean counted
+    ) throws ClassNotFoundException, SQLException {
+        try {
+            Connection connection;
+            while (true) {
+                synchronized (pool) {
+                    connection = pool.idle.poll();
+                }
+                if (connection == null) {
+                    connection = connect(driver, url, user, password, name);
+                    break;
+                }
+                if (isValid(connection)) {
+                    break;
+                }
+                log("replacing an invalid connection of " + name);
+                closeQuietly(connection);
+            }
+            return (Connection) Proxy.newProxyInstance(
+                RoutineConnectionPool.class.getClassLoader(),
+                new Class<?>[] { Connection.class },
+                new PooledConnectionHandler(pool, connection, counted)
+            );
+        } catch (ClassNotFoundException e) {
+            release(pool, counted);
+            throw e;
+        } catch (SQLException e) {
+            release(pool, counted);
+            throw e;
+        } catch (RuntimeException e) {
+            release(pool, counted);
+            throw e;
+        }
+    }
+
+    /**
+     * Returns whether a connection is open and answers within the timeout.
+     *
+     * {talendTypes} Boolean
+     *
+     * {Category} User Defined
+     *
+     * {param} object(connection) connection : The connection to check.
+     *
+     * {example} isValid(connection) #
+     */
+    public static boolean isValid(Connection connection) {
+        configure();
+        try {
+            return !connection.isClosed() && connection.isValid(timeout);
+        } catch (SQLException e) {
+            return false;
+        }
+    }
+
+    /**
+     * Takes a connection from the pool of its database, waiting for one to
+     * be given back when all are taken. Closing it gives it back.
+     *
+     * {talendTypes} Object
+     *
+     * {Category} User Defined
+     *
+     * {param} string(context.ovirtEngineDbDriverClass) driver : The JDBC driver.
+     *
+     * {param} string(context.ovirtEngineDbJdbcConnection) url : The JDBC url.
+     *
+     * {param} string(context.ovirtEngineDbUser) user : The database user.
+     *
+     * {param} string(context.ovirtEngineDbPassword) password : The password.
+     *
+     * {param} string("engine") name : The name the connection is used with.
+     *
+     * {example} getConnection(driver, url, user, password, "engine") #
+     */
+    public static Connection getConnection(String driver, String url, String user, String password, String name)
+            throws ClassNotFoundException, SQLException {
+        Pool pool = getPool(url, user);
+        try {
+            if (!pool.permits.tryAcquire(timeout, TimeUnit.SECONDS)) {
+                throw new SQLException(
+                    "Timed out after " + timeout + " seconds waiting for a connection for " + name +
+                    ", all the " + size + " connections to " + url + " are in use"
+                );
+            }
+        } catch (InterruptedException e) {
+            Thread.currentThread().interrupt();
+            throw new SQLException("Interrupted waiting for a connection for " + name);
+        }
+        return take(pool, driver, url, user, password, name, true);
+    }
+
+    /**
+     * Takes a connection from the pool of its database, or returns null at
+     * once when all are taken. Closing it gives it back.
+     *
+     * {talendTypes} Object
+     *
+     * {Category} User Defined
+     *
+     * {param} string(context.ovirtEngineDbDriverClass) driver : The JDBC driver.
+     *
+     * {param} string(context.ovirtEngineDbJdbcConnection) url : The JDBC url.
+     *
+     * {param} string(context.ovirtEngineDbUser) user : The database user.
+     *
+     * {param} string(context.ovirtEngineDbPassword) password : The password.
+     *
+     * {param} string("engine") name : The name the connection is used with.
+     *
+     * {example} pollConnection(driver, url, user, password, "engine") #
+     */
+    public static Connection pollConnection(String driver, String url, String user, String password, String name)
+            throws ClassNotFoundException, SQLException {
+        Pool pool = getPool(url, user);
+        if (!pool.permits.tryAcquire()) {
+            return null;
+        }
+        return take(pool, driver, url, user, password, name, true);
+    }
+
+    /**
+     * Takes a connection from the pool of its database to be shared by
+     * name for as long as the jobs run, not counted in the size of the
+     * pool. Closing it gives it back.
+     *
+     * {talendTypes} Object
+     *
+     * {Category} User Defined
+     *
+     * {param} string(context.ovirtEngineDbDriverClass) driver : The JDBC driver.
+     *
+     * {param} string(context.ovirtEngineDbJdbcConnection) url : The JDBC url.
+     *
+     * {param} string(context.ovirtEngineDbUser) user : The database user.
+     *
+     * {param} string(context.ovirtEngineDbPassword) password : The password.
+     *
+     * {param} string("engine") name : The name the connection is shared by.
+     *
+     * {example} getSharedConnection(driver, url, user, password, "engine") #
+     */
+    public static Connection getSharedConnection(String driver, String url, String user, String password, String name)
+            throws ClassNotFoundException, SQLException {
+        return take(getPool(url, user), driver, url, user, password, name, false);
+    }
+}
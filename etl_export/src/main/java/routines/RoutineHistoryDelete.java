@@ -0,0 +1,329 @@
+package routines;
+
+import java.sql.Connection;
+import java.sql.ResultSet;
+import java.sql.SQLException;
+import java.sql.Statement;
+import java.text.SimpleDateFormat;
+import java.util.Date;
+import java.util.HashMap;
+import java.util.Map;
+import java.util.Properties;
+
+/*
+ * Sizes the batches of the history delete job.
+ *
+ * Every table keeps its own batch size, which is grown or shrunk after each
+ * batch so that deleting it takes about deleteTargetLatency milliseconds.
+ * Between iterations the job pauses long enough to keep the WAL written by
+ * the deletes under deleteMaxWalRate kilobytes per second.
+ *
+ * With the keyset strategy, batches are selected in history_id order by the
+ * history_delete_range database function, which checkpoints its position in
+ * history_configuration. The datetime strategy selects the rows older than
+ * the cutoff by history_datetime.
+ *
+ * State is kept for the lifetime of the JVM, so the sizes learned in one
+ * delete iteration are used by the next one.
+ */
+public class RoutineHistoryDelete {
+
+    private static final int MIN_BATCH = 100;
+    private static final long MIN_PAUSE = 1000;
+    private static final long PROGRESS_INTERVAL = 60000;
+
+    // Bounds of the change of the batch size after one batch
+    private static final double MIN_FACTOR = 0.5;
+    private static final double MAX_FACTOR = 2.0;
+
+    private static class Batch {
+        String table;
+        Date cutoff;
+        int size;
+        long started;
+        long deleted;
+        long elapsed;
+        long remaining = -1;
+        long logged;
+        boolean full;
+    }
+
+    private static final Map<String, Batch> batches = new HashMap<String, Batch>();
+
+    private static int initialBatch = 1000;
+    private static int maxBatch = 1000000;
+    private static long targetLatency = 2000;
+    private static long maxWalRate = 10240;
+    private static boolean keyset = true;
+
+    private static Boolean walSupported;
+    // Set once the WAL position cannot be read, not reset by configure().
+    private static boolean walUnavailable;
+    private static long lastWalPosition = -1;
+    private static long lastPauseEnd;
+
+    private static int intProperty(Properties context, String name, int defaultValue) {
+        String value = context.getProperty(name);
+        if (value == null || value.trim().isEmpty()) {
+            return defaultValue;
+        }
+        return Integer.parseInt(value.trim());
+    }
+
+    private static void log(String message) {
+        System.out.print(
+            new SimpleDateFormat("yyyy-MM-dd HH:mm:ss").format(new Date()) +
+            " History delete " + message + "\n"
+        );
+    }
+
+    private static String formatDuration(long millis) {
+        long minutes = millis / 60000;
+        if (minutes < 1) {
+            return (millis / 1000) + "s";
+        }
+        if (minutes < 120) {
+            return minutes + "m";
+        }
+        return (minutes / 60) + "h" + (minutes % 60) + "m";
+    }
+
+    /**
+     * Reads the delete settings of the job context.
+     *
+     * {talendTypes} Object
+     *
+     * {Category} User Defined
+     *
+     * {param} object(context) context : The job context.
+     *
+     * {example} configure(context) #
+     */
+    public static synchronized void configure(Properties context) {
+        initialBatch = Math.max(MIN_BATCH, intProperty(context, "deleteMultiplier", initialBatch));
+        maxBatch = Math.max(initialBatch, intProperty(context, "deleteMaxBatch", maxBatch));
+        targetLatency = Math.max(1, intProperty(context, "deleteTargetLatency", (int) targetLatency));
+        maxWalRate = Math.max(0, intProperty(context, "deleteMaxWalRate", (int) maxWalRate));
+        String strategy = context.getProperty("deleteStrategy");
+        if (strategy != null && !strategy.trim().isEmpty()) {
+            keyset = !"datetime".equals(strategy.trim());
+        }
+    }
+
+    /**
+     * Returns the query selecting the next batch of rows to delete from a table.
+     *
+     * {talendTypes} String
+     *
+     * {Category} User Defined
+     *
+     * {param} object(context) context : The job context.
+     *
+     * {param} string("host_samples_history") table : The history table.
+     *
+     * {param} date(cutoff) cutoff : Rows older than this are deleted.
+     *
+     * {example} selectQuery(context, "host_samples_history", cutoff) #
+     */
+    public static synchronized String selectQuery(Properties context, String table, Date cutoff) {
+        configure(context);
+        Batch batch = batches.get(table);
+        if (batch == null) {
+            batch = new Batch();
+            batch.table = table;
+            batch.size = initialBatch;
+            batches.put(table, batch);
+        }
+        // The cutoff moves with every iteration, the remaining rows counted
+        // at the start of a backlog are only decremented until it is done.
+        batch.cutoff = cutoff;
+        batch.size = Math.min(batch.size, maxBatch);
+        batch.started = System.currentTimeMillis();
+        if (keyset) {
+            return (
+                "SELECT history_id\n" +
+                "FROM history_delete_range('" + table + "', '" +
+                new SimpleDateFormat("yyyy-MM-dd HH:mm:ss.SSSSSSZ").format(cutoff) +
+                "', " + batch.size + ") history_id"
+            );
+        }
+        return (
+            "SELECT history_id\n" +
+            "FROM " + table + "\n" +
+            "WHERE history_datetime < '" +
+            new SimpleDateFormat("yyyy-MM-dd HH:mm:ss.SSSSSSZ").format(cutoff) +
+            "'\n" +
+            "LIMIT " + batch.size
+        );
+    }
+
+    /**
+     * Records a completed batch and sizes the next one from its duration.
+     *
+     * {talendTypes} Object
+     *
+     * {Category} User Defined
+     *
+     * {param} object(connection) connection : The connection the rows were deleted with.
+     *
+     * {param} string("host_samples_history") table : The history table.
+     *
+     * {param} int(rows) rows : The number of rows deleted.
+     *
+     * {example} batchDone(connection, "host_samples_history", rows) #
+     */
+    public static synchronized void batchDone(Connection connection, String table, int rows)
+        throws SQLException {
+        Batch batch = batches.get(table);
+        if (batch == null) {
+            return;
+        }
+        long now = System.currentTimeMillis();
+        long elapsed = Math.max(1, now - batch.started);
+        int size = batch.size;
+
+        batch.full = rows >= size;
+        batch.deleted += rows;
+        batch.elapsed += elapsed;
+
+        if (batch.full && batch.remaining < 0) {
+            batch.remaining = countRemaining(connection, batch);
+            batch.logged = now;
+            log(
+                table + ": " + (batch.remaining + rows) +
+                " rows to delete, starting with batches of " + size + " rows"
+            );
+        } else if (batch.remaining >= 0) {
+            batch.remaining = Math.max(0, batch.remaining - rows);
+        }
+
+        // Only a full batch tells how long a larger one would take, grow
+        // according to it, shrink whenever the target is exceeded.
+        double factor = (double) targetLatency / elapsed;
+        if (batch.full || factor < 1) {
+            factor = Math.max(MIN_FACTOR, Math.min(MAX_FACTOR, factor));
+            batch.size = (int) Math.max(MIN_BATCH, Math.min(maxBatch, size * factor));
+        }
+
+        if (batch.remaining >= 0) {
+            if (!batch.full) {
+                log(
+                    table + ": done, deleted " + batch.deleted + " rows in " +
+                    formatDuration(batch.elapsed)
+                );
+                batch.remaining = -1;
+                batch.deleted = 0;
+                batch.elapsed = 0;
+            } else if (now - batch.logged >= PROGRESS_INTERVAL) {
+                batch.logged = now;
+                log(
+                    table + ": deleted " + batch.deleted + " rows, " +
+                    batch.remaining + " left, batch " + batch.size +
+                    " rows, ETA " + formatDuration(
+                        batch.remaining * batch.elapsed / Math.max(1, batch.deleted)
+                    )
+                );
+            }
+        } else {
+            batch.deleted = 0;
+            batch.elapsed = 0;
+        }
+    }
+
+    private static long countRemaining(Connection connection, Batch batch) throws SQLException {
+        Statement stmt = connection.createStatement();
+        try {
+            ResultSet rs = stmt.executeQuery(
+                "SELECT count(*)\n" +
+                "FROM " + batch.table + "\n" +
+                "WHERE history_datetime < '" +
+                new SimpleDateFormat("yyyy-MM-dd HH:mm:ss.SSSSSSZ").format(batch.cutoff) +
+                "'"
+            );
+            rs.next();
+            return rs.getLong(1);
+        } finally {
+            stmt.close();
+        }
+    }
+
+    /**
+     * Returns true while any table filled its last batch.
+     *
+     * {talendTypes} Boolean
+     *
+     * {Category} User Defined
+     *
+     * {example} pending() #
+     */
+    public static synchronized boolean pending() {
+        for (Batch batch : batches.values()) {
+            if (batch.full) {
+                return true;
+            }
+        }
+        return false;
+    }
+
+    private static long walPosition(Connection connection) {
+        Statement stmt = null;
+        try {
+            stmt = connection.createStatement();
+            if (walSupported == null) {
+                ResultSet rs = stmt.executeQuery("SELECT current_setting('server_version_num')::integer");
+                rs.next();
+                walSupported = rs.getInt(1) >= 100000;
+            }
+            ResultSet rs = stmt.executeQuery(
+                walSupported ?
+                "SELECT pg_wal_lsn_diff(pg_current_wal_lsn(), '0/0')::bigint" :
+                "SELECT pg_xlog_location_diff(pg_current_xlog_location(), '0/0')::bigint"
+            );
+            rs.next();
+            return rs.getLong(1);
+        } catch (SQLException e) {
+            // Not available, for example while in recovery, stop measuring.
+            log("cannot measure WAL position, not limiting WAL rate: " + e.getMessage());
+            walUnavailable = true;
+            try {
+                connection.rollback();
+            } catch (SQLException e1) {
+            }
+            return -1;
+        } finally {
+            try {
+                if (stmt != null) {
+                    stmt.close();
+                }
+            } catch (SQLException e) {
+            }
+        }
+    }
+
+    /**
+     * Returns the milliseconds to wait before the next delete iteration, to
+     * keep the WAL rate of the deletes under deleteMaxWalRate.
+     *
+     * {talendTypes} Long
+     *
+     * {Category} User Defined
+     *
+     * {param} object(connection) connection : The connection the rows were deleted with.
+     *
+     * {example} pause(connection) #
+     */
+    public static synchronized long pause(Connection connection) {
+        long now = System.currentTimeMillis();
+        long pause = MIN_PAUSE;
+        if (maxWalRate > 0 && !walUnavailable) {
+            long position = walPosition(connection);
+            if (position >= 0 && lastWalPosition >= 0) {
+                long needed = (position - lastWalPosition) * 1000 / (maxWalRate * 1024);
+                pause = Math.max(pause, needed - (now - lastPauseEnd));
+            }
+            lastWalPosition = position;
+        }
+        lastPauseEnd = now + pause;
+        return pause;
+    }
+}
@@ -0,0 +1,88 @@
+package routines;
+
+import java.io.FileInputStream;
+import java.io.IOException;
+import java.io.InputStream;
+import java.lang.reflect.InvocationTargetException;
+import java.sql.Connection;
+import java.sql.SQLException;
+import java.util.Arrays;
+import java.util.Properties;
+
+import routines.system.SharedDBConnection;
+
+/*
+ * Runs an ETL job on its own, as its parent job would, for the benchmarks.
+ *
+ * The aggregation jobs write on a shared connection to the history
+ * database that their time keeping job commits once they return. Run on
+ * their own, nothing would commit it, so the runner commits the shared
+ * connection named on the command line when the job succeeds, and rolls
+ * it back when it fails. The connection details of the history database
+ * are read from the org.ovirt.engine.dwh.settings file. The runner then
+ * waits for the run to be recorded in etl_job_runs and exits with the
+ * return code of the job.
+ *
+ * Usage: routines.RoutineJobRunner JOB_CLASS CONNECTION_NAME [JOB_ARGUMENTS]
+ */
+public class RoutineJobRunner {
+
+    private static final String SETTINGS_PROPERTY = "org.ovirt.engine.dwh.settings";
+
+    private static Properties loadSettings() throws IOException {
+        Properties settings = new Properties();
+        String settingsFile = System.getProperty(SETTINGS_PROPERTY);
+        if (settingsFile != null) {
+            InputStream in = new FileInputStream(settingsFile);
+            try {
+                settings.load(in);
+            } finally {
+                in.close();
+            }
+        }
+        return settings;
+    }
+
+    private static int runJob(String jobClass, String[] args) throws Exception {
+        Object job = Class.forName(jobClass).newInstance();
+        try {
+            return (Integer) job.getClass().getMethod("runJobInTOS", String[].class).invoke(job, (Object) args);
+        } catch (InvocationTargetException e) {
+            throw (Exception) e.getCause();
+        }
+    }
+
+    private static void end(String name, boolean commit) throws IOException, ClassNotFoundException, SQLException {
+        Properties settings = loadSettings();
+        // the connection the job shared under that name
+        Connection connection = SharedDBConnection.getDBConnection(
+            settings.getProperty("ovirtEngineHistoryDbDriverClass", "org.postgresql.Driver"),
+            settings.getProperty("ovirtEngineHistoryDbJdbcConnection"),
+            settings.getProperty("ovirtEngineHistoryDbUser"),
+            settings.getProperty("ovirtEngineHistoryDbPassword"),
+            name
+        );
+        try {
+            if (!connection.getAutoCommit()) {
+                if (commit) {
+                    connection.commit();
+                } else {
+                    connection.rollback();
+                }
+            }
+        } finally {
+            connection.close();
+        }
+    }
+
+    public static void main(String[] args) throws Exception {
+        if (args.length < 2) {
+            System.err.println("Usage: routines.RoutineJobRunner JOB_CLASS CONNECTION_NAME [JOB_ARGUMENTS]");
+            System.exit(2);
+        }
+        int returnCode = runJob(args[0], Arrays.copyOfRange(args, 2, args.length));
+        end(args[1], returnCode == 0);
+        RoutineMetrics.flush();
+        System.exit(returnCode);
+    }
+}
@@ -0,0 +1,570 @@
+package routines;
+
+import java.io.FileInputStream;
+import java.io.IOException;
+import java.io.InputStream;
+import java.io.OutputStream;
+import java.lang.management.GarbageCollectorMXBean;
+import java.lang.management.ManagementFactory;
+import java.lang.management.MemoryUsage;
+import java.net.InetSocketAddress;
+import java.sql.Connection;
+import java.sql.PreparedStatement;
+import java.sql.ResultSet;
+import java.sql.SQLException;
+import java.sql.Statement;
+import java.sql.Timestamp;
+import java.text.SimpleDateFormat;
+import java.util.ArrayList;
+import java.util.Date;
+import java.util.HashMap;
+import java.util.List;
+import java.util.Map;
+import java.util.Properties;
+import java.util.TreeMap;
+import java.util.concurrent.ExecutionException;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.Executors;
+import java.util.concurrent.Future;
+import java.util.concurrent.ThreadFactory;
+import java.util.concurrent.TimeUnit;
+import java.util.concurrent.TimeoutException;
+import java.util.regex.Pattern;
+
+import com.sun.net.httpserver.HttpExchange;
+import com.sun.net.httpserver.HttpHandler;
+import com.sun.net.httpserver.HttpServer;
+
+/*
+ * Collects the durations and row counts of the ETL jobs and serves them,
+ * with the figures of the java virtual machine, in Prometheus text format.
+ *
+ * The endpoint is started by the first job when the
+ * org.ovirt.engine.dwh.metrics system property holds the host:port to
+ * listen on. The last aggregations and the rows written per table are
+ * read from the history database, using the connection details of the
+ * settings file, when the metrics are requested.
+ *
+ * Every job run is also recorded in the etl_job_runs table of the history
+ * database, which is kept as long as the samples. The runs are written by
+ * a thread of their own over a connection of the pool, so that the jobs do
+ * not wait for them.
+ */
+public class RoutineMetrics {
+
+    private static final String SETTINGS_PROPERTY = "org.ovirt.engine.dwh.settings";
+    private static final String ADDRESS_PROPERTY = "org.ovirt.engine.dwh.metrics";
+
+    // Job reporting the sample cycle
+    private static final String CYCLE_JOB = "SampleRunJobs";
+
+    private static final Pattern ROWS_READ = Pattern.compile("tJDBCInput_\\d+_NB_LINE");
+    private static final Pattern ROWS_WRITTEN = Pattern.compile("tJDBCOutput_\\d+_NB_LINE_(INSERTED|UPDATED|DELETED)");
+
+    // Runs kept while the history database cannot be written
+    private static final int MAX_PENDING_RUNS = 10000;
+    private static final long RETENTION_INTERVAL = 3600000;
+    private static final long FLUSH_TIMEOUT = 60;
+
+    private static class Job {
+        long started;
+        long runs;
+        long failures;
+        long elapsed;
+        long lastElapsed;
+        long lastEnd;
+        long rowsRead;
+        long rowsWritten;
+    }
+
+    private static final Map<String, Job> jobs = new TreeMap<String, Job>();
+    private static final long processStart = System.currentTimeMillis();
+
+    private static class Run {
+        String job;
+        long start;
+        long elapsed;
+        long rowsRead;
+        long rowsWritten;
+        int returnCode;
+    }
+
+    private static final List<Run> pendingRuns = new ArrayList<Run>();
+    private static final ExecutorService recorder = Executors.newSingleThreadExecutor(new ThreadFactory() {
+        public Thread newThread(Runnable r) {
+            Thread thread = new Thread(r, "job-runs");
+            thread.setDaemon(true);
+            return thread;
+        }
+    });
+
+    private static boolean started;
+    private static Properties settings = new Properties();
+    private static long lastRetention;
+
+    private static void log(String message) {
+        System.out.print(
+            new SimpleDateFormat("yyyy-MM-dd HH:mm:ss").format(new Date()) +
+            " Metrics " + message + "\n"
+        );
+    }
+
+    private static long longSetting(String name, long defaultValue) {
+        try {
+            return Long.parseLong(settings.getProperty(name, "").trim());
+        } catch (NumberFormatException e) {
+            return defaultValue;
+        }
+    }
+
+    private static Job job(String name) {
+        Job job = jobs.get(name);
+        if (job == null) {
+            job = new Job();
+            jobs.put(name, job);
+        }
+        return job;
+    }
+
+    private static void start() {
+        if (started) {
+            return;
+        }
+        started = true;
+
+        String settingsFile = System.getProperty(SETTINGS_PROPERTY);
+        if (settingsFile != null) {
+            try {
+                InputStream in = new FileInputStream(settingsFile);
+                try {
+                    settings.load(in);
+                } finally {
+                    in.close();
+                }
+            } catch (IOException e) {
+                log("cannot load settings " + settingsFile + ": " + e.getMessage());
+            }
+        }
+
+        String address = System.getProperty(ADDRESS_PROPERTY);
+        if (address == null || address.trim().isEmpty()) {
+            return;
+        }
+        try {
+            int colon = address.lastIndexOf(':');
+            HttpServer server = HttpServer.create(
+                new InetSocketAddress(
+                    address.substring(0, colon),
+                    Integer.parseInt(address.substring(colon + 1))
+                ),
+                0
+            );
+            server.createContext("/metrics", new HttpHandler() {
+                public void handle(HttpExchange exchange) throws IOException {
+                    byte[] body = render().getBytes("UTF-8");
+                    exchange.getResponseHeaders().set(
+                        "Content-Type",
+                        "text/plain; version=0.0.4; charset=utf-8"
+                    );
+                    exchange.sendResponseHeaders(200, body.length);
+                    OutputStream out = exchange.getResponseBody();
+                    try {
+                        out.write(body);
+                    } finally {
+                        out.close();
+                    }
+                }
+            });
+            server.setExecutor(Executors.newSingleThreadExecutor(new ThreadFactory() {
+                public Thread newThread(Runnable r) {
+                    Thread thread = new Thread(r, "metrics");
+                    thread.setDaemon(true);
+                    return thread;
+                }
+            }));
+            server.start();
+            log("listening on " + address);
+        } catch (Exception e) {
+            // Metrics are optional, never fail the ETL because of them.
+            log("cannot listen on " + address + ": " + e);
+        }
+    }
+
+    /**
+     * Records the start of a job.
+     *
+     * {talendTypes} Object
+     *
+     * {Category} User Defined
+     *
+     * {param} string("StatisticsSync") name : The job name.
+     *
+     * {example} jobStarted(jobName) #
+     */
+    public static synchronized void jobStarted(String name) {
+        start();
+        job(name).started = System.currentTimeMillis();
+    }
+
+    /**
+     * Records the end of a job, with the rows read and written by its
+     * database components.
+     *
+     * {talendTypes} Object
+     *
+     * {Category} User Defined
+     *
+     * {param} string("StatisticsSync") name : The job name.
+     *
+     * {param} object(globalMap) globalMap : The global map of the job.
+     *
+     * {param} long(elapsed) elapsed : The duration of the job in milliseconds.
+     *
+     * {param} int(returnCode) returnCode : The return code of the job.
+     *
+     * {example} jobDone(jobName, globalMap, end - startTime, returnCode) #
+     */
+    public static void jobDone(String name, Map<String, Object> globalMap, long elapsed, int returnCode) {
+        long read = 0;
+        long written = 0;
+        Map<String, Object> values;
+        synchronized (globalMap) {
+            values = new HashMap<String, Object>(globalMap);
+        }
+        for (Map.Entry<String, Object> entry : values.entrySet()) {
+            if (!(entry.getValue() instanceof Number)) {
+                continue;
+            }
+            long rows = ((Number) entry.getValue()).longValue();
+            if (ROWS_READ.matcher(entry.getKey()).matches()) {
+                read += rows;
+            } else if (ROWS_WRITTEN.matcher(entry.getKey()).matches()) {
+                written += rows;
+            }
+        }
+
+        synchronized (RoutineMetrics.class) {
+            start();
+            Job job = job(name);
+            job.started = 0;
+            job.runs++;
+            if (returnCode != 0) {
+                job.failures++;
+            }
+            job.elapsed += elapsed;
+            job.lastElapsed = elapsed;
+            job.lastEnd = System.currentTimeMillis();
+            job.rowsRead += read;
+            job.rowsWritten += written;
+
+            Run run = new Run();
+            run.job = name;
+            run.start = job.lastEnd - elapsed;
+            run.elapsed = elapsed;
+            run.rowsRead = read;
+            run.rowsWritten = written;
+            run.returnCode = returnCode;
+            if (pendingRuns.size() < MAX_PENDING_RUNS) {
+                pendingRuns.add(run);
+            }
+        }
+
+        recorder.execute(new Runnable() {
+            public void run() {
+                recordRuns();
+            }
+        });
+    }
+
+    /**
+     * Waits for the job runs recorded so far to be written, for a process
+     * running jobs on its own before it exits.
+     *
+     * {talendTypes} Object
+     *
+     * {Category} User Defined
+     *
+     * {example} flush() #
+     */
+    public static void flush() {
+        Future<?> written = recorder.submit(new Runnable() {
+            public void run() {
+                recordRuns();
+            }
+        });
+        try {
+            written.get(FLUSH_TIMEOUT, TimeUnit.SECONDS);
+        } catch (InterruptedException e) {
+            Thread.currentThread().interrupt();
+        } catch (ExecutionException e) {
+            log("cannot record job runs: " + e.getCause());
+        } catch (TimeoutException e) {
+            log("timed out after " + FLUSH_TIMEOUT + " seconds recording job runs");
+        }
+    }
+
+    private static Connection openConnection(String name) throws SQLException {
+        try {
+            return RoutineConnectionPool.getConnection(
+                settings.getProperty("ovirtEngineHistoryDbDriverClass", "org.postgresql.Driver"),
+                settings.getProperty("ovirtEngineHistoryDbJdbcConnection"),
+                settings.getProperty("ovirtEngineHistoryDbUser"),
+                settings.getProperty("ovirtEngineHistoryDbPassword"),
+                name
+            );
+        } catch (ClassNotFoundException e) {
+            throw new SQLException(e);
+        }
+    }
+
+    private static void closeQuietly(Connection conn) {
+        try {
+            if (conn != null) {
+                conn.close();
+            }
+        } catch (SQLException e) {
+        }
+    }
+
+    /*
+     * Writes the pending runs to etl_job_runs, and removes the runs older
+     * than the samples retention once an hour. Only the recorder thread
+     * calls it.
+     */
+    private static void recordRuns() {
+        List<Run> runs;
+        synchronized (RoutineMetrics.class) {
+            runs = new ArrayList<Run>(pendingRuns);
+        }
+        if (runs.isEmpty()) {
+            return;
+        }
+        Connection conn = null;
+        try {
+            conn = openConnection("job-runs");
+            PreparedStatement stmt = conn.prepareStatement(
+                "INSERT INTO etl_job_runs (\n" +
+                "    history_datetime, job_name, duration_ms, rows_read,\n" +
+                "    rows_written, status, sampling_interval\n" +
+                ")\n" +
+                "VALUES (?, ?, ?, ?, ?, ?, ?)"
+            );
+            try {
+                for (Run run : runs) {
+                    stmt.setTimestamp(1, new Timestamp(run.start));
+                    stmt.setString(2, run.job);
+                    stmt.setLong(3, run.elapsed);
+                    stmt.setLong(4, run.rowsRead);
+                    stmt.setLong(5, run.rowsWritten);
+                    stmt.setString(6, run.returnCode == 0 ? "success" : "failure");
+                    stmt.setLong(7, longSetting("runInterleave", 60));
+                    stmt.addBatch();
+                }
+                stmt.executeBatch();
+            } finally {
+                stmt.close();
+            }
+            synchronized (RoutineMetrics.class) {
+                pendingRuns.subList(0, runs.size()).clear();
+            }
+
+            long now = System.currentTimeMillis();
+            if (now - lastRetention >= RETENTION_INTERVAL) {
+                lastRetention = now;
+                stmt = conn.prepareStatement(
+                    "DELETE FROM etl_job_runs\n" +
+                    "WHERE history_datetime < ?"
+                );
+                try {
+                    stmt.setTimestamp(
+                        1,
+                        new Timestamp(now - longSetting("hoursToKeepSamples", 24) * 3600000)
+                    );
+                    stmt.executeUpdate();
+                } finally {
+                    stmt.close();
+                }
+            }
+        } catch (SQLException e) {
+            log("cannot record job runs: " + e.getMessage());
+        } finally {
+            closeQuietly(conn);
+        }
+    }
+
+    private static String escape(String value) {
+        return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n");
+    }
+
+    private static void metric(StringBuilder out, String name, String type, String help) {
+        out.append("# HELP ").append(name).append(' ').append(help).append('\n');
+        out.append("# TYPE ").append(name).append(' ').append(type).append('\n');
+    }
+
+    private static void sample(StringBuilder out, String name, String labels, double value) {
+        out.append(name);
+        if (labels != null) {
+            out.append('{').append(labels).append('}');
+        }
+        out.append(' ');
+        if (value == Math.rint(value) && !Double.isInfinite(value)) {
+            out.append((long) value);
+        } else {
+            out.append(value);
+        }
+        out.append('\n');
+    }
+
+    private static String label(String name, String value) {
+        return name + "=\"" + escape(value) + "\"";
+    }
+
+    private static void renderJobs(StringBuilder out) {
+        Map<String, Job> snapshot = new TreeMap<String, Job>();
+        long now = System.currentTimeMillis();
+        synchronized (RoutineMetrics.class) {
+            for (Map.Entry<String, Job> entry : jobs.entrySet()) {
+                Job job = new Job();
+                Job current = entry.getValue();
+                job.started = current.started;
+                job.runs = current.runs;
+                job.failures = current.failures;
+                job.elapsed = current.elapsed;
+                job.lastElapsed = current.lastElapsed;
+                job.lastEnd = current.lastEnd;
+                job.rowsRead = current.rowsRead;
+                job.rowsWritten = current.rowsWritten;
+                snapshot.put(entry.getKey(), job);
+            }
+        }
+
+        metric(out, "ovirt_dwh_job_runs_total", "counter", "Completed runs of the job.");
+        for (Map.Entry<String, Job> entry : snapshot.entrySet()) {
+            sample(out, "ovirt_dwh_job_runs_total", label("job_name", entry.getKey()), entry.getValue().runs);
+        }
+        metric(out, "ovirt_dwh_job_failures_total", "counter", "Runs of the job that failed.");
+        for (Map.Entry<String, Job> entry : snapshot.entrySet()) {
+            sample(out, "ovirt_dwh_job_failures_total", label("job_name", entry.getKey()), entry.getValue().failures);
+        }
+        metric(out, "ovirt_dwh_job_duration_seconds_total", "counter", "Time spent in completed runs of the job.");
+        for (Map.Entry<String, Job> entry : snapshot.entrySet()) {
+            sample(out, "ovirt_dwh_job_duration_seconds_total", label("job_name", entry.getKey()), entry.getValue().elapsed / 1000.0);
+        }
+        metric(out, "ovirt_dwh_job_last_duration_seconds", "gauge", "Duration of the last run of the job.");
+        for (Map.Entry<String, Job> entry : snapshot.entrySet()) {
+            sample(out, "ovirt_dwh_job_last_duration_seconds", label("job_name", entry.getKey()), entry.getValue().lastElapsed / 1000.0);
+        }
+        metric(out, "ovirt_dwh_job_last_end_timestamp_seconds", "gauge", "End of the last run of the job.");
+        for (Map.Entry<String, Job> entry : snapshot.entrySet()) {
+            sample(out, "ovirt_dwh_job_last_end_timestamp_seconds", label("job_name", entry.getKey()), entry.getValue().lastEnd / 1000.0);
+        }
+        metric(out, "ovirt_dwh_job_running_seconds", "gauge", "Time the job has been running, 0 when not running.");
+        for (Map.Entry<String, Job> entry : snapshot.entrySet()) {
+            Job job = entry.getValue();
+            sample(out, "ovirt_dwh_job_running_seconds", label("job_name", entry.getKey()), job.started > 0 ? (now - job.started) / 1000.0 : 0);
+        }
+        metric(out, "ovirt_dwh_job_rows_read_total", "counter", "Rows read by the database inputs of the job.");
+        for (Map.Entry<String, Job> entry : snapshot.entrySet()) {
+            sample(out, "ovirt_dwh_job_rows_read_total", label("job_name", entry.getKey()), entry.getValue().rowsRead);
+        }
+        metric(out, "ovirt_dwh_job_rows_written_total", "counter", "Rows inserted, updated or deleted by the database outputs of the job.");
+        for (Map.Entry<String, Job> entry : snapshot.entrySet()) {
+            sample(out, "ovirt_dwh_job_rows_written_total", label("job_name", entry.getKey()), entry.getValue().rowsWritten);
+        }
+
+        long interval = longSetting("runInterleave", 60);
+        Job cycle = snapshot.get(CYCLE_JOB);
+        long lastCycle = cycle != null && cycle.lastEnd > 0 ? cycle.lastEnd : processStart;
+        metric(out, "ovirt_dwh_sampling_interval_seconds", "gauge", "Configured interval between sample cycles (DWH_SAMPLING).");
+        sample(out, "ovirt_dwh_sampling_interval_seconds", null, interval);
+        metric(out, "ovirt_dwh_cycle_lag_seconds", "gauge", "Time the next sample cycle is overdue.");
+        sample(out, "ovirt_dwh_cycle_lag_seconds", null, Math.max(0, (now - lastCycle) / 1000.0 - interval));
+    }
+
+    private static void renderDatabase(StringBuilder out) {
+        StringBuilder db = new StringBuilder();
+        boolean up = false;
+        Connection conn = null;
+        Statement stmt = null;
+        try {
+            conn = openConnection("metrics");
+            stmt = conn.createStatement();
+            ResultSet rs = stmt.executeQuery(
+                "SELECT var_name, extract(epoch FROM var_datetime)\n" +
+                "FROM history_configuration\n" +
+                "WHERE var_name IN ('lastHourAggr', 'lastDayAggr')"
+            );
+            metric(db, "ovirt_dwh_last_aggregation_timestamp_seconds", "gauge", "Hour or day up to which the samples were aggregated.");
+            while (rs.next()) {
+                sample(
+                    db,
+                    "ovirt_dwh_last_aggregation_timestamp_seconds",
+                    label("aggregation", "lastHourAggr".equals(rs.getString(1)) ? "hourly" : "daily"),
+                    rs.getDouble(2)
+                );
+            }
+            rs.close();
+
+            rs = stmt.executeQuery(
+                "SELECT relname, n_tup_ins, n_tup_upd, n_tup_del\n" +
+                "FROM pg_stat_user_tables\n" +
+                "WHERE schemaname = current_schema()\n" +
+                "ORDER BY relname"
+            );
+            metric(db, "ovirt_dwh_table_rows_written_total", "counter", "Rows written to the history table since the statistics were reset.");
+            while (rs.next()) {
+                String table = label("table", rs.getString(1));
+                sample(db, "ovirt_dwh_table_rows_written_total", table + "," + label("operation", "insert"), rs.getLong(2));
+                sample(db, "ovirt_dwh_table_rows_written_total", table + "," + label("operation", "update"), rs.getLong(3));
+                sample(db, "ovirt_dwh_table_rows_written_total", table + "," + label("operation", "delete"), rs.getLong(4));
+            }
+            rs.close();
+            up = true;
+        } catch (SQLException e) {
+            log("cannot query history database: " + e.getMessage());
+        } finally {
+            try {
+                if (stmt != null) {
+                    stmt.close();
+                }
+            } catch (SQLException e) {
+            }
+            closeQuietly(conn);
+        }
+        metric(out, "ovirt_dwh_history_db_up", "gauge", "Whether the history database could be queried.");
+        sample(out, "ovirt_dwh_history_db_up", null, up ? 1 : 0);
+        if (up) {
+            out.append(db);
+        }
+    }
+
+    private static void renderJvm(StringBuilder out) {
+        MemoryUsage heap = ManagementFactory.getMemoryMXBean().getHeapMemoryUsage();
+        metric(out, "ovirt_dwh_jvm_heap_used_bytes", "gauge", "Used heap.");
+        sample(out, "ovirt_dwh_jvm_heap_used_bytes", null, heap.getUsed());
+        metric(out, "ovirt_dwh_jvm_heap_committed_bytes", "gauge", "Committed heap.");
+        sample(out, "ovirt_dwh_jvm_heap_committed_bytes", null, heap.getCommitted());
+        metric(out, "ovirt_dwh_jvm_heap_max_bytes", "gauge", "Maximum heap.");
+        sample(out, "ovirt_dwh_jvm_heap_max_bytes", null, heap.getMax());
+
+        metric(out, "ovirt_dwh_jvm_gc_collections_total", "counter", "Garbage collections.");
+        for (GarbageCollectorMXBean gc : ManagementFactory.getGarbageCollectorMXBeans()) {
+            sample(out, "ovirt_dwh_jvm_gc_collections_total", label("gc", gc.getName()), gc.getCollectionCount());
+        }
+        metric(out, "ovirt_dwh_jvm_gc_seconds_total", "counter", "Time spent in garbage collection.");
+        for (GarbageCollectorMXBean gc : ManagementFactory.getGarbageCollectorMXBeans()) {
+            sample(out, "ovirt_dwh_jvm_gc_seconds_total", label("gc", gc.getName()), gc.getCollectionTime() / 1000.0);
+        }
+
+        metric(out, "ovirt_dwh_jvm_uptime_seconds", "gauge", "Time since the java virtual machine started.");
+        sample(out, "ovirt_dwh_jvm_uptime_seconds", null, ManagementFactory.getRuntimeMXBean().getUptime() / 1000.0);
+    }
+
+    private static String render() {
+        StringBuilder out = new StringBuilder();
+        renderJobs(out);
+        renderDatabase(out);
+        renderJvm(out);
+        return out.toString();
+    }
+}
@@ -0,0 +1,447 @@
+package routines;
+
+import java.io.IOException;
+import java.lang.reflect.InvocationHandler;
+import java.lang.reflect.InvocationTargetException;
+import java.lang.reflect.Method;
+import java.lang.reflect.Proxy;
+import java.sql.Connection;
+import java.sql.PreparedStatement;
+import java.sql.ResultSet;
+import java.sql.SQLException;
+import java.sql.Savepoint;
+import java.sql.Statement;
+import java.text.SimpleDateFormat;
+import java.util.ArrayList;
+import java.util.Date;
+import java.util.HashMap;
+import java.util.List;
+import java.util.Map;
+import java.util.Random;
+import java.util.TreeMap;
+import java.util.logging.FileHandler;
+import java.util.logging.Formatter;
+import java.util.logging.LogRecord;
+import java.util.logging.Logger;
+import java.util.regex.Pattern;
+
+/*
+ * Profiles the SQL statements of the ETL jobs.
+ *
+ * When the org.ovirt.engine.dwh.profileSql system property is true, the
+ * connections shared between the jobs are wrapped, and a sample of the
+ * statements created on them record their executions, the time spent
+ * executing and fetching, and the rows returned or changed. A line per
+ * statement is written when it is closed to a rotating file in the
+ * org.ovirt.engine.dwh.profileSql.logDir directory. Literals are replaced
+ * by ? in the logged text, so that the lines of the same query can be
+ * summed by the report tool.
+ *
+ * Executions slower than org.ovirt.engine.dwh.profileSql.explainThreshold
+ * milliseconds are run again with EXPLAIN (ANALYZE, BUFFERS), at most once
+ * an hour per query, in a transaction or savepoint that is rolled back.
+ * The plan is written indented by a tab after an explain line, which
+ * holds the query both with and without literals.
+ */
+public class RoutineSqlProfile {
+
+    private static final String PROPERTY = "org.ovirt.engine.dwh.profileSql";
+    private static final String LOG_NAME = "ovirt-engine-dwhd-sql-profile.%g.log";
+
+    private static final long EXPLAIN_INTERVAL = 3600000;
+    private static final int MAX_EXPLAINED = 1000;
+
+    private static final Pattern EXPLAINABLE = Pattern.compile(
+        "^\\s*(select|with|insert|update|delete|values)\\b",
+        Pattern.CASE_INSENSITIVE
+    );
+    private static final Pattern STRING_LITERAL = Pattern.compile("'(?:[^']|'')*'");
+    private static final Pattern NUMBER_LITERAL = Pattern.compile("\\b\\d+(?:\\.\\d+)?\\b");
+    private static final Pattern WHITESPACE = Pattern.compile("\\s+");
+
+    private static boolean configured;
+    private static boolean enabled;
+    private static long samplePercent;
+    private static long explainThreshold;
+    private static Logger profile;
+
+    private static final Map<String, Long> explained = new HashMap<String, Long>();
+    private static final Random random = new Random();
+
+    private static void log(String message) {
+        System.out.print(
+            new SimpleDateFormat("yyyy-MM-dd HH:mm:ss").format(new Date()) +
+            " SQL profile " + message + "\n"
+        );
+    }
+
+    private static synchronized boolean configure() {
+        if (configured) {
+            return enabled;
+        }
+        configured = true;
+
+        if (!Boolean.getBoolean(PROPERTY)) {
+            return false;
+        }
+
+        samplePercent = Math.max(0, Math.min(100, Long.getLong(PROPERTY + ".samplePercent", 10)));
+        explainThreshold = Math.max(0, Long.getLong(PROPERTY + ".explainThreshold", 0));
+        String dir = System.getProperty(PROPERTY + ".logDir", ".");
+        try {
+            FileHandler handler = new FileHandler(
+                dir + "/" + LOG_NAME,
+                (int) Math.min(Integer.MAX_VALUE, Long.getLong(PROPERTY + ".logMaxSize", 10485760)),
+                (int) Math.max(1, Long.getLong(PROPERTY + ".logFiles", 5)),
+                true
+            );
+            handler.setFormatter(
+                new Formatter() {
+                    @Override
+                    public String format(LogRecord record) {
+                        return record.getMessage();
+                    }
+                }
+            );
+            profile = Logger.getAnonymousLogger();
+            profile.setUseParentHandlers(false);
+            profile.addHandler(handler);
+        } catch (IOException e) {
+            log("cannot open log in " + dir + ", profiling disabled: " + e.getMessage());
+            return false;
+        }
+
+        log(
+            "enabled, sampling " + samplePercent + "% of the statements" +
+            (explainThreshold > 0 ? ", explaining the ones slower than " + explainThreshold + "ms" : "")
+        );
+        enabled = true;
+        return true;
+    }
+
+    private static String normalize(String sql) {
+        String normalized = STRING_LITERAL.matcher(sql).replaceAll("?");
+        normalized = NUMBER_LITERAL.matcher(normalized).replaceAll("?");
+        return WHITESPACE.matcher(normalized).replaceAll(" ").trim();
+    }
+
+    private static String timestamp() {
+        return new SimpleDateFormat("yyyy-MM-dd HH:mm:ss").format(new Date());
+    }
+
+    private static String millis(long nanos) {
+        return String.format("%.3f", nanos / 1000000.0);
+    }
+
+    private static boolean shouldExplain(String query) {
+        long now = System.currentTimeMillis();
+        synchronized (explained) {
+            Long last = explained.get(query);
+            if (last != null && now - last < EXPLAIN_INTERVAL) {
+                return false;
+            }
+            if (explained.size() >= MAX_EXPLAINED) {
+                explained.clear();
+            }
+            explained.put(query, now);
+            return true;
+        }
+    }
+
+    private static Object invoke(Object target, Method method, Object[] args) throws Throwable {
+        try {
+            return method.invoke(target, args);
+        } catch (InvocationTargetException e) {
+            throw e.getCause();
+        }
+    }
+
+    private static class ConnectionHandler implements InvocationHandler {
+
+        private final Connection connection;
+        private final String name;
+
+        ConnectionHandler(Connection connection, String name) {
+            this.connection = connection;
+            this.name = name;
+        }
+
+        @Override
+        public Object invoke(Object proxy, Method method, Object[] args) throws Throwable {
+            Object result = RoutineSqlProfile.invoke(connection, method, args);
+            if (
+                result instanceof Statement &&
+                Statement.class.isAssignableFrom(method.getReturnType()) &&
+                random.nextInt(100) < samplePercent
+            ) {
+                String sql = null;
+                if (method.getName().startsWith("prepare") && args != null && args[0] instanceof String) {
+                    sql = (String) args[0];
+                }
+                return Proxy.newProxyInstance(
+                    RoutineSqlProfile.class.getClassLoader(),
+                    new Class<?>[] { method.getReturnType() },
+                    new StatementHandler(name, (Statement) result, sql)
+                );
+            }
+            return result;
+        }
+    }
+
+    private static class StatementHandler implements InvocationHandler {
+
+        private final String name;
+        private final Statement statement;
+        private final String sql;
+        private final Map<Integer, Object[]> parameters = new TreeMap<Integer, Object[]>();
+
+        // Executions of the current query since the last line written
+        private String query;
+        private long executions;
+        private long nanos;
+        private long maxNanos;
+        private long rows;
+
+        StatementHandler(String name, Statement statement, String sql) {
+            this.name = name;
+            this.statement = statement;
+            this.sql = sql;
+        }
+
+        @Override
+        public Object invoke(Object proxy, Method method, Object[] args) throws Throwable {
+            String methodName = method.getName();
+
+            if (
+                sql != null &&
+                methodName.startsWith("set") &&
+                args != null &&
+                args.length >= 2 &&
+                args[0] instanceof Integer
+            ) {
+                parameters.put((Integer) args[0], new Object[] { method, args });
+            } else if ("clearParameters".equals(methodName)) {
+                parameters.clear();
+            } else if ("close".equals(methodName)) {
+                try {
+                    return RoutineSqlProfile.invoke(statement, method, args);
+                } finally {
+                    flush();
+                }
+            } else if (methodName.startsWith("execute")) {
+                String executed = sql;
+                if (args != null && args.length > 0 && args[0] instanceof String) {
+                    executed = (String) args[0];
+                }
+                if (executed != null) {
+                    return execute(executed, method, args);
+                }
+            }
+            return RoutineSqlProfile.invoke(statement, method, args);
+        }
+
+        private Object execute(String executed, Method method, Object[] args) throws Throwable {
+            long start = System.nanoTime();
+            Object result = RoutineSqlProfile.invoke(statement, method, args);
+            long elapsed = System.nanoTime() - start;
+
+            if (result instanceof ResultSet) {
+                return Proxy.newProxyInstance(
+                    RoutineSqlProfile.class.getClassLoader(),
+                    new Class<?>[] { ResultSet.class },
+                    new ResultSetHandler(this, (ResultSet) result, executed, elapsed)
+                );
+            }
+
+            long changed = 0;
+            if (result instanceof Number) {
+                changed = ((Number) result).longValue();
+            } else if (result instanceof int[]) {
+                for (int count : (int[]) result) {
+                    changed += Math.max(0, count);
+                }
+            } else if (Boolean.FALSE.equals(result)) {
+                changed = Math.max(0, statement.getUpdateCount());
+            }
+            done(executed, elapsed, changed);
+            return result;
+        }
+
+        void done(String executed, long elapsed, long count) {
+            String normalized = normalize(executed);
+            if (query != null && !query.equals(normalized)) {
+                flush();
+            }
+            query = normalized;
+            executions++;
+            nanos += elapsed;
+            maxNanos = Math.max(maxNanos, elapsed);
+            rows += count;
+
+            if (
+                explainThreshold > 0 &&
+                elapsed >= explainThreshold * 1000000 &&
+                EXPLAINABLE.matcher(executed).find() &&
+                shouldExplain(normalized)
+            ) {
+                explain(executed, elapsed);
+            }
+        }
+
+        private void flush() {
+            if (query == null) {
+                return;
+            }
+            profile.info(
+                timestamp() + "\tstatement\t" + name + "\t" + executions + "\t" +
+                millis(nanos) + "\t" + millis(maxNanos) + "\t" + rows + "\t" + query + "\n"
+            );
+            query = null;
+            executions = 0;
+            nanos = 0;
+            maxNanos = 0;
+            rows = 0;
+        }
+
+        private List<String> plan(Connection connection, String executed) throws Throwable {
+            List<String> plan = new ArrayList<String>();
+            boolean prepared = executed.equals(sql);
+            Statement explain = prepared ?
+                connection.prepareStatement("EXPLAIN (ANALYZE, BUFFERS) " + executed) :
+                connection.createStatement();
+            try {
+                ResultSet rs;
+                if (prepared) {
+                    for (Object[] parameter : parameters.values()) {
+                        RoutineSqlProfile.invoke(explain, (Method) parameter[0], (Object[]) parameter[1]);
+                    }
+                    rs = ((PreparedStatement) explain).executeQuery();
+                } else {
+                    rs = explain.executeQuery("EXPLAIN (ANALYZE, BUFFERS) " + executed);
+                }
+                while (rs.next()) {
+                    plan.add(rs.getString(1));
+                }
+            } finally {
+                explain.close();
+            }
+            return plan;
+        }
+
+        private void explain(String executed, long elapsed) {
+            List<String> plan;
+            Connection connection = null;
+            boolean autoCommit = false;
+            Savepoint savepoint = null;
+            try {
+                // Explaining runs the statement again, never keep its changes
+                connection = statement.getConnection();
+                autoCommit = connection.getAutoCommit();
+                if (autoCommit) {
+                    connection.setAutoCommit(false);
+                } else {
+                    savepoint = connection.setSavepoint();
+                }
+                plan = plan(connection, executed);
+            } catch (Throwable e) {
+                plan = new ArrayList<String>();
+                plan.add("cannot explain: " + e.getMessage());
+            } finally {
+                try {
+                    if (autoCommit) {
+                        connection.rollback();
+                        connection.setAutoCommit(true);
+                    } else if (savepoint != null) {
+                        connection.rollback(savepoint);
+                        connection.releaseSavepoint(savepoint);
+                    }
+                } catch (SQLException e) {
+                    log("cannot roll back explain on " + name + ": " + e.getMessage());
+                }
+            }
+
+            StringBuilder record = new StringBuilder();
+            record.append(timestamp()).append("\texplain\t").append(name).append("\t")
+                .append(millis(elapsed)).append("\t").append(normalize(executed)).append("\t")
+                .append(WHITESPACE.matcher(executed).replaceAll(" ").trim()).append("\n");
+            for (String line : plan) {
+                record.append("\t").append(line).append("\n");
+            }
+            profile.info(record.toString());
+        }
+    }
+
+    private static class ResultSetHandler implements InvocationHandler {
+
+        private final StatementHandler owner;
+        private final ResultSet rs;
+        private final String executed;
+        private long nanos;
+        private long rows;
+        private boolean done;
+
+        ResultSetHandler(StatementHandler owner, ResultSet rs, String executed, long nanos) {
+            this.owner = owner;
+            this.rs = rs;
+            this.executed = executed;
+            this.nanos = nanos;
+        }
+
+        @Override
+        public Object invoke(Object proxy, Method method, Object[] args) throws Throwable {
+            String methodName = method.getName();
+            if ("next".equals(methodName)) {
+                // Only the time spent fetching counts, not processing the rows
+                long start = System.nanoTime();
+                Object result = RoutineSqlProfile.invoke(rs, method, args);
+                nanos += System.nanoTime() - start;
+                if (Boolean.TRUE.equals(result)) {
+                    rows++;
+                } else {
+                    done();
+                }
+                return result;
+            }
+            if ("close".equals(methodName)) {
+                try {
+                    return RoutineSqlProfile.invoke(rs, method, args);
+                } finally {
+                    done();
+                }
+            }
+            return RoutineSqlProfile.invoke(rs, method, args);
+        }
+
+        private void done() {
+            if (!done) {
+                done = true;
+                owner.done(executed, nanos, rows);
+            }
+        }
+    }
+
+    /**
+     * Returns the connection profiling its statements when SQL profiling
+     * is enabled, the connection itself otherwise.
+     *
+     * {talendTypes} Object
+     *
+     * {Category} User Defined
+     *
+     * {param} object(connection) connection : The connection to profile.
+     *
+     * {param} string("engine") name : The name the connection is shared with.
+     *
+     * {example} wrap(connection, "engine") #
+     */
+    public static Connection wrap(Connection connection, String name) {
+        if (connection == null || !configure()) {
+            return connection;
+        }
+        return (Connection) Proxy.newProxyInstance(
+            RoutineSqlProfile.class.getClassLoader(),
+            new Class<?>[] { Connection.class },
+            new ConnectionHandler(connection, name)
+        );
+    }
+}
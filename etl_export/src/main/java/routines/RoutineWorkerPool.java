@@ -0,0 +1,204 @@
+package routines;
+
+import java.sql.Connection;
+import java.sql.SQLException;
+import java.text.SimpleDateFormat;
+import java.util.Date;
+import java.util.HashMap;
+import java.util.Map;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.Executors;
+import java.util.concurrent.ThreadFactory;
+
+/*
+ * Runs the subjobs of the ETL jobs on a pool of worker threads shared by
+ * all the jobs.
+ *
+ * The jobs generated with multi thread execution start a thread for every
+ * subjob each time they run. AggregationToHourly, AggregationToDaily and
+ * HistoryDelete hand them to execute instead, which runs them on
+ * org.ovirt.engine.dwh.workerThreads threads, as many as the processors
+ * when 0. StatisticsSync hands them to executeSampling, which runs them on
+ * as many threads kept for the sampling, so that a sample cycle does not
+ * wait behind the long deletes and aggregations of the time keeping jobs
+ * running meanwhile, and the sampling does not fall behind. The jobs
+ * still wait for their subjobs, so the subjobs of a job run after the
+ * ones of the jobs it depends on, as ordered by SampleRunJobs. A subjob
+ * handed by a worker thread runs on it, instead of waiting for a worker
+ * that may never be free.
+ *
+ * The subjobs of StatisticsSync read the engine database on a connection
+ * of their worker, so that the statistics of the entity types are queried
+ * at the same time instead of one after the other on the connection of
+ * the job. These connections are in auto commit and read only, are taken
+ * from RoutineConnectionPool and given back when the subjob ends. When
+ * all the connections of the pool are taken, the subjob reads on the
+ * connection of the job. The history database is still written on the
+ * connection of the job, so that a sample cycle commits as a whole.
+ */
+public class RoutineWorkerPool {
+
+    private static final String PROPERTY = "org.ovirt.engine.dwh.workerThreads";
+
+    private static class Worker extends Thread {
+
+        final Map<String, Connection> connections = new HashMap<String, Connection>();
+
+        Worker(Runnable runnable, String name) {
+            super(runnable, name);
+            setDaemon(true);
+        }
+
+        void release() {
+            for (Connection connection : connections.values()) {
+                try {
+                    connection.close();
+                } catch (SQLException e) {
+                    // ignore
+                }
+            }
+            connections.clear();
+        }
+
+        @Override
+        public void run() {
+            try {
+                super.run();
+            } finally {
+                release();
+            }
+        }
+    }
+
+    private static ExecutorService pool;
+    private static ExecutorService samplingPool;
+    private static int threads;
+
+    private static void log(String message) {
+        System.out.print(
+            new SimpleDateFormat("yyyy-MM-dd HH:mm:ss").format(new Date()) +
+            " Worker pool " + message + "\n"
+        );
+    }
+
+    private static ExecutorService newPool(final String name) {
+        return Executors.newFixedThreadPool(threads, new ThreadFactory() {
+            private int count;
+
+            public synchronized Thread newThread(Runnable r) {
+                return new Worker(r, name + "-" + ++count);
+            }
+        });
+    }
+
+    private static synchronized ExecutorService getPool(boolean sampling) {
+        if (pool == null) {
+            threads = Integer.getInteger(PROPERTY, 0);
+            if (threads <= 0) {
+                threads = Runtime.getRuntime().availableProcessors();
+            }
+            pool = newPool("worker");
+            samplingPool = newPool("sampling");
+            log("started with " + threads + " threads, and " + threads + " for the sampling");
+        }
+        return sampling ? samplingPool : pool;
+    }
+
+    private static void execute(final Runnable subjob, boolean sampling) {
+        if (Thread.currentThread() instanceof Worker) {
+            subjob.run();
+        } else {
+            getPool(sampling).execute(new Runnable() {
+                public void run() {
+                    try {
+                        subjob.run();
+                    } finally {
+                        ((Worker) Thread.currentThread()).release();
+                    }
+                }
+            });
+        }
+    }
+
+    /**
+     * Runs a subjob on a worker thread, or at once when called from one.
+     *
+     * {talendTypes} Object
+     *
+     * {Category} User Defined
+     *
+     * {param} object(subjob) subjob : The subjob.
+     *
+     * {example} execute(subjob) #
+     */
+    public static void execute(Runnable subjob) {
+        execute(subjob, false);
+    }
+
+    /**
+     * Runs a subjob of the sampling on a worker thread kept for the
+     * sampling, or at once when called from a worker thread.
+     *
+     * {talendTypes} Object
+     *
+     * {Category} User Defined
+     *
+     * {param} object(subjob) subjob : The subjob.
+     *
+     * {example} executeSampling(subjob) #
+     */
+    public static void executeSampling(Runnable subjob) {
+        execute(subjob, true);
+    }
+
+    /**
+     * Returns the connection a subjob reads from: the one of its worker
+     * for the database when running on a worker thread and the pool has
+     * one free, the one of the job otherwise.
+     *
+     * {talendTypes} Object
+     *
+     * {Category} User Defined
+     *
+     * {param} object(connection) connection : The connection of the job.
+     *
+     * {param} string(context.ovirtEngineDbDriverClass) driver : The JDBC driver.
+     *
+     * {param} string(context.ovirtEngineDbJdbcConnection) url : The JDBC url.
+     *
+     * {param} string(context.ovirtEngineDbUser) user : The database user.
+     *
+     * {param} string(context.ovirtEngineDbPassword) password : The password.
+     *
+     * {example} readConnection(connection, driver, url, user, password) #
+     */
+    public static Connection readConnection(
+        Connection connection,
+        String driver,
+        String url,
+        String user,
+        String password
+    ) throws ClassNotFoundException, SQLException {
+        if (!(Thread.currentThread() instanceof Worker)) {
+            return connection;
+        }
+        Worker worker = (Worker) Thread.currentThread();
+        String key = user + "@" + url;
+        Connection own = worker.connections.get(key);
+        if (own == null || own.isClosed()) {
+            if (own != null) {
+                // gives back its place in the pool
+                own.close();
+                worker.connections.remove(key);
+            }
+            own = RoutineConnectionPool.pollConnection(driver, url, user, password, worker.getName());
+            if (own == null) {
+                return connection;
+            }
+            own.setAutoCommit(true);
+            own.setReadOnly(true);
+            worker.connections.put(key, own);
+        }
+        return own;
+    }
+}
@@ -13,14 +13,16 @@
 package routines.system;
 
 import java.sql.Connection;
-import java.sql.DriverManager;
 import java.sql.SQLException;
 import java.util.HashMap;
 import java.util.Map;
 import java.util.Set;
 
+import routines.RoutineConnectionPool;
+
 /**
- * A buffer to keep all the DB connections, make it reusable between the different jobs.
+ * A buffer to keep all the DB connections, make it reusable between the different jobs. The connections are taken
+ * from RoutineConnectionPool, and replaced when they are no longer valid.
  */
 public class SharedDBConnection {
 
@@ -59,15 +61,16 @@ public class SharedDBConnection {
                 System.out.println("SharedDBConnection, can't find the key:" + dbConnectionName + " " //$NON-NLS-1$ //$NON-NLS-2$
                         + "so create a new one and share it."); //$NON-NLS-1$
             }
-            Class.forName(dbDriver);
-            connection = DriverManager.getConnection(url, userName, password);
+            connection = RoutineConnectionPool.getSharedConnection(dbDriver, url, userName, password, dbConnectionName);
             sharedConnections.put(dbConnectionName, connection);
-        } else if (connection.isClosed()) {
+        } else if (!RoutineConnectionPool.isValid(connection)) {
             if (DEBUG) {
                 System.out.println("SharedDBConnection, find the key: " + dbConnectionName + " " //$NON-NLS-1$ //$NON-NLS-2$
                         + "But it is closed. So create a new one and share it."); //$NON-NLS-1$
             }
-            connection = DriverManager.getConnection(url, userName, password);
+            // gives it back to the pool, which replaces it when broken
+            connection.close();
+            connection = RoutineConnectionPool.getSharedConnection(dbDriver, url, userName, password, dbConnectionName);
             sharedConnections.put(dbConnectionName, connection);
         } else {
             if (DEBUG) {
@@ -95,15 +98,15 @@ public class SharedDBConnection {
                 System.out.println("SharedDBConnection, can't find the key:" + dbConnectionName + " " //$NON-NLS-1$ //$NON-NLS-2$
                         + "so create a new one and share it."); //$NON-NLS-1$
             }
-            Class.forName(dbDriver);
-            connection = DriverManager.getConnection(url);
+            connection = RoutineConnectionPool.getSharedConnection(dbDriver, url, null, null, dbConnectionName);
             sharedConnections.put(dbConnectionName, connection);
-        } else if (connection.isClosed()) {
+        } else if (!RoutineConnectionPool.isValid(connection)) {
             if (DEBUG) {
                 System.out.println("SharedDBConnection, find the key: " + dbConnectionName + " " //$NON-NLS-1$ //$NON-NLS-2$
                         + "But it is closed. So create a new one and share it."); //$NON-NLS-1$
             }
-            connection = DriverManager.getConnection(url);
+            connection.close();
+            connection = RoutineConnectionPool.getSharedConnection(dbDriver, url, null, null, dbConnectionName);
             sharedConnections.put(dbConnectionName, connection);
         } else {
             if (DEBUG) {
@@ -1,5 +1,13 @@
 package org.ovirt.engine.dwh.etltermination;
 
+import java.io.FileOutputStream;
+import java.io.IOException;
+import java.io.OutputStream;
+import java.lang.management.ManagementFactory;
+import java.lang.management.MemoryPoolMXBean;
+import java.lang.management.MemoryType;
+import java.util.Properties;
+
 import sun.misc.Signal;
 import sun.misc.SignalHandler;
 
@@ -7,6 +15,11 @@ public class Termination {
 
     private static volatile Termination instance;
 
+    // How often the heap left in use after the collections is sampled
+    private static final long LIVE_INTERVAL = 10000;
+
+    private static volatile long live;
+
     private boolean terminate;
 
     public static Termination getInstance() {
@@ -27,6 +40,88 @@ public class Termination {
         };
         Signal.handle(new Signal("TERM"), sh );
         Signal.handle(new Signal("INT"), sh );
+
+        final String heapUsage = System.getProperty("org.ovirt.engine.dwh.heapUsage");
+        if (heapUsage != null) {
+            Thread sampler = new Thread("heap-usage") {
+                public void run() {
+                    while (true) {
+                        live = Math.max(live, getLiveHeap());
+                        try {
+                            Thread.sleep(LIVE_INTERVAL);
+                        } catch (InterruptedException e) {
+                            return;
+                        }
+                    }
+                }
+            };
+            sampler.setDaemon(true);
+            sampler.start();
+            Runtime.getRuntime().addShutdownHook(new Thread() {
+                public void run() {
+                    writeHeapUsage(heapUsage);
+                }
+            });
+        }
+    }
+
+    /*
+     * Returns the old generation heap in use after its last collection,
+     * which is what the ETL keeps alive whatever the size of the heap. The
+     * collectors without an old generation count all their heap pools.
+     */
+    private static long getLiveHeap() {
+        long old = 0;
+        long all = 0;
+        boolean hasOld = false;
+        for (MemoryPoolMXBean pool : ManagementFactory.getMemoryPoolMXBeans()) {
+            if (pool.getType() != MemoryType.HEAP || pool.getCollectionUsage() == null) {
+                continue;
+            }
+            long used = pool.getCollectionUsage().getUsed();
+            all += used;
+            if (pool.getName().contains("Old Gen") || pool.getName().contains("Tenured")) {
+                old += used;
+                hasOld = true;
+            }
+        }
+        return hasOld ? old : all;
+    }
+
+    /*
+     * Records the largest heap left in use after the collections during
+     * this run, the daemon sizes the heap of the next one from it. The
+     * peak usage, which grows with the heap given, is recorded for
+     * information only.
+     */
+    private static void writeHeapUsage(String fileName) {
+        long peak = 0;
+        for (MemoryPoolMXBean pool : ManagementFactory.getMemoryPoolMXBeans()) {
+            if (pool.getType() == MemoryType.HEAP && pool.getPeakUsage() != null) {
+                peak += pool.getPeakUsage().getUsed();
+            }
+        }
+        Properties usage = new Properties();
+        usage.setProperty("live", Long.toString(Math.max(live, getLiveHeap())));
+        usage.setProperty("peak", Long.toString(peak));
+        usage.setProperty(
+            "max",
+            Long.toString(ManagementFactory.getMemoryMXBean().getHeapMemoryUsage().getMax())
+        );
+        OutputStream out = null;
+        try {
+            out = new FileOutputStream(fileName);
+            usage.store(out, "ovirt-engine-dwhd heap usage");
+        } catch (IOException e) {
+            System.err.println("Cannot write heap usage to " + fileName + ": " + e.getMessage());
+        } finally {
+            if (out != null) {
+                try {
+                    out.close();
+                } catch (IOException e) {
+                }
+            }
+        }
     }
 
     public boolean shouldTerminate() {
@@ -0,0 +1,435 @@
+/**************************************
+    AGGREGATION BENCHMARK DATA
+**************************************/
+
+-- Deterministic input of the hourly and daily aggregation, generated in
+-- an empty history database by bench_aggregation_populate() for
+-- dwh-benchmark-aggregation.
+--
+-- Values are derived from md5 of the entity and the time, never from
+-- random(), so that the same arguments always generate the same rows and
+-- the aggregated rows can be compared to golden results. In some hours an
+-- entity changes its status or its configuration version at the half
+-- hour, and some VMs change their logged in user, to cover the weighting
+-- by the time in status and the grouping by version and user.
+--
+-- Times are formatted into the keys, the session time zone must be UTC.
+
+CREATE OR REPLACE FUNCTION bench_aggregation_start()
+RETURNS TIMESTAMP WITH TIME ZONE IMMUTABLE
+AS $function$
+    SELECT '2020-01-06 00:00:00+00'::timestamp with time zone
+$function$
+LANGUAGE sql;
+
+CREATE OR REPLACE FUNCTION bench_id(v_kind VARCHAR, v_number INTEGER)
+RETURNS UUID IMMUTABLE
+AS $function$
+    SELECT md5(v_kind || ':' || v_number)::uuid
+$function$
+LANGUAGE sql;
+
+-- A number from 0 to v_modulo - 1
+CREATE OR REPLACE FUNCTION bench_hash(v_key TEXT, v_modulo INTEGER)
+RETURNS INTEGER IMMUTABLE
+AS $function$
+    SELECT ('x' || substr(md5(v_key), 1, 7))::bit(28)::integer % v_modulo
+$function$
+LANGUAGE sql;
+
+-- What an entity changes at the half hour of an hour: 0 nothing,
+-- 1 its status, 2 its configuration version, each in about one of eight
+-- hours.
+CREATE OR REPLACE FUNCTION bench_change(v_kind VARCHAR, v_number INTEGER, v_hour TIMESTAMP WITH TIME ZONE)
+RETURNS INTEGER STABLE
+AS $function$
+    SELECT CASE bench_hash(v_kind || ':' || v_number || ':' || v_hour, 8)
+        WHEN 0 THEN 1
+        WHEN 1 THEN 2
+        ELSE 0
+    END
+$function$
+LANGUAGE sql;
+
+-- The configuration version of an entity at v_time, a new one for every
+-- hour, and another one after the half hour when bench_change() says so.
+CREATE OR REPLACE FUNCTION bench_version(v_kind VARCHAR, v_number INTEGER, v_time TIMESTAMP WITH TIME ZONE)
+RETURNS INTEGER STABLE
+AS $function$
+    SELECT v_number * 100000
+        + (extract(epoch FROM date_trunc('hour', v_time) - bench_aggregation_start()) / 3600)::integer * 2
+        + CASE
+            WHEN extract(minute FROM v_time) >= 30
+                AND bench_change(v_kind, v_number, date_trunc('hour', v_time)) = 2
+            THEN 1
+            ELSE 0
+        END
+$function$
+LANGUAGE sql;
+
+-- Whether an entity is in its alternative status at v_time
+CREATE OR REPLACE FUNCTION bench_down(v_kind VARCHAR, v_number INTEGER, v_time TIMESTAMP WITH TIME ZONE)
+RETURNS BOOLEAN STABLE
+AS $function$
+    SELECT extract(minute FROM v_time) >= 30
+        AND bench_change(v_kind, v_number, date_trunc('hour', v_time)) = 1
+$function$
+LANGUAGE sql;
+
+-- A percentage for a column of an entity at v_time
+CREATE OR REPLACE FUNCTION bench_percent(v_column VARCHAR, v_number INTEGER, v_time TIMESTAMP WITH TIME ZONE)
+RETURNS SMALLINT STABLE
+AS $function$
+    SELECT bench_hash(v_column || ':' || v_number || ':' || v_time, 101)::smallint
+$function$
+LANGUAGE sql;
+
+-- Generates, for v_vms VMs, a tenth of the hosts with two interfaces
+-- each, a fifth of the hosts storage domains, one disk and one interface
+-- per VM:
+-- - hourly rows for the v_days days from bench_aggregation_start(), the
+--   input of the daily aggregation,
+-- - samples every v_sampling seconds for the v_hours hours after them,
+--   the input of the hourly aggregation.
+CREATE OR REPLACE FUNCTION bench_aggregation_populate(
+    v_vms INTEGER,
+    v_hours INTEGER,
+    v_days INTEGER,
+    v_sampling INTEGER
+)
+RETURNS VOID
+AS $procedure$
+declare
+	v_hosts INTEGER := greatest(v_vms / 10, 1);
+	v_storage_domains INTEGER := greatest(v_hosts / 5, 1);
+	v_samples_start TIMESTAMP WITH TIME ZONE := bench_aggregation_start() + v_days * interval '1 day';
+begin
+	CREATE TEMPORARY TABLE bench_samples ON COMMIT DROP AS
+	SELECT t AS history_datetime
+	FROM generate_series(
+		v_samples_start,
+		v_samples_start + v_hours * interval '1 hour' - v_sampling * interval '1 second',
+		v_sampling * interval '1 second'
+	) t;
+
+	CREATE TEMPORARY TABLE bench_hours ON COMMIT DROP AS
+	SELECT t AS history_datetime
+	FROM generate_series(
+		bench_aggregation_start(),
+		v_samples_start - interval '1 hour',
+		interval '1 hour'
+	) t;
+
+	-- samples
+
+	INSERT INTO host_samples_history (
+		history_datetime, host_id, host_status, seconds_in_status,
+		memory_usage_percent, ksm_shared_memory_mb, cpu_usage_percent,
+		ksm_cpu_percent, active_vms, total_vms, total_vms_vcpus, cpu_load,
+		system_cpu_usage_percent, user_cpu_usage_percent, swap_used_mb,
+		host_configuration_version
+	)
+	SELECT s.history_datetime, bench_id('host', i),
+		CASE WHEN bench_down('host', i, s.history_datetime) THEN 2 ELSE 3 END,
+		v_sampling,
+		bench_percent('memory', i, s.history_datetime),
+		bench_hash('ksm_mb:' || i || s.history_datetime, 4096),
+		bench_percent('cpu', i, s.history_datetime),
+		bench_percent('ksm_cpu', i, s.history_datetime) / 10,
+		bench_hash('active:' || i || s.history_datetime, 10),
+		10,
+		20,
+		bench_hash('load:' || i || s.history_datetime, 64),
+		bench_percent('system_cpu', i, s.history_datetime) / 2,
+		bench_percent('user_cpu', i, s.history_datetime) / 2,
+		bench_hash('swap:' || i || s.history_datetime, 8192),
+		bench_version('host', i, s.history_datetime)
+	FROM generate_series(1, v_hosts) i, bench_samples s;
+
+	INSERT INTO host_interface_samples_history (
+		history_datetime, host_interface_id, receive_rate_percent,
+		transmit_rate_percent, host_interface_configuration_version,
+		received_total_byte, transmitted_total_byte
+	)
+	SELECT s.history_datetime, bench_id('host_interface', i),
+		bench_percent('rx', i, s.history_datetime),
+		bench_percent('tx', i, s.history_datetime),
+		bench_version('host_interface', i, s.history_datetime),
+		extract(epoch FROM s.history_datetime - bench_aggregation_start())::bigint * (1000 + i),
+		extract(epoch FROM s.history_datetime - bench_aggregation_start())::bigint * (500 + i)
+	FROM generate_series(1, v_hosts * 2) i, bench_samples s;
+
+	INSERT INTO vm_samples_history (
+		history_datetime, vm_id, vm_status, seconds_in_status,
+		cpu_usage_percent, memory_usage_percent, user_cpu_usage_percent,
+		system_cpu_usage_percent, vm_ip, vm_client_ip, current_user_id,
+		current_user_name, user_logged_in_to_guest,
+		currently_running_on_host, vm_configuration_version,
+		current_host_configuration_version, memory_buffered_kb,
+		memory_cached_kb
+	)
+	SELECT s.history_datetime, bench_id('vm', i),
+		CASE WHEN down THEN 0 ELSE 1 END,
+		v_sampling,
+		CASE WHEN down THEN 0 ELSE bench_percent('cpu', i, s.history_datetime) END,
+		CASE WHEN down THEN 0 ELSE bench_percent('memory', i, s.history_datetime) END,
+		CASE WHEN down THEN 0 ELSE bench_percent('user_cpu', i, s.history_datetime) / 2 END,
+		CASE WHEN down THEN 0 ELSE bench_percent('system_cpu', i, s.history_datetime) / 2 END,
+		CASE WHEN down THEN NULL ELSE '10.1.' || (i / 256) || '.' || (i % 256) END,
+		CASE WHEN down THEN NULL ELSE '10.2.0.' || (i % 256) END,
+		CASE WHEN down THEN NULL ELSE bench_id('user', u) END,
+		CASE WHEN down THEN NULL ELSE 'user' || u END,
+		NOT down,
+		CASE WHEN down THEN NULL ELSE bench_id('host', (i - 1) % v_hosts + 1) END,
+		bench_version('vm', i, s.history_datetime),
+		bench_version('host', (i - 1) % v_hosts + 1, s.history_datetime),
+		bench_hash('buffered:' || i || s.history_datetime, 1048576),
+		bench_hash('cached:' || i || s.history_datetime, 1048576)
+	FROM generate_series(1, v_vms) i
+	CROSS JOIN bench_samples s
+	CROSS JOIN LATERAL (
+		SELECT
+			bench_down('vm', i, s.history_datetime) AS down,
+			-- another user logs in for the last third of some hours
+			CASE
+				WHEN extract(minute FROM s.history_datetime) >= 40
+					AND bench_hash('login:' || i || date_trunc('hour', s.history_datetime), 4) = 0
+				THEN i % 7 + 1001
+				ELSE i % 7 + 1
+			END AS u
+	) state;
+
+	INSERT INTO vm_interface_samples_history (
+		history_datetime, vm_interface_id, receive_rate_percent,
+		transmit_rate_percent, vm_interface_configuration_version,
+		received_total_byte, transmitted_total_byte
+	)
+	SELECT s.history_datetime, bench_id('vm_interface', i),
+		bench_percent('rx', i, s.history_datetime),
+		bench_percent('tx', i, s.history_datetime),
+		bench_version('vm_interface', i, s.history_datetime),
+		extract(epoch FROM s.history_datetime - bench_aggregation_start())::bigint * (100 + i),
+		extract(epoch FROM s.history_datetime - bench_aggregation_start())::bigint * (50 + i)
+	FROM generate_series(1, v_vms) i, bench_samples s;
+
+	INSERT INTO storage_domain_samples_history (
+		history_datetime, storage_domain_id, storage_domain_status,
+		seconds_in_status, available_disk_size_gb, used_disk_size_gb,
+		storage_configuration_version
+	)
+	SELECT s.history_datetime, bench_id('storage_domain', i),
+		CASE WHEN bench_down('storage_domain', i, s.history_datetime) THEN 2 ELSE 1 END,
+		v_sampling,
+		10000 - bench_hash('used:' || i || s.history_datetime, 5000),
+		bench_hash('used:' || i || s.history_datetime, 5000),
+		bench_version('storage_domain', i, s.history_datetime)
+	FROM generate_series(1, v_storage_domains) i, bench_samples s;
+
+	INSERT INTO vm_disk_samples_history (
+		history_datetime, vm_disk_id, image_id, vm_disk_status,
+		seconds_in_status, vm_disk_actual_size_mb,
+		read_rate_bytes_per_second, read_latency_seconds,
+		write_rate_bytes_per_second, write_latency_seconds,
+		flush_latency_seconds, vm_disk_configuration_version
+	)
+	SELECT s.history_datetime, bench_id('disk', i), bench_id('image', i),
+		CASE WHEN bench_down('disk', i, s.history_datetime) THEN 2 ELSE 1 END,
+		v_sampling,
+		2048 + bench_hash('size:' || i || date_trunc('hour', s.history_datetime), 1024),
+		bench_hash('read:' || i || s.history_datetime, 104857600),
+		bench_hash('read_latency:' || i || s.history_datetime, 1000000) / 1000000000.0,
+		bench_hash('write:' || i || s.history_datetime, 104857600),
+		bench_hash('write_latency:' || i || s.history_datetime, 1000000) / 1000000000.0,
+		bench_hash('flush_latency:' || i || s.history_datetime, 1000000) / 1000000000.0,
+		bench_version('disk', i, s.history_datetime)
+	FROM generate_series(1, v_vms) i, bench_samples s;
+
+	INSERT INTO vm_disks_usage_samples_history (history_datetime, vm_id, disks_usage)
+	SELECT s.history_datetime, bench_id('vm', i),
+		'[{"path":"/","fs":"xfs","total":"21474836480","used":"'
+			|| (1073741824 + bench_hash('disks_usage:' || i || s.history_datetime, 1073741824))
+			|| '"}]'
+	FROM generate_series(1, v_vms) i, bench_samples s;
+
+	-- hourly rows
+
+	INSERT INTO host_hourly_history (
+		history_datetime, host_id, host_status, minutes_in_status,
+		memory_usage_percent, max_memory_usage, ksm_shared_memory_mb,
+		max_ksm_shared_memory_mb, cpu_usage_percent, max_cpu_usage,
+		ksm_cpu_percent, max_ksm_cpu_percent, active_vms, max_active_vms,
+		total_vms, max_total_vms, total_vms_vcpus, max_total_vms_vcpus,
+		cpu_load, max_cpu_load, system_cpu_usage_percent,
+		max_system_cpu_usage_percent, user_cpu_usage_percent,
+		max_user_cpu_usage_percent, swap_used_mb, max_swap_used_mb,
+		host_configuration_version
+	)
+	SELECT h.history_datetime, bench_id('host', i), p.status, p.minutes,
+		bench_percent('memory', i, p.t) / 2, bench_percent('memory', i, p.t),
+		bench_hash('ksm_mb:' || i || p.t, 2048), 2048 + bench_hash('ksm_mb:' || i || p.t, 2048),
+		bench_percent('cpu', i, p.t) / 2, bench_percent('cpu', i, p.t),
+		bench_percent('ksm_cpu', i, p.t) / 20, bench_percent('ksm_cpu', i, p.t) / 10,
+		bench_hash('active:' || i || p.t, 5), 5 + bench_hash('active:' || i || p.t, 5),
+		10, 10, 20, 20,
+		bench_hash('load:' || i || p.t, 32), 32 + bench_hash('load:' || i || p.t, 32),
+		bench_percent('system_cpu', i, p.t) / 4, bench_percent('system_cpu', i, p.t) / 2,
+		bench_percent('user_cpu', i, p.t) / 4, bench_percent('user_cpu', i, p.t) / 2,
+		bench_hash('swap:' || i || p.t, 4096), 4096 + bench_hash('swap:' || i || p.t, 4096),
+		bench_version('host', i, p.t)
+	FROM generate_series(1, v_hosts) i
+	CROSS JOIN bench_hours h
+	CROSS JOIN LATERAL (
+		SELECT h.history_datetime + half * interval '30 minutes' AS t,
+			CASE WHEN bench_down('host', i, h.history_datetime + half * interval '30 minutes') THEN 2 ELSE 3 END AS status,
+			CASE WHEN bench_change('host', i, h.history_datetime) = 0 THEN 60 ELSE 30 END AS minutes
+		FROM generate_series(0, CASE WHEN bench_change('host', i, h.history_datetime) = 0 THEN 0 ELSE 1 END) half
+	) p;
+
+	INSERT INTO host_interface_hourly_history (
+		history_datetime, host_interface_id, receive_rate_percent,
+		max_receive_rate_percent, transmit_rate_percent,
+		max_transmit_rate_percent, host_interface_configuration_version,
+		received_total_byte, transmitted_total_byte
+	)
+	SELECT h.history_datetime, bench_id('host_interface', i),
+		bench_percent('rx', i, h.history_datetime) / 2, bench_percent('rx', i, h.history_datetime),
+		bench_percent('tx', i, h.history_datetime) / 2, bench_percent('tx', i, h.history_datetime),
+		bench_version('host_interface', i, h.history_datetime),
+		extract(epoch FROM h.history_datetime - bench_aggregation_start())::bigint * (1000 + i),
+		extract(epoch FROM h.history_datetime - bench_aggregation_start())::bigint * (500 + i)
+	FROM generate_series(1, v_hosts * 2) i, bench_hours h;
+
+	INSERT INTO vm_hourly_history (
+		history_datetime, vm_id, vm_status, minutes_in_status,
+		cpu_usage_percent, max_cpu_usage, memory_usage_percent,
+		max_memory_usage, user_cpu_usage_percent, max_user_cpu_usage_percent,
+		system_cpu_usage_percent, max_system_cpu_usage_percent, vm_ip,
+		current_user_id, currently_running_on_host, vm_configuration_version,
+		current_host_configuration_version, memory_buffered_kb,
+		max_memory_buffered_kb, memory_cached_kb, max_memory_cached_kb
+	)
+	SELECT h.history_datetime, bench_id('vm', i),
+		CASE WHEN p.down THEN 0 ELSE 1 END, p.minutes,
+		CASE WHEN p.down THEN 0 ELSE bench_percent('cpu', i, p.t) / 2 END,
+		CASE WHEN p.down THEN 0 ELSE bench_percent('cpu', i, p.t) END,
+		CASE WHEN p.down THEN 0 ELSE bench_percent('memory', i, p.t) / 2 END,
+		CASE WHEN p.down THEN 0 ELSE bench_percent('memory', i, p.t) END,
+		CASE WHEN p.down THEN 0 ELSE bench_percent('user_cpu', i, p.t) / 4 END,
+		CASE WHEN p.down THEN 0 ELSE bench_percent('user_cpu', i, p.t) / 2 END,
+		CASE WHEN p.down THEN 0 ELSE bench_percent('system_cpu', i, p.t) / 4 END,
+		CASE WHEN p.down THEN 0 ELSE bench_percent('system_cpu', i, p.t) / 2 END,
+		CASE WHEN p.down THEN NULL ELSE '10.1.' || (i / 256) || '.' || (i % 256) END,
+		CASE WHEN p.down THEN NULL ELSE bench_id('user', i % 7 + 1) END,
+		CASE WHEN p.down THEN NULL ELSE bench_id('host', (i - 1) % v_hosts + 1) END,
+		bench_version('vm', i, p.t),
+		bench_version('host', (i - 1) % v_hosts + 1, p.t),
+		bench_hash('buffered:' || i || p.t, 524288), 524288 + bench_hash('buffered:' || i || p.t, 524288),
+		bench_hash('cached:' || i || p.t, 524288), 524288 + bench_hash('cached:' || i || p.t, 524288)
+	FROM generate_series(1, v_vms) i
+	CROSS JOIN bench_hours h
+	CROSS JOIN LATERAL (
+		SELECT h.history_datetime + half * interval '30 minutes' AS t,
+			bench_down('vm', i, h.history_datetime + half * interval '30 minutes') AS down,
+			CASE WHEN bench_change('vm', i, h.history_datetime) = 0 THEN 60 ELSE 30 END AS minutes
+		FROM generate_series(0, CASE WHEN bench_change('vm', i, h.history_datetime) = 0 THEN 0 ELSE 1 END) half
+	) p;
+
+	INSERT INTO statistics_vms_users_usage_hourly (
+		history_datetime, user_id, user_name, user_logged_in_to_guest,
+		vm_id, session_time_in_minutes, cpu_usage_percent, max_cpu_usage,
+		memory_usage_percent, max_memory_usage, user_cpu_usage_percent,
+		max_user_cpu_usage_percent, system_cpu_usage_percent,
+		max_system_cpu_usage_percent, vm_ip, vm_client_ip,
+		currently_running_on_host, vm_configuration_version,
+		current_host_configuration_version
+	)
+	SELECT h.history_datetime, bench_id('user', u.u), 'user' || u.u, true,
+		bench_id('vm', i), u.minutes,
+		bench_percent('cpu', i, h.history_datetime) / 2, bench_percent('cpu', i, h.history_datetime),
+		bench_percent('memory', i, h.history_datetime) / 2, bench_percent('memory', i, h.history_datetime),
+		bench_percent('user_cpu', i, h.history_datetime) / 4, bench_percent('user_cpu', i, h.history_datetime) / 2,
+		bench_percent('system_cpu', i, h.history_datetime) / 4, bench_percent('system_cpu', i, h.history_datetime) / 2,
+		'10.1.' || (i / 256) || '.' || (i % 256), '10.2.0.' || (i % 256),
+		bench_id('host', (i - 1) % v_hosts + 1),
+		bench_version('vm', i, h.history_datetime),
+		bench_version('host', (i - 1) % v_hosts + 1, h.history_datetime)
+	FROM generate_series(1, v_vms) i
+	CROSS JOIN bench_hours h
+	CROSS JOIN LATERAL (
+		SELECT i % 7 + 1 AS u,
+			CASE WHEN bench_hash('login:' || i || h.history_datetime, 4) = 0 THEN 40 ELSE 60 END AS minutes
+		UNION ALL
+		SELECT i % 7 + 1001, 20
+		WHERE bench_hash('login:' || i || h.history_datetime, 4) = 0
+	) u;
+
+	INSERT INTO vm_interface_hourly_history (
+		history_datetime, vm_interface_id, receive_rate_percent,
+		max_receive_rate_percent, transmit_rate_percent,
+		max_transmit_rate_percent, vm_interface_configuration_version,
+		received_total_byte, transmitted_total_byte
+	)
+	SELECT h.history_datetime, bench_id('vm_interface', i),
+		bench_percent('rx', i, h.history_datetime) / 2, bench_percent('rx', i, h.history_datetime),
+		bench_percent('tx', i, h.history_datetime) / 2, bench_percent('tx', i, h.history_datetime),
+		bench_version('vm_interface', i, h.history_datetime),
+		extract(epoch FROM h.history_datetime - bench_aggregation_start())::bigint * (100 + i),
+		extract(epoch FROM h.history_datetime - bench_aggregation_start())::bigint * (50 + i)
+	FROM generate_series(1, v_vms) i, bench_hours h;
+
+	INSERT INTO storage_domain_hourly_history (
+		history_datetime, storage_domain_id, storage_domain_status,
+		minutes_in_status, available_disk_size_gb, used_disk_size_gb,
+		storage_configuration_version
+	)
+	SELECT h.history_datetime, bench_id('storage_domain', i),
+		CASE WHEN bench_down('storage_domain', i, p.t) THEN 2 ELSE 1 END, p.minutes,
+		10000 - bench_hash('used:' || i || p.t, 5000),
+		bench_hash('used:' || i || p.t, 5000),
+		bench_version('storage_domain', i, p.t)
+	FROM generate_series(1, v_storage_domains) i
+	CROSS JOIN bench_hours h
+	CROSS JOIN LATERAL (
+		SELECT h.history_datetime + half * interval '30 minutes' AS t,
+			CASE WHEN bench_change('storage_domain', i, h.history_datetime) = 0 THEN 60 ELSE 30 END AS minutes
+		FROM generate_series(0, CASE WHEN bench_change('storage_domain', i, h.history_datetime) = 0 THEN 0 ELSE 1 END) half
+	) p;
+
+	INSERT INTO vm_disk_hourly_history (
+		history_datetime, vm_disk_id, image_id, vm_disk_status,
+		minutes_in_status, vm_disk_actual_size_mb,
+		read_rate_bytes_per_second, max_read_rate_bytes_per_second,
+		read_latency_seconds, max_read_latency_seconds,
+		write_rate_bytes_per_second, max_write_rate_bytes_per_second,
+		write_latency_seconds, max_write_latency_seconds,
+		flush_latency_seconds, max_flush_latency_seconds,
+		vm_disk_configuration_version
+	)
+	SELECT h.history_datetime, bench_id('disk', i), bench_id('image', i),
+		CASE WHEN bench_down('disk', i, p.t) THEN 2 ELSE 1 END, p.minutes,
+		2048 + bench_hash('size:' || i || h.history_datetime, 1024),
+		bench_hash('read:' || i || p.t, 52428800), 52428800 + bench_hash('read:' || i || p.t, 52428800),
+		bench_hash('read_latency:' || i || p.t, 500000) / 1000000000.0,
+		(500000 + bench_hash('read_latency:' || i || p.t, 500000)) / 1000000000.0,
+		bench_hash('write:' || i || p.t, 52428800), 52428800 + bench_hash('write:' || i || p.t, 52428800),
+		bench_hash('write_latency:' || i || p.t, 500000) / 1000000000.0,
+		(500000 + bench_hash('write_latency:' || i || p.t, 500000)) / 1000000000.0,
+		bench_hash('flush_latency:' || i || p.t, 500000) / 1000000000.0,
+		(500000 + bench_hash('flush_latency:' || i || p.t, 500000)) / 1000000000.0,
+		bench_version('disk', i, p.t)
+	FROM generate_series(1, v_vms) i
+	CROSS JOIN bench_hours h
+	CROSS JOIN LATERAL (
+		SELECT h.history_datetime + half * interval '30 minutes' AS t,
+			CASE WHEN bench_change('disk', i, h.history_datetime) = 0 THEN 60 ELSE 30 END AS minutes
+		FROM generate_series(0, CASE WHEN bench_change('disk', i, h.history_datetime) = 0 THEN 0 ELSE 1 END) half
+	) p;
+
+	INSERT INTO vm_disks_usage_hourly_history (history_datetime, vm_id, disks_usage)
+	SELECT h.history_datetime, bench_id('vm', i),
+		'[{"path":"/","fs":"xfs","total":"21474836480","used":"'
+			|| (1073741824 + bench_hash('disks_usage:' || i || h.history_datetime, 1073741824))
+			|| '"}]'
+	FROM generate_series(1, v_vms) i, bench_hours h;
+end; $procedure$
+LANGUAGE plpgsql;
@@ -0,0 +1,842 @@
+/**************************************
+    SYNTHETIC ENGINE DATABASE
+**************************************/
+
+-- The tables and views of the engine database the ETL reads, filled with
+-- a generated inventory by bench_populate() and changed between the
+-- sample cycles by bench_cycle(), for dwh-benchmark-etl.
+--
+-- Only the columns the ETL selects exist. The engine tables the ETL reads
+-- directly keep their engine names, the others are named after the
+-- columns of the views. Identifiers are derived from the entity numbers,
+-- so that the same inventory is generated on every run.
+
+CREATE TABLE vdc_options
+(
+   option_id SERIAL PRIMARY KEY NOT NULL,
+   option_name VARCHAR(100) NOT NULL,
+   option_value VARCHAR(4000) NOT NULL,
+   version VARCHAR(40) NOT NULL DEFAULT 'general'
+);
+
+CREATE TABLE dwh_history_timekeeping
+(
+   var_name VARCHAR(50) PRIMARY KEY NOT NULL,
+   var_value VARCHAR(255),
+   var_datetime TIMESTAMP WITH TIME ZONE
+);
+
+CREATE TABLE audit_log
+(
+   audit_log_id BIGSERIAL PRIMARY KEY NOT NULL,
+   log_time TIMESTAMP WITH TIME ZONE NOT NULL,
+   log_type_name VARCHAR(100),
+   log_type INTEGER NOT NULL,
+   severity INTEGER NOT NULL,
+   message TEXT NOT NULL
+);
+
+CREATE TABLE dwh_osinfo
+(
+   os_id INTEGER PRIMARY KEY NOT NULL,
+   os_name VARCHAR(255)
+);
+
+CREATE TABLE storage_pool
+(
+   id UUID PRIMARY KEY NOT NULL,
+   datacenter_name VARCHAR(40) NOT NULL,
+   datacenter_description VARCHAR(4000) NOT NULL,
+   is_local_storage BOOLEAN NOT NULL,
+   _create_date TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+   _update_date TIMESTAMP WITH TIME ZONE
+);
+
+CREATE TABLE cluster
+(
+   cluster_id UUID PRIMARY KEY NOT NULL,
+   cluster_name VARCHAR(40) NOT NULL,
+   cluster_description VARCHAR(4000),
+   datacenter_id UUID NOT NULL,
+   cpu_name VARCHAR(255),
+   compatibility_version VARCHAR(40) NOT NULL,
+   _create_date TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+   _update_date TIMESTAMP WITH TIME ZONE
+);
+
+CREATE TABLE storage_domain_static
+(
+   id UUID PRIMARY KEY NOT NULL,
+   storage_domain_name VARCHAR(250) NOT NULL,
+   storage_domain_type SMALLINT NOT NULL,
+   storage_type SMALLINT NOT NULL,
+   storage_domain_status SMALLINT,
+   available_disk_size_gb INTEGER,
+   used_disk_size_gb INTEGER,
+   _create_date TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+   _update_date TIMESTAMP WITH TIME ZONE
+);
+
+CREATE TABLE storage_pool_iso_map
+(
+   storage_id UUID NOT NULL,
+   storage_pool_id UUID NOT NULL,
+   PRIMARY KEY (storage_id, storage_pool_id)
+);
+
+CREATE TABLE vds_static
+(
+   vds_id UUID PRIMARY KEY NOT NULL,
+   host_unique_id VARCHAR(128),
+   host_name VARCHAR(255) NOT NULL,
+   cluster_id UUID NOT NULL,
+   host_type SMALLINT NOT NULL,
+   fqdn_or_ip VARCHAR(255) NOT NULL,
+   memory_size_mb INTEGER,
+   swap_size_mb INTEGER,
+   cpu_model VARCHAR(255),
+   number_of_cores SMALLINT,
+   number_of_sockets SMALLINT,
+   cpu_speed_mh DECIMAL(18,0),
+   host_os VARCHAR(255),
+   kernel_version VARCHAR(255),
+   kvm_version VARCHAR(255),
+   vdsm_version VARCHAR(40),
+   vdsm_port INTEGER NOT NULL,
+   threads_per_core SMALLINT,
+   hardware_manufacturer VARCHAR(255),
+   hardware_product_name VARCHAR(255),
+   hardware_version VARCHAR(255),
+   hardware_serial_number VARCHAR(255),
+   host_status SMALLINT NOT NULL,
+   memory_usage_percent SMALLINT,
+   ksm_shared_memory_mb BIGINT,
+   cpu_usage_percent SMALLINT,
+   ksm_cpu_percent SMALLINT,
+   cpu_load INTEGER,
+   system_cpu_usage_percent SMALLINT,
+   user_cpu_usage_percent SMALLINT,
+   swap_used_mb INTEGER,
+   vm_active SMALLINT,
+   total_vms SMALLINT,
+   total_vms_vcpus INTEGER,
+   _create_date TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+   _update_date TIMESTAMP WITH TIME ZONE
+);
+
+CREATE TABLE vds_interface
+(
+   id UUID PRIMARY KEY NOT NULL,
+   host_interface_name VARCHAR(50) NOT NULL,
+   host_id UUID NOT NULL,
+   host_interface_type SMALLINT,
+   host_interface_speed_bps INTEGER,
+   mac_address VARCHAR(59),
+   logical_network_name VARCHAR(256),
+   ip_address VARCHAR(20),
+   gateway VARCHAR(20),
+   bond BOOLEAN,
+   bond_name VARCHAR(50),
+   vlan_id INTEGER,
+   receive_rate_percent DECIMAL(18,4),
+   transmit_rate_percent DECIMAL(18,4),
+   received_total_byte BIGINT NOT NULL DEFAULT 0,
+   transmitted_total_byte BIGINT NOT NULL DEFAULT 0,
+   _create_date TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+   _update_date TIMESTAMP WITH TIME ZONE
+);
+
+CREATE TABLE users
+(
+   user_id UUID PRIMARY KEY NOT NULL,
+   first_name VARCHAR(255),
+   last_name VARCHAR(255),
+   domain VARCHAR(255) NOT NULL,
+   username VARCHAR(255) NOT NULL,
+   department VARCHAR(255),
+   user_role_title VARCHAR(255),
+   email VARCHAR(255),
+   external_id TEXT NOT NULL,
+   active BOOLEAN NOT NULL,
+   _create_date TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+   _update_date TIMESTAMP WITH TIME ZONE
+);
+
+CREATE TABLE vm_static
+(
+   vm_guid UUID PRIMARY KEY NOT NULL,
+   entity_type VARCHAR(32) NOT NULL DEFAULT 'VM',
+   vm_name VARCHAR(255) NOT NULL,
+   vm_description VARCHAR(4000),
+   vm_type SMALLINT,
+   cluster_id UUID NOT NULL,
+   template_id UUID NOT NULL,
+   template_name VARCHAR(255),
+   cpu_per_socket SMALLINT,
+   number_of_sockets SMALLINT,
+   memory_size_mb INTEGER,
+   operating_system SMALLINT NOT NULL,
+   default_host UUID,
+   high_availability BOOLEAN,
+   initialized BOOLEAN,
+   stateless BOOLEAN,
+   fail_back BOOLEAN,
+   usb_policy SMALLINT,
+   time_zone VARCHAR(40),
+   vm_pool_id UUID,
+   vm_pool_name VARCHAR(255),
+   created_by_user_id UUID,
+   vm_status SMALLINT NOT NULL,
+   cpu_usage_percent SMALLINT,
+   memory_usage_percent SMALLINT,
+   system_cpu_usage_percent SMALLINT,
+   user_cpu_usage_percent SMALLINT,
+   disks_usage TEXT,
+   vm_ip TEXT,
+   vm_client_ip VARCHAR(255),
+   current_user_id UUID,
+   user_logged_in_to_guest BOOLEAN,
+   currently_running_on_host UUID,
+   memory_buffered_kb BIGINT,
+   memory_cached_kb BIGINT,
+   _create_date TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+   _update_date TIMESTAMP WITH TIME ZONE
+);
+
+CREATE TABLE base_disks
+(
+   disk_id UUID PRIMARY KEY NOT NULL,
+   image_id UUID NOT NULL,
+   vm_disk_name VARCHAR(255),
+   vm_disk_description VARCHAR(4000),
+   storage_domain_id UUID,
+   vm_disk_size_mb INTEGER,
+   vm_disk_type SMALLINT,
+   vm_disk_format SMALLINT,
+   is_shared BOOLEAN,
+   vm_disk_status SMALLINT,
+   vm_disk_actual_size_mb INTEGER NOT NULL,
+   read_rate_bytes_per_second INTEGER,
+   read_latency_seconds DECIMAL(18,9),
+   write_rate_bytes_per_second INTEGER,
+   write_latency_seconds DECIMAL(18,9),
+   flush_latency_seconds DECIMAL(18,9),
+   _create_date TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+   _update_date TIMESTAMP WITH TIME ZONE
+);
+
+CREATE TABLE vm_interface
+(
+   id UUID PRIMARY KEY NOT NULL,
+   vm_interface_name VARCHAR(50) NOT NULL,
+   vm_id UUID,
+   vm_interface_type SMALLINT,
+   vm_interface_speed_bps INTEGER,
+   mac_address VARCHAR(20),
+   logical_network_name VARCHAR(256),
+   receive_rate_percent DECIMAL(18,4),
+   transmit_rate_percent DECIMAL(18,4),
+   received_total_byte BIGINT NOT NULL DEFAULT 0,
+   transmitted_total_byte BIGINT NOT NULL DEFAULT 0,
+   _create_date TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+   _update_date TIMESTAMP WITH TIME ZONE
+);
+
+CREATE TABLE vm_device
+(
+   device_id UUID NOT NULL,
+   vm_id UUID NOT NULL,
+   type VARCHAR(30) NOT NULL,
+   device VARCHAR(30) NOT NULL,
+   address VARCHAR(255) NOT NULL,
+   is_managed BOOLEAN NOT NULL,
+   is_plugged BOOLEAN,
+   is_readonly BOOLEAN NOT NULL,
+   _create_date TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+   _update_date TIMESTAMP WITH TIME ZONE,
+   PRIMARY KEY (device_id, vm_id)
+);
+
+CREATE TABLE tags
+(
+   tag_id UUID PRIMARY KEY NOT NULL,
+   tag_name VARCHAR(50) NOT NULL,
+   tag_description VARCHAR(4000),
+   _create_date TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+   _update_date TIMESTAMP WITH TIME ZONE
+);
+
+CREATE TABLE tags_relations
+(
+   entity_id UUID NOT NULL,
+   entity_type SMALLINT NOT NULL,
+   parent_id UUID,
+   attach_date TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+   move_date TIMESTAMP WITH TIME ZONE
+);
+
+CREATE OR REPLACE FUNCTION bench_last_sync()
+RETURNS TIMESTAMP WITH TIME ZONE STABLE
+AS $function$
+    SELECT var_datetime
+    FROM dwh_history_timekeeping
+    WHERE var_name = 'lastSync'
+$function$
+LANGUAGE sql;
+
+-- Configuration views, returning what changed since the last sync
+
+CREATE OR REPLACE VIEW dwh_datacenter_configuration_history_view
+ AS
+SELECT
+    id AS datacenter_id,
+    datacenter_name,
+    datacenter_description,
+    is_local_storage,
+    _create_date AS create_date,
+    _update_date AS update_date
+FROM storage_pool
+WHERE _create_date > bench_last_sync() OR _update_date > bench_last_sync();
+
+CREATE OR REPLACE VIEW dwh_cluster_configuration_history_view
+ AS
+SELECT
+    cluster_id,
+    cluster_name,
+    cluster_description,
+    datacenter_id,
+    cpu_name,
+    compatibility_version,
+    _create_date AS create_date,
+    _update_date AS update_date
+FROM cluster
+WHERE _create_date > bench_last_sync() OR _update_date > bench_last_sync();
+
+CREATE OR REPLACE VIEW dwh_storage_domain_configuration_history_view
+ AS
+SELECT
+    id AS storage_domain_id,
+    storage_domain_name,
+    storage_domain_type,
+    storage_type,
+    _create_date AS create_date,
+    _update_date AS update_date
+FROM storage_domain_static
+WHERE _create_date > bench_last_sync() OR _update_date > bench_last_sync();
+
+CREATE OR REPLACE VIEW dwh_host_configuration_full_check_view
+ AS
+SELECT
+    vds_id AS host_id,
+    host_unique_id,
+    host_name,
+    cluster_id,
+    host_type,
+    fqdn_or_ip,
+    memory_size_mb,
+    swap_size_mb,
+    cpu_model,
+    number_of_cores,
+    number_of_sockets,
+    cpu_speed_mh,
+    host_os,
+    kernel_version,
+    kvm_version,
+    vdsm_version,
+    vdsm_port,
+    threads_per_core,
+    hardware_manufacturer,
+    hardware_product_name,
+    hardware_version,
+    hardware_serial_number,
+    _create_date AS create_date,
+    _update_date AS update_date
+FROM vds_static;
+
+CREATE OR REPLACE VIEW dwh_host_configuration_history_view
+ AS
+SELECT *
+FROM dwh_host_configuration_full_check_view
+WHERE create_date > bench_last_sync() OR update_date > bench_last_sync();
+
+CREATE OR REPLACE VIEW dwh_host_interface_configuration_history_view
+ AS
+SELECT
+    id AS host_interface_id,
+    host_interface_name,
+    host_id,
+    host_interface_type,
+    host_interface_speed_bps,
+    mac_address,
+    logical_network_name,
+    ip_address,
+    gateway,
+    bond,
+    bond_name,
+    vlan_id,
+    _create_date AS create_date,
+    _update_date AS update_date
+FROM vds_interface
+WHERE _create_date > bench_last_sync() OR _update_date > bench_last_sync();
+
+CREATE OR REPLACE VIEW dwh_vm_configuration_history_view
+ AS
+SELECT
+    vm_guid AS vm_id,
+    vm_name,
+    vm_description,
+    vm_type,
+    cluster_id,
+    template_id,
+    template_name,
+    cpu_per_socket,
+    number_of_sockets,
+    memory_size_mb,
+    operating_system,
+    default_host,
+    high_availability,
+    initialized,
+    stateless,
+    fail_back,
+    usb_policy,
+    time_zone,
+    vm_pool_id,
+    vm_pool_name,
+    created_by_user_id,
+    _create_date AS create_date,
+    _update_date AS update_date
+FROM vm_static
+WHERE entity_type = 'VM' AND (
+    _create_date > bench_last_sync() OR _update_date > bench_last_sync()
+);
+
+CREATE OR REPLACE VIEW dwh_vm_disk_configuration_history_view
+ AS
+SELECT
+    disk_id AS vm_disk_id,
+    vm_disk_name,
+    vm_disk_description,
+    storage_domain_id,
+    vm_disk_size_mb,
+    vm_disk_type,
+    vm_disk_format,
+    is_shared,
+    _create_date AS create_date,
+    _update_date AS update_date
+FROM base_disks
+WHERE _create_date > bench_last_sync() OR _update_date > bench_last_sync();
+
+CREATE OR REPLACE VIEW dwh_vm_interface_configuration_history_view
+ AS
+SELECT
+    id AS vm_interface_id,
+    vm_interface_name,
+    vm_id,
+    vm_interface_type,
+    vm_interface_speed_bps,
+    mac_address,
+    logical_network_name,
+    _create_date AS create_date,
+    _update_date AS update_date
+FROM vm_interface
+WHERE _create_date > bench_last_sync() OR _update_date > bench_last_sync();
+
+CREATE OR REPLACE VIEW dwh_vm_device_history_view
+ AS
+SELECT
+    device_id,
+    vm_id,
+    type,
+    address,
+    is_managed,
+    is_plugged,
+    is_readonly,
+    _create_date AS create_date,
+    _update_date AS update_date
+FROM vm_device
+WHERE (
+    (type = 'disk' AND device = 'disk') OR type = 'interface'
+) AND (
+    _create_date > bench_last_sync() OR _update_date > bench_last_sync()
+);
+
+CREATE OR REPLACE VIEW dwh_users_history_view
+ AS
+SELECT
+    user_id,
+    first_name,
+    last_name,
+    domain,
+    username,
+    department,
+    user_role_title,
+    email,
+    external_id,
+    active,
+    _create_date AS create_date,
+    _update_date AS update_date
+FROM users
+WHERE _create_date > bench_last_sync() OR _update_date > bench_last_sync();
+
+CREATE OR REPLACE VIEW dwh_tags_details_history_view
+ AS
+SELECT
+    tag_id,
+    tag_name,
+    tag_description,
+    _create_date AS create_date,
+    _update_date AS update_date
+FROM tags
+WHERE _create_date > bench_last_sync() OR _update_date > bench_last_sync();
+
+CREATE OR REPLACE VIEW dwh_add_tags_relations_history_view
+ AS
+SELECT
+    entity_id,
+    entity_type,
+    parent_id,
+    attach_date,
+    move_date
+FROM tags_relations
+WHERE attach_date > bench_last_sync() OR move_date > bench_last_sync();
+
+CREATE OR REPLACE VIEW dwh_remove_tags_relations_history_view
+ AS
+SELECT
+    entity_id,
+    parent_id
+FROM tags_relations
+WHERE FALSE;
+
+-- Statistics views, returning the current values
+
+CREATE OR REPLACE VIEW dwh_storage_domain_history_view
+ AS
+SELECT
+    id AS storage_domain_id,
+    storage_domain_status,
+    available_disk_size_gb,
+    used_disk_size_gb
+FROM storage_domain_static;
+
+CREATE OR REPLACE VIEW dwh_host_history_view
+ AS
+SELECT
+    vds_id AS host_id,
+    host_status,
+    memory_usage_percent,
+    ksm_shared_memory_mb,
+    cpu_usage_percent,
+    ksm_cpu_percent,
+    cpu_load,
+    system_cpu_usage_percent,
+    user_cpu_usage_percent,
+    swap_used_mb,
+    vm_active,
+    total_vms,
+    total_vms_vcpus
+FROM vds_static;
+
+CREATE OR REPLACE VIEW dwh_host_interface_history_view
+ AS
+SELECT
+    id AS host_interface_id,
+    receive_rate_percent,
+    transmit_rate_percent,
+    received_total_byte,
+    transmitted_total_byte
+FROM vds_interface;
+
+CREATE OR REPLACE VIEW dwh_vm_history_view
+ AS
+SELECT
+    vm_guid AS vm_id,
+    vm_status,
+    cpu_usage_percent,
+    memory_usage_percent,
+    system_cpu_usage_percent,
+    user_cpu_usage_percent,
+    disks_usage,
+    vm_ip,
+    vm_client_ip,
+    current_user_id,
+    user_logged_in_to_guest,
+    currently_running_on_host,
+    memory_buffered_kb,
+    memory_cached_kb
+FROM vm_static
+WHERE entity_type = 'VM';
+
+CREATE OR REPLACE VIEW dwh_vm_interface_history_view
+ AS
+SELECT
+    id AS vm_interface_id,
+    receive_rate_percent,
+    transmit_rate_percent,
+    received_total_byte,
+    transmitted_total_byte
+FROM vm_interface;
+
+CREATE OR REPLACE VIEW dwh_vm_disks_history_view
+ AS
+SELECT
+    disk_id AS vm_disk_id,
+    image_id,
+    vm_disk_status,
+    vm_disk_actual_size_mb,
+    read_rate_bytes_per_second,
+    read_latency_seconds,
+    write_rate_bytes_per_second,
+    write_latency_seconds,
+    flush_latency_seconds
+FROM base_disks;
+
+CREATE OR REPLACE FUNCTION bench_id(v_kind VARCHAR, v_number INTEGER)
+RETURNS UUID IMMUTABLE
+AS $function$
+    SELECT md5(v_kind || ':' || v_number)::uuid
+$function$
+LANGUAGE sql;
+
+-- Generates the inventory: per datacenter a cluster and a storage domain,
+-- hosts with two interfaces and VMs spread over the clusters, every VM
+-- with v_disks disks and v_nics interfaces, running on a host of its
+-- cluster when there is one.
+CREATE OR REPLACE FUNCTION bench_populate(
+    v_datacenters INTEGER,
+    v_hosts INTEGER,
+    v_vms INTEGER,
+    v_disks INTEGER,
+    v_nics INTEGER,
+    v_dwh_uuid VARCHAR,
+    v_etl_version VARCHAR
+)
+RETURNS VOID
+AS $procedure$
+begin
+	INSERT INTO vdc_options (option_name, option_value) VALUES
+		('DisconnectDwh', '0'),
+		('MinimalETLVersion', v_etl_version);
+
+	INSERT INTO dwh_history_timekeeping (var_name, var_value, var_datetime) VALUES
+		('lastSync', NULL, '2000-01-01 00:00:00+00'),
+		('lastFullHostCheck', NULL, '2000-01-01 00:00:00+00'),
+		('lastOsinfoUpdate', NULL, now()),
+		('lastOsinfoSync', NULL, '2000-01-01 00:00:00+00'),
+		('heartBeat', NULL, now()),
+		('timesFailed', '0', NULL),
+		('lastErrorSent', NULL, '2000-01-01 00:00:00+00'),
+		('lastSampling', NULL, '2000-01-01 00:00:00+00'),
+		('DwhCurrentlyRunning', '0', NULL),
+		('dwhUuid', v_dwh_uuid, NULL),
+		('dwhHostname', 'benchmark', NULL);
+
+	INSERT INTO dwh_osinfo (os_id, os_name) VALUES
+		(0, 'Other OS'),
+		(1, 'Windows XP'),
+		(5, 'Other Linux'),
+		(24, 'Red Hat Enterprise Linux 7.x x64');
+
+	INSERT INTO users (user_id, first_name, last_name, domain, username, external_id, active) VALUES
+		(bench_id('user', 1), 'admin', '', 'internal-authz', 'admin', 'admin', true);
+
+	INSERT INTO tags (tag_id, tag_name, tag_description) VALUES
+		('00000000-0000-0000-0000-000000000000', 'root', 'root');
+
+	INSERT INTO storage_pool (id, datacenter_name, datacenter_description, is_local_storage)
+	SELECT bench_id('datacenter', i), 'dc' || i, 'datacenter ' || i, false
+	FROM generate_series(1, v_datacenters) i;
+
+	INSERT INTO cluster (cluster_id, cluster_name, cluster_description, datacenter_id, cpu_name, compatibility_version)
+	SELECT bench_id('cluster', i), 'cluster' || i, 'cluster ' || i, bench_id('datacenter', i),
+		'Intel Haswell Family', '4.3'
+	FROM generate_series(1, v_datacenters) i;
+
+	INSERT INTO storage_domain_static (
+		id, storage_domain_name, storage_domain_type, storage_type,
+		storage_domain_status, available_disk_size_gb, used_disk_size_gb
+	)
+	SELECT bench_id('storage_domain', i), 'data' || i, 0, 1, 3, 10000, 0
+	FROM generate_series(1, v_datacenters) i;
+
+	INSERT INTO storage_pool_iso_map (storage_id, storage_pool_id)
+	SELECT bench_id('storage_domain', i), bench_id('datacenter', i)
+	FROM generate_series(1, v_datacenters) i;
+
+	INSERT INTO vds_static (
+		vds_id, host_unique_id, host_name, cluster_id, host_type, fqdn_or_ip,
+		memory_size_mb, swap_size_mb, cpu_model, number_of_cores,
+		number_of_sockets, cpu_speed_mh, host_os, kernel_version,
+		kvm_version, vdsm_version, vdsm_port, threads_per_core,
+		hardware_manufacturer, hardware_product_name, hardware_version,
+		hardware_serial_number, host_status
+	)
+	SELECT bench_id('host', i), 'host-' || i, 'host' || i,
+		bench_id('cluster', (i - 1) % v_datacenters + 1), 0,
+		'host' || i || '.example.com', 262144, 8192, 'Intel Xeon', 32, 2,
+		2400, 'RHEL - 7.6', '3.10.0', '2.12.0', '4.30', 54321, 2,
+		'Vendor', 'Server', '1', 'SN' || i, 3
+	FROM generate_series(1, v_hosts) i;
+
+	INSERT INTO vds_interface (
+		id, host_interface_name, host_id, host_interface_type,
+		host_interface_speed_bps, mac_address, logical_network_name,
+		ip_address, gateway, bond, bond_name, vlan_id
+	)
+	SELECT bench_id('host_interface', (i - 1) * 2 + n), 'eth' || (n - 1),
+		bench_id('host', i), 0, 10000, '00:1a:4a:00:00:00',
+		'ovirtmgmt', '10.0.0.1', '10.0.0.254', false, NULL, NULL
+	FROM generate_series(1, v_hosts) i, generate_series(1, 2) n;
+
+	INSERT INTO vm_static (
+		vm_guid, vm_name, vm_description, vm_type, cluster_id, template_id,
+		template_name, cpu_per_socket, number_of_sockets, memory_size_mb,
+		operating_system, default_host, high_availability, initialized,
+		stateless, fail_back, usb_policy, time_zone, created_by_user_id,
+		vm_status, currently_running_on_host
+	)
+	SELECT bench_id('vm', i), 'vm' || i, 'vm ' || i, 1, vm.cluster_id,
+		'00000000-0000-0000-0000-000000000000', 'Blank', 1, 2, 4096, 24,
+		NULL, false, true, false, false, 1, 'Etc/GMT', bench_id('user', 1),
+		1, host.vds_id
+	FROM (
+		SELECT i, bench_id('cluster', (i - 1) % v_datacenters + 1) AS cluster_id
+		FROM generate_series(1, v_vms) i
+	) vm
+	LEFT JOIN LATERAL (
+		SELECT vds_id
+		FROM vds_static
+		WHERE vds_static.cluster_id = vm.cluster_id
+		ORDER BY vds_id
+		OFFSET (vm.i / v_datacenters) % greatest(1, v_hosts / v_datacenters)
+		LIMIT 1
+	) host ON true;
+
+	INSERT INTO base_disks (
+		disk_id, image_id, vm_disk_name, vm_disk_description,
+		storage_domain_id, vm_disk_size_mb, vm_disk_type, vm_disk_format,
+		is_shared, vm_disk_status, vm_disk_actual_size_mb
+	)
+	SELECT bench_id('disk', (i - 1) * v_disks + n), bench_id('image', (i - 1) * v_disks + n),
+		'vm' || i || '_disk' || n, '', bench_id('storage_domain', (i - 1) % v_datacenters + 1),
+		20480, 2, 4, false, 1, 2048
+	FROM generate_series(1, v_vms) i, generate_series(1, v_disks) n;
+
+	INSERT INTO vm_interface (
+		id, vm_interface_name, vm_id, vm_interface_type,
+		vm_interface_speed_bps, mac_address, logical_network_name
+	)
+	SELECT bench_id('vm_interface', (i - 1) * v_nics + n), 'nic' || n,
+		bench_id('vm', i), 3, 10000, '00:1a:4a:16:01:51', 'ovirtmgmt'
+	FROM generate_series(1, v_vms) i, generate_series(1, v_nics) n;
+
+	INSERT INTO vm_device (device_id, vm_id, type, device, address, is_managed, is_plugged, is_readonly)
+	SELECT bench_id('disk', (i - 1) * v_disks + n), bench_id('vm', i), 'disk', 'disk',
+		'{bus=0, controller=0, type=virtio}', true, true, false
+	FROM generate_series(1, v_vms) i, generate_series(1, v_disks) n
+	UNION ALL
+	SELECT bench_id('vm_interface', (i - 1) * v_nics + n), bench_id('vm', i), 'interface', 'bridge',
+		'{slot=0x03, bus=0x00, domain=0x0000, type=pci, function=0x0}', true, true, false
+	FROM generate_series(1, v_vms) i, generate_series(1, v_nics) n;
+
+	PERFORM bench_cycle(0);
+end; $procedure$
+LANGUAGE plpgsql;
+
+-- Moves the statistics on and, when v_change_percent is not 0, changes
+-- the configuration of about that percent of the hosts, VMs and disks,
+-- as the engine would between two sample cycles.
+CREATE OR REPLACE FUNCTION bench_cycle(v_change_percent INTEGER)
+RETURNS VOID
+AS $procedure$
+begin
+	UPDATE storage_domain_static SET
+		used_disk_size_gb = (
+			SELECT coalesce(sum(vm_disk_actual_size_mb), 0) / 1024
+			FROM base_disks
+			WHERE base_disks.storage_domain_id = storage_domain_static.id
+		),
+		available_disk_size_gb = 10000 - (
+			SELECT coalesce(sum(vm_disk_actual_size_mb), 0) / 1024
+			FROM base_disks
+			WHERE base_disks.storage_domain_id = storage_domain_static.id
+		);
+
+	UPDATE vds_static SET
+		memory_usage_percent = (random() * 100)::smallint,
+		ksm_shared_memory_mb = (random() * 1024)::bigint,
+		cpu_usage_percent = (random() * 100)::smallint,
+		ksm_cpu_percent = (random() * 5)::smallint,
+		cpu_load = (random() * 32)::integer,
+		system_cpu_usage_percent = (random() * 20)::smallint,
+		user_cpu_usage_percent = (random() * 80)::smallint,
+		swap_used_mb = (random() * 100)::integer,
+		vm_active = running.vms,
+		total_vms = running.vms,
+		total_vms_vcpus = running.vcpus
+	FROM (
+		SELECT
+			vds_id AS host_id,
+			count(vm_guid)::smallint AS vms,
+			coalesce(sum(cpu_per_socket * number_of_sockets), 0)::integer AS vcpus
+		FROM vds_static
+		LEFT JOIN vm_static ON vm_static.currently_running_on_host = vds_static.vds_id
+		GROUP BY vds_id
+	) running
+	WHERE vds_static.vds_id = running.host_id;
+
+	UPDATE vds_interface SET
+		receive_rate_percent = round((random() * 10)::numeric, 4),
+		transmit_rate_percent = round((random() * 10)::numeric, 4),
+		received_total_byte = received_total_byte + (random() * 1e9)::bigint,
+		transmitted_total_byte = transmitted_total_byte + (random() * 1e9)::bigint;
+
+	UPDATE vm_static SET
+		cpu_usage_percent = (random() * 100)::smallint,
+		memory_usage_percent = (random() * 100)::smallint,
+		system_cpu_usage_percent = (random() * 20)::smallint,
+		user_cpu_usage_percent = (random() * 80)::smallint,
+		disks_usage = '[{"path":"/","total":"21003583488","used":"' ||
+			(random() * 21003583488)::bigint || '","fs":"xfs"}]',
+		vm_ip = '10.' || (random() * 255)::integer || '.0.1',
+		current_user_id = created_by_user_id,
+		user_logged_in_to_guest = false,
+		memory_buffered_kb = (random() * 1048576)::bigint,
+		memory_cached_kb = (random() * 1048576)::bigint
+	WHERE entity_type = 'VM';
+
+	UPDATE vm_interface SET
+		receive_rate_percent = round((random() * 10)::numeric, 4),
+		transmit_rate_percent = round((random() * 10)::numeric, 4),
+		received_total_byte = received_total_byte + (random() * 1e8)::bigint,
+		transmitted_total_byte = transmitted_total_byte + (random() * 1e8)::bigint;
+
+	UPDATE base_disks SET
+		vm_disk_actual_size_mb = least(vm_disk_size_mb, vm_disk_actual_size_mb + (random() * 10)::integer),
+		read_rate_bytes_per_second = (random() * 1e7)::integer,
+		read_latency_seconds = round((random() * 0.01)::numeric, 9),
+		write_rate_bytes_per_second = (random() * 1e7)::integer,
+		write_latency_seconds = round((random() * 0.01)::numeric, 9),
+		flush_latency_seconds = round((random() * 0.001)::numeric, 9);
+
+	IF v_change_percent > 0 THEN
+		UPDATE vds_static SET
+			vdsm_version = '4.30.' || (random() * 100)::integer,
+			_update_date = now()
+		WHERE random() * 100 < v_change_percent;
+
+		UPDATE vm_static SET
+			memory_size_mb = CASE WHEN memory_size_mb = 4096 THEN 8192 ELSE 4096 END,
+			_update_date = now()
+		WHERE entity_type = 'VM' AND random() * 100 < v_change_percent;
+
+		UPDATE base_disks SET
+			vm_disk_size_mb = vm_disk_size_mb + 1024,
+			_update_date = now()
+		WHERE random() * 100 < v_change_percent;
+	END IF;
+
+	UPDATE dwh_history_timekeeping SET var_datetime = now()
+	WHERE var_name = 'heartBeat';
+end; $procedure$
+LANGUAGE plpgsql;
@@ -0,0 +1,250 @@
+/**************************************
+    VIEWS BENCHMARK QUERIES
+**************************************/
+
+-- Representative queries of the reporting tools and of the engine
+-- dashboard on the public v4_3 views, run by dwh-benchmark-views.
+--
+-- Every query starts with a "-- query: NAME" line, NAME being the view
+-- it mostly exercises, followed by a suffix when a view has several
+-- queries. bench_views_end() is the end of the generated history, the
+-- queries use it where the tools use now().
+
+-- query: v4_3_statistics_hosts_resources_usage_samples
+SELECT
+    conf.host_name,
+    avg(stats.cpu_usage_percent) AS cpu_usage_percent,
+    avg(stats.memory_usage_percent) AS memory_usage_percent
+FROM v4_3_statistics_hosts_resources_usage_samples AS stats
+    JOIN v4_3_latest_configuration_hosts AS conf
+        ON (conf.host_id = stats.host_id)
+WHERE stats.history_datetime >= bench_views_end() - interval '1 hour'
+GROUP BY conf.host_name
+ORDER BY cpu_usage_percent DESC;
+
+-- query: v4_3_statistics_hosts_resources_usage_hourly
+SELECT
+    stats.history_datetime,
+    conf.cluster_id,
+    avg(stats.cpu_usage_percent) AS cpu_usage_percent,
+    max(stats.max_cpu_usage) AS max_cpu_usage,
+    avg(stats.memory_usage_percent) AS memory_usage_percent
+FROM v4_3_statistics_hosts_resources_usage_hourly AS stats
+    JOIN v4_3_latest_configuration_hosts AS conf
+        ON (conf.host_id = stats.host_id)
+WHERE stats.history_datetime >= bench_views_end() - interval '1 day'
+    AND stats.host_status = 3
+GROUP BY stats.history_datetime, conf.cluster_id
+ORDER BY stats.history_datetime;
+
+-- query: v4_3_statistics_vms_resources_usage_hourly
+SELECT
+    conf.vm_name,
+    avg(stats.cpu_usage_percent) AS cpu_usage_percent,
+    max(stats.max_cpu_usage) AS max_cpu_usage
+FROM v4_3_statistics_vms_resources_usage_hourly AS stats
+    JOIN v4_3_latest_configuration_vms AS conf
+        ON (conf.vm_id = stats.vm_id)
+WHERE stats.history_datetime >= bench_views_end() - interval '7 days'
+    AND stats.vm_status = 1
+GROUP BY conf.vm_name
+ORDER BY cpu_usage_percent DESC
+LIMIT 10;
+
+-- query: v4_3_enum_translator
+SELECT
+    status.value AS vm_status,
+    count(*) AS samples,
+    avg(stats.cpu_usage_percent) AS cpu_usage_percent
+FROM v4_3_statistics_vms_resources_usage_hourly AS stats
+    JOIN v4_3_enum_translator AS status
+        ON (status.enum_type = 'VM_STATUS'
+            AND status.enum_key = stats.vm_status)
+WHERE stats.history_datetime >= bench_views_end() - interval '1 month'
+GROUP BY status.value
+ORDER BY status.value;
+
+-- query: v4_3_statistics_vms_resources_usage_daily
+SELECT
+    clusters.cluster_name,
+    stats.history_datetime,
+    avg(stats.cpu_usage_percent) AS cpu_usage_percent,
+    avg(stats.memory_usage_percent) AS memory_usage_percent
+FROM v4_3_statistics_vms_resources_usage_daily AS stats
+    JOIN v4_3_latest_configuration_vms AS conf
+        ON (conf.vm_id = stats.vm_id)
+    JOIN v4_3_latest_configuration_clusters AS clusters
+        ON (clusters.cluster_id = conf.cluster_id)
+WHERE stats.history_datetime >= bench_views_end() - interval '1 month'
+GROUP BY clusters.cluster_name, stats.history_datetime
+ORDER BY clusters.cluster_name, stats.history_datetime;
+
+-- query: v4_3_statistics_vms_users_usage_daily
+SELECT
+    users.username,
+    count(DISTINCT stats.vm_id) AS vms,
+    sum(stats.session_time_in_minutes) AS session_time_in_minutes
+FROM v4_3_statistics_vms_users_usage_daily AS stats
+    JOIN v4_3_latest_users_details AS users
+        ON (users.user_id = stats.user_id)
+WHERE stats.history_datetime >= bench_views_end() - interval '1 month'
+GROUP BY users.username
+ORDER BY session_time_in_minutes DESC;
+
+-- query: v4_3_statistics_vms_disks_resources_usage_hourly
+SELECT
+    disks.vm_disk_name,
+    avg(stats.read_latency_seconds) AS read_latency_seconds,
+    avg(stats.write_latency_seconds) AS write_latency_seconds
+FROM v4_3_statistics_vms_disks_resources_usage_hourly AS stats
+    JOIN v4_3_latest_configuration_vms_disks AS disks
+        ON (disks.vm_disk_id = stats.vm_disk_id)
+WHERE stats.history_datetime >= bench_views_end() - interval '1 day'
+GROUP BY disks.vm_disk_name
+ORDER BY write_latency_seconds DESC
+LIMIT 10;
+
+-- query: v4_3_statistics_hosts_interfaces_resources_usage_hourly
+SELECT
+    stats.history_datetime,
+    sum(stats.receive_rate_percent) AS receive_rate_percent,
+    sum(stats.transmit_rate_percent) AS transmit_rate_percent
+FROM v4_3_statistics_hosts_interfaces_resources_usage_hourly AS stats
+    JOIN v4_3_latest_configuration_hosts_interfaces AS nics
+        ON (nics.host_interface_id = stats.host_interface_id)
+WHERE stats.history_datetime >= bench_views_end() - interval '1 day'
+GROUP BY stats.history_datetime
+ORDER BY stats.history_datetime;
+
+-- query: v4_3_statistics_storage_domains_resources_usage_daily
+SELECT
+    domains.storage_domain_name,
+    stats.history_datetime,
+    stats.used_disk_size_gb,
+    stats.available_disk_size_gb
+FROM v4_3_statistics_storage_domains_resources_usage_daily AS stats
+    JOIN v4_3_latest_configuration_storage_domains AS domains
+        ON (domains.storage_domain_id = stats.storage_domain_id)
+    JOIN v4_3_latest_map_datacenters_storage_domains AS map
+        ON (map.storage_domain_id = domains.storage_domain_id)
+WHERE stats.history_datetime >= bench_views_end() - interval '3 months'
+ORDER BY domains.storage_domain_name, stats.history_datetime;
+
+-- query: v4_3_fully_joined_statistics_hosts_resources_usage_daily
+SELECT
+    host_name,
+    history_datetime,
+    cpu_usage_percent,
+    memory_usage_percent,
+    host_interface_name,
+    receive_rate_percent,
+    transmit_rate_percent
+FROM v4_3_fully_joined_statistics_hosts_resources_usage_daily
+WHERE host_id = bench_id('host', 1)
+    AND history_datetime >= bench_views_end() - interval '1 month'
+ORDER BY history_datetime, host_interface_name;
+
+-- query: v4_3_fully_joined_statistics_vms_resources_usage_hourly
+SELECT
+    vm_name,
+    history_datetime,
+    cpu_usage_percent,
+    memory_usage_percent,
+    vm_disk_name,
+    read_rate_bytes_per_second,
+    vm_interface_name,
+    receive_rate_percent
+FROM v4_3_fully_joined_statistics_vms_resources_usage_hourly
+WHERE vm_id = bench_id('vm', 1)
+    AND history_datetime >= bench_views_end() - interval '1 day'
+ORDER BY history_datetime;
+
+-- query: v4_3_mv_fully_joined_statistics_hosts_resources_usage_daily
+SELECT
+    host_name,
+    history_datetime,
+    cpu_usage_percent,
+    memory_usage_percent,
+    host_interface_name,
+    receive_rate_percent,
+    transmit_rate_percent
+FROM v4_3_mv_fully_joined_statistics_hosts_resources_usage_daily
+WHERE host_id = bench_id('host', 1)
+    AND history_datetime >= bench_views_end() - interval '1 month'
+ORDER BY history_datetime, host_interface_name;
+
+-- query: v4_3_mv_fully_joined_statistics_vms_resources_usage_hourly
+SELECT
+    vm_name,
+    history_datetime,
+    cpu_usage_percent,
+    memory_usage_percent,
+    vm_disk_name,
+    read_rate_bytes_per_second,
+    vm_interface_name,
+    receive_rate_percent
+FROM v4_3_mv_fully_joined_statistics_vms_resources_usage_hourly
+WHERE vm_id = bench_id('vm', 1)
+    AND history_datetime >= bench_views_end() - interval '1 day'
+ORDER BY history_datetime;
+
+-- query: dashboard_cluster_usage_buckets_hourly
+SELECT
+    buckets.cluster_id,
+    buckets.resource,
+    buckets.bucket,
+    sum(buckets.entities) AS entities
+FROM dashboard_cluster_usage_buckets_hourly AS buckets
+WHERE buckets.history_datetime >= bench_views_end() - interval '1 day'
+    AND buckets.entity_type = 3
+GROUP BY buckets.cluster_id, buckets.resource, buckets.bucket
+ORDER BY buckets.cluster_id, buckets.resource, buckets.bucket;
+
+-- query: dashboard_top_vms_hourly
+SELECT
+    top.vm_id,
+    max(top.usage_percent) AS usage_percent
+FROM dashboard_top_vms_hourly AS top
+WHERE top.history_datetime >= bench_views_end() - interval '1 day'
+    AND top.resource = 'cpu'
+GROUP BY top.vm_id
+ORDER BY usage_percent DESC
+LIMIT 10;
+
+-- query: v4_3_configuration_history_vms
+SELECT
+    conf.vm_name,
+    count(*) AS versions,
+    max(conf.update_date) AS last_update
+FROM v4_3_configuration_history_vms AS conf
+GROUP BY conf.vm_name
+ORDER BY last_update DESC NULLS LAST
+LIMIT 20;
+
+-- query: v4_3_latest_tags_relations
+SELECT
+    tags.tag_name,
+    count(*) FILTER (WHERE relations.entity_type = 2) AS vms,
+    count(*) FILTER (WHERE relations.entity_type = 3) AS hosts
+FROM v4_3_latest_tags_relations AS relations
+    JOIN v4_3_latest_tags_details AS tags
+        ON (tags.tag_id = relations.parent_id)
+GROUP BY tags.tag_name
+ORDER BY tags.tag_name;
+
+-- query: v4_3_latest_tags_hierarchy
+SELECT
+    tags.tag_name,
+    count(DISTINCT relations.entity_id) AS vms
+FROM v4_3_latest_tags_hierarchy AS children
+    JOIN v4_3_latest_tags_details AS tags
+        ON (tags.tag_id = children.descendant_tag_id)
+    JOIN v4_3_latest_tags_hierarchy AS subtree
+        ON (subtree.ancestor_tag_id = children.descendant_tag_id)
+    JOIN v4_3_latest_tags_relations AS relations
+        ON (relations.parent_id = subtree.descendant_tag_id)
+WHERE children.ancestor_tag_id = '00000000-0000-0000-0000-000000000000'
+    AND children.depth = 1
+    AND relations.entity_type = 2
+GROUP BY tags.tag_name
+ORDER BY tags.tag_name;
@@ -0,0 +1,647 @@
+/**************************************
+    VIEWS BENCHMARK DATA
+**************************************/
+
+-- A deterministic history of several months, generated in an empty
+-- history database by bench_views_populate() for dwh-benchmark-views,
+-- to run the reporting and dashboard queries of view-queries.sql on.
+--
+-- Uses bench_id(), bench_hash() and bench_percent() of
+-- aggregation-data.sql. Every entity gets a new configuration version
+-- every week, its hourly and daily rows refer to the version of their
+-- week. Samples are generated for the last day only, as the samples
+-- retention keeps them.
+--
+-- Times are formatted into the keys, the session time zone must be UTC.
+
+CREATE OR REPLACE FUNCTION bench_views_start()
+RETURNS TIMESTAMP WITH TIME ZONE IMMUTABLE
+AS $function$
+    SELECT '2020-01-01 00:00:00+00'::timestamp with time zone
+$function$
+LANGUAGE sql;
+
+CREATE OR REPLACE FUNCTION bench_views_end()
+RETURNS TIMESTAMP WITH TIME ZONE STABLE
+AS $function$
+    SELECT var_datetime
+    FROM history_configuration
+    WHERE var_name = 'lastHourAggr'
+$function$
+LANGUAGE sql;
+
+CREATE OR REPLACE FUNCTION bench_week(v_time TIMESTAMP WITH TIME ZONE)
+RETURNS INTEGER IMMUTABLE
+AS $function$
+    SELECT floor(extract(epoch FROM v_time - bench_views_start()) / 604800)::integer
+$function$
+LANGUAGE sql;
+
+-- Generates, for v_vms VMs, a tenth of the hosts with two interfaces
+-- each, a datacenter with a cluster and two storage domains per ten
+-- hosts, one disk and one interface per VM, and seven users, with the
+-- hourly and daily rows of v_months months from bench_views_start() and
+-- the samples, every v_sampling seconds, of their last day.
+CREATE OR REPLACE FUNCTION bench_views_populate(
+    v_vms INTEGER,
+    v_months INTEGER,
+    v_sampling INTEGER
+)
+RETURNS VOID
+AS $procedure$
+declare
+	v_hosts INTEGER := greatest(v_vms / 10, 1);
+	v_datacenters INTEGER := greatest(v_hosts / 10, 1);
+	v_end TIMESTAMP WITH TIME ZONE := bench_views_start() + v_months * interval '1 month';
+	v_weeks INTEGER := bench_week(v_end - interval '1 hour') + 1;
+begin
+	CREATE TEMPORARY TABLE bench_hours ON COMMIT DROP AS
+	SELECT t AS history_datetime, bench_week(t) AS week
+	FROM generate_series(bench_views_start(), v_end - interval '1 hour', interval '1 hour') t;
+
+	CREATE TEMPORARY TABLE bench_days ON COMMIT DROP AS
+	SELECT t AS history_datetime, bench_week(t) AS week
+	FROM generate_series(bench_views_start(), v_end - interval '1 day', interval '1 day') t;
+
+	CREATE TEMPORARY TABLE bench_samples ON COMMIT DROP AS
+	SELECT t AS history_datetime, bench_week(t) AS week
+	FROM generate_series(
+		v_end - interval '1 day',
+		v_end - v_sampling * interval '1 second',
+		v_sampling * interval '1 second'
+	) t;
+
+	-- the configuration versions, one per entity and week
+	CREATE TEMPORARY TABLE bench_versions ON COMMIT DROP AS
+	SELECT kind, number, week, nextval('configuration_seq')::integer AS history_id
+	FROM (
+		SELECT 'datacenter'::varchar AS kind, generate_series(1, v_datacenters) AS number
+		UNION ALL SELECT 'cluster', generate_series(1, v_datacenters)
+		UNION ALL SELECT 'storage_domain', generate_series(1, v_datacenters * 2)
+		UNION ALL SELECT 'host', generate_series(1, v_hosts)
+		UNION ALL SELECT 'host_interface', generate_series(1, v_hosts * 2)
+		UNION ALL SELECT 'vm', generate_series(1, v_vms)
+		UNION ALL SELECT 'vm_interface', generate_series(1, v_vms)
+		UNION ALL SELECT 'disk', generate_series(1, v_vms)
+	) entities
+	CROSS JOIN generate_series(0, v_weeks - 1) week
+	ORDER BY week, kind, number;
+	CREATE UNIQUE INDEX ON bench_versions (kind, number, week);
+	ANALYZE bench_versions;
+
+	-- configuration
+
+	INSERT INTO datacenter_configuration (
+		history_id, datacenter_id, datacenter_name, datacenter_description,
+		is_local_storage, create_date, update_date
+	)
+	SELECT v.history_id, bench_id('datacenter', v.number), 'dc' || v.number,
+		'datacenter ' || v.number, false, bench_views_start(),
+		CASE WHEN v.week > 0 THEN bench_views_start() + v.week * interval '1 week' END
+	FROM bench_versions v
+	WHERE v.kind = 'datacenter';
+
+	INSERT INTO cluster_configuration (
+		history_id, cluster_id, cluster_name, cluster_description,
+		datacenter_id, cpu_name, compatibility_version,
+		datacenter_configuration_version, create_date, update_date
+	)
+	SELECT v.history_id, bench_id('cluster', v.number), 'cluster' || v.number,
+		'cluster ' || v.number, bench_id('datacenter', v.number),
+		'Intel Haswell Family', '4.3', dc.history_id, bench_views_start(),
+		CASE WHEN v.week > 0 THEN bench_views_start() + v.week * interval '1 week' END
+	FROM bench_versions v
+	JOIN bench_versions dc ON dc.kind = 'datacenter' AND dc.number = v.number AND dc.week = v.week
+	WHERE v.kind = 'cluster';
+
+	INSERT INTO storage_domain_configuration (
+		history_id, storage_domain_id, storage_domain_name,
+		storage_domain_type, storage_type, create_date, update_date
+	)
+	SELECT v.history_id, bench_id('storage_domain', v.number), 'data' || v.number,
+		0, 1, bench_views_start(),
+		CASE WHEN v.week > 0 THEN bench_views_start() + v.week * interval '1 week' END
+	FROM bench_versions v
+	WHERE v.kind = 'storage_domain';
+
+	INSERT INTO datacenter_storage_domain_map (storage_domain_id, datacenter_id, attach_date)
+	SELECT bench_id('storage_domain', i), bench_id('datacenter', (i - 1) % v_datacenters + 1),
+		bench_views_start()
+	FROM generate_series(1, v_datacenters * 2) i;
+
+	INSERT INTO host_configuration (
+		history_id, host_id, host_unique_id, host_name, cluster_id,
+		host_type, fqdn_or_ip, memory_size_mb, swap_size_mb, cpu_model,
+		number_of_cores, number_of_sockets, cpu_speed_mh, host_os,
+		kernel_version, kvm_version, vdsm_version, vdsm_port,
+		threads_per_core, cluster_configuration_version, create_date,
+		update_date
+	)
+	SELECT v.history_id, bench_id('host', v.number), 'host-' || v.number,
+		'host' || v.number, bench_id('cluster', (v.number - 1) % v_datacenters + 1),
+		0, 'host' || v.number || '.example.com', 262144, 8192, 'Intel Xeon',
+		32, 2, 2400, 'RHEL - 7.6', '3.10.0', '2.12.0', '4.30', 54321, 2,
+		cluster.history_id, bench_views_start(),
+		CASE WHEN v.week > 0 THEN bench_views_start() + v.week * interval '1 week' END
+	FROM bench_versions v
+	JOIN bench_versions cluster
+		ON cluster.kind = 'cluster'
+		AND cluster.number = (v.number - 1) % v_datacenters + 1
+		AND cluster.week = v.week
+	WHERE v.kind = 'host';
+
+	INSERT INTO host_interface_configuration (
+		history_id, host_interface_id, host_interface_name, host_id,
+		host_interface_type, host_interface_speed_bps, mac_address,
+		logical_network_name, ip_address, gateway, bond,
+		host_configuration_version, create_date, update_date
+	)
+	SELECT v.history_id, bench_id('host_interface', v.number),
+		'eth' || ((v.number - 1) % 2), bench_id('host', (v.number - 1) / 2 + 1),
+		0, 10000, '00:1a:4a:00:00:00', 'ovirtmgmt', '10.0.0.1',
+		'10.0.0.254', false, host.history_id, bench_views_start(),
+		CASE WHEN v.week > 0 THEN bench_views_start() + v.week * interval '1 week' END
+	FROM bench_versions v
+	JOIN bench_versions host
+		ON host.kind = 'host'
+		AND host.number = (v.number - 1) / 2 + 1
+		AND host.week = v.week
+	WHERE v.kind = 'host_interface';
+
+	INSERT INTO vm_configuration (
+		history_id, vm_id, vm_name, vm_description, vm_type, cluster_id,
+		template_id, template_name, cpu_per_socket, number_of_sockets,
+		memory_size_mb, operating_system, high_availability, initialized,
+		stateless, fail_back, usb_policy, time_zone, created_by_user_id,
+		cluster_configuration_version, default_host_configuration_version,
+		create_date, update_date
+	)
+	SELECT v.history_id, bench_id('vm', v.number), 'vm' || v.number,
+		'vm ' || v.number, 1,
+		bench_id('cluster', (v.number - 1) % v_datacenters + 1),
+		'00000000-0000-0000-0000-000000000000', 'Blank', 1, 2, 4096, 24,
+		false, true, false, false, 1, 'Etc/GMT', bench_id('user', 1),
+		cluster.history_id, host.history_id, bench_views_start(),
+		CASE WHEN v.week > 0 THEN bench_views_start() + v.week * interval '1 week' END
+	FROM bench_versions v
+	JOIN bench_versions cluster
+		ON cluster.kind = 'cluster'
+		AND cluster.number = (v.number - 1) % v_datacenters + 1
+		AND cluster.week = v.week
+	JOIN bench_versions host
+		ON host.kind = 'host'
+		AND host.number = (v.number - 1) % v_hosts + 1
+		AND host.week = v.week
+	WHERE v.kind = 'vm';
+
+	INSERT INTO vm_interface_configuration (
+		history_id, vm_interface_id, vm_interface_name, vm_id,
+		vm_interface_type, vm_interface_speed_bps, mac_address,
+		logical_network_name, vm_configuration_version, create_date,
+		update_date
+	)
+	SELECT v.history_id, bench_id('vm_interface', v.number), 'nic1',
+		bench_id('vm', v.number), 3, 10000, '00:1a:4a:16:01:51', 'ovirtmgmt',
+		vm.history_id, bench_views_start(),
+		CASE WHEN v.week > 0 THEN bench_views_start() + v.week * interval '1 week' END
+	FROM bench_versions v
+	JOIN bench_versions vm ON vm.kind = 'vm' AND vm.number = v.number AND vm.week = v.week
+	WHERE v.kind = 'vm_interface';
+
+	INSERT INTO vm_disk_configuration (
+		history_id, vm_disk_id, image_id, storage_domain_id,
+		vm_disk_description, vm_disk_name, vm_disk_size_mb, vm_disk_type,
+		vm_disk_format, is_shared, create_date, update_date
+	)
+	SELECT v.history_id, bench_id('disk', v.number), bench_id('image', v.number),
+		bench_id('storage_domain', (v.number - 1) % (v_datacenters * 2) + 1),
+		'', 'vm' || v.number || '_disk1', 20480, 2, 4, false,
+		bench_views_start(),
+		CASE WHEN v.week > 0 THEN bench_views_start() + v.week * interval '1 week' END
+	FROM bench_versions v
+	WHERE v.kind = 'disk';
+
+	INSERT INTO vm_device_history (
+		vm_id, device_id, type, address, is_managed, is_plugged,
+		is_readonly, vm_configuration_version, device_configuration_version,
+		create_date
+	)
+	SELECT bench_id('vm', vm.number), bench_id('disk', vm.number), 'disk',
+		'{bus=0, controller=0, type=virtio}', true, true, false,
+		vm.history_id, disk.history_id, bench_views_start() + vm.week * interval '1 week'
+	FROM bench_versions vm
+	JOIN bench_versions disk ON disk.kind = 'disk' AND disk.number = vm.number AND disk.week = vm.week
+	WHERE vm.kind = 'vm'
+	UNION ALL
+	SELECT bench_id('vm', vm.number), bench_id('vm_interface', vm.number), 'interface',
+		'{slot=0x03, bus=0x00, domain=0x0000, type=pci, function=0x0}', true, true, false,
+		vm.history_id, nic.history_id, bench_views_start() + vm.week * interval '1 week'
+	FROM bench_versions vm
+	JOIN bench_versions nic ON nic.kind = 'vm_interface' AND nic.number = vm.number AND nic.week = vm.week
+	WHERE vm.kind = 'vm';
+
+	INSERT INTO users_details_history (
+		user_id, first_name, last_name, domain, username, external_id,
+		active, create_date
+	)
+	SELECT bench_id('user', i), 'user' || i, '', 'internal-authz', 'user' || i,
+		convert_to('user' || i, 'UTF8'), true, bench_views_start()
+	FROM generate_series(1, 7) i;
+
+	INSERT INTO tag_details (
+		tag_id, tag_name, tag_description, tag_path, tag_level, create_date
+	)
+	SELECT '00000000-0000-0000-0000-000000000000', 'root', 'root',
+		'/00000000-0000-0000-0000-000000000000', 0, bench_views_start()
+	UNION ALL
+	SELECT bench_id('tag', i), 'tag' || i, 'tag of datacenter ' || i,
+		'/00000000-0000-0000-0000-000000000000/' || bench_id('tag', i), 1,
+		bench_views_start()
+	FROM generate_series(1, v_datacenters) i;
+
+	INSERT INTO tag_relations_history (entity_id, entity_type, parent_id, attach_date)
+	SELECT bench_id('tag', i), 18, '00000000-0000-0000-0000-000000000000', bench_views_start()
+	FROM generate_series(1, v_datacenters) i
+	UNION ALL
+	SELECT bench_id('host', i), 3, bench_id('tag', (i - 1) % v_datacenters + 1), bench_views_start()
+	FROM generate_series(1, v_hosts) i
+	UNION ALL
+	SELECT bench_id('vm', i), 2, bench_id('tag', (i - 1) % v_datacenters + 1), bench_views_start()
+	FROM generate_series(1, v_vms) i;
+
+	-- statistics
+
+	INSERT INTO host_hourly_history (
+		history_datetime, host_id, host_status, minutes_in_status,
+		memory_usage_percent, max_memory_usage, ksm_shared_memory_mb,
+		max_ksm_shared_memory_mb, cpu_usage_percent, max_cpu_usage,
+		ksm_cpu_percent, max_ksm_cpu_percent, active_vms, max_active_vms,
+		total_vms, max_total_vms, total_vms_vcpus, max_total_vms_vcpus,
+		cpu_load, max_cpu_load, system_cpu_usage_percent,
+		max_system_cpu_usage_percent, user_cpu_usage_percent,
+		max_user_cpu_usage_percent, swap_used_mb, max_swap_used_mb,
+		host_configuration_version
+	)
+	SELECT h.history_datetime, bench_id('host', v.number), 3, 60,
+		bench_percent('memory', v.number, h.history_datetime) / 2, bench_percent('memory', v.number, h.history_datetime),
+		1024, 2048,
+		bench_percent('cpu', v.number, h.history_datetime) / 2, bench_percent('cpu', v.number, h.history_datetime),
+		0, 0, 10, 10, 10, 10, 20, 20, 8, 16,
+		bench_percent('system_cpu', v.number, h.history_datetime) / 4, bench_percent('system_cpu', v.number, h.history_datetime) / 2,
+		bench_percent('user_cpu', v.number, h.history_datetime) / 4, bench_percent('user_cpu', v.number, h.history_datetime) / 2,
+		0, 0, v.history_id
+	FROM bench_hours h
+	JOIN bench_versions v ON v.kind = 'host' AND v.week = h.week;
+
+	INSERT INTO host_daily_history (
+		history_datetime, host_id, host_status, minutes_in_status,
+		memory_usage_percent, max_memory_usage, ksm_shared_memory_mb,
+		max_ksm_shared_memory_mb, cpu_usage_percent, max_cpu_usage,
+		ksm_cpu_percent, max_ksm_cpu_percent, active_vms, max_active_vms,
+		total_vms, max_total_vms, total_vms_vcpus, max_total_vms_vcpus,
+		cpu_load, max_cpu_load, system_cpu_usage_percent,
+		max_system_cpu_usage_percent, user_cpu_usage_percent,
+		max_user_cpu_usage_percent, swap_used_mb, max_swap_used_mb,
+		host_configuration_version
+	)
+	SELECT d.history_datetime, bench_id('host', v.number), 3, 1440,
+		bench_percent('memory', v.number, d.history_datetime) / 2, bench_percent('memory', v.number, d.history_datetime),
+		1024, 2048,
+		bench_percent('cpu', v.number, d.history_datetime) / 2, bench_percent('cpu', v.number, d.history_datetime),
+		0, 0, 10, 10, 10, 10, 20, 20, 8, 16,
+		bench_percent('system_cpu', v.number, d.history_datetime) / 4, bench_percent('system_cpu', v.number, d.history_datetime) / 2,
+		bench_percent('user_cpu', v.number, d.history_datetime) / 4, bench_percent('user_cpu', v.number, d.history_datetime) / 2,
+		0, 0, v.history_id
+	FROM bench_days d
+	JOIN bench_versions v ON v.kind = 'host' AND v.week = d.week;
+
+	INSERT INTO host_samples_history (
+		history_datetime, host_id, host_status, seconds_in_status,
+		memory_usage_percent, ksm_shared_memory_mb, cpu_usage_percent,
+		ksm_cpu_percent, active_vms, total_vms, total_vms_vcpus, cpu_load,
+		system_cpu_usage_percent, user_cpu_usage_percent, swap_used_mb,
+		host_configuration_version
+	)
+	SELECT s.history_datetime, bench_id('host', v.number), 3, v_sampling,
+		bench_percent('memory', v.number, s.history_datetime), 1024,
+		bench_percent('cpu', v.number, s.history_datetime), 0, 10, 10, 20, 8,
+		bench_percent('system_cpu', v.number, s.history_datetime) / 2,
+		bench_percent('user_cpu', v.number, s.history_datetime) / 2,
+		0, v.history_id
+	FROM bench_samples s
+	JOIN bench_versions v ON v.kind = 'host' AND v.week = s.week;
+
+	INSERT INTO host_interface_hourly_history (
+		history_datetime, host_interface_id, receive_rate_percent,
+		max_receive_rate_percent, transmit_rate_percent,
+		max_transmit_rate_percent, host_interface_configuration_version,
+		received_total_byte, transmitted_total_byte
+	)
+	SELECT h.history_datetime, bench_id('host_interface', v.number),
+		bench_percent('rx', v.number, h.history_datetime) / 2, bench_percent('rx', v.number, h.history_datetime),
+		bench_percent('tx', v.number, h.history_datetime) / 2, bench_percent('tx', v.number, h.history_datetime),
+		v.history_id,
+		extract(epoch FROM h.history_datetime - bench_views_start())::bigint * 1000,
+		extract(epoch FROM h.history_datetime - bench_views_start())::bigint * 500
+	FROM bench_hours h
+	JOIN bench_versions v ON v.kind = 'host_interface' AND v.week = h.week;
+
+	INSERT INTO host_interface_daily_history (
+		history_datetime, host_interface_id, receive_rate_percent,
+		max_receive_rate_percent, transmit_rate_percent,
+		max_transmit_rate_percent, host_interface_configuration_version,
+		received_total_byte, transmitted_total_byte
+	)
+	SELECT d.history_datetime, bench_id('host_interface', v.number),
+		bench_percent('rx', v.number, d.history_datetime) / 2, bench_percent('rx', v.number, d.history_datetime),
+		bench_percent('tx', v.number, d.history_datetime) / 2, bench_percent('tx', v.number, d.history_datetime),
+		v.history_id,
+		extract(epoch FROM d.history_datetime - bench_views_start())::bigint * 1000,
+		extract(epoch FROM d.history_datetime - bench_views_start())::bigint * 500
+	FROM bench_days d
+	JOIN bench_versions v ON v.kind = 'host_interface' AND v.week = d.week;
+
+	INSERT INTO host_interface_samples_history (
+		history_datetime, host_interface_id, receive_rate_percent,
+		transmit_rate_percent, host_interface_configuration_version,
+		received_total_byte, transmitted_total_byte
+	)
+	SELECT s.history_datetime, bench_id('host_interface', v.number),
+		bench_percent('rx', v.number, s.history_datetime),
+		bench_percent('tx', v.number, s.history_datetime),
+		v.history_id,
+		extract(epoch FROM s.history_datetime - bench_views_start())::bigint * 1000,
+		extract(epoch FROM s.history_datetime - bench_views_start())::bigint * 500
+	FROM bench_samples s
+	JOIN bench_versions v ON v.kind = 'host_interface' AND v.week = s.week;
+
+	INSERT INTO vm_hourly_history (
+		history_datetime, vm_id, vm_status, minutes_in_status,
+		cpu_usage_percent, max_cpu_usage, memory_usage_percent,
+		max_memory_usage, user_cpu_usage_percent, max_user_cpu_usage_percent,
+		system_cpu_usage_percent, max_system_cpu_usage_percent, vm_ip,
+		current_user_id, currently_running_on_host, vm_configuration_version,
+		current_host_configuration_version, memory_buffered_kb,
+		max_memory_buffered_kb, memory_cached_kb, max_memory_cached_kb
+	)
+	SELECT h.history_datetime, bench_id('vm', v.number), 1, 60,
+		bench_percent('cpu', v.number, h.history_datetime) / 2, bench_percent('cpu', v.number, h.history_datetime),
+		bench_percent('memory', v.number, h.history_datetime) / 2, bench_percent('memory', v.number, h.history_datetime),
+		bench_percent('user_cpu', v.number, h.history_datetime) / 4, bench_percent('user_cpu', v.number, h.history_datetime) / 2,
+		bench_percent('system_cpu', v.number, h.history_datetime) / 4, bench_percent('system_cpu', v.number, h.history_datetime) / 2,
+		'10.1.' || (v.number / 256) || '.' || (v.number % 256),
+		bench_id('user', v.number % 7 + 1), bench_id('host', (v.number - 1) % v_hosts + 1),
+		v.history_id, host.history_id, 262144, 524288, 262144, 524288
+	FROM bench_hours h
+	JOIN bench_versions v ON v.kind = 'vm' AND v.week = h.week
+	JOIN bench_versions host
+		ON host.kind = 'host'
+		AND host.number = (v.number - 1) % v_hosts + 1
+		AND host.week = h.week;
+
+	INSERT INTO vm_daily_history (
+		history_datetime, vm_id, vm_status, minutes_in_status,
+		cpu_usage_percent, max_cpu_usage, memory_usage_percent,
+		max_memory_usage, user_cpu_usage_percent, max_user_cpu_usage_percent,
+		system_cpu_usage_percent, max_system_cpu_usage_percent, vm_ip,
+		current_user_id, currently_running_on_host, vm_configuration_version,
+		current_host_configuration_version, memory_buffered_kb,
+		max_memory_buffered_kb, memory_cached_kb, max_memory_cached_kb
+	)
+	SELECT d.history_datetime, bench_id('vm', v.number), 1, 1440,
+		bench_percent('cpu', v.number, d.history_datetime) / 2, bench_percent('cpu', v.number, d.history_datetime),
+		bench_percent('memory', v.number, d.history_datetime) / 2, bench_percent('memory', v.number, d.history_datetime),
+		bench_percent('user_cpu', v.number, d.history_datetime) / 4, bench_percent('user_cpu', v.number, d.history_datetime) / 2,
+		bench_percent('system_cpu', v.number, d.history_datetime) / 4, bench_percent('system_cpu', v.number, d.history_datetime) / 2,
+		'10.1.' || (v.number / 256) || '.' || (v.number % 256),
+		bench_id('user', v.number % 7 + 1), bench_id('host', (v.number - 1) % v_hosts + 1),
+		v.history_id, host.history_id, 262144, 524288, 262144, 524288
+	FROM bench_days d
+	JOIN bench_versions v ON v.kind = 'vm' AND v.week = d.week
+	JOIN bench_versions host
+		ON host.kind = 'host'
+		AND host.number = (v.number - 1) % v_hosts + 1
+		AND host.week = d.week;
+
+	INSERT INTO vm_samples_history (
+		history_datetime, vm_id, vm_status, seconds_in_status,
+		cpu_usage_percent, memory_usage_percent, user_cpu_usage_percent,
+		system_cpu_usage_percent, vm_ip, vm_client_ip, current_user_id,
+		current_user_name, user_logged_in_to_guest,
+		currently_running_on_host, vm_configuration_version,
+		current_host_configuration_version, memory_buffered_kb,
+		memory_cached_kb
+	)
+	SELECT s.history_datetime, bench_id('vm', v.number), 1, v_sampling,
+		bench_percent('cpu', v.number, s.history_datetime),
+		bench_percent('memory', v.number, s.history_datetime),
+		bench_percent('user_cpu', v.number, s.history_datetime) / 2,
+		bench_percent('system_cpu', v.number, s.history_datetime) / 2,
+		'10.1.' || (v.number / 256) || '.' || (v.number % 256),
+		'10.2.0.' || (v.number % 256),
+		bench_id('user', v.number % 7 + 1), 'user' || (v.number % 7 + 1), true,
+		bench_id('host', (v.number - 1) % v_hosts + 1),
+		v.history_id, host.history_id, 262144, 262144
+	FROM bench_samples s
+	JOIN bench_versions v ON v.kind = 'vm' AND v.week = s.week
+	JOIN bench_versions host
+		ON host.kind = 'host'
+		AND host.number = (v.number - 1) % v_hosts + 1
+		AND host.week = s.week;
+
+	INSERT INTO statistics_vms_users_usage_hourly (
+		history_datetime, user_id, user_name, user_logged_in_to_guest,
+		vm_id, session_time_in_minutes, cpu_usage_percent, max_cpu_usage,
+		memory_usage_percent, max_memory_usage, user_cpu_usage_percent,
+		max_user_cpu_usage_percent, system_cpu_usage_percent,
+		max_system_cpu_usage_percent, vm_ip, vm_client_ip,
+		currently_running_on_host, vm_configuration_version,
+		current_host_configuration_version
+	)
+	SELECT history_datetime, user_id, user_name, true, vm_id, minutes_in_status,
+		cpu_usage_percent, max_cpu_usage, memory_usage_percent,
+		max_memory_usage, user_cpu_usage_percent, max_user_cpu_usage_percent,
+		system_cpu_usage_percent, max_system_cpu_usage_percent, vm_ip,
+		'10.2.0.1', currently_running_on_host, vm_configuration_version,
+		current_host_configuration_version
+	FROM vm_hourly_history
+	JOIN (
+		SELECT bench_id('user', i) AS user_id, 'user' || i AS user_name
+		FROM generate_series(1, 7) i
+	) users ON users.user_id = vm_hourly_history.current_user_id;
+
+	INSERT INTO statistics_vms_users_usage_daily (
+		history_datetime, user_id, user_name, user_logged_in_to_guest,
+		vm_id, session_time_in_minutes, cpu_usage_percent, max_cpu_usage,
+		memory_usage_percent, max_memory_usage, user_cpu_usage_percent,
+		max_user_cpu_usage_percent, system_cpu_usage_percent,
+		max_system_cpu_usage_percent, vm_ip, vm_client_ip,
+		currently_running_on_host, vm_configuration_version,
+		current_host_configuration_version
+	)
+	SELECT history_datetime, user_id, user_name, true, vm_id, minutes_in_status,
+		cpu_usage_percent, max_cpu_usage, memory_usage_percent,
+		max_memory_usage, user_cpu_usage_percent, max_user_cpu_usage_percent,
+		system_cpu_usage_percent, max_system_cpu_usage_percent, vm_ip,
+		'10.2.0.1', currently_running_on_host, vm_configuration_version,
+		current_host_configuration_version
+	FROM vm_daily_history
+	JOIN (
+		SELECT bench_id('user', i) AS user_id, 'user' || i AS user_name
+		FROM generate_series(1, 7) i
+	) users ON users.user_id = vm_daily_history.current_user_id;
+
+	INSERT INTO vm_interface_hourly_history (
+		history_datetime, vm_interface_id, receive_rate_percent,
+		max_receive_rate_percent, transmit_rate_percent,
+		max_transmit_rate_percent, vm_interface_configuration_version,
+		received_total_byte, transmitted_total_byte
+	)
+	SELECT h.history_datetime, bench_id('vm_interface', v.number),
+		bench_percent('rx', v.number, h.history_datetime) / 2, bench_percent('rx', v.number, h.history_datetime),
+		bench_percent('tx', v.number, h.history_datetime) / 2, bench_percent('tx', v.number, h.history_datetime),
+		v.history_id,
+		extract(epoch FROM h.history_datetime - bench_views_start())::bigint * 100,
+		extract(epoch FROM h.history_datetime - bench_views_start())::bigint * 50
+	FROM bench_hours h
+	JOIN bench_versions v ON v.kind = 'vm_interface' AND v.week = h.week;
+
+	INSERT INTO vm_interface_daily_history (
+		history_datetime, vm_interface_id, receive_rate_percent,
+		max_receive_rate_percent, transmit_rate_percent,
+		max_transmit_rate_percent, vm_interface_configuration_version,
+		received_total_byte, transmitted_total_byte
+	)
+	SELECT d.history_datetime, bench_id('vm_interface', v.number),
+		bench_percent('rx', v.number, d.history_datetime) / 2, bench_percent('rx', v.number, d.history_datetime),
+		bench_percent('tx', v.number, d.history_datetime) / 2, bench_percent('tx', v.number, d.history_datetime),
+		v.history_id,
+		extract(epoch FROM d.history_datetime - bench_views_start())::bigint * 100,
+		extract(epoch FROM d.history_datetime - bench_views_start())::bigint * 50
+	FROM bench_days d
+	JOIN bench_versions v ON v.kind = 'vm_interface' AND v.week = d.week;
+
+	INSERT INTO vm_interface_samples_history (
+		history_datetime, vm_interface_id, receive_rate_percent,
+		transmit_rate_percent, vm_interface_configuration_version,
+		received_total_byte, transmitted_total_byte
+	)
+	SELECT s.history_datetime, bench_id('vm_interface', v.number),
+		bench_percent('rx', v.number, s.history_datetime),
+		bench_percent('tx', v.number, s.history_datetime),
+		v.history_id,
+		extract(epoch FROM s.history_datetime - bench_views_start())::bigint * 100,
+		extract(epoch FROM s.history_datetime - bench_views_start())::bigint * 50
+	FROM bench_samples s
+	JOIN bench_versions v ON v.kind = 'vm_interface' AND v.week = s.week;
+
+	INSERT INTO vm_disk_hourly_history (
+		history_datetime, vm_disk_id, image_id, vm_disk_status,
+		minutes_in_status, vm_disk_actual_size_mb,
+		read_rate_bytes_per_second, max_read_rate_bytes_per_second,
+		read_latency_seconds, max_read_latency_seconds,
+		write_rate_bytes_per_second, max_write_rate_bytes_per_second,
+		write_latency_seconds, max_write_latency_seconds,
+		flush_latency_seconds, max_flush_latency_seconds,
+		vm_disk_configuration_version
+	)
+	SELECT h.history_datetime, bench_id('disk', v.number), bench_id('image', v.number), 1, 60,
+		2048 + v.week * 10,
+		bench_hash('read:' || v.number || h.history_datetime, 52428800), 104857600,
+		bench_hash('read_latency:' || v.number || h.history_datetime, 500000) / 1000000000.0, 0.001,
+		bench_hash('write:' || v.number || h.history_datetime, 52428800), 104857600,
+		bench_hash('write_latency:' || v.number || h.history_datetime, 500000) / 1000000000.0, 0.001,
+		0.0001, 0.001,
+		v.history_id
+	FROM bench_hours h
+	JOIN bench_versions v ON v.kind = 'disk' AND v.week = h.week;
+
+	INSERT INTO vm_disk_daily_history (
+		history_datetime, vm_disk_id, image_id, vm_disk_status,
+		minutes_in_status, vm_disk_actual_size_mb,
+		read_rate_bytes_per_second, max_read_rate_bytes_per_second,
+		read_latency_seconds, max_read_latency_seconds,
+		write_rate_bytes_per_second, max_write_rate_bytes_per_second,
+		write_latency_seconds, max_write_latency_seconds,
+		flush_latency_seconds, max_flush_latency_seconds,
+		vm_disk_configuration_version
+	)
+	SELECT d.history_datetime, bench_id('disk', v.number), bench_id('image', v.number), 1, 1440,
+		2048 + v.week * 10,
+		bench_hash('read:' || v.number || d.history_datetime, 52428800), 104857600,
+		bench_hash('read_latency:' || v.number || d.history_datetime, 500000) / 1000000000.0, 0.001,
+		bench_hash('write:' || v.number || d.history_datetime, 52428800), 104857600,
+		bench_hash('write_latency:' || v.number || d.history_datetime, 500000) / 1000000000.0, 0.001,
+		0.0001, 0.001,
+		v.history_id
+	FROM bench_days d
+	JOIN bench_versions v ON v.kind = 'disk' AND v.week = d.week;
+
+	INSERT INTO vm_disk_samples_history (
+		history_datetime, vm_disk_id, image_id, vm_disk_status,
+		seconds_in_status, vm_disk_actual_size_mb,
+		read_rate_bytes_per_second, read_latency_seconds,
+		write_rate_bytes_per_second, write_latency_seconds,
+		flush_latency_seconds, vm_disk_configuration_version
+	)
+	SELECT s.history_datetime, bench_id('disk', v.number), bench_id('image', v.number), 1,
+		v_sampling, 2048 + v.week * 10,
+		bench_hash('read:' || v.number || s.history_datetime, 104857600),
+		bench_hash('read_latency:' || v.number || s.history_datetime, 1000000) / 1000000000.0,
+		bench_hash('write:' || v.number || s.history_datetime, 104857600),
+		bench_hash('write_latency:' || v.number || s.history_datetime, 1000000) / 1000000000.0,
+		0.0001,
+		v.history_id
+	FROM bench_samples s
+	JOIN bench_versions v ON v.kind = 'disk' AND v.week = s.week;
+
+	INSERT INTO vm_disks_usage_hourly_history (history_datetime, vm_id, disks_usage)
+	SELECT h.history_datetime, bench_id('vm', i),
+		'[{"path":"/","fs":"xfs","total":"21474836480","used":"' || (1073741824 + i) || '"}]'
+	FROM bench_hours h, generate_series(1, v_vms) i;
+
+	INSERT INTO vm_disks_usage_daily_history (history_datetime, vm_id, disks_usage)
+	SELECT d.history_datetime, bench_id('vm', i),
+		'[{"path":"/","fs":"xfs","total":"21474836480","used":"' || (1073741824 + i) || '"}]'
+	FROM bench_days d, generate_series(1, v_vms) i;
+
+	INSERT INTO vm_disks_usage_samples_history (history_datetime, vm_id, disks_usage)
+	SELECT s.history_datetime, bench_id('vm', i),
+		'[{"path":"/","fs":"xfs","total":"21474836480","used":"' || (1073741824 + i) || '"}]'
+	FROM bench_samples s, generate_series(1, v_vms) i;
+
+	INSERT INTO storage_domain_hourly_history (
+		history_datetime, storage_domain_id, storage_domain_status,
+		minutes_in_status, available_disk_size_gb, used_disk_size_gb,
+		storage_configuration_version
+	)
+	SELECT h.history_datetime, bench_id('storage_domain', v.number), 1, 60,
+		10000 - v.week * 10, v.week * 10, v.history_id
+	FROM bench_hours h
+	JOIN bench_versions v ON v.kind = 'storage_domain' AND v.week = h.week;
+
+	INSERT INTO storage_domain_daily_history (
+		history_datetime, storage_domain_id, storage_domain_status,
+		minutes_in_status, available_disk_size_gb, used_disk_size_gb,
+		storage_configuration_version
+	)
+	SELECT d.history_datetime, bench_id('storage_domain', v.number), 1, 1440,
+		10000 - v.week * 10, v.week * 10, v.history_id
+	FROM bench_days d
+	JOIN bench_versions v ON v.kind = 'storage_domain' AND v.week = d.week;
+
+	INSERT INTO storage_domain_samples_history (
+		history_datetime, storage_domain_id, storage_domain_status,
+		seconds_in_status, available_disk_size_gb, used_disk_size_gb,
+		storage_configuration_version
+	)
+	SELECT s.history_datetime, bench_id('storage_domain', v.number), 1, v_sampling,
+		10000 - v.week * 10, v.week * 10, v.history_id
+	FROM bench_samples s
+	JOIN bench_versions v ON v.kind = 'storage_domain' AND v.week = s.week;
+
+	UPDATE history_configuration
+	SET var_datetime = v_end
+	WHERE var_name IN ('lastHourAggr', 'lastDayAggr');
+end; $procedure$
+LANGUAGE plpgsql;
@@ -0,0 +1,348 @@
+#!/bin/sh
+
+. "$(dirname "$(readlink -f "$0")")"/dwh-prolog.sh
+
+BENCH_DB="ovirt_dwh_bench_aggregation"
+TEMPLATE_DB="${BENCH_DB}_template"
+HOURLY_JOB="ovirt_engine_dwh.aggregationtohourly_4_3.AggregationToHourly"
+DAILY_JOB="ovirt_engine_dwh.aggregationtodaily_4_3.AggregationToDaily"
+# runs a job on its own and commits the history connection it shares, as
+# the time keeping jobs do
+JOB_RUNNER="routines.RoutineJobRunner"
+
+HOURLY_TABLES="
+host_hourly_history
+host_interface_hourly_history
+vm_hourly_history
+vm_interface_hourly_history
+storage_domain_hourly_history
+vm_disk_hourly_history
+vm_disks_usage_hourly_history
+statistics_vms_users_usage_hourly
+"
+
+DAILY_TABLES="
+host_daily_history
+host_interface_daily_history
+vm_daily_history
+vm_interface_daily_history
+storage_domain_daily_history
+vm_disk_daily_history
+vm_disks_usage_daily_history
+statistics_vms_users_usage_daily
+"
+
+usage() {
+	cat << __EOF__
+Usage $0:
+
+    -z SIZES       - comma separated numbers of VMs to run with, with a
+                     host per ten VMs (default: 10,100,1000)
+    -H HOURS       - hours of samples to aggregate to hourly rows
+                     (default: 3)
+    -D DAYS        - days of hourly rows to aggregate to daily rows
+                     (default: 2)
+    -s SECONDS     - seconds between the samples (default: 60)
+    -g DIR         - directory of the golden results, required unless
+                     recording them
+    -r             - record the results as the golden results, instead of
+                     comparing them (default DIR: a temporary directory)
+    -S HOST        - PostgreSQL host (default: localhost)
+    -P PORT        - PostgreSQL port (default: 5432)
+    -U USER        - PostgreSQL user allowed to create databases
+                     (default: postgres), the password is taken from
+                     PGPASSWORD or ~/.pgpass
+    -v             - verbose output
+
+    -h --help      - this help message
+
+For every size, generate deterministic samples and hourly rows in an
+empty history database named ${BENCH_DB}, run the installed hourly
+aggregation for every hour of samples and the daily aggregation for
+every day of hourly rows, and print per job the milliseconds and rows
+per second recorded in etl_job_runs. The aggregated rows are then
+compared to the golden results of the size, the golden results of
+another HOURS, DAYS or SECONDS do not match. Exits with an error when
+any differ or are missing.
+__EOF__
+}
+
+while getopts ":z:H:D:s:g:rS:P:U:v" opt; do
+	case $opt in
+		z) SIZES="$OPTARG"
+		;;
+		H) HOURS="$OPTARG"
+		;;
+		D) DAYS="$OPTARG"
+		;;
+		s) SAMPLING="$OPTARG"
+		;;
+		g) GOLDEN_DIR="$OPTARG"
+		;;
+		r) RECORD=1
+		;;
+		S) BENCH_DB_HOST="$OPTARG"
+		;;
+		P) BENCH_DB_PORT="$OPTARG"
+		;;
+		U) BENCH_DB_USER="$OPTARG"
+		;;
+		v) VERBOSE=1
+		;;
+		\?) usage && exit
+		;;
+		:) die "-$OPTARG requires an argument"
+		;;
+	esac
+done
+
+SIZES="${SIZES:-10,100,1000}"
+HOURS="${HOURS:-3}"
+DAYS="${DAYS:-2}"
+SAMPLING="${SAMPLING:-60}"
+BENCH_DB_HOST="${BENCH_DB_HOST:-localhost}"
+BENCH_DB_PORT="${BENCH_DB_PORT:-5432}"
+BENCH_DB_USER="${BENCH_DB_USER:-postgres}"
+
+for v in HOURS DAYS SAMPLING BENCH_DB_PORT; do
+	eval "value=\"\${${v}}\""
+	echo "${value}" | grep -q '^[0-9][0-9]*$' || die "Invalid ${v} '${value}'"
+done
+for size in $(echo "${SIZES}" | tr ',' ' '); do
+	echo "${size}" | grep -q '^[1-9][0-9]*$' || die "Invalid size '${size}'"
+done
+if [ -z "${GOLDEN_DIR}" ]; then
+	[ -n "${RECORD}" ] || die "No golden results, record them with -r and compare with -g DIR"
+	GOLDEN_DIR="$(mktemp -d)" || die "Cannot create a directory for the golden results"
+fi
+
+# the generated data and the golden results depend on the time zone
+export PGOPTIONS="-c TimeZone=UTC -c extra_float_digits=0"
+export PGTZ=UTC
+
+BENCH_TMP="$(mktemp -d)"
+
+dbquery() {
+	local database="$1"
+	local query="$2"
+	psql \
+	${VERBOSE+-e} \
+	-X \
+	-q \
+	-A \
+	-t \
+	-v ON_ERROR_STOP=1 \
+	-h "${BENCH_DB_HOST}" \
+	-p "${BENCH_DB_PORT}" \
+	-U "${BENCH_DB_USER}" \
+	-d "${database}" \
+	-w \
+	-c "${query}"
+}
+
+cleanup_benchmark() {
+	dbquery postgres "DROP DATABASE IF EXISTS ${BENCH_DB}" > /dev/null 2>&1
+	dbquery postgres "DROP DATABASE IF EXISTS ${TEMPLATE_DB}" > /dev/null 2>&1
+	rm -rf "${BENCH_TMP}"
+}
+trap cleanup_benchmark 0
+
+create_template() {
+	echo "Creating ${TEMPLATE_DB}"
+	dbquery postgres "DROP DATABASE IF EXISTS ${TEMPLATE_DB}" || die "Cannot drop ${TEMPLATE_DB}"
+	dbquery postgres "CREATE DATABASE ${TEMPLATE_DB}" || die "Cannot create ${TEMPLATE_DB}"
+	"${PKG_DATA_DIR}/dbscripts/schema.sh" \
+		-s "${BENCH_DB_HOST}" \
+		-p "${BENCH_DB_PORT}" \
+		-u "${BENCH_DB_USER}" \
+		-d "${TEMPLATE_DB}" \
+		-l "${BENCH_TMP}/schema.log" \
+		-m "${BENCH_TMP}/schema.md5" \
+		-c apply \
+		|| die "Cannot create the history schema, see ${BENCH_TMP}/schema.log"
+	psql \
+		-X \
+		-q \
+		-v ON_ERROR_STOP=1 \
+		-h "${BENCH_DB_HOST}" \
+		-p "${BENCH_DB_PORT}" \
+		-U "${BENCH_DB_USER}" \
+		-d "${TEMPLATE_DB}" \
+		-w \
+		-f "${PKG_DATA_DIR}/benchmark/aggregation-data.sql" \
+		> /dev/null \
+		|| die "Cannot create the benchmark functions"
+}
+
+populate() {
+	local size="$1"
+	dbquery postgres "DROP DATABASE IF EXISTS ${BENCH_DB}" || die "Cannot drop ${BENCH_DB}"
+	dbquery postgres "CREATE DATABASE ${BENCH_DB} TEMPLATE ${TEMPLATE_DB}" || die "Cannot create ${BENCH_DB}"
+	dbquery "${BENCH_DB}" "
+		SELECT bench_aggregation_populate(${size}, ${HOURS}, ${DAYS}, ${SAMPLING})
+	" > /dev/null || die "Cannot populate ${BENCH_DB}"
+	dbquery "${BENCH_DB}" "VACUUM ANALYZE" || die "Cannot analyze ${BENCH_DB}"
+}
+
+# settings.properties read by the job metrics, which record the runs, and
+# by the job runner, which commits the aggregations
+write_settings() {
+	cat > "${BENCH_TMP}/settings.properties" << __EOF__
+ovirtEngineHistoryDbDriverClass=${DWH_DB_DRIVER}
+ovirtEngineHistoryDbJdbcConnection=jdbc:postgresql://${BENCH_DB_HOST}:${BENCH_DB_PORT}/${BENCH_DB}
+ovirtEngineHistoryDbUser=${BENCH_DB_USER}
+ovirtEngineHistoryDbPassword=${PGPASSWORD}
+__EOF__
+}
+
+run_job() {
+	local job="$1"
+	local connection="$2"
+	local param="$3"
+	local start="$4"
+	"${JAVA_HOME}/bin/java" \
+		-Xms"${DWH_HEAP_MIN}" \
+		-Xmx"${DWH_HEAP_MAX}" \
+		-Duser.timezone=UTC \
+		-Dorg.ovirt.engine.dwh.settings="${BENCH_TMP}/settings.properties" \
+		-classpath "${CLASSPATH_BENCH}" \
+		"${JOB_RUNNER}" \
+		"${job}" \
+		"${connection}" \
+		--context=Default \
+		--context_param "ovirtEngineHistoryDbDriverClass=${DWH_DB_DRIVER}" \
+		--context_param "ovirtEngineHistoryDbJdbcConnection=jdbc:postgresql://${BENCH_DB_HOST}:${BENCH_DB_PORT}/${BENCH_DB}" \
+		--context_param "ovirtEngineHistoryDbUser=${BENCH_DB_USER}" \
+		--context_param "ovirtEngineHistoryDbPassword=${PGPASSWORD}" \
+		--context_param "${param}=$(echo "${start}" | tr 'T' ' ')" \
+		> "${BENCH_TMP}/job.log" 2>&1 \
+		|| {
+			cat "${BENCH_TMP}/job.log" >&2
+			die "${job} failed for ${start}"
+		}
+}
+
+# the starts of the hours of samples and of the days of hourly rows, with
+# a T between the date and the time
+periods() {
+	local step="$1"
+	local first="$2"
+	local count="$3"
+	dbquery "${BENCH_DB}" "
+		SELECT to_char(t, 'YYYY-MM-DD\"T\"HH24:MI:SS')
+		FROM generate_series(
+			bench_aggregation_start() + interval '${first}',
+			bench_aggregation_start() + interval '${first}' + (${count} - 1) * interval '${step}',
+			interval '${step}'
+		) t
+	"
+}
+
+# the aggregated rows, without their serial ids, in a stable order
+dump_table() {
+	local table="$1"
+	local since="$2"
+	local columns
+	columns="$(dbquery "${BENCH_DB}" "
+		SELECT string_agg(quote_ident(column_name), ', ' ORDER BY ordinal_position)
+		FROM information_schema.columns
+		WHERE table_schema = 'public'
+			AND table_name = '${table}'
+			AND column_name <> 'history_id'
+	")" || die "Cannot read the columns of ${table}"
+	dbquery "${BENCH_DB}" "
+		COPY (
+			SELECT ${columns}
+			FROM ${table}
+			WHERE history_datetime >= bench_aggregation_start() + interval '${since}'
+			ORDER BY ${columns}
+		) TO STDOUT
+	" || die "Cannot dump ${table}"
+}
+
+# compares a table to its golden results, or records them
+verify_table() {
+	local table="$1"
+	local since="$2"
+	local golden="$3"
+	dump_table "${table}" "${since}" > "${BENCH_TMP}/${table}.tsv"
+	if [ -n "${RECORD}" ]; then
+		cp "${BENCH_TMP}/${table}.tsv" "${golden}/${table}.tsv" \
+			|| die "Cannot write ${golden}/${table}.tsv"
+	elif [ ! -f "${golden}/${table}.tsv" ]; then
+		echo "# ${table} has no golden results in ${golden}"
+		DIFFERS=1
+	elif ! diff -q "${golden}/${table}.tsv" "${BENCH_TMP}/${table}.tsv" > /dev/null 2>&1; then
+		echo "# ${table} differs from ${golden}/${table}.tsv"
+		[ -n "${VERBOSE}" ] && diff -u "${golden}/${table}.tsv" "${BENCH_TMP}/${table}.tsv" | head -n 40
+		DIFFERS=1
+	fi
+}
+
+verify() {
+	local size="$1"
+	local golden="${GOLDEN_DIR}/${size}"
+	local t
+
+	if [ -n "${RECORD}" ]; then
+		mkdir -p "${golden}" || die "Cannot create ${golden}"
+	elif [ ! -d "${golden}" ]; then
+		die "No golden results for ${size} VMs in ${GOLDEN_DIR}, record them with -r"
+	fi
+
+	# the hourly rows generated as input of the daily aggregation are
+	# not compared, only the ones aggregated from the samples after them
+	for t in ${HOURLY_TABLES}; do
+		verify_table "${t}" "${DAYS} days" "${golden}"
+	done
+	for t in ${DAILY_TABLES}; do
+		verify_table "${t}" "0 days" "${golden}"
+	done
+	if [ -n "${RECORD}" ]; then
+		echo "# golden results of ${size} VMs recorded in ${golden}"
+	fi
+}
+
+report() {
+	local size="$1"
+	dbquery "${BENCH_DB}" "
+		SELECT
+			${size},
+			job_name,
+			count(*),
+			count(*) FILTER (WHERE status <> 'success'),
+			round(avg(duration_ms)),
+			max(duration_ms),
+			sum(rows_read),
+			sum(rows_written),
+			round(sum(rows_read + rows_written) * 1000.0 / greatest(sum(duration_ms), 1))
+		FROM etl_job_runs
+		WHERE job_name IN ('AggregationToHourly', 'AggregationToDaily')
+		GROUP BY job_name
+		ORDER BY job_name DESC
+	" | tr '|' ' '
+}
+
+CLASSPATH_BENCH="${PKG_JAVA_LIB}/*:$("${PKG_DATA_DIR}/bin/dwh-classpath.sh" run)" \
+	|| die "Cannot resolve the classpath"
+
+create_template
+write_settings
+
+echo "# vms job runs failures avg_ms max_ms rows_read rows_written rows_per_second"
+for size in $(echo "${SIZES}" | tr ',' ' '); do
+	[ -n "${VERBOSE}" ] && echo "Generating ${size} VMs"
+	populate "${size}"
+	for hour in $(periods "1 hour" "${DAYS} days" "${HOURS}"); do
+		[ -n "${VERBOSE}" ] && echo "Aggregating hour ${hour}"
+		run_job "${HOURLY_JOB}" hourly_ovirt_engine_history lastHourAggr "${hour}"
+	done
+	for day in $(periods "1 day" "0 days" "${DAYS}"); do
+		[ -n "${VERBOSE}" ] && echo "Aggregating day ${day}"
+		run_job "${DAILY_JOB}" daily_ovirt_engine_history lastDayAggr "${day}"
+	done
+	report "${size}"
+	verify "${size}"
+done
+
+[ -z "${DIFFERS}" ] || die "Aggregated rows differ from the golden results"
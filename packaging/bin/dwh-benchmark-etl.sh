@@ -0,0 +1,391 @@
+#!/bin/sh
+
+. "$(dirname "$(readlink -f "$0")")"/dwh-prolog.sh
+
+ENGINE_BENCH_DB="ovirt_dwh_bench_engine"
+HISTORY_BENCH_DB="ovirt_dwh_bench_history"
+MAIN_CLASS="ovirt_engine_dwh.historyetl_4_3.HistoryETL"
+
+usage() {
+	cat << __EOF__
+Usage $0:
+
+    -d DATACENTERS - datacenters, each with a cluster and a storage domain
+                     (default: 1)
+    -H HOSTS       - hosts, with two interfaces each (default: 10)
+    -m VMS         - virtual machines (default: 100)
+    -k DISKS       - disks per virtual machine (default: 1)
+    -i NICS        - interfaces per virtual machine (default: 1)
+    -c PERCENT     - percent of the hosts, VMs and disks changing their
+                     configuration every cycle (default: 1)
+    -n CYCLES      - sample cycles to run (default: 10)
+    -s SECONDS     - seconds between sample cycles (default: 15)
+    -t SECONDS     - give up waiting for a sample cycle after SECONDS
+                     (default: 600)
+    -w THREADS     - comma separated numbers of worker threads, to run
+                     CYCLES sample cycles with each and compare their
+                     cycle times (default: DWH_WORKER_THREADS)
+    -S HOST        - PostgreSQL host (default: localhost)
+    -P PORT        - PostgreSQL port (default: 5432)
+    -U USER        - PostgreSQL user allowed to create databases
+                     (default: postgres), the password is taken from
+                     PGPASSWORD or ~/.pgpass
+    -K             - keep the benchmark databases
+    -v             - verbose output
+
+    -h --help      - this help message
+
+Create a synthetic engine database with the given inventory and an empty
+history database, named ${ENGINE_BENCH_DB} and ${HISTORY_BENCH_DB},
+run the installed ETL against them with DWH_HEAP_MIN and DWH_HEAP_MAX for
+CYCLES sample cycles, changing the statistics and some configuration
+between the cycles, and print per job its time and rows per second, the
+growth of the history database and the heap used, and the cycle and
+StatisticsSync times per number of worker threads. Needs only a local
+PostgreSQL, not an engine, the installed DWH service is not touched.
+__EOF__
+}
+
+while getopts ":d:H:m:k:i:c:n:s:t:w:S:P:U:Kv" opt; do
+	case $opt in
+		d) DATACENTERS="$OPTARG"
+		;;
+		H) HOSTS="$OPTARG"
+		;;
+		m) VMS="$OPTARG"
+		;;
+		k) DISKS="$OPTARG"
+		;;
+		i) NICS="$OPTARG"
+		;;
+		c) CHANGE_PERCENT="$OPTARG"
+		;;
+		n) CYCLES="$OPTARG"
+		;;
+		s) SAMPLING="$OPTARG"
+		;;
+		t) TIMEOUT="$OPTARG"
+		;;
+		w) WORKER_THREADS="$OPTARG"
+		;;
+		S) BENCH_DB_HOST="$OPTARG"
+		;;
+		P) BENCH_DB_PORT="$OPTARG"
+		;;
+		U) BENCH_DB_USER="$OPTARG"
+		;;
+		K) KEEP=1
+		;;
+		v) VERBOSE=1
+		;;
+		\?) usage && exit
+		;;
+		:) die "-$OPTARG requires an argument"
+		;;
+	esac
+done
+
+DATACENTERS="${DATACENTERS:-1}"
+HOSTS="${HOSTS:-10}"
+VMS="${VMS:-100}"
+DISKS="${DISKS:-1}"
+NICS="${NICS:-1}"
+CHANGE_PERCENT="${CHANGE_PERCENT:-1}"
+CYCLES="${CYCLES:-10}"
+SAMPLING="${SAMPLING:-15}"
+TIMEOUT="${TIMEOUT:-600}"
+WORKER_THREADS="${WORKER_THREADS:-${DWH_WORKER_THREADS:-0}}"
+BENCH_DB_HOST="${BENCH_DB_HOST:-localhost}"
+BENCH_DB_PORT="${BENCH_DB_PORT:-5432}"
+BENCH_DB_USER="${BENCH_DB_USER:-postgres}"
+
+for v in \
+	DATACENTERS \
+	HOSTS \
+	VMS \
+	DISKS \
+	NICS \
+	CHANGE_PERCENT \
+	CYCLES \
+	SAMPLING \
+	TIMEOUT \
+	BENCH_DB_PORT \
+	; do
+	eval "value=\"\${${v}}\""
+	echo "${value}" | grep -q '^[0-9][0-9]*$' || die "Invalid ${v} '${value}'"
+done
+[ "${DATACENTERS}" -gt 0 ] || die "At least one datacenter is needed"
+echo "${WORKER_THREADS}" | grep -q '^[0-9][0-9]*\(,[0-9][0-9]*\)*$' || \
+	die "Invalid WORKER_THREADS '${WORKER_THREADS}'"
+
+BENCH_TMP="$(mktemp -d)"
+ETL_PID=
+
+dbquery() {
+	local database="$1"
+	local query="$2"
+	psql \
+	${VERBOSE+-e} \
+	-X \
+	-q \
+	-A \
+	-t \
+	-v ON_ERROR_STOP=1 \
+	-h "${BENCH_DB_HOST}" \
+	-p "${BENCH_DB_PORT}" \
+	-U "${BENCH_DB_USER}" \
+	-d "${database}" \
+	-w \
+	-c "${query}"
+}
+
+drop_databases() {
+	dbquery postgres "DROP DATABASE IF EXISTS ${ENGINE_BENCH_DB}"
+	dbquery postgres "DROP DATABASE IF EXISTS ${HISTORY_BENCH_DB}"
+}
+
+stop_etl() {
+	if [ -n "${ETL_PID}" ]; then
+		kill "${ETL_PID}" 2> /dev/null
+		wait "${ETL_PID}"
+		ETL_PID=
+	fi
+}
+
+cleanup_benchmark() {
+	stop_etl
+	[ -z "${KEEP}" ] && drop_databases > /dev/null 2>&1
+	rm -rf "${BENCH_TMP}"
+}
+trap cleanup_benchmark 0
+
+jdbc_url() {
+	echo "jdbc:postgresql://${BENCH_DB_HOST}:${BENCH_DB_PORT}/$1"
+}
+
+create_databases() {
+	echo "Creating ${ENGINE_BENCH_DB} with ${DATACENTERS} datacenters, ${HOSTS} hosts, ${VMS} VMs"
+	drop_databases || die "Cannot drop the benchmark databases"
+	dbquery postgres "CREATE DATABASE ${ENGINE_BENCH_DB}" || die "Cannot create ${ENGINE_BENCH_DB}"
+	dbquery postgres "CREATE DATABASE ${HISTORY_BENCH_DB}" || die "Cannot create ${HISTORY_BENCH_DB}"
+
+	psql \
+		-X \
+		-q \
+		-v ON_ERROR_STOP=1 \
+		-h "${BENCH_DB_HOST}" \
+		-p "${BENCH_DB_PORT}" \
+		-U "${BENCH_DB_USER}" \
+		-d "${ENGINE_BENCH_DB}" \
+		-w \
+		-f "${PKG_DATA_DIR}/benchmark/engine-schema.sql" \
+		> /dev/null \
+		|| die "Cannot create the synthetic engine schema"
+	dbquery "${ENGINE_BENCH_DB}" "
+		SELECT bench_populate(
+			${DATACENTERS},
+			${HOSTS},
+			${VMS},
+			${DISKS},
+			${NICS},
+			'${BENCH_UUID}',
+			'${DWH_VERSION}'
+		)
+	" > /dev/null || die "Cannot populate ${ENGINE_BENCH_DB}"
+
+	echo "Creating ${HISTORY_BENCH_DB}"
+	"${PKG_DATA_DIR}/dbscripts/schema.sh" \
+		-s "${BENCH_DB_HOST}" \
+		-p "${BENCH_DB_PORT}" \
+		-u "${BENCH_DB_USER}" \
+		-d "${HISTORY_BENCH_DB}" \
+		-l "${BENCH_TMP}/schema.log" \
+		-m "${BENCH_TMP}/schema.md5" \
+		-c apply \
+		|| die "Cannot create the history schema, see ${BENCH_TMP}/schema.log"
+}
+
+# settings.properties of the service, pointing to the benchmark databases
+write_settings() (
+	local template="${PKG_DATA_DIR}/conf/settings.properties.in"
+	local name
+
+	DWH_DB_URL="$(jdbc_url "${HISTORY_BENCH_DB}")"
+	DWH_DB_USER="${BENCH_DB_USER}"
+	DWH_DB_PASSWORD="${PGPASSWORD}"
+	ENGINE_DB_URL="$(jdbc_url "${ENGINE_BENCH_DB}")"
+	ENGINE_DB_USER="${BENCH_DB_USER}"
+	ENGINE_DB_PASSWORD="${PGPASSWORD}"
+	DWH_SAMPLING="${SAMPLING}"
+	DWH_UUID="${BENCH_UUID}"
+	# never an hour, no delete job runs during the benchmark
+	DWH_DELETE_JOB_HOUR=-1
+	DWH_AGGREGATION_DEBUG=false
+	for name in $(grep -o '@[A-Z_]*@' "${template}" | tr -d @ | sort -u); do
+		export "${name}"
+	done
+
+	awk '
+		{
+			while (match($0, /@[A-Z_]+@/)) {
+				name = substr($0, RSTART + 1, RLENGTH - 2)
+				$0 = substr($0, 1, RSTART - 1) ENVIRON[name] \
+					substr($0, RSTART + RLENGTH)
+			}
+			print
+		}
+	' "${template}" > "${BENCH_TMP}/settings.properties"
+)
+
+start_etl() {
+	local threads="$1"
+	local classpath
+	classpath="${PKG_JAVA_LIB}/*:$("${PKG_DATA_DIR}/bin/dwh-classpath.sh" run)" \
+		|| die "Cannot resolve the classpath"
+	"${JAVA_HOME}/bin/java" \
+		-Xms"${DWH_HEAP_MIN}" \
+		-Xmx"${DWH_HEAP_MAX}" \
+		-Dorg.ovirt.engine.dwh.settings="${BENCH_TMP}/settings.properties" \
+		-Dorg.ovirt.engine.dwh.heapUsage="${BENCH_TMP}/heap-usage.properties" \
+		-Dorg.ovirt.engine.dwh.workerThreads="${threads}" \
+		-classpath "${classpath}" \
+		"${MAIN_CLASS}" \
+		--context=Default \
+		> "${BENCH_TMP}/etl.log" 2>&1 &
+	ETL_PID=$!
+}
+
+cycles_done() {
+	dbquery "${HISTORY_BENCH_DB}" "
+		SELECT count(*)
+		FROM etl_job_runs
+		WHERE job_name = 'SampleRunJobs'
+	"
+}
+
+wait_cycle() {
+	local cycle="$1"
+	local deadline="$(( $(date +%s) + TIMEOUT ))"
+	while [ "$(cycles_done)" -lt "${cycle}" ]; do
+		if ! kill -0 "${ETL_PID}" 2> /dev/null; then
+			tail -n 20 "${BENCH_TMP}/etl.log" >&2
+			ETL_PID=
+			die "ETL exited"
+		fi
+		[ "$(date +%s)" -ge "${deadline}" ] && \
+			die "No sample cycle within ${TIMEOUT} seconds"
+		# the ETL stops sampling when the engine heart beat is late
+		dbquery "${ENGINE_BENCH_DB}" "
+			UPDATE dwh_history_timekeeping
+			SET var_datetime = now()
+			WHERE var_name = 'heartBeat'
+		" > /dev/null
+		sleep 1
+	done
+}
+
+last_run() {
+	dbquery "${HISTORY_BENCH_DB}" "
+		SELECT coalesce(max(history_id), 0)
+		FROM etl_job_runs
+	"
+}
+
+# prints: threads|cycles|cycle avg ms|cycle max ms|StatisticsSync avg ms
+threads_report() {
+	local threads="$1"
+	local after="$2"
+	dbquery "${HISTORY_BENCH_DB}" "
+		SELECT
+			${threads},
+			count(*) FILTER (WHERE job_name = 'SampleRunJobs'),
+			round(avg(duration_ms) FILTER (WHERE job_name = 'SampleRunJobs')),
+			max(duration_ms) FILTER (WHERE job_name = 'SampleRunJobs'),
+			round(avg(duration_ms) FILTER (WHERE job_name = 'StatisticsSync'))
+		FROM etl_job_runs
+		WHERE history_id > ${after}
+	"
+}
+
+run_cycles() {
+	local threads="$1"
+	local first
+	local cycle=1
+
+	first="$(cycles_done)" || die "Cannot query ${HISTORY_BENCH_DB}"
+	start_etl "${threads}"
+	while [ "${cycle}" -le "${CYCLES}" ]; do
+		wait_cycle "$(( first + cycle ))"
+		[ -n "${VERBOSE}" ] && echo "Cycle ${cycle} done"
+		dbquery "${ENGINE_BENCH_DB}" "SELECT bench_cycle(${CHANGE_PERCENT})" > /dev/null \
+			|| die "Cannot change ${ENGINE_BENCH_DB}"
+		cycle="$(( cycle + 1 ))"
+	done
+	stop_etl
+}
+
+report() {
+	local size_before="$1"
+	local size_after="$2"
+	local cycles="$3"
+
+	echo "# threads cycles cycle_avg_ms cycle_max_ms statistics_avg_ms"
+	tr '|' ' ' < "${BENCH_TMP}/threads"
+
+	echo "# job runs failures avg_ms max_ms rows_read rows_written rows_per_second"
+	dbquery "${HISTORY_BENCH_DB}" "
+		SELECT
+			job_name,
+			count(*),
+			count(*) FILTER (WHERE status <> 'success'),
+			round(avg(duration_ms)),
+			max(duration_ms),
+			sum(rows_read),
+			sum(rows_written),
+			round(sum(rows_read + rows_written) * 1000.0 / greatest(sum(duration_ms), 1))
+		FROM etl_job_runs
+		GROUP BY job_name
+		ORDER BY sum(duration_ms) DESC
+	" | tr '|' ' '
+
+	echo "${size_before} ${size_after} ${cycles}" | awk '{
+		printf("# history database grew %.1f MB, %.1f MB per cycle\n",
+			($2 - $1) / 1048576, ($2 - $1) / 1048576 / $3)
+	}'
+
+	if [ -r "${BENCH_TMP}/heap-usage.properties" ]; then
+		awk -F= '
+			$1 == "peak" { peak = $2 }
+			$1 == "max" { max = $2 }
+			END {
+				printf("# heap peak %.1f MB of %.1f MB\n",
+					peak / 1048576, max / 1048576)
+			}
+		' "${BENCH_TMP}/heap-usage.properties"
+	else
+		echo "# heap usage was not recorded"
+	fi
+}
+
+BENCH_UUID="$(cat /proc/sys/kernel/random/uuid)"
+
+create_databases
+write_settings
+
+size_before="$(dbquery "${HISTORY_BENCH_DB}" "SELECT pg_database_size(current_database())")" \
+	|| die "Cannot query ${HISTORY_BENCH_DB}"
+
+cycles=0
+for threads in $(echo "${WORKER_THREADS}" | tr ',' ' '); do
+	echo "Running ${CYCLES} sample cycles every ${SAMPLING} seconds with ${threads} worker threads"
+	after="$(last_run)" || die "Cannot query ${HISTORY_BENCH_DB}"
+	run_cycles "${threads}"
+	cycles="$(( cycles + CYCLES ))"
+	threads_report "${threads}" "${after}" >> "${BENCH_TMP}/threads" \
+		|| die "Cannot query ${HISTORY_BENCH_DB}"
+done
+
+size_after="$(dbquery "${HISTORY_BENCH_DB}" "SELECT pg_database_size(current_database())")" \
+	|| die "Cannot query ${HISTORY_BENCH_DB}"
+
+report "${size_before}" "${size_after}" "${cycles}"
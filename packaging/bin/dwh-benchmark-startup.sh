@@ -0,0 +1,163 @@
+#!/bin/sh
+
+. "$(dirname "$(readlink -f "$0")")"/generate-pgpass.sh
+
+SAMPLES_TABLES="
+host_samples_history
+host_interface_samples_history
+vm_samples_history
+vm_interface_samples_history
+storage_domain_samples_history
+vm_disk_samples_history
+vm_disks_usage_samples_history
+"
+
+SERVICE=ovirt-engine-dwhd
+BENCHMARK_CONF="${DWH_VARS}.d/99-benchmark-startup.conf"
+
+usage() {
+	cat << __EOF__
+Usage $0:
+
+    -n RUNS     - measured starts per mode (default: 3)
+    -m MODES    - comma separated modes to measure, of
+                  default - as configured
+                  nocds   - without class data sharing
+                  cds     - with class data sharing, after the starts
+                            needed to record and archive the classes
+                  (default: nocds,cds)
+    -t SECONDS  - give up waiting for a sample cycle after SECONDS
+                  (default: 600)
+    -v          - verbose output
+
+    -h --help   - this help message
+
+Restart the DWH service repeatedly and print the seconds from the start
+until the first sample cycle has been written to the history database.
+Must be run as root, the service is left running as configured.
+__EOF__
+}
+
+while getopts ":n:m:t:v" opt; do
+	case $opt in
+		n) RUNS="$OPTARG"
+		;;
+		m) MODES="$OPTARG"
+		;;
+		t) TIMEOUT="$OPTARG"
+		;;
+		v) VERBOSE=1
+		;;
+		\?) usage && exit
+		;;
+		:) die "-$OPTARG requires an argument"
+		;;
+	esac
+done
+
+RUNS="${RUNS:-3}"
+MODES="${MODES:-nocds,cds}"
+TIMEOUT="${TIMEOUT:-600}"
+
+for v in RUNS TIMEOUT; do
+	eval "value=\"\${${v}}\""
+	echo "${value}" | grep -q '^[0-9][0-9]*$' || die "Invalid ${v} '${value}'"
+done
+
+[ "$(id -u)" = 0 ] || die "Must be run as root"
+
+# setups with 'trust' may have empty passwords
+[ -n "${DWH_DB_PASSWORD}" ] && generatePgPass
+
+dbquery() {
+	psql \
+	${VERBOSE+-e} \
+	-X \
+	-q \
+	-A \
+	-t \
+	-v ON_ERROR_STOP=1 \
+	-h "${DWH_DB_HOST}" \
+	-p "${DWH_DB_PORT}" \
+	-U "${DWH_DB_USER}" \
+	-d "${DWH_DB_DATABASE}" \
+	-w \
+	-c "$1"
+}
+
+# latest sample written to any of the samples tables
+last_sample() {
+	local query=""
+	local t
+	for t in ${SAMPLES_TABLES}; do
+		[ -n "${query}" ] && query="${query} UNION ALL "
+		query="${query}SELECT max(history_datetime) AS d FROM ${t}"
+	done
+	dbquery "SELECT coalesce(max(d), '-infinity') FROM (${query}) s"
+}
+
+now() {
+	date +%s.%N
+}
+
+# seconds from starting the service to the first new sample
+measure() {
+	local before
+	local start
+	local deadline
+
+	systemctl stop "${SERVICE}" || die "Cannot stop ${SERVICE}"
+	before="$(last_sample)" || die "Cannot query samples"
+	start="$(now)"
+	deadline="$(( $(date +%s) + TIMEOUT ))"
+	systemctl start "${SERVICE}" || die "Cannot start ${SERVICE}"
+	while [ "$(last_sample)" = "${before}" ]; do
+		[ "$(date +%s)" -ge "${deadline}" ] && \
+			die "No sample cycle within ${TIMEOUT} seconds"
+		sleep 0.2
+	done
+	echo "$(now) ${start}" | awk '{ printf("%.1f\n", $1 - $2) }'
+}
+
+configure() {
+	local mode="$1"
+	case "${mode}" in
+		default)
+			rm -f "${BENCHMARK_CONF}"
+		;;
+		nocds)
+			echo "DWH_CDS_ENABLED=false" > "${BENCHMARK_CONF}"
+		;;
+		cds)
+			echo "DWH_CDS_ENABLED=true" > "${BENCHMARK_CONF}"
+			# record the classes, then archive them
+			measure > /dev/null
+			measure > /dev/null
+		;;
+		*)
+			die "Invalid mode '${mode}'"
+		;;
+	esac
+}
+
+cleanup_benchmark() {
+	rm -f "${BENCHMARK_CONF}"
+	systemctl restart "${SERVICE}"
+	cleanup
+}
+trap cleanup_benchmark 0
+
+echo "# mode run seconds"
+for mode in $(echo "${MODES}" | tr ',' ' '); do
+	configure "${mode}"
+	run=1
+	total=0
+	while [ "${run}" -le "${RUNS}" ]; do
+		seconds="$(measure)" || exit 1
+		echo "${mode} ${run} ${seconds}"
+		total="$(echo "${total} ${seconds}" | awk '{ print $1 + $2 }')"
+		run="$(( run + 1 ))"
+	done
+	echo "${total} ${RUNS}" | \
+		awk -v mode="${mode}" '{ printf("# %s average %.1f\n", mode, $1 / $2) }'
+done
@@ -0,0 +1,332 @@
+#!/bin/sh
+
+. "$(dirname "$(readlink -f "$0")")"/dwh-prolog.sh
+
+BENCH_DB="ovirt_dwh_bench_views"
+
+usage() {
+	cat << __EOF__
+Usage $0:
+
+    -m VMS         - number of VMs to generate, with a host per ten VMs
+                     (default: 100)
+    -M MONTHS      - months of hourly and daily rows to generate
+                     (default: 3)
+    -s SECONDS     - seconds between the samples of the last day
+                     (default: 60)
+    -n RUNS        - timed runs of every query (default: 5)
+    -q FILE        - queries to run
+                     (default: PKG_DATA_DIR/benchmark/view-queries.sql)
+    -f FILE        - views to benchmark instead of the installed
+                     create_views_4_3.sql
+    -o DIR         - directory to write the latencies and the plans to
+                     (default: a temporary directory)
+    -b DIR         - output directory of a previous run to compare the
+                     plans and the latencies with
+    -S HOST        - PostgreSQL host (default: localhost)
+    -P PORT        - PostgreSQL port (default: 5432)
+    -U USER        - PostgreSQL user allowed to create databases
+                     (default: postgres), the password is taken from
+                     PGPASSWORD or ~/.pgpass
+    -v             - verbose output
+
+    -h --help      - this help message
+
+Create an history database named ${BENCH_DB}, generate MONTHS months
+of history of VMS VMs in it, and run every query of the catalogue once
+to warm the cache and RUNS times with EXPLAIN ANALYZE. The minimum,
+median and maximum execution times of every query are printed and
+written to DIR/latency.txt, its plan to DIR/plans/NAME.txt and the md5
+of the views to DIR/views.md5. The average size of the rows of
+vm_samples_history, and the size of its table and TOAST table in
+bytes, are printed and written to DIR/sizes.txt.
+
+With -b, the plans are compared to the ones of the previous run, and
+the ratio of the median execution times is printed. Exits with an
+error when any plan changed.
+__EOF__
+}
+
+while getopts ":m:M:s:n:q:f:o:b:S:P:U:v" opt; do
+	case $opt in
+		m) VMS="$OPTARG"
+		;;
+		M) MONTHS="$OPTARG"
+		;;
+		s) SAMPLING="$OPTARG"
+		;;
+		n) RUNS="$OPTARG"
+		;;
+		q) QUERIES_FILE="$OPTARG"
+		;;
+		f) VIEWS_FILE="$OPTARG"
+		;;
+		o) OUTPUT_DIR="$OPTARG"
+		;;
+		b) BASELINE_DIR="$OPTARG"
+		;;
+		S) BENCH_DB_HOST="$OPTARG"
+		;;
+		P) BENCH_DB_PORT="$OPTARG"
+		;;
+		U) BENCH_DB_USER="$OPTARG"
+		;;
+		v) VERBOSE=1
+		;;
+		\?) usage && exit
+		;;
+		:) die "-$OPTARG requires an argument"
+		;;
+	esac
+done
+
+VMS="${VMS:-100}"
+MONTHS="${MONTHS:-3}"
+SAMPLING="${SAMPLING:-60}"
+RUNS="${RUNS:-5}"
+QUERIES_FILE="${QUERIES_FILE:-${PKG_DATA_DIR}/benchmark/view-queries.sql}"
+VIEWS_FILE="${VIEWS_FILE:-${PKG_DATA_DIR}/dbscripts/create_views_4_3.sql}"
+BENCH_DB_HOST="${BENCH_DB_HOST:-localhost}"
+BENCH_DB_PORT="${BENCH_DB_PORT:-5432}"
+BENCH_DB_USER="${BENCH_DB_USER:-postgres}"
+
+for v in VMS MONTHS SAMPLING RUNS; do
+	eval "value=\"\${${v}}\""
+	echo "${value}" | grep -q '^[1-9][0-9]*$' || die "Invalid ${v} '${value}'"
+done
+echo "${BENCH_DB_PORT}" | grep -q '^[0-9][0-9]*$' || die "Invalid BENCH_DB_PORT '${BENCH_DB_PORT}'"
+[ -r "${QUERIES_FILE}" ] || die "Cannot read ${QUERIES_FILE}"
+[ -r "${VIEWS_FILE}" ] || die "Cannot read ${VIEWS_FILE}"
+[ -z "${BASELINE_DIR}" -o -r "${BASELINE_DIR}/latency.txt" ] \
+	|| die "Cannot read ${BASELINE_DIR}/latency.txt"
+
+# the generated data depends on the time zone
+export PGOPTIONS="-c TimeZone=UTC"
+export PGTZ=UTC
+
+BENCH_TMP="$(mktemp -d)"
+if [ -z "${OUTPUT_DIR}" ]; then
+	OUTPUT_DIR="$(mktemp -d)"
+fi
+mkdir -p "${OUTPUT_DIR}/plans" || die "Cannot create ${OUTPUT_DIR}/plans"
+
+dbquery() {
+	local database="$1"
+	local query="$2"
+	psql \
+	${VERBOSE+-e} \
+	-X \
+	-q \
+	-A \
+	-t \
+	-v ON_ERROR_STOP=1 \
+	-h "${BENCH_DB_HOST}" \
+	-p "${BENCH_DB_PORT}" \
+	-U "${BENCH_DB_USER}" \
+	-d "${database}" \
+	-w \
+	-c "${query}"
+}
+
+dbfile() {
+	local file="$1"
+	psql \
+		-X \
+		-q \
+		-v ON_ERROR_STOP=1 \
+		-h "${BENCH_DB_HOST}" \
+		-p "${BENCH_DB_PORT}" \
+		-U "${BENCH_DB_USER}" \
+		-d "${BENCH_DB}" \
+		-w \
+		-f "${file}" \
+		> /dev/null
+}
+
+cleanup_benchmark() {
+	dbquery postgres "DROP DATABASE IF EXISTS ${BENCH_DB}" > /dev/null 2>&1
+	rm -rf "${BENCH_TMP}"
+}
+trap cleanup_benchmark 0
+
+create_database() {
+	echo "Creating ${BENCH_DB}"
+	dbquery postgres "DROP DATABASE IF EXISTS ${BENCH_DB}" || die "Cannot drop ${BENCH_DB}"
+	dbquery postgres "CREATE DATABASE ${BENCH_DB} TEMPLATE template0 ENCODING 'UTF8'" || die "Cannot create ${BENCH_DB}"
+	"${PKG_DATA_DIR}/dbscripts/schema.sh" \
+		-s "${BENCH_DB_HOST}" \
+		-p "${BENCH_DB_PORT}" \
+		-u "${BENCH_DB_USER}" \
+		-d "${BENCH_DB}" \
+		-l "${BENCH_TMP}/schema.log" \
+		-m "${BENCH_TMP}/schema.md5" \
+		-c apply \
+		|| die "Cannot create the history schema, see ${BENCH_TMP}/schema.log"
+}
+
+# replaces the installed 4.3 views, and whatever depends on them, by the
+# ones to benchmark
+replace_views() {
+	echo "Creating the views of ${VIEWS_FILE}"
+	dbquery "${BENCH_DB}" "
+		SELECT 'DROP VIEW IF EXISTS ' || quote_ident(table_name) || ' CASCADE;'
+		FROM information_schema.views
+		WHERE table_schema = 'public'
+			AND table_name LIKE 'v4\\_3\\_%'
+	" > "${BENCH_TMP}/drop-views.sql" || die "Cannot list the 4.3 views"
+	dbfile "${BENCH_TMP}/drop-views.sql" || die "Cannot drop the 4.3 views"
+	dbfile "${VIEWS_FILE}" || die "Cannot create the views of ${VIEWS_FILE}"
+}
+
+populate() {
+	echo "Generating ${MONTHS} months of ${VMS} VMs"
+	dbfile "${PKG_DATA_DIR}/benchmark/aggregation-data.sql" \
+		|| die "Cannot create the benchmark functions"
+	dbfile "${PKG_DATA_DIR}/benchmark/views-data.sql" \
+		|| die "Cannot create the benchmark functions"
+	dbquery "${BENCH_DB}" "
+		SELECT bench_views_populate(${VMS}, ${MONTHS}, ${SAMPLING})
+	" > /dev/null || die "Cannot populate ${BENCH_DB}"
+	dbquery "${BENCH_DB}" "
+		SELECT materialized_views_drop();
+		SELECT materialized_views_create();
+		SELECT dashboard_summary_create();
+	" > /dev/null || die "Cannot create the materialized views"
+	dbquery "${BENCH_DB}" "VACUUM ANALYZE" || die "Cannot analyze ${BENCH_DB}"
+}
+
+# prints the number of rows of vm_samples_history, their average size,
+# and the sizes of its table and of its TOAST table in bytes
+sample_sizes() {
+	dbquery "${BENCH_DB}" "
+		SELECT
+			count(*),
+			round(avg(pg_column_size(t.*)), 1),
+			pg_table_size('vm_samples_history'),
+			coalesce(pg_total_relation_size(c.reltoastrelid), 0)
+		FROM vm_samples_history t, pg_class c
+		WHERE c.oid = 'vm_samples_history'::regclass
+		GROUP BY c.reltoastrelid
+	" | tr '|' ' '
+}
+
+# writes every query of the catalogue to BENCH_TMP/queries/NAME.sql, and
+# prints their names in order
+split_queries() {
+	mkdir -p "${BENCH_TMP}/queries"
+	awk -v dir="${BENCH_TMP}/queries" '
+		/^-- query: / {
+			name = $3
+			file = dir "/" name ".sql"
+			if (name in seen) {
+				print "duplicate query " name > "/dev/stderr"
+				exit 1
+			}
+			seen[name] = 1
+			print name
+			next
+		}
+		name != "" && !/^--/ {
+			sub(/;[ \t]*$/, "")
+			print >> file
+		}
+	' "${QUERIES_FILE}"
+}
+
+# prints the execution times in milliseconds of RUNS runs of a query
+execution_times() {
+	local query="$1"
+	local i=0
+	while [ "${i}" -lt "${RUNS}" ]; do
+		dbquery "${BENCH_DB}" "EXPLAIN (ANALYZE, TIMING OFF) ${query}" \
+			| sed -n 's/^Execution [Tt]ime: \([0-9.]*\) ms$/\1/p'
+		i=$((i + 1))
+	done
+}
+
+# prints the minimum, the median and the maximum of the times on stdin
+summarize() {
+	sort -n | awk '
+		{ t[NR] = $1 }
+		END {
+			if (NR == 0) {
+				exit 1
+			}
+			median = NR % 2 ? t[(NR + 1) / 2] : (t[NR / 2] + t[NR / 2 + 1]) / 2
+			printf "%.3f %.3f %.3f\n", t[1], median, t[NR]
+		}
+	'
+}
+
+bench_query() {
+	local name="$1"
+	local query
+	local times
+	query="$(cat "${BENCH_TMP}/queries/${name}.sql")"
+
+	[ -n "${VERBOSE}" ] && echo "Running ${name}"
+	dbquery "${BENCH_DB}" "${query}" > /dev/null || die "Query ${name} failed"
+	dbquery "${BENCH_DB}" "EXPLAIN (COSTS OFF) ${query}" \
+		> "${OUTPUT_DIR}/plans/${name}.txt" \
+		|| die "Cannot explain ${name}"
+	times="$(execution_times "${query}" | summarize)" \
+		|| die "Cannot time ${name}"
+	echo "${name} ${times}" >> "${OUTPUT_DIR}/latency.txt"
+	echo "${name} ${times}"
+}
+
+# compares the plans and the median latencies with the baseline
+compare() {
+	local name="$1"
+	local median
+	local baseline
+	median="$(awk -v name="${name}" '$1 == name { print $3 }' "${OUTPUT_DIR}/latency.txt")"
+	baseline="$(awk -v name="${name}" '$1 == name { print $3 }' "${BASELINE_DIR}/latency.txt")"
+
+	if [ -z "${baseline}" ]; then
+		echo "# ${name} is not in ${BASELINE_DIR}"
+		return 0
+	fi
+	echo "${name} ${baseline} ${median}" | awk '
+		{ printf "%s %s %s %.2f\n", $1, $2, $3, ($2 > 0 ? $3 / $2 : 0) }
+	'
+	if ! diff -q "${BASELINE_DIR}/plans/${name}.txt" "${OUTPUT_DIR}/plans/${name}.txt" > /dev/null 2>&1; then
+		echo "# plan of ${name} changed"
+		[ -n "${VERBOSE}" ] && diff -u "${BASELINE_DIR}/plans/${name}.txt" "${OUTPUT_DIR}/plans/${name}.txt"
+		PLAN_CHANGED=1
+	fi
+}
+
+create_database
+if [ "${VIEWS_FILE}" != "${PKG_DATA_DIR}/dbscripts/create_views_4_3.sql" ]; then
+	replace_views
+fi
+populate
+
+NAMES="$(split_queries)" || die "Cannot read the queries of ${QUERIES_FILE}"
+md5sum < "${VIEWS_FILE}" | cut -d ' ' -f 1 > "${OUTPUT_DIR}/views.md5"
+rm -f "${OUTPUT_DIR}/latency.txt"
+
+echo "# vm_samples_history rows avg_row_bytes table_bytes toast_bytes"
+sample_sizes > "${OUTPUT_DIR}/sizes.txt" || die "Cannot measure vm_samples_history"
+cat "${OUTPUT_DIR}/sizes.txt"
+if [ -r "${BASELINE_DIR}/sizes.txt" ]; then
+	echo "# baseline $(cat "${BASELINE_DIR}/sizes.txt")"
+fi
+
+echo "# query min_ms median_ms max_ms"
+for name in ${NAMES}; do
+	bench_query "${name}"
+done
+echo "# latencies and plans written to ${OUTPUT_DIR}"
+
+if [ -n "${BASELINE_DIR}" ]; then
+	if cmp -s "${BASELINE_DIR}/views.md5" "${OUTPUT_DIR}/views.md5"; then
+		echo "# same views as ${BASELINE_DIR}"
+	fi
+	echo "# query baseline_median_ms median_ms ratio"
+	for name in ${NAMES}; do
+		compare "${name}"
+	done
+	[ -z "${PLAN_CHANGED}" ] || die "Plans differ from ${BASELINE_DIR}"
+fi
@@ -0,0 +1,169 @@
+#!/bin/sh
+
+. "$(dirname "$(readlink -f "$0")")"/generate-pgpass.sh
+
+usage() {
+    cat << __EOF__
+Usage $0:
+
+    -n NAME     - name of the engine to add, as in DWH_ENGINES
+    -f          - connect the engine to this DWH even when it is
+                  connected to another one
+    -l          - list the engines of the history database
+    -v          - verbose output
+
+    -h --help   - this help message
+
+Adds an engine to collect from into the history database, whose database
+is set in the DWH_ENGINE_<NAME>_DB_* variables of the configuration of
+the DWH service. Creates or upgrades the schema NAME of the history
+database, where its statistics are kept, connects the engine to this DWH
+and creates the views of all the engines. Restart the DWH service
+afterwards to start collecting.
+__EOF__
+}
+
+while getopts ":n:flv" opt; do
+    case $opt in
+        n) NAME="$OPTARG"
+        ;;
+        f) FORCE=1
+        ;;
+        l) LIST=1
+        ;;
+        v) VERBOSE=1
+        ;;
+        \?) usage && exit
+        ;;
+        :) die "-$OPTARG requires an argument"
+        ;;
+    esac
+done
+
+# setups with 'trust' may have empty passwords
+[[ -n $DWH_DB_PASSWORD ]] && generatePgPass
+
+dbquery() {
+    psql \
+    ${VERBOSE+-e} \
+    -X \
+    -q \
+    -A \
+    -t \
+    -v ON_ERROR_STOP=1 \
+    -h $DWH_DB_HOST \
+    -p $DWH_DB_PORT \
+    -U $DWH_DB_USER \
+    -d $DWH_DB_DATABASE \
+    -w \
+    -c "$1"
+}
+
+enginequery() {
+    psql \
+    ${VERBOSE+-e} \
+    -X \
+    -q \
+    -A \
+    -t \
+    -v ON_ERROR_STOP=1 \
+    -h $ENGINE_HOST \
+    -p $ENGINE_PORT \
+    -U $ENGINE_USER \
+    -d $ENGINE_DATABASE \
+    -w \
+    -c "$1"
+}
+
+if [ -n "${LIST}" ]; then
+    echo "# engine|schema|added"
+    dbquery "
+        SELECT engine_name, schema_name, create_date
+        FROM dwh_engines
+        ORDER BY engine_name
+    " || die "Cannot list the engines"
+    exit 0
+fi
+
+[ -n "${NAME}" ] || die "Please specify the name of the engine"
+echo "${NAME}" | grep -q '^[a-z][a-z0-9_]\{0,62\}$' || \
+    die "Invalid engine name '${NAME}'"
+case "${NAME}" in
+    default|public|all_engines|information_schema)
+        die "Engine name '${NAME}' is reserved"
+        ;;
+esac
+echo " ${DWH_ENGINES} " | grep -q " ${NAME} " || \
+    die "Engine '${NAME}' is not in DWH_ENGINES"
+
+# sync with _getEngines of ovirt-engine-dwhd.py
+PREFIX="DWH_ENGINE_$(echo "${NAME}" | tr '[:lower:]' '[:upper:]')_DB"
+eval "ENGINE_HOST=\"\${${PREFIX}_HOST}\""
+eval "ENGINE_PORT=\"\${${PREFIX}_PORT:-5432}\""
+eval "ENGINE_USER=\"\${${PREFIX}_USER}\""
+eval "ENGINE_PASSWORD=\"\${${PREFIX}_PASSWORD}\""
+eval "ENGINE_DATABASE=\"\${${PREFIX}_DATABASE}\""
+[[ -z $ENGINE_HOST ]]     || \
+[[ -z $ENGINE_USER ]]     || \
+[[ -z $ENGINE_DATABASE ]] && \
+    die "Can't parse the connection details of engine '${NAME}'"
+
+if [[ -n $ENGINE_PASSWORD ]]; then
+    export PGPASSFILE="${MYTEMP}/.pgpass"
+    touch "${PGPASSFILE}" || die "Can't create ${PGPASSFILE}"
+    chmod 0600 "${PGPASSFILE}" || die "Can't chmod ${PGPASSFILE}"
+    echo "${ENGINE_HOST}:${ENGINE_PORT}:${ENGINE_DATABASE}:${ENGINE_USER}:$(
+        echo "${ENGINE_PASSWORD}" | sed -e 's/\\/\\\\/g' -e 's/:/\\:/g'
+    )" >> "${PGPASSFILE}"
+fi
+
+[[ -n $DWH_UUID ]] || die "Can't find DWH_UUID"
+
+current="$(
+    enginequery "
+        SELECT var_value
+        FROM dwh_history_timekeeping
+        WHERE var_name = 'dwhUuid'
+    "
+)" || die "Cannot connect to the database of engine '${NAME}'"
+if [ -n "${current}" ] && [ "${current}" != "${DWH_UUID}" ] && \
+    [ -z "${FORCE}" ]; then
+    die "Engine '${NAME}' is connected to another DWH (${current}), use -f to connect it to this one"
+fi
+
+echo "Adding engine ${NAME}"
+dbquery "
+    INSERT INTO dwh_engines(engine_name, schema_name)
+    SELECT '${NAME}', '${NAME}'
+    WHERE NOT EXISTS (
+        SELECT engine_name
+        FROM dwh_engines
+        WHERE engine_name = '${NAME}'
+    )
+" || die "Cannot add engine '${NAME}'"
+
+DBFUNC_DB_PGPASSFILE="${PGPASSFILE}" \
+    "${PKG_DATA_DIR}/dbscripts/schema.sh" \
+    ${VERBOSE+-v} \
+    -s "${DWH_DB_HOST}" \
+    -p "${DWH_DB_PORT}" \
+    -u "${DWH_DB_USER}" \
+    -d "${DWH_DB_DATABASE}" \
+    -n "${NAME}" \
+    -c apply \
+    || die "Cannot create the schema of engine '${NAME}'"
+
+echo "Connecting engine ${NAME} to this DWH"
+enginequery "
+    UPDATE dwh_history_timekeeping
+    SET var_value = '${DWH_UUID}'
+    WHERE var_name = 'dwhUuid';
+    UPDATE dwh_history_timekeeping
+    SET var_value = '$(hostname -f)'
+    WHERE var_name = 'dwhHostname';
+" || die "Cannot connect engine '${NAME}' to this DWH"
+
+dbquery "SELECT all_engines_views_create()" > /dev/null || \
+    die "Cannot create the views of all the engines"
+
+echo "Engine ${NAME} added, restart the DWH service to collect from it"
@@ -0,0 +1,63 @@
+#!/bin/sh
+
+. "$(dirname "$(readlink -f "$0")")"/dwh-prolog.sh
+
+MAIN_CLASS="ovirt_engine_dwh.historyetl_4_3.HistoryETL"
+
+usage() {
+	cat << __EOF__
+Usage $0:
+
+    -e ENGINE   - name of the engine of DWH_ENGINES whose worker to
+                  dump (default: the worker of the engine of
+                  ENGINE_DB_*)
+    -o FILE     - file to write the recording to
+                  (default: DWH_JFR_DIR/WORKER-dump-TIME.jfr, WORKER
+                  being ovirt-engine-dwhd or ovirt-engine-dwhd-ENGINE)
+
+    -h --help   - this help message
+
+Dump the Flight Recorder recording of a worker of the running DWH
+service, enabled with DWH_JFR_ENABLED. Every worker has a recording of
+its own. Requires jcmd, of the java development package.
+__EOF__
+}
+
+while getopts ":e:o:" opt; do
+	case $opt in
+		e) ENGINE="$OPTARG"
+		;;
+		o) OUTPUT="$OPTARG"
+		;;
+		\?) usage && exit
+		;;
+		:) die "-$OPTARG requires an argument"
+		;;
+	esac
+done
+
+if [ -n "${ENGINE}" ]; then
+	echo "${ENGINE}" | grep -qE '^[a-z][a-z0-9_]{0,62}$' || die "Invalid engine name '${ENGINE}'"
+fi
+RECORDING="ovirt-engine-dwhd${ENGINE:+-${ENGINE}}"
+OUTPUT="${OUTPUT:-${DWH_JFR_DIR}/${RECORDING}-dump-$(date +%Y%m%d%H%M%S).jfr}"
+
+JCMD="${JAVA_HOME}/bin/jcmd"
+[ -x "${JCMD}" ] || die "Cannot find ${JCMD}, install the java development package"
+
+# the workers are named after their engine, as the first argument
+pid="$(pgrep -f -- "^${RECORDING} .*${MAIN_CLASS}")"
+[ -n "${pid}" ] || die "Worker ${RECORDING} of the DWH service is not running"
+[ "$(echo "${pid}" | wc -l)" -eq 1 ] || die "Several processes of worker ${RECORDING}: ${pid}"
+user="$(ps -o user= -p "${pid}")" || die "Cannot find the user of process ${pid}"
+
+# jcmd attaches only to processes of the same user
+if [ "$(id -un)" = "${user}" ]; then
+	"${JCMD}" "${pid}" JFR.dump name="${RECORDING}" filename="${OUTPUT}"
+else
+	[ "$(id -u)" = 0 ] || die "Must be run as root or ${user}"
+	runuser -u "${user}" -- \
+		"${JCMD}" "${pid}" JFR.dump name="${RECORDING}" filename="${OUTPUT}"
+fi || die "Cannot dump the recording, is DWH_JFR_ENABLED set?"
+
+echo "Recording written to ${OUTPUT}"
@@ -0,0 +1,297 @@
+#!/bin/sh
+
+. "$(dirname "$(readlink -f "$0")")"/generate-pgpass.sh
+
+SAMPLES_TABLES="
+host_samples_history
+host_interface_samples_history
+vm_samples_history
+vm_interface_samples_history
+storage_domain_samples_history
+vm_disk_samples_history
+vm_disks_usage_samples_history
+"
+
+HOURLY_TABLES="
+host_hourly_history
+host_interface_hourly_history
+vm_hourly_history
+vm_interface_hourly_history
+storage_domain_hourly_history
+vm_disk_hourly_history
+vm_disks_usage_hourly_history
+statistics_vms_users_usage_hourly
+"
+
+DAILY_TABLES="
+host_daily_history
+host_interface_daily_history
+vm_daily_history
+vm_interface_daily_history
+storage_domain_daily_history
+vm_disk_daily_history
+vm_disks_usage_daily_history
+statistics_vms_users_usage_daily
+"
+
+# minimum seconds HistoryDelete pauses between two delete iterations
+DELETE_ITERATION_PAUSE=1
+
+usage() {
+    cat << __EOF__
+Usage $0:
+
+    -s HOURS    - hours to keep samples, defaults to DWH_TABLES_KEEP_SAMPLES
+    -H HOURS    - hours to keep hourly aggregations, defaults to DWH_TABLES_KEEP_HOURLY
+    -D HOURS    - hours to keep daily aggregations, defaults to DWH_TABLES_KEEP_DAILY
+    -p          - purge the rows outside the retention window now,
+                  instead of leaving them to the DWH delete job.
+                  DWH service should not be running when purging
+    -b ROWS     - rows to delete per purge batch (default: 100000)
+    -r PERCENT  - rebuild a table instead of deleting in batches when at
+                  least PERCENT of its rows are purged (default: 50)
+    -v          - verbose output
+
+    -h --help   - this help message
+
+Without -p, print per table the rows outside the retention window and
+an estimation of the time the DWH delete job will need to remove them.
+__EOF__
+}
+
+while getopts ":s:H:D:pb:r:v" opt; do
+    case $opt in
+        s) DWH_TABLES_KEEP_SAMPLES="$OPTARG"
+        ;;
+        H) DWH_TABLES_KEEP_HOURLY="$OPTARG"
+        ;;
+        D) DWH_TABLES_KEEP_DAILY="$OPTARG"
+        ;;
+        p) PURGE=1
+        ;;
+        b) BATCH="$OPTARG"
+        ;;
+        r) REBUILD_PERCENT="$OPTARG"
+        ;;
+        v) VERBOSE=1
+        ;;
+        \?) usage && exit
+        ;;
+        :) die "-$OPTARG requires an argument"
+        ;;
+    esac
+done
+
+BATCH="${BATCH:-100000}"
+REBUILD_PERCENT="${REBUILD_PERCENT:-50}"
+
+for v in \
+    DWH_TABLES_KEEP_SAMPLES \
+    DWH_TABLES_KEEP_HOURLY \
+    DWH_TABLES_KEEP_DAILY \
+    BATCH \
+    REBUILD_PERCENT \
+    ; do
+    eval "value=\"\${${v}}\""
+    echo "${value}" | grep -q '^[0-9][0-9]*$' || die "Invalid ${v} '${value}'"
+done
+
+# setups with 'trust' may have empty passwords
+[[ -n $DWH_DB_PASSWORD ]] && generatePgPass
+
+dbquery() {
+    psql \
+    ${VERBOSE+-e} \
+    -X \
+    -q \
+    -A \
+    -t \
+    -v ON_ERROR_STOP=1 \
+    -h $DWH_DB_HOST \
+    -p $DWH_DB_PORT \
+    -U $DWH_DB_USER \
+    -d $DWH_DB_DATABASE \
+    -w \
+    -c "$1"
+}
+
+cutoff() {
+    local hours="$1"
+    echo "now() - interval '${hours} hours'"
+}
+
+# prints: table|kind|hours|rows outside the window|rows in the table|table bytes
+count_table() {
+    local table="$1"
+    local kind="$2"
+    local hours="$3"
+    dbquery "
+        SELECT
+            '${table}',
+            '${kind}',
+            ${hours},
+            count(*),
+            (
+                SELECT greatest(reltuples::bigint, 0)
+                FROM pg_class
+                WHERE oid = '${table}'::regclass
+            ),
+            pg_relation_size('${table}')
+        FROM ${table}
+        WHERE history_datetime < $(cutoff "${hours}")
+    " || die "Cannot count rows of ${table}"
+}
+
+count_tables() {
+    local t
+    for t in ${SAMPLES_TABLES}; do
+        count_table "${t}" samples "${DWH_TABLES_KEEP_SAMPLES}"
+    done
+    for t in ${HOURLY_TABLES}; do
+        count_table "${t}" hourly "${DWH_TABLES_KEEP_HOURLY}"
+    done
+    for t in ${DAILY_TABLES}; do
+        count_table "${t}" daily "${DWH_TABLES_KEEP_DAILY}"
+    done
+}
+
+#
+# Estimate the way the DWH delete job works through the backlog:
+# every iteration deletes a batch from each table, starting at
+# DWH_DELETE_MULTIPLIER rows and at best doubling up to
+# DWH_DELETE_MAX_BATCH, each batch taking up to DWH_DELETE_TARGET_LATENCY.
+# The write ahead log is assumed to carry about the size of the deleted
+# rows, as pages are logged in full when first modified after a
+# checkpoint, and is limited to DWH_DELETE_MAX_WAL_RATE.
+#
+plan() {
+    local counts
+    counts="$(count_tables)" || exit 1
+    echo "${counts}" | awk \
+        -F '|' \
+        -v initial="${DWH_DELETE_MULTIPLIER:-1000}" \
+        -v maxbatch="${DWH_DELETE_MAX_BATCH:-1000000}" \
+        -v latency="${DWH_DELETE_TARGET_LATENCY:-2000}" \
+        -v walrate="${DWH_DELETE_MAX_WAL_RATE:-10240}" \
+        -v pause="${DELETE_ITERATION_PAUSE}" \
+        -v hour="${DWH_DELETE_JOB_HOUR}" \
+        '
+        function batch_iterations(rows,    i, size, deleted) {
+            size = initial
+            for (i = 0; deleted < rows; i++) {
+                deleted += size
+                size = size * 2 > maxbatch ? maxbatch : size * 2
+            }
+            return i
+        }
+        function ceil(x) {
+            return x == int(x) ? x : int(x) + 1
+        }
+        function duration(secs) {
+            if (secs >= 86400) {
+                return sprintf("%d days", ceil(secs / 86400))
+            }
+            if (secs >= 3600) {
+                return sprintf("%d hours", ceil(secs / 3600))
+            }
+            return sprintf("%d minutes", ceil(secs / 60))
+        }
+        {
+            n++
+            table[n] = $1
+            kind[n] = $2
+            hours[n] = $3
+            rows[n] = $4
+            total[n] = $5
+            bytes[n] = $5 > 0 ? $4 * $6 / $5 : 0
+            iterations[n] = batch_iterations($4)
+            if ($4 > 0) {
+                active++
+            }
+            wal += bytes[n]
+        }
+        END {
+            printf("# %-36s %-8s %8s %12s %12s %10s %12s\n", \
+                "table", "kind", "hours", "rows", "total", "iterations", \
+                "seconds")
+            # every iteration deletes a batch of each table with rows left
+            step = pause + active * latency / 1000
+            # the write ahead log rate limits all the tables together
+            walrate *= 1024
+            longest = walrate > 0 ? wal / walrate : 0
+            for (i = 1; i <= n; i++) {
+                seconds[i] = iterations[i] * step
+                if (walrate > 0 && seconds[i] < bytes[i] / walrate) {
+                    seconds[i] = bytes[i] / walrate
+                }
+                printf("%-38s %-8s %8d %12d %12d %10d %12d\n", \
+                    table[i], kind[i], hours[i], rows[i], total[i], \
+                    iterations[i], seconds[i])
+                sum += rows[i]
+                if (seconds[i] > longest) {
+                    longest = seconds[i]
+                }
+            }
+            printf( \
+                "# %d rows outside the retention window, the delete job " \
+                "needs about %s starting at %02d:00\n", \
+                sum, duration(longest), hour)
+        }
+        '
+}
+
+purge_table() {
+    local table="$1"
+    local hours="$2"
+    local rows="$3"
+    local total="$4"
+    local deleted
+
+    if [ "${total}" -gt 0 ] && \
+        [ $((rows * 100)) -ge $((total * REBUILD_PERCENT)) ]; then
+        echo "Rebuilding ${table}, removing ${rows} of ${total} rows"
+        dbquery "
+            BEGIN;
+            SELECT history_table_rebuild('${table}', $(cutoff "${hours}"));
+            COMMIT;
+        " > /dev/null || die "Cannot rebuild ${table}"
+    else
+        echo "Deleting ${rows} rows of ${table}"
+        deleted="${BATCH}"
+        while [ "${deleted}" -ge "${BATCH}" ]; do
+            deleted="$(
+                dbquery "
+                    WITH deleted AS (
+                        DELETE FROM ${table}
+                        WHERE history_id IN (
+                            SELECT history_id
+                            FROM ${table}
+                            WHERE history_datetime < $(cutoff "${hours}")
+                            LIMIT ${BATCH}
+                        )
+                        RETURNING 1
+                    )
+                    SELECT count(*) FROM deleted
+                "
+            )" || die "Cannot delete rows of ${table}"
+        done
+    fi
+    dbquery "ANALYZE ${table}" || die "Cannot analyze ${table}"
+}
+
+purge() {
+    local table kind hours rows total
+    local counts
+    counts="$(count_tables)" || exit 1
+    echo "${counts}" | while IFS='|' read table kind hours rows total bytes; do
+        if [ "${rows}" -gt 0 ]; then
+            purge_table "${table}" "${hours}" "${rows}" "${total}"
+        fi
+    done
+}
+
+if [ -n "${PURGE}" ]; then
+    purge
+else
+    plan
+fi
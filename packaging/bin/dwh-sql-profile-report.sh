@@ -0,0 +1,143 @@
+#!/bin/sh
+
+. "$(dirname "$(readlink -f "$0")")"/dwh-prolog.sh
+
+PROFILE_NAME="ovirt-engine-dwhd-sql-profile"
+
+usage() {
+	cat << __EOF__
+Usage $0:
+
+    -d DIR      - directory of the profile files (default: PKG_LOG_DIR)
+    -n QUERIES  - number of queries to print (default: 20)
+    -s ORDER    - order the queries by one of
+                  total      - total milliseconds
+                  avg        - average milliseconds per execution
+                  max        - slowest execution
+                  executions - number of executions
+                  rows       - rows returned or changed
+                  (default: total)
+    -p          - print the latest plan recorded for every query
+
+    -h --help   - this help message
+
+Summarize the SQL profile written by the DWH service when DWH_PROFILE_SQL
+is enabled: per query, with literals replaced by ?, the executions, the
+milliseconds spent executing and fetching, and the rows.
+__EOF__
+}
+
+while getopts ":d:n:s:p" opt; do
+	case $opt in
+		d) DIR="$OPTARG"
+		;;
+		n) QUERIES="$OPTARG"
+		;;
+		s) ORDER="$OPTARG"
+		;;
+		p) PLANS=1
+		;;
+		\?) usage && exit
+		;;
+		:) die "-$OPTARG requires an argument"
+		;;
+	esac
+done
+
+DIR="${DIR:-${PKG_LOG_DIR}}"
+QUERIES="${QUERIES:-20}"
+ORDER="${ORDER:-total}"
+
+echo "${QUERIES}" | grep -q '^[0-9][0-9]*$' || die "Invalid QUERIES '${QUERIES}'"
+case "${ORDER}" in
+	total|avg|max|executions|rows) ;;
+	*) die "Invalid ORDER '${ORDER}'";;
+esac
+
+files="$(ls "${DIR}/${PROFILE_NAME}".*.log 2> /dev/null)"
+[ -n "${files}" ] || die "No SQL profile found in ${DIR}, is DWH_PROFILE_SQL enabled?"
+
+# statement: time, "statement", connection, executions, total ms, max ms, rows, query
+# explain:   time, "explain", connection, ms, query, sql, followed by the
+#            plan lines, each starting with a tab
+cat ${files} | awk \
+	-F '\t' \
+	-v queries="${QUERIES}" \
+	-v order="${ORDER}" \
+	-v plans="${PLANS}" \
+	'
+	$1 == "" {
+		if (inplan) {
+			plan[current] = plan[current] "    " $2 "\n"
+		}
+		next
+	}
+	$2 == "statement" {
+		inplan = 0
+		q = $8
+		if (!(q in executions)) {
+			n++
+			query[n] = q
+			connection[q] = $3
+		}
+		executions[q] += $4
+		total[q] += $5
+		if ($6 > max[q]) {
+			max[q] = $6
+		}
+		rows[q] += $7
+		next
+	}
+	$2 == "explain" {
+		# keep the latest plan of every query
+		inplan = $1 >= planned[$5]
+		if (inplan) {
+			current = $5
+			planned[current] = $1
+			plan[current] = sprintf("  plan at %s, %.1f ms:\n    %s\n", $1, $4, $6)
+		}
+		next
+	}
+	function key(q) {
+		if (order == "avg") {
+			return total[q] / executions[q]
+		}
+		if (order == "max") {
+			return max[q]
+		}
+		if (order == "executions") {
+			return executions[q]
+		}
+		if (order == "rows") {
+			return rows[q]
+		}
+		return total[q]
+	}
+	END {
+		printf("# %8s %12s %10s %10s %12s %-28s %s\n", \
+			"executions", "total_ms", "avg_ms", "max_ms", "rows", \
+			"connection", "query")
+		for (printed = 0; printed < queries && printed < n; printed++) {
+			best = 0
+			for (i = 1; i <= n; i++) {
+				if (!done[i] && (best == 0 || key(query[i]) > key(query[best]))) {
+					best = i
+				}
+			}
+			done[best] = 1
+			q = query[best]
+			printf("%10d %12.1f %10.3f %10.3f %12d %-28s %s\n", \
+				executions[q], total[q], total[q] / executions[q], \
+				max[q], rows[q], connection[q], q)
+			if (plans && q in plan) {
+				printf("%s", plan[q])
+			}
+			sum += total[q]
+		}
+		for (i = 1; i <= n; i++) {
+			all += total[query[i]]
+		}
+		printf("# %d queries, the ones printed took %.1f of %.1f ms profiled\n", \
+			n, sum, all)
+	}
+	'
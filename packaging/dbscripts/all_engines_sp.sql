@@ -0,0 +1,126 @@
+----------------------------------------------------------------
+-- Views of all the engines
+----------------------------------------------------------------
+
+-- The history database may keep the statistics of several engines, every
+-- one in a schema listed in public.dwh_engines, collected by a worker of
+-- dwhd of its own. When there are several, the all_engines schema has a
+-- view for every v4_3 view of public, of the same name, with the name of
+-- the engine first and the columns of the view after it, over the engines
+-- whose schema has the view with the same columns, which the schemas not
+-- upgraded yet may not have.
+--
+-- The views of a schema are dropped with the views depending on them
+-- whenever its views and stored procedures are refreshed, so the views of
+-- all_engines are created again every time. The schema and the views still
+-- there are kept, with their grants, and only the views of all_engines that
+-- are not over any view of public anymore, or all of them when there are
+-- less than two engines, are dropped.
+
+Create or replace FUNCTION all_engines_views_create()
+RETURNS VOID
+AS $procedure$
+declare
+	v_view record;
+	v_views text[] := '{}';
+begin
+	if
+		to_regclass('public.dwh_engines') is not null and
+		(select count(*) from public.dwh_engines) >= 2
+	then
+		create schema if not exists all_engines;
+
+		for v_view in
+			with engine_views as (
+				select
+					n.nspname as schema_name,
+					c.relname as view_name,
+					string_agg(
+						quote_ident(a.attname),
+						', '
+						order by a.attnum
+					) as columns,
+					string_agg(
+						quote_ident(a.attname) || ' ' ||
+							format_type(a.atttypid, a.atttypmod),
+						', '
+						order by a.attnum
+					) as signature
+				from pg_catalog.pg_class c
+					join pg_catalog.pg_namespace n
+						on (n.oid = c.relnamespace)
+					join pg_catalog.pg_attribute a
+						on (a.attrelid = c.oid)
+				where
+					n.nspname in (select schema_name from public.dwh_engines) and
+					c.relkind = 'v' and
+					c.relname like 'v4\_3\_%' and
+					a.attnum > 0 and
+					not a.attisdropped
+				group by n.nspname, c.relname
+			)
+			select
+				p.view_name,
+				string_agg(
+					format(
+						'select %L::varchar(63) as engine_name, %s from %I.%I',
+						e.engine_name,
+						p.columns,
+						e.schema_name,
+						p.view_name
+					),
+					' union all '
+					order by e.engine_name
+				) as query
+			from engine_views p
+				join engine_views o
+					on (
+						o.view_name = p.view_name and
+						o.signature = p.signature
+					)
+				join public.dwh_engines e
+					on (e.schema_name = o.schema_name)
+			where p.schema_name = 'public'
+			group by p.view_name
+		loop
+			begin
+				execute format(
+					'create or replace view all_engines.%I as %s',
+					v_view.view_name,
+					v_view.query
+				);
+			exception
+				-- the columns of the view changed
+				when invalid_table_definition then
+					execute format(
+						'drop view all_engines.%I',
+						v_view.view_name
+					);
+					execute format(
+						'create view all_engines.%I as %s',
+						v_view.view_name,
+						v_view.query
+					);
+			end;
+			v_views := v_views || v_view.view_name::text;
+		end loop;
+	end if;
+
+	for v_view in
+		select c.relname as view_name
+		from pg_catalog.pg_class c
+			join pg_catalog.pg_namespace n
+				on (n.oid = c.relnamespace)
+		where
+			n.nspname = 'all_engines' and
+			c.relkind = 'v' and
+			c.relname::text <> all(v_views)
+	loop
+		execute format('drop view all_engines.%I', v_view.view_name);
+	end loop;
+end; $procedure$
+LANGUAGE plpgsql;
+
+-- the refresh of the views of any engine drops the views of all_engines
+-- over them
+select all_engines_views_create();
@@ -10,7 +10,7 @@ declare
 v_sql text;
 
 begin
-	if (not exists (select 1 from information_schema.columns where table_name ilike v_table and column_name ilike v_column)) then
+	if (not exists (select 1 from information_schema.columns where table_schema = current_schema() and table_name ilike v_table and column_name ilike v_column)) then
 	    begin
 		v_sql := 'ALTER TABLE ' || v_table || ' ADD COLUMN ' || v_column || ' ' || v_column_def;
 		EXECUTE v_sql;
@@ -26,7 +26,7 @@ AS $procedure$
 declare
 v_sql text;
 begin
-        if (exists (select 1 from information_schema.columns where table_name ilike v_table and column_name ilike v_column)) then
+        if (exists (select 1 from information_schema.columns where table_schema = current_schema() and table_name ilike v_table and column_name ilike v_column)) then
             begin
                 v_sql := 'ALTER TABLE ' || v_table || ' DROP COLUMN ' || v_column;
                 EXECUTE v_sql;
@@ -44,7 +44,7 @@ declare
 v_sql text;
 
 begin
-	if (exists (select 1 from information_schema.columns where table_name ilike v_table and column_name ilike v_column and (udt_name ilike v_type or data_type ilike v_type))) then
+	if (exists (select 1 from information_schema.columns where table_schema = current_schema() and table_name ilike v_table and column_name ilike v_column and (udt_name ilike v_type or data_type ilike v_type))) then
 	    begin
 		v_sql := 'ALTER TABLE ' || v_table || ' ALTER COLUMN ' || v_column || ' TYPE ' || v_new_type;
 		EXECUTE v_sql;
@@ -61,7 +61,7 @@ declare
 v_sql text;
 
 begin
-	if (exists (select 1 from information_schema.columns where table_name ilike v_table and column_name ilike v_column)) then
+	if (exists (select 1 from information_schema.columns where table_schema = current_schema() and table_name ilike v_table and column_name ilike v_column)) then
 	    begin
 		v_sql := 'ALTER TABLE ' || v_table || ' RENAME COLUMN ' || v_column || ' TO ' || v_new_name;
 		EXECUTE v_sql;
@@ -257,28 +257,28 @@ LANGUAGE plpgsql;
 Create or replace FUNCTION generate_drop_all_functions_syntax() RETURNS SETOF text STABLE
    AS $procedure$
 BEGIN
-RETURN QUERY select 'drop function if exists ' || ns.nspname || '.' || proname || '(' || oidvectortypes(proargtypes) || ') cascade;' from pg_proc inner join pg_namespace ns on (pg_proc.pronamespace=ns.oid) where ns.nspname = 'public' and proname not ilike 'uuid%' order by proname;
+RETURN QUERY select 'drop function if exists ' || ns.nspname || '.' || proname || '(' || oidvectortypes(proargtypes) || ') cascade;' from pg_proc inner join pg_namespace ns on (pg_proc.pronamespace=ns.oid) where ns.nspname = current_schema() and proname not ilike 'uuid%' order by proname;
 END; $procedure$
 LANGUAGE plpgsql;
 
 Create or replace FUNCTION generate_drop_all_views_syntax() RETURNS SETOF text STABLE
    AS $procedure$
 BEGIN
-RETURN QUERY select 'DROP VIEW if exists ' || table_name || ' CASCADE;' from information_schema.views where table_schema = 'public' order by table_name;
+RETURN QUERY select 'DROP VIEW if exists ' || table_name || ' CASCADE;' from information_schema.views where table_schema = current_schema() order by table_name;
 END; $procedure$
 LANGUAGE plpgsql;
 
 Create or replace FUNCTION generate_drop_all_tables_syntax() RETURNS SETOF text STABLE
    AS $procedure$
 BEGIN
-RETURN QUERY select 'DROP TABLE if exists ' || table_name || ' CASCADE;' from information_schema.tables where table_schema = 'public' and table_type = 'BASE TABLE' order by table_name;
+RETURN QUERY select 'DROP TABLE if exists ' || table_name || ' CASCADE;' from information_schema.tables where table_schema = current_schema() and table_type = 'BASE TABLE' order by table_name;
 END; $procedure$
 LANGUAGE plpgsql;
 
 Create or replace FUNCTION generate_drop_all_seq_syntax() RETURNS SETOF text STABLE
    AS $procedure$
 BEGIN
-RETURN QUERY select 'DROP SEQUENCE if exists ' || sequence_name || ' CASCADE;' from information_schema.sequences  where sequence_schema = 'public' order by sequence_name;
+RETURN QUERY select 'DROP SEQUENCE if exists ' || sequence_name || ' CASCADE;' from information_schema.sequences  where sequence_schema = current_schema() order by sequence_name;
 END; $procedure$
 LANGUAGE plpgsql;
 
@@ -288,7 +288,7 @@ BEGIN
 RETURN QUERY SELECT 'DROP TYPE if exists ' || c.relname::information_schema.sql_identifier || ' CASCADE;'
    FROM pg_namespace n, pg_class c, pg_type t
    WHERE n.oid = c.relnamespace and t.typrelid = c.oid and c.relkind = 'c'::"char" and
-   n.nspname = 'public'
+   n.nspname = current_schema()
    ORDER BY  c.relname::information_schema.sql_identifier;
 END; $procedure$
 LANGUAGE plpgsql;
@@ -301,7 +301,7 @@ BEGIN
    retvalue := character_maximum_length from information_schema.columns
     where
     table_name ilike v_table and column_name ilike v_column and
-    table_schema = 'public' and udt_name in ('char','varchar');
+    table_schema = current_schema() and udt_name in ('char','varchar');
    return retvalue;
 END; $procedure$
 LANGUAGE plpgsql;
@@ -465,7 +465,7 @@ begin
         begin
             -- verify that there is such object in db
             if exists (select 1 from information_schema.columns
-                       where table_name = v_object_name and column_name = v_column_name) then
+                       where table_schema = current_schema() and table_name = v_object_name and column_name = v_column_name) then
                 insert into object_column_white_list (object_name, column_name) values (v_object_name, v_column_name);
             end if;
         end;
@@ -0,0 +1,72 @@
+/**************************************
+    VIEWS OF THE ETL JOB RUNS
+**************************************/
+
+-- Duration percentiles and row counts of the runs of each job, per day
+CREATE OR REPLACE VIEW etl_job_runs_daily_view
+AS
+SELECT
+    job_name,
+    CAST(history_datetime AS date) AS run_date,
+    count(*) AS runs,
+    sum(CASE WHEN status = 'success' THEN 0 ELSE 1 END) AS failures,
+    percentile_cont(0.5) WITHIN GROUP (ORDER BY duration_ms) AS p50_duration_ms,
+    percentile_cont(0.95) WITHIN GROUP (ORDER BY duration_ms) AS p95_duration_ms,
+    max(duration_ms) AS max_duration_ms,
+    sum(rows_read) AS rows_read,
+    sum(rows_written) AS rows_written
+FROM etl_job_runs
+GROUP BY
+    job_name,
+    CAST(history_datetime AS date);
+
+-- Sample cycles that took longer than the sampling interval
+CREATE OR REPLACE VIEW etl_cycle_overruns_view
+AS
+SELECT
+    history_datetime AS cycle_datetime,
+    duration_ms,
+    sampling_interval,
+    duration_ms - sampling_interval * 1000 AS overrun_ms,
+    status
+FROM etl_job_runs
+WHERE
+    job_name = 'SampleRunJobs'
+    AND duration_ms > sampling_interval * 1000;
+
+/**************************************
+    VIEWS READ BY THE ETL JOBS
+**************************************/
+
+-- The VM samples with the attributes kept in vm_samples_attributes_history
+-- since they last changed, read by the hourly aggregation
+CREATE OR REPLACE VIEW vm_samples_history_view
+AS
+SELECT
+    a.history_id,
+    a.history_datetime,
+    a.vm_id,
+    a.vm_status,
+    a.seconds_in_status,
+    a.cpu_usage_percent,
+    a.memory_usage_percent,
+    a.user_cpu_usage_percent,
+    a.system_cpu_usage_percent,
+    c.vm_ip,
+    c.vm_client_ip,
+    a.current_user_id,
+    c.current_user_name,
+    a.user_logged_in_to_guest,
+    a.currently_running_on_host,
+    a.vm_configuration_version,
+    a.current_host_configuration_version,
+    a.memory_buffered_kb,
+    a.memory_cached_kb
+FROM vm_samples_history AS a
+    LEFT OUTER JOIN LATERAL (
+        SELECT vm_ip, vm_client_ip, current_user_name
+        FROM vm_samples_attributes_history
+        WHERE vm_id = a.vm_id AND history_datetime <= a.history_datetime
+        ORDER BY history_datetime DESC
+        LIMIT 1
+    ) AS c ON true;
@@ -8,24 +8,24 @@ CREATE OR REPLACE FUNCTION GetPathInNames(tagHistoryID int)
 RETURNS VARCHAR(4000)
    AS $function$
    DECLARE
-   v_id  UUID;
+   v_tag_id  UUID;
+   v_date  TIMESTAMP WITH TIME ZONE;
    v_path_names  VARCHAR(4000);
    SWV_path VARCHAR(4000);
 BEGIN
-   SELECT tag_path into SWV_path FROM tag_details WHERE history_id = tagHistoryID;
-   v_path_names := '/root';
+   SELECT tag_id, tag_path, coalesce(update_date, create_date) into v_tag_id, SWV_path, v_date FROM tag_details WHERE history_id = tagHistoryID;
    IF (SWV_path IS NULL or SWV_path = '') THEN
     RETURN SWV_path;
-   ELSEIF (SWV_path = '/00000000-0000-0000-0000-000000000000') THEN
-    RETURN v_path_names;
-   ELSE
-      SWV_path := SUBSTR(SWV_path,38);
-      WHILE (LENGTH(SWV_path) > 0) LOOP
-         v_id := cast(SUBSTR(SWV_path,2,36) as UUID);
-         SWV_path := SUBSTR(SWV_path,38);
-         SELECT  v_path_names || '/' || tag_name INTO v_path_names FROM tag_details where tag_id = v_id;
-      END LOOP;
    end if;
+   /* names of the ancestors below the root when this version of the tag was written */
+   SELECT '/root' || coalesce(string_agg('/' || n.tag_name, '' ORDER BY c.depth DESC), '') INTO v_path_names
+   FROM tag_closure_history c
+        JOIN LATERAL (SELECT tag_name FROM tag_details WHERE tag_id = c.ancestor_id ORDER BY history_id DESC LIMIT 1) n ON true
+   WHERE c.descendant_id = v_tag_id
+     and c.depth > 0
+     and c.ancestor_id <> '00000000-0000-0000-0000-000000000000'
+     and c.attach_date <= v_date
+     and (c.detach_date IS NULL or c.detach_date > v_date);
    RETURN v_path_names;
 END; $function$
 LANGUAGE plpgsql;
@@ -34,18 +34,18 @@ CREATE OR REPLACE FUNCTION GetPathIDs(currentTagID UUID, runNumber int default 0
 RETURNS VARCHAR(4000)
    AS $function$
    DECLARE
-    ParentID UUID;
+    v_path VARCHAR(4000);
 BEGIN
    IF currentTagID IS NULL then
       RETURN NULL;
    end if;
-   select parent_id INTO ParentID FROM tag_relations_history WHERE entity_id = currentTagID and history_id in  (SELECT max(a.history_id)
-                                                        FROM tag_relations_history a
-                                                        WHERE a.entity_id = currentTagID);
+   SELECT string_agg('/' || CAST(ancestor_id AS VARCHAR(36)), '' ORDER BY depth DESC) INTO v_path
+   FROM tag_closure_history
+   WHERE descendant_id = currentTagID and depth > 0 and detach_date IS NULL;
     IF runNumber = 0 then
-        RETURN coalesce(GetPathIDs(ParentID, runNumber + 1),'/');
+        RETURN coalesce(v_path,'/');
     ELSE
-        RETURN coalesce(GetPathIDs(ParentID, runNumber + 1) || '/' ,'/') || currentTagID;
+        RETURN coalesce(v_path,'') || '/' || currentTagID;
    end if;
 END; $function$
 LANGUAGE plpgsql;
@@ -61,28 +61,22 @@ BEGIN
                   tag_level,
                   create_date,
                   update_date)
-    select distinct a.tag_id,
+    select a.tag_id,
             a.tag_name,
             a.tag_description,
-            c.new_child_path || SUBSTR(a.tag_path,LENGTH(b.old_child_path) + 1),
-            LENGTH(c.new_child_path || SUBSTR(a.tag_path,LENGTH(b.old_child_path) + 1)) - LENGTH(REPLACE((c.new_child_path || SUBSTR(a.tag_path,LENGTH(b.old_child_path) + 1)),'/','')),
+            p.tag_path,
+            LENGTH(p.tag_path) - LENGTH(REPLACE(p.tag_path,'/','')),
             a.create_date,
             thisUpdate
-    FROM tag_details a,
-         (select e.tag_path || '/' || CAST(e.tag_id AS VARCHAR(36)) as old_child_path, e.tag_id as parent /*36 is the uuid length*/
+    FROM (select distinct c.descendant_id
           from tag_details e
-          where e.history_id in (SELECT max(f.history_id)
-                    FROM tag_details f
-                       WHERE (f.update_date < thisUpdate or f.update_date IS NULL)
-                    GROUP BY f.tag_id)
-           AND e.delete_date IS NULL) b,
-         (select tag_path || '/' || CAST(tag_id AS VARCHAR(36)) as new_child_path, tag_id as parent /*36 is the uuid length*/
-          from tag_details
-          where update_date = thisUpdate
-            and delete_date IS NULL) c
-    Where a.tag_path like b.old_child_path || '%' and
-          b.parent = c.parent and
-          not exists (SELECT z.tag_id, z.tag_path FROM tag_details as z WHERE tag_id = a.tag_id and z.tag_path = c.new_child_path || SUBSTR(a.tag_path,LENGTH(b.old_child_path) + 1));
+               JOIN tag_closure_history c ON (c.ancestor_id = e.tag_id and c.depth > 0 and c.detach_date IS NULL)
+          where e.update_date = thisUpdate
+            and e.delete_date IS NULL) b
+         JOIN tag_details a ON (a.history_id = (SELECT max(f.history_id) FROM tag_details f WHERE f.tag_id = b.descendant_id))
+         CROSS JOIN LATERAL (select CAST(GetPathIDs(a.tag_id) AS VARCHAR(4000)) as tag_path) p
+    Where a.delete_date IS NULL and
+          a.tag_path <> p.tag_path;
     RETURN;
 END; $procedure$
 LANGUAGE plpgsql;
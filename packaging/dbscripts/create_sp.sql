@@ -1 +1,115 @@
 --This file is a place holder for the creation of stored procedures in the oVirt Engine History database.
+
+----------------------------------------------------------------
+-- History delete
+----------------------------------------------------------------
+
+-- Returns the next batch of history_id values older than v_cutoff in a
+-- history table, walking history_id in key order instead of scanning the
+-- history_datetime index from its start on every batch.
+-- The position reached and the history_id bounding the rows older than the
+-- cutoff are checkpointed in history_configuration as 'position:bound',
+-- within the caller transaction, so that deleting resumes where it stopped.
+Create or replace FUNCTION history_delete_range(v_table varchar(128), v_cutoff timestamp with time zone, v_limit integer)
+returns SETOF bigint
+AS $procedure$
+declare
+v_var_name varchar(50);
+v_checkpoint varchar(255);
+v_checkpoint_cutoff timestamp with time zone;
+v_position bigint;
+v_bound bigint;
+v_ids bigint[];
+begin
+	v_var_name := 'deleteCheckpoint_' || v_table;
+
+	select var_value, var_datetime into v_checkpoint, v_checkpoint_cutoff
+	from history_configuration
+	where var_name = v_var_name;
+
+	if (v_checkpoint is not null) then
+		v_position := split_part(v_checkpoint, ':', 1)::bigint;
+		v_bound := split_part(v_checkpoint, ':', 2)::bigint;
+	else
+		execute format('select min(history_id) from %I', v_table) into v_position;
+		if (v_position is null) then
+			return;
+		end if;
+	end if;
+
+	-- find the cutoff history_id once, and again only when the rows
+	-- older than the previous cutoff are gone or the cutoff moved back
+	if (
+		v_checkpoint is null or
+		v_cutoff < v_checkpoint_cutoff or
+		(v_position >= v_bound and v_cutoff > v_checkpoint_cutoff)
+	) then
+		-- the lowest history_id of the rows at the oldest history_datetime
+		-- kept, not any of them, so that none below it is skipped
+		execute format(
+			'select min(history_id) from %I where history_datetime = (select min(history_datetime) from %I where history_datetime >= $1)',
+			v_table,
+			v_table
+		) into v_bound using v_cutoff;
+		if (v_bound is null) then
+			execute format('select max(history_id) + 1 from %I', v_table) into v_bound;
+		end if;
+		v_checkpoint_cutoff := v_cutoff;
+	end if;
+
+	if (v_position < v_bound) then
+		execute format(
+			'select array(select history_id from %I where history_id >= $1 and history_id < $2 and history_datetime < $3 order by history_id limit $4)',
+			v_table
+		) into v_ids using v_position, v_bound, v_cutoff, v_limit;
+		if (coalesce(array_length(v_ids, 1), 0) < v_limit) then
+			v_position := v_bound;
+		else
+			v_position := v_ids[array_length(v_ids, 1)] + 1;
+		end if;
+	end if;
+
+	update history_configuration
+	set
+		var_value = v_position || ':' || coalesce(v_bound, v_position),
+		var_datetime = v_checkpoint_cutoff
+	where var_name = v_var_name;
+	if (not found) then
+		insert into history_configuration(var_name, var_value, var_datetime)
+		values (v_var_name, v_position || ':' || coalesce(v_bound, v_position), v_checkpoint_cutoff);
+	end if;
+
+	if (v_ids is not null) then
+		return query select unnest(v_ids);
+	end if;
+END; $procedure$
+LANGUAGE plpgsql;
+
+----------------------------------------------------------------
+-- History rebuild
+----------------------------------------------------------------
+
+-- Rebuilds a history table with only its rows from v_cutoff on, which is
+-- faster than deleting when most of its rows are older. The kept rows are
+-- inserted back with the user triggers of the table disabled, as they
+-- were already processed when first inserted: the VM sample attributes
+-- would be replaced by the nulls left in the samples, and the interface
+-- rates computed again. To be called in a transaction, that keeps the
+-- table locked until it commits.
+Create or replace FUNCTION history_table_rebuild(v_table varchar(128), v_cutoff timestamp with time zone)
+RETURNS VOID
+AS $procedure$
+begin
+	execute format('lock table %I in access exclusive mode', v_table);
+	execute format(
+		'create temporary table history_rebuild_keep as select * from %I where history_datetime >= %L',
+		v_table,
+		v_cutoff
+	);
+	execute format('truncate table %I', v_table);
+	execute format('alter table %I disable trigger user', v_table);
+	execute format('insert into %I select * from history_rebuild_keep', v_table);
+	execute format('alter table %I enable trigger user', v_table);
+	drop table history_rebuild_keep;
+END; $procedure$
+LANGUAGE plpgsql;
@@ -519,8 +519,8 @@ SELECT
     a.memory_usage_percent as memory_usage_percent,
     a.user_cpu_usage_percent as user_cpu_usage_percent,
     a.system_cpu_usage_percent as system_cpu_usage_percent,
-    a.vm_ip as vm_ip,
-    a.vm_client_ip,
+    c.vm_ip as vm_ip,
+    c.vm_client_ip as vm_client_ip,
     a.currently_running_on_host as currently_running_on_host,
     a.current_user_id as current_user_id,
     a.user_logged_in_to_guest,
@@ -531,7 +531,14 @@ SELECT
     a.memory_cached_kb as memory_cached_kb
 FROM     vm_samples_history as a
         LEFT OUTER JOIN vm_disks_usage_samples_history as b
-            ON (a.history_datetime = b.history_datetime AND a.vm_id = b.vm_id);
+            ON (a.history_datetime = b.history_datetime AND a.vm_id = b.vm_id)
+        LEFT OUTER JOIN LATERAL (
+            SELECT vm_ip, vm_client_ip
+            FROM vm_samples_attributes_history
+            WHERE vm_id = a.vm_id AND history_datetime <= a.history_datetime
+            ORDER BY history_datetime DESC
+            LIMIT 1
+        ) as c ON true;
 
 CREATE OR REPLACE VIEW v3_6_statistics_vms_resources_usage_hourly
  AS
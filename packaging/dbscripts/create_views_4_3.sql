@@ -5,13 +5,10 @@
 CREATE OR REPLACE VIEW v4_3_enum_translator
  AS
 SELECT
-    enum_translator.enum_type as enum_type,
-    enum_translator.enum_key as enum_key,
-    enum_translator.value as value
-FROM enum_translator INNER JOIN
-            history_configuration ON
-                (enum_translator.language_code = history_configuration.var_value
-                and history_configuration.var_name = 'default_language');
+    enum_translator_default.enum_type as enum_type,
+    enum_translator_default.enum_key as enum_key,
+    enum_translator_default.value as value
+FROM enum_translator_default;
 
 CREATE OR REPLACE VIEW v4_3_configuration_history_datacenters
  AS
@@ -399,7 +396,11 @@ SELECT
       max_transmit_rate_percent as max_transmit_rate_percent,
       received_total_byte as received_total_byte,
       transmitted_total_byte as transmitted_total_byte,
-      host_interface_configuration_version as host_interface_configuration_version
+      host_interface_configuration_version as host_interface_configuration_version,
+      receive_rate_bytes_per_second as receive_rate_bytes_per_second,
+      max_receive_rate_bytes_per_second as max_receive_rate_bytes_per_second,
+      transmit_rate_bytes_per_second as transmit_rate_bytes_per_second,
+      max_transmit_rate_bytes_per_second as max_transmit_rate_bytes_per_second
 FROM host_interface_hourly_history;
 
 CREATE OR REPLACE VIEW v4_3_statistics_hosts_interfaces_resources_usage_daily
@@ -415,7 +416,11 @@ SELECT
       max_transmit_rate_percent as max_transmit_rate_percent,
       received_total_byte as received_total_byte,
       transmitted_total_byte as transmitted_total_byte,
-      host_interface_configuration_version as host_interface_configuration_version
+      host_interface_configuration_version as host_interface_configuration_version,
+      receive_rate_bytes_per_second as receive_rate_bytes_per_second,
+      max_receive_rate_bytes_per_second as max_receive_rate_bytes_per_second,
+      transmit_rate_bytes_per_second as transmit_rate_bytes_per_second,
+      max_transmit_rate_bytes_per_second as max_transmit_rate_bytes_per_second
 FROM host_interface_daily_history;
 
 CREATE OR REPLACE VIEW v4_3_fully_joined_statistics_hosts_resources_usage_samples
@@ -738,8 +743,8 @@ SELECT
     a.memory_usage_percent as memory_usage_percent,
     a.user_cpu_usage_percent as user_cpu_usage_percent,
     a.system_cpu_usage_percent as system_cpu_usage_percent,
-    a.vm_ip as vm_ip,
-    a.vm_client_ip,
+    c.vm_ip as vm_ip,
+    c.vm_client_ip as vm_client_ip,
     a.currently_running_on_host as currently_running_on_host,
     a.current_user_id as current_user_id,
     a.user_logged_in_to_guest,
@@ -750,7 +755,14 @@ SELECT
     a.memory_cached_kb as memory_cached_kb
 FROM     vm_samples_history as a
         LEFT OUTER JOIN vm_disks_usage_samples_history as b
-            ON (a.history_datetime = b.history_datetime AND a.vm_id = b.vm_id);
+            ON (a.history_datetime = b.history_datetime AND a.vm_id = b.vm_id)
+        LEFT OUTER JOIN LATERAL (
+            SELECT vm_ip, vm_client_ip
+            FROM vm_samples_attributes_history
+            WHERE vm_id = a.vm_id AND history_datetime <= a.history_datetime
+            ORDER BY history_datetime DESC
+            LIMIT 1
+        ) as c ON true;
 
 CREATE OR REPLACE VIEW v4_3_statistics_vms_resources_usage_hourly
  AS
@@ -920,7 +932,11 @@ SELECT
       max_transmit_rate_percent as max_transmit_rate_percent,
       received_total_byte as received_total_byte,
       transmitted_total_byte as transmitted_total_byte,
-      vm_interface_configuration_version as vm_interface_configuration_version
+      vm_interface_configuration_version as vm_interface_configuration_version,
+      receive_rate_bytes_per_second as receive_rate_bytes_per_second,
+      max_receive_rate_bytes_per_second as max_receive_rate_bytes_per_second,
+      transmit_rate_bytes_per_second as transmit_rate_bytes_per_second,
+      max_transmit_rate_bytes_per_second as max_transmit_rate_bytes_per_second
 FROM vm_interface_hourly_history;
 
 CREATE OR REPLACE VIEW v4_3_statistics_vms_interfaces_resources_usage_daily
@@ -936,7 +952,11 @@ SELECT
       max_transmit_rate_percent as max_transmit_rate_percent,
       received_total_byte as received_total_byte,
       transmitted_total_byte as transmitted_total_byte,
-      vm_interface_configuration_version as vm_interface_configuration_version
+      vm_interface_configuration_version as vm_interface_configuration_version,
+      receive_rate_bytes_per_second as receive_rate_bytes_per_second,
+      max_receive_rate_bytes_per_second as max_receive_rate_bytes_per_second,
+      transmit_rate_bytes_per_second as transmit_rate_bytes_per_second,
+      max_transmit_rate_bytes_per_second as max_transmit_rate_bytes_per_second
 FROM vm_interface_daily_history;
 
 CREATE OR REPLACE VIEW v4_3_configuration_history_vms_disks
@@ -1507,3 +1527,21 @@ SELECT  history_id as history_id,
 FROM         tag_details
 WHERE history_id in (SELECT max(a.history_id) FROM tag_details as a GROUP BY a.tag_id)
       and delete_date IS NULL;
+
+CREATE OR REPLACE VIEW v4_3_tags_hierarchy_history
+ AS
+SELECT  ancestor_id as ancestor_tag_id,
+        descendant_id as descendant_tag_id,
+        depth as depth,
+        attach_date as attach_date,
+        detach_date as detach_date
+FROM         tag_closure_history;
+
+CREATE OR REPLACE VIEW v4_3_latest_tags_hierarchy
+ AS
+SELECT  ancestor_id as ancestor_tag_id,
+        descendant_id as descendant_tag_id,
+        depth as depth,
+        attach_date as attach_date
+FROM         tag_closure_history
+WHERE       detach_date IS NULL;
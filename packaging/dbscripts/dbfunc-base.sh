@@ -5,6 +5,8 @@ DBFUNC_DB_PORT="${DBFUNC_DB_PORT:-5432}"
 #DBFUNC_DB_USER=
 #DBFUNC_DB_DATABASE=
 #DBFUNC_DB_PGPASSFILE=
+# schema the scripts create their objects in, public when empty
+#DBFUNC_DB_SCHEMA=
 
 PSQL="${PSQL:-psql}"
 PG_DUMP="${PG_DUMP:-pg_dump}"
@@ -28,7 +30,9 @@ dbfunc_cleanup() {
 }
 
 dbfunc_psql_raw() {
-	LC_ALL="C" "${PSQL}" \
+	LC_ALL="C" \
+	PGOPTIONS="${DBFUNC_DB_SCHEMA:+-c search_path=${DBFUNC_DB_SCHEMA} }${PGOPTIONS}" \
+	"${PSQL}" \
 		-w \
 		--pset=tuples_only=on \
 		${DBFUNC_LOGFILE:+--log-file="${DBFUNC_LOGFILE}"} \
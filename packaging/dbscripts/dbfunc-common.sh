@@ -13,6 +13,12 @@ dbfunc_common_hook_pre_upgrade() {
 	return 0
 }
 
+# called before the views are dropped, while their dependencies and
+# permissions can still be inspected
+dbfunc_common_hook_views_inspect() {
+	return 0
+}
+
 dbfunc_common_hook_views_refresh() {
 	return 0
 }
@@ -33,6 +39,16 @@ dbfunc_common_hook_sequence_numbers_update() {
 	return 0
 }
 
+# prints the checksum of the scripts the views and stored procedures were
+# last created from, nothing when it is not known
+dbfunc_common_hook_scripts_checksum_get() {
+	return 0
+}
+
+dbfunc_common_hook_scripts_checksum_set() {
+	return 0
+}
+
 #cleans db by dropping all objects
 dbfunc_common_schema_drop() {
 	dbfunc_psql_die --file="${DBFUNC_COMMON_DBSCRIPTS_DIR}/common_sp.sql" > /dev/null
@@ -64,13 +80,16 @@ dbfunc_common_schema_apply() {
 	# check database connection
 	dbfunc_psql_die --command="select 1;" > /dev/null
 
-	echo "Creating schema ${DBFUNC_DB_USER}@${DBFUNC_DB_HOST}:${DBFUNC_DB_PORT}/${DBFUNC_DB_DATABASE}"
+	echo "Creating schema ${DBFUNC_DB_USER}@${DBFUNC_DB_HOST}:${DBFUNC_DB_PORT}/${DBFUNC_DB_DATABASE}${DBFUNC_DB_SCHEMA:+/${DBFUNC_DB_SCHEMA}}"
+	if [ -n "${DBFUNC_DB_SCHEMA}" ]; then
+		dbfunc_psql_die --command="create schema if not exists \"${DBFUNC_DB_SCHEMA}\";" > /dev/null
+	fi
 	if [ "$(dbfunc_psql_statement_parsable "
 		select count(*) as count
 		from pg_catalog.pg_tables
 		where
 			tablename = 'schema_version' and
-			schemaname = 'public'
+			schemaname = current_schema()
 	")" -eq 0 ]; then
 		echo "Creating fresh schema"
 		_dbfunc_common_schema_create
@@ -80,6 +99,7 @@ dbfunc_common_schema_apply() {
 	echo "Saving custom users permissions on database objects..."
 	permissions="$(_dbfunc_common_get_custom_user_permissions)" || exit $?
 
+	dbfunc_common_hook_views_inspect
 	_dbfunc_common_schema_upgrade
 
 	dbfunc_common_restore_permissions "${permissions}"
@@ -91,6 +111,7 @@ dbfunc_common_schema_refresh() {
 	echo "Saving custom users permissions on database objects..."
 	permissions="$(_dbfunc_common_get_custom_user_permissions)" || exit $?
 
+	dbfunc_common_hook_views_inspect
 	_dbfunc_common_schema_refresh_drop
 	_dbfunc_common_schema_refresh_create
 
@@ -171,7 +192,7 @@ _dbfunc_common_schema_upgrade() {
 		local comment=""
 		local updated=0
 		_dbfunc_common_validate_version_uniqueness
-		if [ -z "${DBFUNC_COMMON_MD5FILE}" ] || ! _dbfunc_common_is_view_or_sp_changed; then
+		if ! _dbfunc_common_is_view_or_sp_changed; then
 			echo "upgrade script detected a change in Config, View or Stored Procedure..."
 			_dbfunc_common_run_pre_upgrade
 			updated=1
@@ -261,6 +282,7 @@ Please fix numbering to interval 0$(( ${last} + 1)) to 0$(( ${last} + 10)) and r
 		# restore views & SPs if dropped
 		if [ "${updated}" -eq 1 ]; then
 			_dbfunc_common_run_post_upgrade
+			dbfunc_common_hook_scripts_checksum_set "$(_dbfunc_common_scripts_checksum)"
 		else
 			echo "database is up to date."
 		fi
@@ -307,6 +329,8 @@ _dbfunc_common_get_custom_user_permissions() {
 }
 
 _dbfunc_common_run_pre_upgrade() {
+	#views & sps are not known to match the scripts until post upgrade
+	dbfunc_common_hook_scripts_checksum_set ""
 	#Dropping all views & sps
 	_dbfunc_common_schema_refresh_drop
 	# common stored procedures are executed first (for new added functions to be valid)
@@ -428,14 +452,31 @@ _dbfunc_common_get_files() {
 		sort
 }
 
-_dbfunc_common_is_view_or_sp_changed() {
-	local files="$(_dbfunc_common_get_files "upgrade" 3)"
-	local md5sum_tmp_file="${DBFUNC_COMMON_MD5FILE}.tmp"
-
+# md5sum of the upgrade scripts and of the views and stored procedures
+# scripts, relative to the dbscripts directory
+_dbfunc_common_scripts_md5sum() {
 	{
 		_dbfunc_common_get_files "upgrade" 3
 		find "${DBFUNC_COMMON_DBSCRIPTS_DIR}" -name 'create_*views.sql' -or -name '*_sp.sql'
-	} | sort | uniq | xargs -d '\n' md5sum > "${DBFUNC_COMMON_MD5FILE}.tmp"
+	} | LC_ALL=C sort | uniq | xargs -d '\n' md5sum | \
+		sed "s#  ${DBFUNC_COMMON_DBSCRIPTS_DIR}/#  #"
+}
+
+_dbfunc_common_scripts_checksum() {
+	_dbfunc_common_scripts_md5sum | md5sum | cut -d " " -f1
+}
+
+# succeeds when the scripts did not change since the views and stored
+# procedures were last created, according to the md5 file if one is used
+# and to the checksum kept in the database otherwise
+_dbfunc_common_is_view_or_sp_changed() {
+	if [ -z "${DBFUNC_COMMON_MD5FILE}" ]; then
+		local checksum="$(dbfunc_common_hook_scripts_checksum_get)"
+		[ -n "${checksum}" ] && [ "${checksum}" = "$(_dbfunc_common_scripts_checksum)" ]
+		return $?
+	fi
+
+	_dbfunc_common_scripts_md5sum > "${DBFUNC_COMMON_MD5FILE}.tmp"
 
 	diff -s -q "${DBFUNC_COMMON_MD5FILE}" "${DBFUNC_COMMON_MD5FILE}.tmp" > /dev/null 2>&1
 	result=$?
@@ -17,17 +17,181 @@ dbfunc_common_hook_init_insert_data() {
 	dbfunc_psql_die --file="${DBFUNC_COMMON_DBSCRIPTS_DIR}/insert_calendar_table_values.sql" > /dev/null
 }
 
+# view API versions, oldest first
+DBFUNC_CUSTOM_VIEWS_ALL_VERSIONS="3_6 4_0 4_1 4_2 4_3"
+DBFUNC_CUSTOM_VIEWS_CURRENT_VERSION="4_3"
+# view API versions to create besides the current one, the ones created
+# last time and the ones in use when empty
+#DBFUNC_CUSTOM_VIEWS_VERSIONS=
+
+# prints the versions of the views that objects not created by the
+# scripts depend on, or that custom users were granted permissions on
+_dbfunc_custom_views_versions_in_use() {
+	dbfunc_psql_statement_parsable "
+		select distinct substring(v.relname from '^v([0-9]+_[0-9]+)_')
+		from pg_catalog.pg_class v
+			join pg_catalog.pg_namespace n on n.oid = v.relnamespace
+		where
+			n.nspname = current_schema() and
+			v.relkind = 'v' and
+			v.relname ~ '^v[0-9]+_[0-9]+_' and
+			(
+				exists (
+					select 1
+					from pg_catalog.pg_depend d
+						join pg_catalog.pg_rewrite r on r.oid = d.objid
+						join pg_catalog.pg_class c on c.oid = r.ev_class
+						join pg_catalog.pg_namespace cn on cn.oid = c.relnamespace
+					where
+						d.classid = 'pg_catalog.pg_rewrite'::regclass and
+						d.refobjid = v.oid and
+						c.oid <> v.oid and
+						(
+							cn.nspname <> current_schema() or
+							c.relname !~ '^v[0-9]+_[0-9]+_'
+						)
+				) or
+				exists (
+					select 1
+					from aclexplode(v.relacl) a
+						join pg_catalog.pg_roles ro on ro.oid = a.grantee
+					where ro.rolname not in ('postgres', current_user)
+				)
+			)
+	"
+}
+
+# prints the views of the views API versions, one per line
+_dbfunc_custom_views_versioned() {
+	dbfunc_psql_statement_parsable "
+		select v.relname
+		from pg_catalog.pg_class v
+			join pg_catalog.pg_namespace n on n.oid = v.relnamespace
+		where
+			n.nspname = current_schema() and
+			v.relkind = 'v' and
+			v.relname ~ '^v[0-9]+_[0-9]+_'
+		order by v.relname
+	"
+}
+
+_dbfunc_custom_views_versions_get() {
+	dbfunc_psql_statement_parsable "
+		select var_value
+		from history_configuration
+		where var_name = 'viewsVersions'
+	"
+}
+
+_dbfunc_custom_views_versions_set() {
+	local versions="$1"
+	dbfunc_psql_die --command="
+		delete from history_configuration
+		where var_name = 'viewsVersions';
+		insert into history_configuration(var_name, var_value)
+		values ('viewsVersions', '${versions}');
+	" > /dev/null
+}
+
+# prints the known versions out of a list of versions separated by
+# spaces or commas, such as '4.1,4.2', oldest first and with the current
+# version
+_dbfunc_custom_views_versions_normalize() {
+	local requested="$(echo "$1" | tr ',.\n' ' _ ')"
+	local version
+	local versions
+	for version in ${requested}; do
+		echo " ${DBFUNC_CUSTOM_VIEWS_ALL_VERSIONS} " | grep -q " ${version} " \
+			|| die "Invalid views API version '${version}'"
+	done
+	for version in ${DBFUNC_CUSTOM_VIEWS_ALL_VERSIONS}; do
+		if echo " ${requested} ${DBFUNC_CUSTOM_VIEWS_CURRENT_VERSION} " | grep -q " ${version} "; then
+			versions="${versions:+${versions} }${version}"
+		fi
+	done
+	echo "${versions}"
+}
+
+dbfunc_common_hook_views_inspect() {
+	local versions="${DBFUNC_CUSTOM_VIEWS_VERSIONS}"
+	local previous
+	local views
+	local view
+	local version
+	previous="$(_dbfunc_custom_views_versions_get)" || exit 1
+	views="$(_dbfunc_custom_views_versioned)" || exit 1
+	if [ -z "${versions}" ] && [ -z "${previous}" ]; then
+		# the versions created last time are not known yet, it is the
+		# first upgrade to choose them, keep all the existing ones
+		for view in ${views}; do
+			version="$(echo "${view}" | sed 's/^v\([0-9]*_[0-9]*\)_.*/\1/')"
+			echo " ${DBFUNC_CUSTOM_VIEWS_ALL_VERSIONS} " | grep -q " ${version} " \
+				&& versions="${versions} ${version}"
+		done
+	elif [ -z "${versions}" ]; then
+		echo "Looking for views API versions in use..."
+		versions="${previous} $(_dbfunc_custom_views_versions_in_use)" || exit 1
+	fi
+	DBFUNC_CUSTOM_VIEWS_VERSIONS="$(_dbfunc_custom_views_versions_normalize "${versions}")" || exit 1
+
+	for view in ${views}; do
+		version="$(echo "${view}" | sed 's/^v\([0-9]*_[0-9]*\)_.*/\1/')"
+		echo " ${DBFUNC_CUSTOM_VIEWS_VERSIONS} " | grep -q " ${version} " \
+			|| echo "Warning: dropping view ${view}, views API $(echo "${version}" | tr '_' '.') is not in use"
+	done
+
+	if [ "${DBFUNC_CUSTOM_VIEWS_VERSIONS}" != "${previous}" ]; then
+		#other views are to be created, force their refresh
+		dbfunc_common_hook_scripts_checksum_set ""
+		[ -n "${DBFUNC_COMMON_MD5FILE}" ] && rm -f "${DBFUNC_COMMON_MD5FILE}" > /dev/null 2>&1
+	fi
+	return 0
+}
+
 dbfunc_common_hook_views_refresh() {
-	echo "Creating views API 3.6..."
-	dbfunc_psql_die --file="${DBFUNC_COMMON_DBSCRIPTS_DIR}/create_views_3_6.sql" > /dev/null
-	echo "Creating views API 4.0..."
-	dbfunc_psql_die --file="${DBFUNC_COMMON_DBSCRIPTS_DIR}/create_views_4_0.sql" > /dev/null
-	echo "Creating views API 4.1..."
-	dbfunc_psql_die --file="${DBFUNC_COMMON_DBSCRIPTS_DIR}/create_views_4_1.sql" > /dev/null
-	echo "Creating views API 4.2..."
-	dbfunc_psql_die --file="${DBFUNC_COMMON_DBSCRIPTS_DIR}/create_views_4_2.sql" > /dev/null
-	echo "Creating ovirt engine reports views..."
-	dbfunc_psql_die --file="${DBFUNC_COMMON_DBSCRIPTS_DIR}/create_views_4_3.sql" > /dev/null
+	local version
+	for version in ${DBFUNC_CUSTOM_VIEWS_VERSIONS:-${DBFUNC_CUSTOM_VIEWS_ALL_VERSIONS}}; do
+		echo "Creating views API $(echo "${version}" | tr '_' '.')..."
+		dbfunc_psql_die --file="${DBFUNC_COMMON_DBSCRIPTS_DIR}/create_views_${version}.sql" > /dev/null
+	done
 	echo "Creating ovirt engine reports views..."
 	dbfunc_psql_die --file="${DBFUNC_COMMON_DBSCRIPTS_DIR}/create_reports_views.sql" > /dev/null
+	echo "Creating ETL views..."
+	dbfunc_psql_die --file="${DBFUNC_COMMON_DBSCRIPTS_DIR}/create_etl_views.sql" > /dev/null
+	_dbfunc_custom_views_versions_set "${DBFUNC_CUSTOM_VIEWS_VERSIONS:-${DBFUNC_CUSTOM_VIEWS_ALL_VERSIONS}}"
+}
+
+dbfunc_common_hook_materialized_views_install() {
+	echo "Creating materialized views functions..."
+	dbfunc_psql_die --file="${DBFUNC_COMMON_DBSCRIPTS_DIR}/materialized_views_sp.sql" > /dev/null
+}
+
+dbfunc_common_hook_materialized_views_drop() {
+	echo "Dropping materialized views..."
+	dbfunc_psql_die --command="select materialized_views_drop();" > /dev/null
+}
+
+dbfunc_common_hook_materialized_viewsrefresh_() {
+	echo "Creating materialized views..."
+	dbfunc_psql_die --command="select materialized_views_create();" > /dev/null
+	echo "Filling dashboard tables..."
+	dbfunc_psql_die --command="select dashboard_summary_create();" > /dev/null
+}
+
+dbfunc_common_hook_scripts_checksum_get() {
+	dbfunc_psql_statement_parsable "
+		select var_value
+		from history_configuration
+		where var_name = 'scriptsChecksum'
+	"
+}
+
+dbfunc_common_hook_scripts_checksum_set() {
+	local checksum="$1"
+	dbfunc_psql_die --command="
+		delete from history_configuration
+		where var_name = 'scriptsChecksum';
+		insert into history_configuration(var_name, var_value)
+		values ('scriptsChecksum', '${checksum}');
+	" > /dev/null
 }
@@ -0,0 +1,53 @@
+----------------------------------------------------------------
+-- Enum translations to the default language
+----------------------------------------------------------------
+
+-- v4_3_enum_translator used to join enum_translator with the
+-- default_language of history_configuration on every query. The
+-- translations to the default language are kept in
+-- enum_translator_default instead, keyed by the enum type and key only,
+-- and rebuilt whenever the translations or the default language change.
+
+Create or replace FUNCTION enum_translator_default_refresh()
+RETURNS VOID
+AS $procedure$
+begin
+	delete from enum_translator_default;
+	insert into enum_translator_default(enum_type, enum_key, value)
+	select e.enum_type, e.enum_key, e.value
+	from enum_translator e
+		join history_configuration h
+			on (
+				h.var_name = 'default_language' and
+				e.language_code = h.var_value
+			);
+end; $procedure$
+LANGUAGE plpgsql;
+
+Create or replace FUNCTION enum_translator_default_refresh_trigger()
+RETURNS TRIGGER
+AS $procedure$
+begin
+	perform enum_translator_default_refresh();
+	return null;
+end; $procedure$
+LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS enum_translator_default_refresh ON enum_translator;
+
+CREATE TRIGGER enum_translator_default_refresh
+	AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON enum_translator
+	FOR EACH STATEMENT
+	EXECUTE PROCEDURE enum_translator_default_refresh_trigger();
+
+DROP TRIGGER IF EXISTS enum_translator_default_refresh ON history_configuration;
+
+CREATE TRIGGER enum_translator_default_refresh
+	AFTER INSERT OR UPDATE ON history_configuration
+	FOR EACH ROW
+	WHEN (NEW.var_name = 'default_language')
+	EXECUTE PROCEDURE enum_translator_default_refresh_trigger();
+
+-- the upgrade scripts update the translations while the triggers are
+-- dropped with the stored procedures
+select enum_translator_default_refresh();
@@ -0,0 +1,256 @@
+----------------------------------------------------------------
+-- Interface byte rates
+----------------------------------------------------------------
+
+-- The hourly and daily interface statistics keep the average and the
+-- maximum of the receive and transmit rate percentages reported by the
+-- engine. The byte rates are derived from the received and transmitted
+-- byte counters of consecutive samples instead, when every hourly and
+-- daily aggregation commits.
+--
+-- The interfaceSamplesStorage option of history_configuration sets what
+-- the samples keep:
+--   full     - the rate percentages and the byte counters (default)
+--   counters - the byte counters only, the hourly rate percentages are
+--              derived from the byte rates and the interface speed
+
+-- Returns the interface statistics tables, with the column of the
+-- interface and the configuration of its speed.
+Create or replace FUNCTION interface_rates_list()
+returns TABLE(
+	samples_table varchar(128),
+	hourly_table varchar(128),
+	daily_table varchar(128),
+	id_column varchar(128),
+	configuration_table varchar(128),
+	configuration_version_column varchar(128),
+	speed_column varchar(128)
+) IMMUTABLE
+AS $procedure$
+begin
+	return query
+	select
+		v.samples_table::varchar(128),
+		v.hourly_table::varchar(128),
+		v.daily_table::varchar(128),
+		v.id_column::varchar(128),
+		v.configuration_table::varchar(128),
+		v.configuration_version_column::varchar(128),
+		v.speed_column::varchar(128)
+	from (
+		values
+			(
+				'host_interface_samples_history',
+				'host_interface_hourly_history',
+				'host_interface_daily_history',
+				'host_interface_id',
+				'host_interface_configuration',
+				'host_interface_configuration_version',
+				'host_interface_speed_bps'
+			),
+			(
+				'vm_interface_samples_history',
+				'vm_interface_hourly_history',
+				'vm_interface_daily_history',
+				'vm_interface_id',
+				'vm_interface_configuration',
+				'vm_interface_configuration_version',
+				'vm_interface_speed_bps'
+			)
+	) as v(
+		samples_table,
+		hourly_table,
+		daily_table,
+		id_column,
+		configuration_table,
+		configuration_version_column,
+		speed_column
+	);
+end; $procedure$
+LANGUAGE plpgsql;
+
+Create or replace FUNCTION interface_samples_storage()
+returns varchar(255) STABLE
+AS $procedure$
+begin
+	return coalesce(
+		(
+			select var_value
+			from history_configuration
+			where var_name = 'interfaceSamplesStorage'
+		),
+		'full'
+	);
+end; $procedure$
+LANGUAGE plpgsql;
+
+-- Sets the byte rates of the hourly rows of the hours starting from
+-- v_from to v_to. The rate of a sample is the difference between its
+-- counters and the ones of the previous sample of the interface, a
+-- counter lower than the previous one being reset to zero since.
+Create or replace FUNCTION interface_rates_refresh_hourly(
+	v_from TIMESTAMP WITH TIME ZONE,
+	v_to TIMESTAMP WITH TIME ZONE
+)
+RETURNS VOID
+AS $procedure$
+declare
+	v_table record;
+	v_counters boolean;
+begin
+	v_counters := interface_samples_storage() = 'counters';
+	for v_table in select * from interface_rates_list() loop
+		execute format(
+			$sql$
+				update %2$I h
+				set
+					receive_rate_bytes_per_second = r.receive_rate,
+					max_receive_rate_bytes_per_second = r.max_receive_rate,
+					transmit_rate_bytes_per_second = r.transmit_rate,
+					max_transmit_rate_bytes_per_second = r.max_transmit_rate
+				from (
+					select
+						d.id,
+						$1 + floor(extract(epoch from d.history_datetime - $1) / 3600) * interval '1 hour' as hour,
+						round(sum(d.received) / nullif(sum(d.seconds) filter (where d.received is not null), 0)) as receive_rate,
+						round(max(d.received / d.seconds)) as max_receive_rate,
+						round(sum(d.transmitted) / nullif(sum(d.seconds) filter (where d.transmitted is not null), 0)) as transmit_rate,
+						round(max(d.transmitted / d.seconds)) as max_transmit_rate
+					from (
+						select
+							s.%3$I as id,
+							s.history_datetime,
+							extract(epoch from s.history_datetime - lag(s.history_datetime) over w) as seconds,
+							case
+								when s.received_total_byte >= lag(s.received_total_byte) over w
+									then s.received_total_byte - lag(s.received_total_byte) over w
+								when lag(s.received_total_byte) over w is not null
+									then s.received_total_byte
+							end as received,
+							case
+								when s.transmitted_total_byte >= lag(s.transmitted_total_byte) over w
+									then s.transmitted_total_byte - lag(s.transmitted_total_byte) over w
+								when lag(s.transmitted_total_byte) over w is not null
+									then s.transmitted_total_byte
+							end as transmitted
+						from %1$I s
+						where
+							s.history_datetime >= $1 - interval '1 hour' and
+							s.history_datetime < $2
+						window w as (partition by s.%3$I order by s.history_datetime)
+					) d
+					where
+						d.history_datetime >= $1 and
+						d.seconds > 0
+					group by d.id, hour
+				) r
+				where
+					h.%3$I = r.id and
+					h.history_datetime = r.hour
+			$sql$,
+			v_table.samples_table,
+			v_table.hourly_table,
+			v_table.id_column
+		)
+		using v_from, v_to;
+
+		if v_counters then
+			-- the engine reports the interface speed in Mbps
+			execute format(
+				$sql$
+					update %1$I h
+					set
+						receive_rate_percent = least(h.receive_rate_bytes_per_second * 8 / (c.%4$I * 10000.0), 100),
+						max_receive_rate_percent = least(h.max_receive_rate_bytes_per_second * 8 / (c.%4$I * 10000.0), 100),
+						transmit_rate_percent = least(h.transmit_rate_bytes_per_second * 8 / (c.%4$I * 10000.0), 100),
+						max_transmit_rate_percent = least(h.max_transmit_rate_bytes_per_second * 8 / (c.%4$I * 10000.0), 100)
+					from %2$I c
+					where
+						c.history_id = h.%3$I and
+						c.%4$I > 0 and
+						h.history_datetime >= $1 and
+						h.history_datetime < $2
+				$sql$,
+				v_table.hourly_table,
+				v_table.configuration_table,
+				v_table.configuration_version_column,
+				v_table.speed_column
+			)
+			using v_from, v_to;
+		end if;
+	end loop;
+end; $procedure$
+LANGUAGE plpgsql;
+
+-- Sets the byte rates of the daily rows of the days starting from v_from
+-- to v_to from the ones of their hours.
+Create or replace FUNCTION interface_rates_refresh_daily(
+	v_from TIMESTAMP WITH TIME ZONE,
+	v_to TIMESTAMP WITH TIME ZONE
+)
+RETURNS VOID
+AS $procedure$
+declare
+	v_table record;
+begin
+	for v_table in select * from interface_rates_list() loop
+		execute format(
+			$sql$
+				update %2$I d
+				set
+					receive_rate_bytes_per_second = r.receive_rate,
+					max_receive_rate_bytes_per_second = r.max_receive_rate,
+					transmit_rate_bytes_per_second = r.transmit_rate,
+					max_transmit_rate_bytes_per_second = r.max_transmit_rate
+				from (
+					select
+						h.%3$I as id,
+						cast(h.history_datetime as date) as day,
+						round(avg(h.receive_rate_bytes_per_second)) as receive_rate,
+						max(h.max_receive_rate_bytes_per_second) as max_receive_rate,
+						round(avg(h.transmit_rate_bytes_per_second)) as transmit_rate,
+						max(h.max_transmit_rate_bytes_per_second) as max_transmit_rate
+					from %1$I h
+					where
+						h.history_datetime >= $1 and
+						h.history_datetime < $2
+					group by h.%3$I, cast(h.history_datetime as date)
+				) r
+				where
+					d.%3$I = r.id and
+					d.history_datetime = r.day
+			$sql$,
+			v_table.hourly_table,
+			v_table.daily_table,
+			v_table.id_column
+		)
+		using v_from, v_to;
+	end loop;
+end; $procedure$
+LANGUAGE plpgsql;
+
+Create or replace FUNCTION interface_samples_storage_trigger()
+returns trigger
+AS $procedure$
+begin
+	if interface_samples_storage() = 'counters' then
+		NEW.receive_rate_percent := null;
+		NEW.transmit_rate_percent := null;
+	end if;
+	return NEW;
+end; $procedure$
+LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS interface_samples_storage ON host_interface_samples_history;
+
+CREATE TRIGGER interface_samples_storage
+	BEFORE INSERT ON host_interface_samples_history
+	FOR EACH ROW
+	EXECUTE PROCEDURE interface_samples_storage_trigger();
+
+DROP TRIGGER IF EXISTS interface_samples_storage ON vm_interface_samples_history;
+
+CREATE TRIGGER interface_samples_storage
+	BEFORE INSERT ON vm_interface_samples_history
+	FOR EACH ROW
+	EXECUTE PROCEDURE interface_samples_storage_trigger();
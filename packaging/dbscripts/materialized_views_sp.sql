@@ -0,0 +1,434 @@
+----------------------------------------------------------------
+-- Materialized fully joined statistics views
+----------------------------------------------------------------
+
+-- The hourly and daily fully joined statistics views join the statistics
+-- with the configuration history of the entity, its disks and interfaces
+-- on every query. Their rows are kept in v4_3_mv_* tables of the same
+-- columns, created by materialized_views_create() and refreshed for the
+-- hour or the day of every aggregation when it commits.
+
+-- Returns the materialized views, with their table, the column of the
+-- entity they are queried by, the history table bounding their rows and
+-- the aggregation refreshing them.
+Create or replace FUNCTION materialized_views_list()
+returns TABLE(
+	view_name varchar(128),
+	table_name varchar(128),
+	id_column varchar(128),
+	history_table varchar(128),
+	aggregation varchar(16)
+) IMMUTABLE
+AS $procedure$
+begin
+	return query
+	select
+		v.view_name::varchar(128),
+		v.table_name::varchar(128),
+		v.id_column::varchar(128),
+		v.history_table::varchar(128),
+		v.aggregation::varchar(16)
+	from (
+		values
+			(
+				'v4_3_fully_joined_statistics_hosts_resources_usage_hourly',
+				'v4_3_mv_fully_joined_statistics_hosts_resources_usage_hourly',
+				'host_id',
+				'host_hourly_history',
+				'lastHourAggr'
+			),
+			(
+				'v4_3_fully_joined_statistics_hosts_resources_usage_daily',
+				'v4_3_mv_fully_joined_statistics_hosts_resources_usage_daily',
+				'host_id',
+				'host_daily_history',
+				'lastDayAggr'
+			),
+			(
+				'v4_3_fully_joined_statistics_vms_resources_usage_hourly',
+				'v4_3_mv_fully_joined_statistics_vms_resources_usage_hourly',
+				'vm_id',
+				'vm_hourly_history',
+				'lastHourAggr'
+			),
+			(
+				'v4_3_fully_joined_statistics_vms_resources_usage_daily',
+				'v4_3_mv_fully_joined_statistics_vms_resources_usage_daily',
+				'vm_id',
+				'vm_daily_history',
+				'lastDayAggr'
+			)
+	) as v(view_name, table_name, id_column, history_table, aggregation);
+end; $procedure$
+LANGUAGE plpgsql;
+
+-- Creates the missing materialized views from all the rows of their view
+-- with statistics, configuration versions without any are left out.
+Create or replace FUNCTION materialized_views_create()
+returns void
+AS $procedure$
+declare
+v_record record;
+begin
+	for v_record in select * from materialized_views_list() loop
+		if not exists (
+			select 1
+			from pg_tables
+			where schemaname = current_schema() and tablename = v_record.table_name
+		) then
+			execute format(
+				'create table %I as select * from %I where history_datetime is not null',
+				v_record.table_name,
+				v_record.view_name
+			);
+			-- named by the server, the names made of the ones of the
+			-- tables would be truncated to the same 63 characters
+			execute format(
+				'create index on %I (history_datetime)',
+				v_record.table_name
+			);
+			execute format(
+				'create index on %I (%I, history_datetime)',
+				v_record.table_name,
+				v_record.id_column
+			);
+			execute format('analyze %I', v_record.table_name);
+		end if;
+	end loop;
+end; $procedure$
+LANGUAGE plpgsql;
+
+-- Drops the materialized views, their columns follow the views which may
+-- change on upgrade.
+Create or replace FUNCTION materialized_views_drop()
+returns void
+AS $procedure$
+declare
+v_record record;
+begin
+	for v_record in select * from materialized_views_list() loop
+		execute format('drop table if exists %I', v_record.table_name);
+	end loop;
+end; $procedure$
+LANGUAGE plpgsql;
+
+-- Replaces the rows of the materialized views refreshed by an aggregation
+-- from v_from to v_to, and deletes the ones older than the rows left in
+-- the history tables by the history delete.
+Create or replace FUNCTION materialized_views_refresh(
+	v_aggregation varchar(16),
+	v_from timestamp with time zone,
+	v_to timestamp with time zone
+)
+returns void
+AS $procedure$
+declare
+v_record record;
+begin
+	for v_record in
+		select l.*
+		from materialized_views_list() l
+			join pg_tables t
+				on (t.schemaname = current_schema() and t.tablename = l.table_name)
+		where l.aggregation = v_aggregation
+	loop
+		execute format(
+			'delete from %I where history_datetime >= $1 and history_datetime < $2',
+			v_record.table_name
+		) using v_from, v_to;
+		execute format(
+			'insert into %I select * from %I where history_datetime >= $1 and history_datetime < $2',
+			v_record.table_name,
+			v_record.view_name
+		) using v_from, v_to;
+		execute format(
+			'delete from %I where history_datetime < (select min(history_datetime) from %I)',
+			v_record.table_name,
+			v_record.history_table
+		);
+	end loop;
+end; $procedure$
+LANGUAGE plpgsql;
+
+----------------------------------------------------------------
+-- Dashboard summary tables
+----------------------------------------------------------------
+
+-- The engine dashboard reads per cluster usage heatmaps, the most used VMs
+-- and the storage usage trends of every hour from the dashboard_* tables,
+-- filled from the hourly history by every hourly aggregation, instead of
+-- the hourly rows of every host, VM and storage domain.
+
+-- Returns the usage of the hosts and the VMs that were up in the hours
+-- from v_from to v_to, with their cluster of that hour.
+Create or replace FUNCTION dashboard_entities_usage(
+	v_from timestamp with time zone,
+	v_to timestamp with time zone
+)
+returns TABLE(
+	history_datetime timestamp with time zone,
+	cluster_id uuid,
+	entity_type smallint,
+	entity_id uuid,
+	cpu_usage_percent smallint,
+	max_cpu_usage smallint,
+	memory_usage_percent smallint,
+	max_memory_usage smallint
+) STABLE
+AS $procedure$
+begin
+	return query
+	select
+		h.history_datetime,
+		c.cluster_id,
+		3::smallint,
+		h.host_id,
+		h.cpu_usage_percent,
+		h.max_cpu_usage,
+		h.memory_usage_percent,
+		h.max_memory_usage
+	from host_hourly_history h
+		join host_configuration c
+			on (c.history_id = h.host_configuration_version)
+	where
+		h.history_datetime >= v_from and
+		h.history_datetime < v_to and
+		h.host_status = 1
+	union all
+	select
+		v.history_datetime,
+		c.cluster_id,
+		2::smallint,
+		v.vm_id,
+		v.cpu_usage_percent,
+		v.max_cpu_usage,
+		v.memory_usage_percent,
+		v.max_memory_usage
+	from vm_hourly_history v
+		join vm_configuration c
+			on (c.history_id = v.vm_configuration_version)
+	where
+		v.history_datetime >= v_from and
+		v.history_datetime < v_to and
+		v.vm_status = 1;
+end; $procedure$
+LANGUAGE plpgsql;
+
+-- Replaces the rows of the dashboard tables of the hours from v_from to
+-- v_to, with the v_top most used VMs of every hour, and deletes the ones
+-- older than the rows left in the hourly history by the history delete.
+Create or replace FUNCTION dashboard_summary_refresh(
+	v_from timestamp with time zone,
+	v_to timestamp with time zone,
+	v_top integer default 10
+)
+returns void
+AS $procedure$
+begin
+	delete from dashboard_cluster_usage_hourly
+	where history_datetime >= v_from and history_datetime < v_to;
+	delete from dashboard_cluster_usage_buckets_hourly
+	where history_datetime >= v_from and history_datetime < v_to;
+	delete from dashboard_top_vms_hourly
+	where history_datetime >= v_from and history_datetime < v_to;
+	delete from dashboard_storage_usage_hourly
+	where history_datetime >= v_from and history_datetime < v_to;
+
+	create temporary table dashboard_usage on commit drop as
+	select * from dashboard_entities_usage(v_from, v_to);
+
+	insert into dashboard_cluster_usage_hourly(
+		history_datetime,
+		cluster_id,
+		entity_type,
+		entities,
+		cpu_usage_percent,
+		max_cpu_usage,
+		memory_usage_percent,
+		max_memory_usage
+	)
+	select
+		u.history_datetime,
+		u.cluster_id,
+		u.entity_type,
+		count(*),
+		round(avg(u.cpu_usage_percent)),
+		max(u.max_cpu_usage),
+		round(avg(u.memory_usage_percent)),
+		max(u.max_memory_usage)
+	from dashboard_usage u
+	group by u.history_datetime, u.cluster_id, u.entity_type;
+
+	-- ten buckets of ten percents, the last one including 100%
+	insert into dashboard_cluster_usage_buckets_hourly(
+		history_datetime,
+		cluster_id,
+		entity_type,
+		resource,
+		bucket,
+		entities
+	)
+	select
+		u.history_datetime,
+		u.cluster_id,
+		u.entity_type,
+		r.resource,
+		least(r.usage / 10, 9),
+		count(*)
+	from dashboard_usage u,
+		lateral (
+			values
+				('cpu', u.cpu_usage_percent),
+				('memory', u.memory_usage_percent)
+		) as r(resource, usage)
+	where r.usage is not null
+	group by u.history_datetime, u.cluster_id, u.entity_type, r.resource, least(r.usage / 10, 9);
+
+	insert into dashboard_top_vms_hourly(
+		history_datetime,
+		resource,
+		rank,
+		vm_id,
+		cluster_id,
+		usage_percent,
+		max_usage
+	)
+	select
+		t.history_datetime,
+		t.resource,
+		t.rank,
+		t.entity_id,
+		t.cluster_id,
+		t.usage,
+		t.max_usage
+	from (
+		select
+			u.history_datetime,
+			u.entity_id,
+			u.cluster_id,
+			r.resource,
+			r.usage,
+			r.max_usage,
+			row_number() over (
+				partition by u.history_datetime, r.resource
+				order by r.usage desc, u.entity_id
+			) as rank
+		from dashboard_usage u,
+			lateral (
+				values
+					('cpu', u.cpu_usage_percent, u.max_cpu_usage),
+					('memory', u.memory_usage_percent, u.max_memory_usage)
+			) as r(resource, usage, max_usage)
+		where u.entity_type = 2 and r.usage is not null
+	) t
+	where t.rank <= v_top;
+
+	insert into dashboard_storage_usage_hourly(
+		history_datetime,
+		datacenter_id,
+		storage_domains,
+		available_disk_size_gb,
+		used_disk_size_gb
+	)
+	select
+		s.history_datetime,
+		m.datacenter_id,
+		count(*),
+		sum(s.available_disk_size_gb),
+		sum(s.used_disk_size_gb)
+	from storage_domain_hourly_history s
+		join datacenter_storage_domain_map m
+			on (
+				m.storage_domain_id = s.storage_domain_id and
+				m.attach_date < s.history_datetime + interval '1 hour' and
+				(m.detach_date is null or m.detach_date >= s.history_datetime)
+			)
+	where s.history_datetime >= v_from and s.history_datetime < v_to
+	group by s.history_datetime, m.datacenter_id;
+
+	drop table dashboard_usage;
+
+	delete from dashboard_cluster_usage_hourly
+	where history_datetime < (select min(history_datetime) from host_hourly_history);
+	delete from dashboard_cluster_usage_buckets_hourly
+	where history_datetime < (select min(history_datetime) from host_hourly_history);
+	delete from dashboard_top_vms_hourly
+	where history_datetime < (select min(history_datetime) from vm_hourly_history);
+	delete from dashboard_storage_usage_hourly
+	where history_datetime < (select min(history_datetime) from storage_domain_hourly_history);
+end; $procedure$
+LANGUAGE plpgsql;
+
+-- Fills the dashboard tables from the hourly history when they are empty,
+-- after they were added.
+Create or replace FUNCTION dashboard_summary_create()
+returns void
+AS $procedure$
+declare
+v_from timestamp with time zone;
+v_to timestamp with time zone;
+begin
+	if not exists (select 1 from dashboard_cluster_usage_hourly) then
+		select min(history_datetime) into v_from from host_hourly_history;
+		select var_datetime into v_to
+		from history_configuration
+		where var_name = 'lastHourAggr';
+		if (v_from is not null and v_to is not null) then
+			perform dashboard_summary_refresh(v_from, v_to);
+		end if;
+	end if;
+end; $procedure$
+LANGUAGE plpgsql;
+
+----------------------------------------------------------------
+-- Refresh on aggregation
+----------------------------------------------------------------
+
+-- The aggregations move lastHourAggr or lastDayAggr to the end of the
+-- period they aggregate before inserting its rows, the refresh of the
+-- materialized views and of the dashboard tables is deferred to the commit
+-- of the aggregation.
+Create or replace FUNCTION materialized_views_refresh_trigger()
+returns trigger
+AS $procedure$
+begin
+	if (NEW.var_name = 'lastHourAggr') then
+		perform interface_rates_refresh_hourly(
+			NEW.var_datetime - interval '1 hour',
+			NEW.var_datetime
+		);
+		perform materialized_views_refresh(
+			NEW.var_name,
+			NEW.var_datetime - interval '1 hour',
+			NEW.var_datetime
+		);
+		perform dashboard_summary_refresh(
+			NEW.var_datetime - interval '1 hour',
+			NEW.var_datetime
+		);
+	else
+		perform interface_rates_refresh_daily(
+			NEW.var_datetime - interval '1 day',
+			NEW.var_datetime
+		);
+		perform materialized_views_refresh(
+			NEW.var_name,
+			NEW.var_datetime - interval '1 day',
+			NEW.var_datetime
+		);
+	end if;
+	return null;
+end; $procedure$
+LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS materialized_views_refresh ON history_configuration;
+
+CREATE CONSTRAINT TRIGGER materialized_views_refresh
+	AFTER UPDATE ON history_configuration
+	DEFERRABLE INITIALLY DEFERRED
+	FOR EACH ROW
+	WHEN (
+		NEW.var_name IN ('lastHourAggr', 'lastDayAggr') AND
+		NEW.var_datetime > OLD.var_datetime
+	)
+	EXECUTE PROCEDURE materialized_views_refresh_trigger();
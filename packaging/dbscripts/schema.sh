@@ -20,14 +20,17 @@ Usage: $0 [options]
     -p PORT       - The database port for the database        (def. ${DBFUNC_DB_PORT})
     -u USER       - The username for the database             (def. ${DBFUNC_DB_USER})
     -d DATABASE   - The database name                         (def. ${DBFUNC_DB_DATABASE})
+    -n SCHEMA     - The schema of the database                (def. public)
     -m MD5FILE    - Where to store schema MD5 files           (def. ${DBFUNC_COMMON_MD5FILE})
     -c COMMAND    - Command: apply|refresh|drop
     -t            - Force cleaning tasks and compensation info.
+    -a VERSIONS   - Views API versions to create besides ${DBFUNC_CUSTOM_VIEWS_CURRENT_VERSION}, comma separated
+                    (def. the ones created last time and the ones in use)
 
 __EOF__
 }
 
-while getopts hvl:s:p:u:d:m:c:t option; do
+while getopts hvl:s:p:u:d:n:m:c:ta: option; do
 	case $option in
 		\?) usage; exit 1;;
 		h) usage; exit 0;;
@@ -37,9 +40,11 @@ while getopts hvl:s:p:u:d:m:c:t option; do
 		p) DBFUNC_DB_PORT="${OPTARG}";;
 		u) DBFUNC_DB_USER="${OPTARG}";;
 		d) DBFUNC_DB_DATABASE="${OPTARG}";;
+		n) DBFUNC_DB_SCHEMA="${OPTARG}";;
 		m) DBFUNC_COMMON_MD5FILE="${OPTARG}";;
 		c) COMMAND="${OPTARG}";;
 		t) DBFUNC_CUSTOM_CLEAN_TASKS=1;;
+		a) DBFUNC_CUSTOM_VIEWS_VERSIONS="${OPTARG}";;
 	esac
 done
 
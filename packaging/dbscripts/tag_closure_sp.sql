@@ -0,0 +1,108 @@
+----------------------------------------------------------------
+-- Tag hierarchy closure
+----------------------------------------------------------------
+
+-- tag_closure_history has a row for every tag below every one of its
+-- ancestors, itself included at depth 0, with the time range it was
+-- below it. ConfigurationSync attaches and detaches the tags in
+-- tag_relations_history, and the tag_closure_update trigger applies the
+-- same changes to the closure, so the path of a tag or the tags below it
+-- are index lookups instead of a walk of the relations.
+
+-- Detaches a tag, and the tags below it, from the ancestors of the tag.
+Create or replace FUNCTION tag_closure_detach(
+	v_tag_id UUID,
+	v_date TIMESTAMP WITH TIME ZONE
+)
+RETURNS VOID
+AS $procedure$
+begin
+	update tag_closure_history c
+	set detach_date = v_date
+	from tag_closure_history a, tag_closure_history d
+	where
+		a.descendant_id = v_tag_id and
+		a.depth > 0 and
+		a.detach_date is null and
+		d.ancestor_id = v_tag_id and
+		d.detach_date is null and
+		c.ancestor_id = a.ancestor_id and
+		c.descendant_id = d.descendant_id and
+		c.detach_date is null;
+end; $procedure$
+LANGUAGE plpgsql;
+
+-- Attaches a tag, and the tags below it, below a parent tag, detaching
+-- them from their previous ancestors.
+Create or replace FUNCTION tag_closure_attach(
+	v_tag_id UUID,
+	v_parent_id UUID,
+	v_date TIMESTAMP WITH TIME ZONE
+)
+RETURNS VOID
+AS $procedure$
+begin
+	insert into tag_closure_history(ancestor_id, descendant_id, depth, attach_date)
+	select t.tag_id, t.tag_id, 0, v_date
+	from (values (v_tag_id), (v_parent_id)) as t(tag_id)
+	where
+		t.tag_id is not null and
+		not exists (
+			select 1
+			from tag_closure_history c
+			where
+				c.ancestor_id = t.tag_id and
+				c.descendant_id = t.tag_id and
+				c.depth = 0
+		);
+
+	if v_parent_id is null then
+		return;
+	end if;
+
+	perform tag_closure_detach(v_tag_id, v_date);
+
+	insert into tag_closure_history(ancestor_id, descendant_id, depth, attach_date)
+	select a.ancestor_id, d.descendant_id, a.depth + d.depth + 1, v_date
+	from tag_closure_history a, tag_closure_history d
+	where
+		a.descendant_id = v_parent_id and
+		a.detach_date is null and
+		d.ancestor_id = v_tag_id and
+		d.detach_date is null;
+end; $procedure$
+LANGUAGE plpgsql;
+
+Create or replace FUNCTION tag_closure_trigger()
+RETURNS TRIGGER
+AS $procedure$
+begin
+	if TG_OP = 'INSERT' then
+		if NEW.detach_date is null then
+			perform tag_closure_attach(NEW.entity_id, NEW.parent_id, NEW.attach_date);
+		end if;
+	elsif NEW.detach_date is not null and OLD.detach_date is null then
+		-- a moved tag is already attached below its new parent
+		if exists (
+			select 1
+			from tag_closure_history
+			where
+				ancestor_id = NEW.parent_id and
+				descendant_id = NEW.entity_id and
+				depth = 1 and
+				detach_date is null
+		) then
+			perform tag_closure_detach(NEW.entity_id, NEW.detach_date);
+		end if;
+	end if;
+	return null;
+end; $procedure$
+LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS tag_closure_update ON tag_relations_history;
+
+CREATE TRIGGER tag_closure_update
+	AFTER INSERT OR UPDATE OF detach_date ON tag_relations_history
+	FOR EACH ROW
+	WHEN (NEW.entity_type = 18)
+	EXECUTE PROCEDURE tag_closure_trigger();
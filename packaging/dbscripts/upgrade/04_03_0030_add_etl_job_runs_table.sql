@@ -0,0 +1,22 @@
+-- Add a table recording every run of the ETL jobs
+CREATE SEQUENCE etl_job_runs_seq INCREMENT BY 1 START WITH 1;
+
+CREATE TABLE etl_job_runs
+(
+   history_id BIGINT DEFAULT NEXTVAL('etl_job_runs_seq') PRIMARY KEY NOT NULL,
+   history_datetime TIMESTAMP WITH TIME ZONE NOT NULL,
+   job_name VARCHAR(128) NOT NULL,
+   duration_ms BIGINT NOT NULL,
+   rows_read BIGINT NOT NULL DEFAULT 0,
+   rows_written BIGINT NOT NULL DEFAULT 0,
+   status VARCHAR(16) NOT NULL,
+   sampling_interval INTEGER
+) WITH OIDS;
+
+CREATE INDEX idx_etl_job_runs_history_datetime
+  ON etl_job_runs
+  (history_datetime);
+
+CREATE INDEX idx_etl_job_runs_job_name_history_datetime
+  ON etl_job_runs
+  (job_name, history_datetime);
@@ -0,0 +1,47 @@
+-- Add the summary tables of the engine dashboard, updated by every hourly
+-- aggregation
+CREATE TABLE dashboard_cluster_usage_hourly
+(
+   history_datetime TIMESTAMP WITH TIME ZONE NOT NULL,
+   cluster_id UUID NOT NULL,
+   entity_type SMALLINT NOT NULL,
+   entities INTEGER NOT NULL,
+   cpu_usage_percent SMALLINT,
+   max_cpu_usage SMALLINT,
+   memory_usage_percent SMALLINT,
+   max_memory_usage SMALLINT,
+   CONSTRAINT pk_dashboard_cluster_usage_hourly PRIMARY KEY (history_datetime, cluster_id, entity_type)
+) WITH OIDS;
+
+CREATE TABLE dashboard_cluster_usage_buckets_hourly
+(
+   history_datetime TIMESTAMP WITH TIME ZONE NOT NULL,
+   cluster_id UUID NOT NULL,
+   entity_type SMALLINT NOT NULL,
+   resource VARCHAR(16) NOT NULL,
+   bucket SMALLINT NOT NULL,
+   entities INTEGER NOT NULL,
+   CONSTRAINT pk_dashboard_cluster_usage_buckets_hourly PRIMARY KEY (history_datetime, cluster_id, entity_type, resource, bucket)
+) WITH OIDS;
+
+CREATE TABLE dashboard_top_vms_hourly
+(
+   history_datetime TIMESTAMP WITH TIME ZONE NOT NULL,
+   resource VARCHAR(16) NOT NULL,
+   rank SMALLINT NOT NULL,
+   vm_id UUID NOT NULL,
+   cluster_id UUID NOT NULL,
+   usage_percent SMALLINT NOT NULL,
+   max_usage SMALLINT,
+   CONSTRAINT pk_dashboard_top_vms_hourly PRIMARY KEY (history_datetime, resource, rank)
+) WITH OIDS;
+
+CREATE TABLE dashboard_storage_usage_hourly
+(
+   history_datetime TIMESTAMP WITH TIME ZONE NOT NULL,
+   datacenter_id UUID NOT NULL,
+   storage_domains INTEGER NOT NULL,
+   available_disk_size_gb BIGINT,
+   used_disk_size_gb BIGINT,
+   CONSTRAINT pk_dashboard_storage_usage_hourly PRIMARY KEY (history_datetime, datacenter_id)
+) WITH OIDS;
@@ -0,0 +1,50 @@
+-- Add the closure of the tag hierarchy: a row for every tag below every
+-- one of its ancestors, itself included, with the time range it was
+-- below it. Kept up to date by a trigger on tag_relations_history.
+CREATE TABLE tag_closure_history
+(
+   ancestor_id UUID NOT NULL,
+   descendant_id UUID NOT NULL,
+   depth SMALLINT NOT NULL,
+   attach_date TIMESTAMP WITH TIME ZONE NOT NULL,
+   detach_date TIMESTAMP WITH TIME ZONE
+) WITH OIDS;
+
+CREATE INDEX tag_closure_history_ancestor_id_idx ON tag_closure_history(ancestor_id, depth) WHERE detach_date IS NULL;
+CREATE INDEX tag_closure_history_descendant_id_idx ON tag_closure_history(descendant_id, depth) WHERE detach_date IS NULL;
+CREATE INDEX tag_closure_history_descendant_id_attach_date_idx ON tag_closure_history(descendant_id, attach_date);
+
+-- every tag is its own ancestor since it is known
+INSERT INTO tag_closure_history(ancestor_id, descendant_id, depth, attach_date)
+SELECT tag_id, tag_id, 0, min(since)
+FROM (
+    SELECT tag_id, create_date FROM tag_details
+    UNION ALL
+    SELECT entity_id, attach_date FROM tag_relations_history WHERE entity_type = 18
+    UNION ALL
+    SELECT parent_id, attach_date FROM tag_relations_history WHERE entity_type = 18
+) AS tags(tag_id, since)
+WHERE tag_id IS NOT NULL
+GROUP BY tag_id;
+
+-- the ancestors of every tag, while all the relations between them were
+-- attached, tag paths hold at most 108 levels
+INSERT INTO tag_closure_history(ancestor_id, descendant_id, depth, attach_date, detach_date)
+WITH RECURSIVE closure(ancestor_id, descendant_id, depth, attach_date, detach_date) AS (
+    SELECT parent_id, entity_id, 1, attach_date, detach_date
+    FROM tag_relations_history
+    WHERE entity_type = 18 AND parent_id IS NOT NULL
+    UNION ALL
+    SELECT r.parent_id,
+           c.descendant_id,
+           c.depth + 1,
+           greatest(c.attach_date, r.attach_date),
+           least(c.detach_date, r.detach_date)
+    FROM closure AS c
+         JOIN tag_relations_history AS r
+             ON (r.entity_id = c.ancestor_id AND r.entity_type = 18 AND r.parent_id IS NOT NULL)
+    WHERE greatest(c.attach_date, r.attach_date) < coalesce(least(c.detach_date, r.detach_date), 'infinity')
+          AND c.depth < 108
+)
+SELECT ancestor_id, descendant_id, depth, attach_date, detach_date
+FROM closure;
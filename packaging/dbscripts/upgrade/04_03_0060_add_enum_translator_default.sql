@@ -0,0 +1,10 @@
+-- Add the translations of the enums to the default language, kept up to
+-- date from enum_translator by the enum_translator_default_refresh
+-- triggers
+CREATE TABLE enum_translator_default
+(
+   enum_type VARCHAR(40) NOT NULL,
+   enum_key SMALLINT NOT NULL,
+   value TEXT NOT NULL,
+   CONSTRAINT pk_enum_translator_default PRIMARY KEY (enum_type, enum_key)
+) WITH OIDS;
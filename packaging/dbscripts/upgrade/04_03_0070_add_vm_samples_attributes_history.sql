@@ -0,0 +1,37 @@
+-- Add the side table of the VM samples text attributes, that usually stay
+-- the same from one sample to the next. A row is written only when they
+-- change, and they are not kept in vm_samples_history anymore, where
+-- 04_03_0075 nulls them.
+CREATE TABLE vm_samples_attributes_history
+(
+   vm_id UUID NOT NULL,
+   history_datetime TIMESTAMP WITH TIME ZONE NOT NULL,
+   vm_ip TEXT,
+   vm_client_ip VARCHAR(255),
+   current_user_name VARCHAR(255),
+   CONSTRAINT pk_vm_samples_attributes_history PRIMARY KEY (vm_id, history_datetime)
+) WITH OIDS;
+
+INSERT INTO vm_samples_attributes_history(vm_id, history_datetime, vm_ip, vm_client_ip, current_user_name)
+SELECT vm_id, history_datetime, vm_ip, vm_client_ip, current_user_name
+FROM (
+    SELECT vm_id,
+           history_datetime,
+           vm_ip,
+           vm_client_ip,
+           current_user_name,
+           lag(history_datetime) OVER w AS previous_datetime,
+           lag(vm_ip) OVER w AS previous_vm_ip,
+           lag(vm_client_ip) OVER w AS previous_vm_client_ip,
+           lag(current_user_name) OVER w AS previous_current_user_name,
+           row_number() OVER (PARTITION BY vm_id, history_datetime ORDER BY history_id) AS duplicate
+    FROM vm_samples_history
+    WINDOW w AS (PARTITION BY vm_id ORDER BY history_datetime, history_id)
+) AS samples
+WHERE duplicate = 1
+      AND (
+          previous_datetime IS NULL
+          OR vm_ip IS DISTINCT FROM previous_vm_ip
+          OR vm_client_ip IS DISTINCT FROM previous_vm_client_ip
+          OR current_user_name IS DISTINCT FROM previous_current_user_name
+      );
@@ -0,0 +1,47 @@
+#!/bin/sh
+#
+# Null in vm_samples_history the attributes 04_03_0070 copied to
+# vm_samples_attributes_history, in batches of history ids each committed
+# on its own, so that the upgrade of a large history does not rewrite the
+# table in a single transaction, and the dead rows of a batch can be
+# vacuumed and their space reused while the next ones run. Running it
+# again after an interruption goes on with the rows not nulled yet.
+#
+
+DBFUNC_COMMON_DBSCRIPTS_DIR="${DBFUNC_COMMON_DBSCRIPTS_DIR:-$(dirname "$0")/..}"
+. "${DBFUNC_COMMON_DBSCRIPTS_DIR}/dbfunc-base.sh"
+
+BATCH_SIZE=100000
+
+dbfunc_init
+
+range="$(
+	dbfunc_psql_statement_parsable "
+		select min(history_id), max(history_id)
+		from vm_samples_history
+	"
+)" || die "Cannot read the history ids of vm_samples_history"
+first="${range%|*}"
+last="${range#*|}"
+
+# empty table
+[ "${first}" = '\N' ] && exit 0
+
+while [ "${first}" -le "${last}" ]; do
+	dbfunc_psql_die --command="
+		update vm_samples_history
+		set
+			vm_ip = null,
+			vm_client_ip = null,
+			current_user_name = null
+		where
+			history_id >= ${first} and
+			history_id < $((first + BATCH_SIZE)) and
+			(
+				vm_ip is not null or
+				vm_client_ip is not null or
+				current_user_name is not null
+			)
+	" > /dev/null
+	first=$((first + BATCH_SIZE))
+done
@@ -0,0 +1,21 @@
+-- Add the byte rates derived from the byte counters of the interface samples
+-- to the hourly and daily interface statistics
+select fn_db_add_column('host_interface_hourly_history', 'receive_rate_bytes_per_second', 'bigint');
+select fn_db_add_column('host_interface_hourly_history', 'max_receive_rate_bytes_per_second', 'bigint');
+select fn_db_add_column('host_interface_hourly_history', 'transmit_rate_bytes_per_second', 'bigint');
+select fn_db_add_column('host_interface_hourly_history', 'max_transmit_rate_bytes_per_second', 'bigint');
+select fn_db_add_column('host_interface_daily_history', 'receive_rate_bytes_per_second', 'bigint');
+select fn_db_add_column('host_interface_daily_history', 'max_receive_rate_bytes_per_second', 'bigint');
+select fn_db_add_column('host_interface_daily_history', 'transmit_rate_bytes_per_second', 'bigint');
+select fn_db_add_column('host_interface_daily_history', 'max_transmit_rate_bytes_per_second', 'bigint');
+select fn_db_add_column('vm_interface_hourly_history', 'receive_rate_bytes_per_second', 'bigint');
+select fn_db_add_column('vm_interface_hourly_history', 'max_receive_rate_bytes_per_second', 'bigint');
+select fn_db_add_column('vm_interface_hourly_history', 'transmit_rate_bytes_per_second', 'bigint');
+select fn_db_add_column('vm_interface_hourly_history', 'max_transmit_rate_bytes_per_second', 'bigint');
+select fn_db_add_column('vm_interface_daily_history', 'receive_rate_bytes_per_second', 'bigint');
+select fn_db_add_column('vm_interface_daily_history', 'max_receive_rate_bytes_per_second', 'bigint');
+select fn_db_add_column('vm_interface_daily_history', 'transmit_rate_bytes_per_second', 'bigint');
+select fn_db_add_column('vm_interface_daily_history', 'max_transmit_rate_bytes_per_second', 'bigint');
+
+-- What the interface samples keep, see interface_rates_sp.sql
+INSERT INTO history_configuration(var_name,var_value) SELECT 'interfaceSamplesStorage','full' WHERE not exists (SELECT var_name FROM history_configuration WHERE var_name = 'interfaceSamplesStorage');
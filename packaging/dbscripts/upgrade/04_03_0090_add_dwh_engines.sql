@@ -0,0 +1,14 @@
+-- Add the engines whose statistics are kept in the history database, each
+-- in the schema of its name, the ones of the engine DWH was set up with
+-- in public. The schemas of the other engines are upgraded after public,
+-- and share its list.
+CREATE TABLE IF NOT EXISTS public.dwh_engines
+(
+   engine_name VARCHAR(63) NOT NULL,
+   schema_name VARCHAR(63) NOT NULL,
+   create_date TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+   CONSTRAINT pk_dwh_engines PRIMARY KEY (engine_name),
+   CONSTRAINT uq_dwh_engines_schema_name UNIQUE (schema_name)
+) WITH OIDS;
+
+INSERT INTO public.dwh_engines(engine_name, schema_name) SELECT 'default', 'public' WHERE not exists (SELECT schema_name FROM public.dwh_engines WHERE schema_name = 'public');
@@ -0,0 +1,85 @@
+----------------------------------------------------------------
+-- VM samples text attributes
+----------------------------------------------------------------
+
+-- The IP addresses and the guest user name of a VM are text columns of
+-- vm_samples_history that usually stay the same from one sample to the
+-- next. The vm_samples_attributes trigger moves them out of every new
+-- sample into vm_samples_attributes_history, which has a row only when
+-- they change, so that the sample rows stay narrow. The views and
+-- vm_samples_history_view join them back by the time of the sample.
+
+Create or replace FUNCTION vm_samples_attributes_trigger()
+RETURNS TRIGGER
+AS $procedure$
+declare
+	v_last record;
+begin
+	select
+		history_datetime,
+		vm_ip,
+		vm_client_ip,
+		current_user_name
+	into v_last
+	from vm_samples_attributes_history
+	where
+		vm_id = NEW.vm_id and
+		history_datetime <= NEW.history_datetime
+	order by history_datetime desc
+	limit 1;
+
+	if
+		v_last.history_datetime is null or
+		v_last.vm_ip is distinct from NEW.vm_ip or
+		v_last.vm_client_ip is distinct from NEW.vm_client_ip or
+		v_last.current_user_name is distinct from NEW.current_user_name
+	then
+		insert into vm_samples_attributes_history(
+			vm_id,
+			history_datetime,
+			vm_ip,
+			vm_client_ip,
+			current_user_name
+		)
+		values (
+			NEW.vm_id,
+			NEW.history_datetime,
+			NEW.vm_ip,
+			NEW.vm_client_ip,
+			NEW.current_user_name
+		)
+		on conflict (vm_id, history_datetime) do update
+		set
+			vm_ip = excluded.vm_ip,
+			vm_client_ip = excluded.vm_client_ip,
+			current_user_name = excluded.current_user_name;
+
+		-- only the attributes of the VM since its oldest sample are joined
+		delete from vm_samples_attributes_history
+		where
+			vm_id = NEW.vm_id and
+			history_datetime < (
+				select max(a.history_datetime)
+				from vm_samples_attributes_history a
+				where
+					a.vm_id = NEW.vm_id and
+					a.history_datetime <= (
+						select min(s.history_datetime)
+						from vm_samples_history s
+					)
+			);
+	end if;
+
+	NEW.vm_ip := null;
+	NEW.vm_client_ip := null;
+	NEW.current_user_name := null;
+	return NEW;
+end; $procedure$
+LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS vm_samples_attributes ON vm_samples_history;
+
+CREATE TRIGGER vm_samples_attributes
+	BEFORE INSERT ON vm_samples_history
+	FOR EACH ROW
+	EXECUTE PROCEDURE vm_samples_attributes_trigger();
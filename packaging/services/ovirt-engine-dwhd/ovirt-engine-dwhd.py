@@ -16,8 +16,13 @@
 
 
 import os
+import re
 import sys
+import time
+import glob
+import json
 import shlex
+import hashlib
 import subprocess
 import gettext
 
@@ -46,15 +51,94 @@ class Daemon(service.Daemon):
                 'ovirt-engine-dwhd.conf',
             )
         )
+        # Not an option of the base daemon, consume it before it parses
+        # the command line.
+        self._verifyClasspath = '--verify-classpath' in sys.argv
+        if self._verifyClasspath:
+            sys.argv.remove('--verify-classpath')
+
+    def _classpathScript(self):
+        return os.path.join(
+            self._config.get('PKG_DATA_DIR'),
+            'bin',
+            'dwh-classpath.sh',
+        )
+
+    def _classpathCacheFile(self):
+        return os.path.join(
+            self._config.get('PKG_STATE_DIR'),
+            'classpath.cache',
+        )
+
+    def _getClasspathKey(self, classpath):
+        """Key of a resolved classpath.
+
+        Covers the content of the resolving scripts, and the modification
+        time and size of every jar and of the directories holding them, so
+        that installing, removing or upgrading a jar invalidates it.
+        """
+        key = hashlib.sha256()
+        script = self._classpathScript()
+        for name in (script, script + '.local'):
+            if os.path.exists(name):
+                with open(name, 'rb') as f:
+                    key.update(f.read())
+                key.update(name.encode('utf-8'))
+        entries = set(e for e in classpath.split(':') if e)
+        entries.update(set(os.path.dirname(e) for e in entries))
+        for entry in sorted(entries):
+            try:
+                st = os.stat(entry)
+                key.update(
+                    (
+                        '%s:%s:%s\n' % (entry, st.st_mtime, st.st_size)
+                    ).encode('utf-8')
+                )
+            except OSError:
+                key.update(('%s:missing\n' % entry).encode('utf-8'))
+        return key.hexdigest()
+
+    def _getCachedClasspath(self):
+        try:
+            with open(self._classpathCacheFile()) as f:
+                cache = json.load(f)
+            classpath = cache['classpath']
+            if cache['key'] == self._getClasspathKey(classpath):
+                return classpath
+            self.logger.debug('Classpath cache is stale')
+        except (IOError, ValueError, KeyError) as e:
+            self.logger.debug('Cannot use classpath cache: %s', e)
+        return None
+
+    def _saveClasspath(self, classpath):
+        cacheFile = self._classpathCacheFile()
+        try:
+            with open('%s.tmp' % cacheFile, 'w') as f:
+                json.dump(
+                    {
+                        'key': self._getClasspathKey(classpath),
+                        'classpath': classpath,
+                    },
+                    f,
+                )
+            os.rename('%s.tmp' % cacheFile, cacheFile)
+        except (IOError, OSError) as e:
+            self.logger.warning(
+                _('Cannot save classpath cache {file}: {error}').format(
+                    file=cacheFile,
+                    error=e,
+                )
+            )
 
     def _getClasspath(self):
+        cached = self._getCachedClasspath()
+        if cached is not None and not self._verifyClasspath:
+            self.logger.debug('classpath (cached): %s', cached)
+            return cached
+
         p = subprocess.Popen(
             args=(
-                os.path.join(
-                    self._config.get('PKG_DATA_DIR'),
-                    'bin',
-                    'dwh-classpath.sh',
-                ),
+                self._classpathScript(),
                 'run',
             ),
             stdout=subprocess.PIPE,
@@ -68,8 +152,623 @@ class Daemon(service.Daemon):
             raise RuntimeError(_('Cannot setup classpath (%s)') % stderr)
         classpath = stdout[0]
         self.logger.debug('classpath: %s', classpath)
+        if cached is not None and cached != classpath:
+            self.logger.warning(
+                _('Cached classpath was out of date, refreshed')
+            )
+        self._saveClasspath(classpath)
         return classpath
 
+    # Heap needed by the ETL besides the entities, and per engine entity
+    # (VM, host, disk or network interface) sampled and aggregated.
+    _HEAP_BASE = 256 * 1024 * 1024
+    _HEAP_PER_ENTITY = 64 * 1024
+    # Headroom over the heap the previous run kept in use after the
+    # collections, which does not grow with the heap it was given
+    _HEAP_LIVE_FACTOR = 2
+
+    _RE_SIZE = re.compile(r'^(?P<value>\d+)(?P<unit>[kmgKMG]?)$')
+
+    def _parseSize(self, size):
+        m = self._RE_SIZE.match(size.strip())
+        if m is None:
+            raise RuntimeError(_('Invalid memory size {size}').format(
+                size=size,
+            ))
+        return int(m.group('value')) * {
+            '': 1,
+            'k': 1024,
+            'm': 1024 ** 2,
+            'g': 1024 ** 3,
+        }[m.group('unit').lower()]
+
+    def _formatSize(self, size):
+        return '%dm' % (size // (1024 ** 2))
+
+    def _heapUsageFile(self, engine):
+        return os.path.join(
+            self._config.get('PKG_STATE_DIR'),
+            (
+                'heap-usage.properties' if engine['NAME'] is None
+                else 'heap-usage-%s.properties' % engine['NAME']
+            ),
+        )
+
+    def _getPreviousHeapLive(self, engine):
+        live = None
+        try:
+            with open(self._heapUsageFile(engine)) as f:
+                for line in f:
+                    key, sep, value = line.strip().partition('=')
+                    if key == 'live':
+                        live = int(value)
+        except (IOError, ValueError) as e:
+            self.logger.debug('Cannot read previous heap usage: %s', e)
+        return live
+
+    def _getEngineEntities(self, engine):
+        try:
+            import psycopg2
+            connection = psycopg2.connect(
+                host=engine['ENGINE_DB_HOST'],
+                port=engine['ENGINE_DB_PORT'],
+                user=engine['ENGINE_DB_USER'],
+                password=engine['ENGINE_DB_PASSWORD'],
+                database=engine['ENGINE_DB_DATABASE'],
+                sslmode=(
+                    'require'
+                    if self._isTrue(engine['ENGINE_DB_SECURED'])
+                    else 'prefer'
+                ),
+                connect_timeout=10,
+            )
+            try:
+                cursor = connection.cursor()
+                cursor.execute(
+                    """
+                        SELECT
+                            (SELECT count(*) FROM vm_static
+                                WHERE entity_type = 'VM'),
+                            (SELECT count(*) FROM vds_static),
+                            (SELECT count(*) FROM base_disks),
+                            (SELECT count(*) FROM vm_interface)
+                    """
+                )
+                return sum(cursor.fetchone())
+            finally:
+                connection.close()
+        except Exception as e:
+            self.logger.debug('Cannot count engine entities: %s', e)
+            return None
+
+    def _getHostMemory(self):
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+
+    def _getAutoHeap(self, engine, workers):
+        lower = self._parseSize(self._config.get('DWH_HEAP_AUTO_MIN'))
+        maximum = self._parseSize(self._config.get('DWH_HEAP_AUTO_MAX'))
+        ram = self._getHostMemory()
+        # the workers of all the engines share the host memory
+        upper = min(
+            maximum,
+            ram * self._config.getinteger(
+                'DWH_HEAP_AUTO_RAM_PERCENT'
+            ) // 100 // workers,
+        )
+
+        reasons = []
+        size = lower
+        live = self._getPreviousHeapLive(engine)
+        if live is not None:
+            size = max(size, int(live * self._HEAP_LIVE_FACTOR))
+            reasons.append(
+                _('previous run live heap {live}').format(
+                    live=self._formatSize(live),
+                )
+            )
+        entities = self._getEngineEntities(engine)
+        if entities is not None:
+            size = max(
+                size,
+                self._HEAP_BASE + entities * self._HEAP_PER_ENTITY,
+            )
+            reasons.append(
+                _('{entities} engine entities').format(
+                    entities=entities,
+                )
+            )
+        if not reasons:
+            reasons.append(_('no usage or inventory information'))
+        if size > upper:
+            # never over DWH_HEAP_AUTO_MAX, even when over DWH_HEAP_AUTO_MIN
+            size = min(max(lower, upper), maximum)
+            reasons.append(
+                _('limited to {upper} of {ram} host memory').format(
+                    upper=self._formatSize(upper),
+                    ram=self._formatSize(ram),
+                )
+            )
+
+        self.logger.info(
+            _(
+                'Using {size} heap for engine {engine}, based on {reasons}'
+            ).format(
+                size=self._formatSize(size),
+                engine=self._engineName(engine),
+                reasons=', '.join(reasons),
+            )
+        )
+        return lower, size
+
+    def _getJavaVersion(self, javaHome):
+        """Feature version of the java virtual machine, from its release
+        file, None if unknown."""
+        try:
+            with open(os.path.join(javaHome, 'release')) as f:
+                for line in f:
+                    key, sep, value = line.strip().partition('=')
+                    if key == 'JAVA_VERSION':
+                        version = value.strip('"').split('.')
+                        if version[0] == '1':
+                            version = version[1:]
+                        return int(version[0])
+        except (IOError, ValueError, IndexError) as e:
+            self.logger.debug('Cannot detect java version: %s', e)
+        return None
+
+    def _cdsFile(self, suffix):
+        return os.path.join(
+            self._config.get('PKG_STATE_DIR'),
+            'cds',
+            'ovirt-engine-dwhd.%s' % suffix,
+        )
+
+    def _getCdsKey(self, javaHome, classpath):
+        key = hashlib.sha256()
+        with open(os.path.join(javaHome, 'release'), 'rb') as f:
+            key.update(f.read())
+        key.update(os.path.realpath(self._executable).encode('utf-8'))
+        key.update(classpath.encode('utf-8'))
+        jars = []
+        for entry in classpath.split(':'):
+            if entry.endswith('*'):
+                jars.extend(sorted(glob.glob(entry + '.jar')))
+            else:
+                jars.append(entry)
+        key.update(self._getClasspathKey(':'.join(jars)).encode('utf-8'))
+        return key.hexdigest()
+
+    def _dumpCdsArchive(self, classpath):
+        p = subprocess.Popen(
+            args=(
+                self._executable,
+                '-Xshare:dump',
+                '-XX:SharedClassListFile=%s' % self._cdsFile('classlist'),
+                '-XX:SharedArchiveFile=%s' % self._cdsFile('jsa'),
+                '-classpath', classpath,
+            ),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            close_fds=True,
+        )
+        stdout, stderr = p.communicate()
+        self.logger.debug(
+            'CDS dump output: %s',
+            stdout.decode('utf-8', 'replace'),
+        )
+        return p.returncode == 0
+
+    def _getCdsArgs(self, javaHome, classpath):
+        """Java arguments for application class data sharing.
+
+        The first start after a change of the jars or of the java virtual
+        machine records the classes it loads, the next one archives them,
+        and later ones map the archive.
+        """
+        version = self._getJavaVersion(javaHome)
+        if version is None or version < 11:
+            self.logger.warning(
+                _(
+                    'Application class data sharing requires java 11 '
+                    'or later, disabled'
+                )
+            )
+            return []
+
+        cdsDir = os.path.dirname(self._cdsFile('key'))
+        if not os.path.exists(cdsDir):
+            os.mkdir(cdsDir)
+
+        key = self._getCdsKey(javaHome, classpath)
+        try:
+            with open(self._cdsFile('key')) as f:
+                stale = f.read().strip() != key
+        except IOError:
+            stale = True
+        if stale:
+            for suffix in ('classlist', 'jsa'):
+                if os.path.exists(self._cdsFile(suffix)):
+                    os.unlink(self._cdsFile(suffix))
+            with open(self._cdsFile('key'), 'w') as f:
+                f.write(key)
+
+        if (
+            not os.path.exists(self._cdsFile('jsa')) and
+            os.path.exists(self._cdsFile('classlist')) and
+            os.path.getsize(self._cdsFile('classlist')) > 0
+        ):
+            self.logger.info(_('Creating class data sharing archive'))
+            if not self._dumpCdsArchive(classpath):
+                self.logger.warning(
+                    _(
+                        'Cannot create class data sharing archive, '
+                        'see log for details'
+                    )
+                )
+                os.unlink(self._cdsFile('classlist'))
+                if os.path.exists(self._cdsFile('jsa')):
+                    os.unlink(self._cdsFile('jsa'))
+
+        if os.path.exists(self._cdsFile('jsa')):
+            return [
+                '-Xshare:auto',
+                '-XX:SharedArchiveFile=%s' % self._cdsFile('jsa'),
+            ]
+        self.logger.debug('Recording classes for class data sharing')
+        return [
+            '-XX:DumpLoadedClassList=%s' % self._cdsFile('classlist'),
+        ]
+
+    def _getGcLogArgs(self, javaHome, engine):
+        gcLog = os.path.join(
+            self._config.get('PKG_LOG_DIR'),
+            '%s-gc.log' % self._workerName(engine),
+        )
+        files = self._config.getinteger('DWH_GC_LOG_FILES')
+        size = self._parseSize(self._config.get('DWH_GC_LOG_SIZE'))
+        version = self._getJavaVersion(javaHome)
+        if version is not None and version >= 9:
+            return [
+                '-Xlog:gc*:file=%s:time,uptime,level,tags:'
+                'filecount=%d,filesize=%d' % (
+                    gcLog,
+                    files,
+                    size,
+                ),
+            ]
+        # The -XX:+PrintGC* flags were removed with unified logging
+        return [
+            '-Xloggc:%s' % gcLog,
+            '-XX:+PrintGCDetails',
+            '-XX:+PrintGCDateStamps',
+            '-XX:+UseGCLogFileRotation',
+            '-XX:NumberOfGCLogFiles=%d' % files,
+            '-XX:GCLogFileSize=%d' % size,
+        ]
+
+    def _getJfrArgs(self, javaHome, engine):
+        version = self._getJavaVersion(javaHome)
+        if version is None or version < 11:
+            self.logger.warning(
+                _('Flight Recorder requires java 11 or later, disabled')
+            )
+            return []
+
+        jfrDir = self._config.get('DWH_JFR_DIR')
+        if not os.path.exists(jfrDir):
+            os.makedirs(jfrDir)
+        return [
+            '-XX:FlightRecorderOptions=repository=%s' % os.path.join(
+                jfrDir,
+                'repository',
+            ),
+            (
+                '-XX:StartFlightRecording=name=%s,'
+                'settings=%s,disk=true,maxsize=%d,dumponexit=true,'
+                'filename=%s'
+            ) % (
+                self._workerName(engine),
+                self._config.get('DWH_JFR_SETTINGS'),
+                self._parseSize(self._config.get('DWH_JFR_MAXSIZE')),
+                os.path.join(
+                    jfrDir,
+                    '%s-%s.jfr' % (
+                        self._workerName(engine),
+                        time.strftime('%Y%m%d%H%M%S'),
+                    ),
+                ),
+            ),
+        ]
+
+    # settings of the engine database a worker collects from
+    _ENGINE_DB_KEYS = (
+        'ENGINE_DB_HOST',
+        'ENGINE_DB_PORT',
+        'ENGINE_DB_USER',
+        'ENGINE_DB_PASSWORD',
+        'ENGINE_DB_DATABASE',
+        'ENGINE_DB_SECURED',
+        'ENGINE_DB_SECURED_VALIDATION',
+        'ENGINE_DB_DRIVER',
+        'ENGINE_DB_URL',
+    )
+
+    # The name of an engine is the schema of the history database its
+    # statistics are kept in.
+    _RE_ENGINE_NAME = re.compile(r'^[a-z][a-z0-9_]{0,62}$')
+    _ENGINE_NAMES_RESERVED = (
+        'default',
+        'public',
+        'all_engines',
+        'information_schema',
+    )
+
+    @staticmethod
+    def _isTrue(value):
+        return str(value).lower() in ('1', 'true', 'yes', 'on')
+
+    def _engineName(self, engine):
+        return engine['NAME'] or 'default'
+
+    def _workerName(self, engine):
+        if engine['NAME'] is None:
+            return 'ovirt-engine-dwhd'
+        return 'ovirt-engine-dwhd-%s' % engine['NAME']
+
+    def _getEngineUrl(self, engine):
+        params = []
+        if self._isTrue(engine['ENGINE_DB_SECURED']):
+            params.append('ssl=true')
+        if not self._isTrue(engine['ENGINE_DB_SECURED_VALIDATION']):
+            params.append('sslfactory=org.postgresql.ssl.NonValidatingFactory')
+        return 'jdbc:postgresql://%s:%s/%s%s' % (
+            engine['ENGINE_DB_HOST'],
+            engine['ENGINE_DB_PORT'],
+            engine['ENGINE_DB_DATABASE'],
+            '?%s' % '&'.join(params) if params else '',
+        )
+
+    def _getEngines(self):
+        """Engines to collect from, the one of ENGINE_DB_* first.
+
+        Every engine is a dict of the ENGINE_DB_* settings of its database
+        and of its NAME, None for the first one, whose statistics are kept
+        in the public schema. The settings of the engines of DWH_ENGINES
+        are the DWH_ENGINE_<NAME>_DB_* ones.
+        """
+        engines = [
+            dict(
+                [('NAME', None)] +
+                [(key, self._config.get(key)) for key in self._ENGINE_DB_KEYS]
+            ),
+        ]
+        for name in self._config.get('DWH_ENGINES').split():
+            if (
+                not self._RE_ENGINE_NAME.match(name) or
+                name.startswith('pg_') or
+                name in self._ENGINE_NAMES_RESERVED
+            ):
+                raise RuntimeError(
+                    _("Invalid engine name '{name}' in DWH_ENGINES").format(
+                        name=name,
+                    )
+                )
+            if name in [e['NAME'] for e in engines]:
+                raise RuntimeError(
+                    _("Engine '{name}' is listed twice in DWH_ENGINES").format(
+                        name=name,
+                    )
+                )
+            prefix = 'DWH_ENGINE_%s_' % name.upper()
+            engine = dict(
+                (key, self._config.values.get(prefix + key[len('ENGINE_'):]))
+                for key in self._ENGINE_DB_KEYS
+            )
+            engine['NAME'] = name
+            for key in (
+                'ENGINE_DB_HOST',
+                'ENGINE_DB_USER',
+                'ENGINE_DB_DATABASE',
+            ):
+                if not engine[key]:
+                    raise RuntimeError(
+                        _('{key} is required by engine {name}').format(
+                            key=prefix + key[len('ENGINE_'):],
+                            name=name,
+                        )
+                    )
+            for key, default in (
+                ('ENGINE_DB_PORT', '5432'),
+                ('ENGINE_DB_PASSWORD', ''),
+                ('ENGINE_DB_SECURED', 'False'),
+                ('ENGINE_DB_SECURED_VALIDATION', 'False'),
+                ('ENGINE_DB_DRIVER', self._config.get('ENGINE_DB_DRIVER')),
+            ):
+                if engine[key] is None:
+                    engine[key] = default
+            if not engine['ENGINE_DB_URL']:
+                engine['ENGINE_DB_URL'] = self._getEngineUrl(engine)
+            engines.append(engine)
+        return engines
+
+    def _writeSettings(self, engine):
+        """Writes the settings of the worker of an engine, which keeps its
+        statistics in the schema of the history database of its name."""
+        values = dict(self._config.values)
+        values.update(
+            (key, engine[key]) for key in self._ENGINE_DB_KEYS
+        )
+        if engine['NAME'] is not None:
+            values['DWH_DB_URL'] = '%s%scurrentSchema=%s' % (
+                values['DWH_DB_URL'],
+                '&' if '?' in values['DWH_DB_URL'] else '?',
+                engine['NAME'],
+            )
+        settings = os.path.join(
+            self._tempDir.directory,
+            (
+                'settings.properties' if engine['NAME'] is None
+                else 'settings-%s.properties' % engine['NAME']
+            ),
+        )
+        with open(settings, 'w') as f:
+            f.write(
+                util.processTemplate(
+                    os.path.join(
+                        self._config.get('PKG_DATA_DIR'),
+                        'conf',
+                        'settings.properties.in'
+                    ),
+                    dict(
+                        ('@%s@' % k, util.escape(v, ':=\\ ')) for (k, v) in
+                        values.items()
+                    ),
+                )
+            )
+        return settings
+
+    def _getMetricsAddress(self, index):
+        """The metrics of every other worker are served on the port after
+        the one of the worker before it."""
+        address = self._config.get('DWH_METRICS_ADDRESS')
+        if not address or index == 0:
+            return address
+        host, sep, port = address.rpartition(':')
+        if not port.isdigit():
+            raise RuntimeError(
+                _('Invalid DWH_METRICS_ADDRESS {address}').format(
+                    address=address,
+                )
+            )
+        return '%s:%d' % (host, int(port) + index)
+
+    def _getProfileSqlLogDir(self, engine):
+        logDir = self._config.get('PKG_LOG_DIR')
+        if engine['NAME'] is not None:
+            logDir = os.path.join(logDir, 'engines', engine['NAME'])
+            if not os.path.exists(logDir):
+                os.makedirs(logDir)
+        return logDir
+
+    def _getWorkerArgs(
+        self,
+        engine,
+        index,
+        workers,
+        javaHome,
+        classpath,
+        cdsArgs,
+    ):
+        args = [
+            self._workerName(engine),
+            '-Dorg.ovirt.engine.dwh.settings=%s' % self._writeSettings(
+                engine
+            ),
+        ]
+
+        # Add arguments for the java heap size:
+        if self._config.get('DWH_HEAP_MODE') == 'auto':
+            heapMin, heapMax = self._getAutoHeap(engine, workers)
+            args.extend([
+                '-Xms%s' % self._formatSize(min(heapMin, heapMax)),
+                '-Xmx%s' % self._formatSize(heapMax),
+            ])
+        else:
+            args.extend([
+                '-Xms%s' % self._config.get('DWH_HEAP_MIN'),
+                '-Xmx%s' % self._config.get('DWH_HEAP_MAX'),
+            ])
+        args.append(
+            '-Dorg.ovirt.engine.dwh.heapUsage=%s' % self._heapUsageFile(
+                engine
+            )
+        )
+
+        metricsAddress = self._getMetricsAddress(index)
+        if metricsAddress:
+            args.append(
+                '-Dorg.ovirt.engine.dwh.metrics=%s' % metricsAddress
+            )
+
+        # Before DWH_PROPERTIES, which may override them:
+        args.extend([
+            '-Dorg.ovirt.engine.dwh.workerThreads=%d' % (
+                self._config.getinteger('DWH_WORKER_THREADS')
+            ),
+            '-Dorg.ovirt.engine.dwh.dbPool.size=%d' % (
+                self._config.getinteger('DWH_DB_POOL_SIZE')
+            ),
+            '-Dorg.ovirt.engine.dwh.dbPool.timeout=%d' % (
+                self._config.getinteger('DWH_DB_POOL_TIMEOUT')
+            ),
+            '-Dorg.ovirt.engine.dwh.dbPool.statementCache=%d' % (
+                self._config.getinteger('DWH_DB_STATEMENT_CACHE')
+            ),
+            '-Dorg.ovirt.engine.dwh.profileSql=%s' % (
+                'true' if self._config.getboolean('DWH_PROFILE_SQL')
+                else 'false'
+            ),
+            '-Dorg.ovirt.engine.dwh.profileSql.samplePercent=%d' % (
+                self._config.getinteger('DWH_PROFILE_SQL_SAMPLE_PERCENT')
+            ),
+            '-Dorg.ovirt.engine.dwh.profileSql.explainThreshold=%d' % (
+                self._config.getinteger('DWH_PROFILE_SQL_EXPLAIN_THRESHOLD')
+            ),
+            '-Dorg.ovirt.engine.dwh.profileSql.logDir=%s' % (
+                self._getProfileSqlLogDir(engine)
+            ),
+            '-Dorg.ovirt.engine.dwh.profileSql.logMaxSize=%d' % (
+                self._parseSize(
+                    self._config.get('DWH_PROFILE_SQL_LOG_MAX_SIZE')
+                )
+            ),
+            '-Dorg.ovirt.engine.dwh.profileSql.logFiles=%d' % (
+                self._config.getinteger('DWH_PROFILE_SQL_LOG_FILES')
+            ),
+        ])
+
+        for engineProperty in shlex.split(
+            self._config.get('DWH_PROPERTIES')
+        ):
+            if not engineProperty.startswith('-D'):
+                engineProperty = '-D' + engineProperty
+            args.append(engineProperty)
+
+        for arg in shlex.split(self._config.get('DWH_JVM_ARGS')):
+            args.append(arg)
+
+        # Only one worker can listen on the debug address
+        engineDebugAddress = self._config.get('DWH_DEBUG_ADDRESS')
+        if engineDebugAddress and index == 0:
+            args.append(
+                (
+                    '-Xrunjdwp:transport=dt_socket,address=%s,'
+                    'server=y,suspend=n'
+                ) % (
+                    engineDebugAddress
+                )
+            )
+
+        if self._config.getboolean('DWH_VERBOSE_GC'):
+            args.extend(self._getGcLogArgs(javaHome, engine))
+
+        if self._config.getboolean('DWH_JFR_ENABLED'):
+            args.extend(self._getJfrArgs(javaHome, engine))
+
+        # The first worker records the classes to archive, the others only
+        # map the archive.
+        if index == 0 or not any(
+            arg.startswith('-XX:DumpLoadedClassList=') for arg in cdsArgs
+        ):
+            args.extend(cdsArgs)
+
+        args.extend([
+            '-classpath', classpath,
+            'ovirt_engine_dwh.historyetl_4_3.HistoryETL',
+            '--context=Default',
+        ])
+        return args
+
     def _checkInstallation(
         self,
         pidfile,
@@ -136,8 +835,9 @@ class Daemon(service.Daemon):
         #
         # the earliest so we can abort early.
         #
+        javaHome = java.Java().getJavaHome()
         self._executable = os.path.join(
-            java.Java().getJavaHome(),
+            javaHome,
             'bin',
             'java',
         )
@@ -149,72 +849,38 @@ class Daemon(service.Daemon):
         self._tempDir = service.TempDir()
         self._tempDir.create()
 
-        settings = os.path.join(self._tempDir.directory, 'settings.properties')
-        with open(settings, 'w') as f:
-            f.write(
-                util.processTemplate(
-                    os.path.join(
-                        self._config.get('PKG_DATA_DIR'),
-                        'conf',
-                        'settings.properties.in'
-                    ),
-                    dict(
-                        ('@%s@' % k, util.escape(v, ':=\\ ')) for (k, v) in
-                        self._config.values.items()
-                    ),
-                )
-            )
-
-        self._serviceArgs = [
-            'ovirt-engine-dwhd',
-            '-Dorg.ovirt.engine.dwh.settings=%s' % settings,
-        ]
+        engines = self._getEngines()
 
-        # Add arguments for the java heap size:
-        self._serviceArgs.extend([
-            '-Xms%s' % self._config.get('DWH_HEAP_MIN'),
-            '-Xmx%s' % self._config.get('DWH_HEAP_MAX'),
-        ])
-
-        for engineProperty in shlex.split(
-            self._config.get('DWH_PROPERTIES')
-        ):
-            if not engineProperty.startswith('-D'):
-                engineProperty = '-D' + engineProperty
-            self._serviceArgs.append(engineProperty)
-
-        for arg in shlex.split(self._config.get('DWH_JVM_ARGS')):
-            self._serviceArgs.append(arg)
-
-        engineDebugAddress = self._config.get('DWH_DEBUG_ADDRESS')
-        if engineDebugAddress:
-            self._serviceArgs.append(
-                (
-                    '-Xrunjdwp:transport=dt_socket,address=%s,'
-                    'server=y,suspend=n'
-                ) % (
-                    engineDebugAddress
-                )
-            )
-
-        if self._config.getboolean('DWH_VERBOSE_GC'):
-            self._serviceArgs.extend([
-                '-verbose:gc',
-                '-XX:+PrintGCTimeStamps',
-                '-XX:+PrintGCDetails',
-            ])
-
-        self._serviceArgs.extend([
-            '-classpath', '%s:%s' % (
+        # Empty entries would add the working directory, which class data
+        # sharing cannot archive.
+        classpath = ':'.join(
+            entry for entry in [
                 os.path.join(
                     self._config.get('PKG_JAVA_LIB'),
                     '*',
                 ),
-                self._getClasspath(),
-            ),
-            'ovirt_engine_dwh.historyetl_4_3.HistoryETL',
-            '--context=Default',
-        ])
+            ] + self._getClasspath().split(':')
+            if entry
+        )
+
+        cdsArgs = []
+        if self._config.getboolean('DWH_CDS_ENABLED'):
+            cdsArgs = self._getCdsArgs(javaHome, classpath)
+
+        self._workers = [
+            (
+                engine,
+                self._getWorkerArgs(
+                    engine=engine,
+                    index=index,
+                    workers=len(engines),
+                    javaHome=javaHome,
+                    classpath=classpath,
+                    cdsArgs=cdsArgs,
+                ),
+            )
+            for index, engine in enumerate(engines)
+        ]
 
         self._serviceEnv = os.environ.copy()
         self._serviceEnv.update({
@@ -236,10 +902,68 @@ class Daemon(service.Daemon):
         )
         return (consoleLog, consoleLog)
 
+    def _runWorkers(self):
+        """Runs the workers of all the engines, until one of them exits,
+        and stops the others then."""
+        stopTime = self._config.getinteger('DAEMON_STOP_TIME')
+        stopInterval = self._config.getinteger('DAEMON_STOP_INTERVAL')
+        processes = []
+        try:
+            for engine, args in self._workers:
+                self.logger.debug(
+                    'Starting the worker of engine %s: %s',
+                    self._engineName(engine),
+                    args,
+                )
+                processes.append(
+                    (
+                        engine,
+                        subprocess.Popen(
+                            args=args,
+                            executable=self._executable,
+                            env=self._serviceEnv,
+                            close_fds=True,
+                        ),
+                    )
+                )
+            while True:
+                for engine, p in processes:
+                    if p.poll() is not None:
+                        raise RuntimeError(
+                            _(
+                                'The worker of engine {engine} exited with '
+                                'status {status}'
+                            ).format(
+                                engine=self._engineName(engine),
+                                status=p.returncode,
+                            )
+                        )
+                time.sleep(stopInterval)
+        finally:
+            for engine, p in processes:
+                if p.poll() is None:
+                    p.terminate()
+            for i in range(max(stopTime // stopInterval, 1)):
+                if all(p.poll() is not None for engine, p in processes):
+                    break
+                time.sleep(stopInterval)
+            for engine, p in processes:
+                if p.poll() is None:
+                    self.logger.warning(
+                        _('Killing the worker of engine {engine}').format(
+                            engine=self._engineName(engine),
+                        )
+                    )
+                    p.kill()
+                    p.wait()
+
     def daemonContext(self):
+        if len(self._workers) > 1:
+            self._runWorkers()
+            return
         self.daemonAsExternalProcess(
             executable=self._executable,
-            args=self._serviceArgs,
+            args=self._workers[0][1],
             env=self._serviceEnv,
             stopTime=self._config.getinteger(
                 'DAEMON_STOP_TIME'
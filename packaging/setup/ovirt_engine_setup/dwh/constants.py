@@ -192,6 +192,11 @@ class FileLocations(object):
         'dwh-vacuum.sh',
     )
 
+    OVIRT_DWH_RETENTION_TOOL = os.path.join(
+        OVIRT_ENGINE_DWH_BINDIR,
+        'dwh-retention.sh',
+    )
+
 
 @util.export
 class Stages(object):
@@ -203,6 +208,8 @@ class Stages(object):
     ENGINE_DB_CONNECTION_AVAILABLE = \
         'osetup.dwh.engine.db.connection.available'
     DB_SCHEMA = 'osetup.dwh.db.schema'
+    DB_RETENTION_PURGE = 'osetup.dwh.db.retention.purge'
+    SCALE_CUSTOMIZATION = 'osetup.dwh.core.scale.customization'
 
 
 @util.export
@@ -249,6 +256,10 @@ class ConfigEnv(object):
     def SCALE(self):
         return 'OVESETUP_DWH_CONFIG/scale'
 
+    TABLES_KEEP_SAMPLES = 'OVESETUP_DWH_CONFIG/tablesKeepSamples'
+    TABLES_KEEP_HOURLY = 'OVESETUP_DWH_CONFIG/tablesKeepHourly'
+    TABLES_KEEP_DAILY = 'OVESETUP_DWH_CONFIG/tablesKeepDaily'
+
 
 @util.export
 @util.codegen
@@ -362,6 +373,18 @@ class DBEnv(object):
     def DWH_VACUUM_FULL(self):
         return 'OVESETUP_DB/dwhVacuumFull'
 
+    @osetupattrs(
+        answerfile=True,
+    )
+    def DWH_RETENTION_PURGE(self):
+        return 'OVESETUP_DWH_DB/retentionPurge'
+
+    @osetupattrs(
+        answerfile=True,
+    )
+    def VIEWS_VERSIONS(self):
+        return 'OVESETUP_DWH_DB/viewsVersions'
+
 
 @util.export
 @util.codegen
@@ -0,0 +1,788 @@
+#
+# ovirt-engine-setup -- ovirt engine setup
+# Copyright (C) 2018 Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""DWH schema apply."""
+
+
+import gettext
+import hashlib
+import os
+
+import psycopg2
+
+from otopi import base
+from otopi import util
+
+from ovirt_engine_setup.engine_common import constants as oengcommcons
+from ovirt_engine_setup.engine_common import database
+
+
+DEK = oengcommcons.DBEnvKeysConst
+
+
+def _(m):
+    return gettext.dgettext(message=m, domain='ovirt-engine-dwh')
+
+
+@util.export
+class SchemaApply(base.Base):
+    """Applies the DWH schema over a single database connection.
+
+    Does what 'schema.sh -c apply' does, without a psql process per
+    statement: the versions and checksums of the installed upgrade scripts
+    are read by one query, and every upgrade script runs in a transaction
+    of its own together with its schema_version row.
+    """
+
+    # sync with dbfunc-custom.sh
+    INIT_DATA_FILES = (
+        'insert_data.sql',
+        'insert_timekeeping_values.sql',
+        'insert_enum_values.sql',
+        'insert_calendar_table_values.sql',
+    )
+    VIEWS_ALL_VERSIONS = ('3_6', '4_0', '4_1', '4_2', '4_3')
+    VIEWS_CURRENT_VERSION = '4_3'
+    VIEWS_VERSION_FILE = 'create_views_%s.sql'
+    VIEWS_FILES = (
+        'create_reports_views.sql',
+        'create_etl_views.sql',
+    )
+    MATERIALIZED_VIEWS_SP = 'materialized_views_sp.sql'
+    MATERIALIZED_VIEWS_REFRESH = (
+        'select materialized_views_create()',
+        'select dashboard_summary_create()',
+    )
+
+    # sync with dbfunc-common.sh
+    CUSTOM_MATERIALIZED_VIEWS = os.path.join(
+        'upgrade',
+        'post_upgrade',
+        'custom',
+        'create_materialized_views.sql',
+    )
+
+    # errors of custom permissions on objects that are gone
+    _MISSING_OBJECT_CODES = ('42P01', '42883')
+
+    def __init__(
+        self,
+        plugin,
+        dbenvkeys,
+        dbscriptsDir,
+        md5File=None,
+        viewsVersions=None,
+        schema=None,
+    ):
+        """viewsVersions are the views API versions to create besides the
+        current one, such as '4.1,4.2'. When None, the ones created last
+        time and the ones in use are.
+
+        schema is the schema of the database to apply to, created when
+        missing, public when None."""
+        super(SchemaApply, self).__init__()
+        self._plugin = plugin
+        self._dbenvkeys = dbenvkeys
+        self._dbscriptsDir = dbscriptsDir
+        self._md5File = md5File
+        self._viewsVersions = viewsVersions
+        self._schema = schema
+        self._connection = None
+
+    @property
+    def environment(self):
+        return self._plugin.environment
+
+    def _path(self, *names):
+        return os.path.join(self._dbscriptsDir, *names)
+
+    def _relative(self, path):
+        return os.path.relpath(path, self._dbscriptsDir)
+
+    def _execute(self, statement, args=None):
+        cursor = self._connection.cursor()
+        try:
+            cursor.execute(statement, args)
+            if cursor.description is None:
+                return []
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+
+    def _runFile(self, path):
+        self.logger.debug("Running '%s'", self._relative(path))
+        with open(path) as f:
+            statements = f.read()
+        try:
+            self._execute(statements)
+        except psycopg2.ProgrammingError as e:
+            # psql runs files of comments only, such as
+            # create_reports_views.sql, the server answers them with an
+            # empty query that psycopg2 refuses
+            if e.pgcode is not None:
+                raise
+            self.logger.debug("No statements in '%s'", self._relative(path))
+
+    def _runScript(self, path):
+        if os.access(path, os.X_OK) and path.endswith('.sh'):
+            # shell scripts connect by themselves, let them see the
+            # changes made so far
+            self._connection.commit()
+            self.logger.debug(
+                "Running upgrade shell script '%s'",
+                self._relative(path),
+            )
+            env = dict(
+                (name, str(self.environment[self._dbenvkeys[key]]))
+                for name, key in (
+                    ('DBFUNC_DB_HOST', DEK.HOST),
+                    ('DBFUNC_DB_PORT', DEK.PORT),
+                    ('DBFUNC_DB_USER', DEK.USER),
+                    ('DBFUNC_DB_DATABASE', DEK.DATABASE),
+                    ('DBFUNC_DB_PGPASSFILE', DEK.PGPASSFILE),
+                )
+            )
+            if self._schema is not None:
+                env['DBFUNC_DB_SCHEMA'] = self._schema
+            self._plugin.execute(
+                args=(path,),
+                envAppend=env,
+            )
+        else:
+            self._runFile(path)
+
+    def _getFiles(self, directory, maxdepth):
+        """Returns the sql and sh scripts found like find -maxdepth."""
+        top = self._path(directory)
+        files = []
+        for root, dirs, names in os.walk(top):
+            if root[len(top):].count(os.sep) + 1 >= maxdepth:
+                dirs[:] = []
+            files.extend(
+                os.path.join(root, name)
+                for name in names
+                if name.endswith(('.sql', '.sh'))
+            )
+        return sorted(files)
+
+    def _findFiles(self, predicate):
+        files = []
+        for root, dirs, names in os.walk(self._dbscriptsDir):
+            files.extend(
+                os.path.join(root, name)
+                for name in names
+                if predicate(name)
+            )
+        return sorted(files)
+
+    @staticmethod
+    def _getFileVersion(path):
+        return os.path.basename(path)[:10].replace('_', '')
+
+    @staticmethod
+    def _checksum(path):
+        with open(path, 'rb') as f:
+            return hashlib.md5(f.read()).hexdigest()
+
+    def _schemaExists(self):
+        return self._execute(
+            """
+                select count(*)
+                from pg_catalog.pg_tables
+                where
+                    tablename = 'schema_version' and
+                    schemaname = current_schema()
+            """
+        )[0][0] > 0
+
+    def _createSchema(self):
+        self.logger.info(_('Creating fresh DWH database schema'))
+        if not self._execute(
+            "select 1 from pg_language where lanname = 'plpgsql'"
+        ):
+            self._execute('create language plpgsql')
+        self._execute(
+            'alter database "%s" set client_min_messages=ERROR' % (
+                self.environment[
+                    self._dbenvkeys[DEK.DATABASE]
+                ].replace('"', '""'),
+            )
+        )
+        for name in (
+            'create_tables.sql',
+            'create_functions.sql',
+            'common_sp.sql',
+        ) + self.INIT_DATA_FILES:
+            self._runFile(self._path(name))
+        self._connection.commit()
+
+        # views and stored procedures are always created on clean install
+        if self._md5File is not None and os.path.exists(self._md5File):
+            os.unlink(self._md5File)
+
+    def _getCustomPermissions(self):
+        """Returns the grants to users other than postgres and ours."""
+        return [
+            row[0]
+            for row in self._execute(
+                """
+                    select
+                        'grant ' || a.privilege_type || ' on ' ||
+                        case c.relkind when 'S' then 'sequence ' else '' end ||
+                        c.oid::regclass || ' to ' || quote_ident(r.rolname)
+                    from pg_class c
+                        join pg_namespace n
+                            on (n.oid = c.relnamespace)
+                        cross join lateral aclexplode(c.relacl) a
+                        join pg_roles r
+                            on (r.oid = a.grantee)
+                    where
+                        n.nspname = current_schema() and
+                        r.rolname not in ('postgres', current_user)
+                    union all
+                    select
+                        'grant execute on function ' ||
+                        p.oid::regprocedure || ' to ' || quote_ident(r.rolname)
+                    from pg_proc p
+                        join pg_namespace n
+                            on (n.oid = p.pronamespace)
+                        cross join lateral aclexplode(p.proacl) a
+                        join pg_roles r
+                            on (r.oid = a.grantee)
+                    where
+                        n.nspname = current_schema() and
+                        r.rolname not in ('postgres', current_user)
+                """
+            )
+        ]
+
+    def _restorePermissions(self, permissions):
+        if permissions:
+            self.logger.info(
+                _('Applying custom users permissions on database objects')
+            )
+        for permission in permissions:
+            self._execute('savepoint permission')
+            try:
+                self._execute(permission)
+            except psycopg2.Error as e:
+                if e.pgcode not in self._MISSING_OBJECT_CODES:
+                    raise RuntimeError(
+                        _(
+                            'Errors while restoring custom permissions: '
+                            '{error}'
+                        ).format(
+                            error=e,
+                        )
+                    )
+                self.logger.debug(
+                    "Skipping '%s': %s",
+                    permission,
+                    e,
+                )
+                self._execute('rollback to savepoint permission')
+        self._connection.commit()
+
+    def _scriptsDigest(self):
+        """Returns the lines md5sum prints for the views and SP sources."""
+        files = set(self._getFiles('upgrade', 3))
+        files.update(
+            self._findFiles(
+                lambda name: (
+                    (
+                        name.startswith('create_') and
+                        name.endswith('views.sql')
+                    ) or
+                    name.endswith('_sp.sql')
+                )
+            )
+        )
+        return ''.join(
+            '%s  %s\n' % (self._checksum(path), self._relative(path))
+            for path in sorted(files)
+        )
+
+    def _getScriptsChecksum(self):
+        result = self._execute(
+            """
+                select var_value
+                from history_configuration
+                where var_name = 'scriptsChecksum'
+            """
+        )
+        return result[0][0] if result else None
+
+    def _setScriptsChecksum(self, checksum):
+        # sync with dbfunc-custom.sh
+        self._execute(
+            """
+                delete from history_configuration
+                where var_name = 'scriptsChecksum';
+                insert into history_configuration(var_name, var_value)
+                values ('scriptsChecksum', %(checksum)s);
+            """,
+            dict(
+                checksum=checksum,
+            ),
+        )
+
+    def _isViewOrSpChanged(self, digest):
+        if self._md5File is None:
+            return self._getScriptsChecksum() != hashlib.md5(
+                digest.encode('utf-8')
+            ).hexdigest()
+        if not os.path.exists(self._md5File):
+            return True
+        with open(self._md5File) as f:
+            return f.read() != digest
+
+    def _getViewsVersionsInUse(self):
+        """Versions of the views that objects not created by the scripts
+        depend on, or that custom users were granted permissions on."""
+        # sync with dbfunc-custom.sh
+        return [
+            row[0] for row in self._execute(
+                """
+                    select distinct substring(
+                        v.relname from '^v([0-9]+_[0-9]+)_'
+                    )
+                    from pg_catalog.pg_class v
+                        join pg_catalog.pg_namespace n
+                            on n.oid = v.relnamespace
+                    where
+                        n.nspname = current_schema() and
+                        v.relkind = 'v' and
+                        v.relname ~ '^v[0-9]+_[0-9]+_' and
+                        (
+                            exists (
+                                select 1
+                                from pg_catalog.pg_depend d
+                                    join pg_catalog.pg_rewrite r
+                                        on r.oid = d.objid
+                                    join pg_catalog.pg_class c
+                                        on c.oid = r.ev_class
+                                    join pg_catalog.pg_namespace cn
+                                        on cn.oid = c.relnamespace
+                                where
+                                    d.classid =
+                                        'pg_catalog.pg_rewrite'::regclass and
+                                    d.refobjid = v.oid and
+                                    c.oid <> v.oid and
+                                    (
+                                        cn.nspname <> current_schema() or
+                                        c.relname !~ '^v[0-9]+_[0-9]+_'
+                                    )
+                            ) or
+                            exists (
+                                select 1
+                                from aclexplode(v.relacl) a
+                                    join pg_catalog.pg_roles ro
+                                        on ro.oid = a.grantee
+                                where ro.rolname not in (
+                                    'postgres',
+                                    current_user
+                                )
+                            )
+                        )
+                """
+            )
+        ]
+
+    def _getVersionedViews(self):
+        """The views of the views API versions, by version."""
+        # sync with dbfunc-custom.sh
+        views = {}
+        for row in self._execute(
+            """
+                select v.relname
+                from pg_catalog.pg_class v
+                    join pg_catalog.pg_namespace n
+                        on n.oid = v.relnamespace
+                where
+                    n.nspname = current_schema() and
+                    v.relkind = 'v' and
+                    v.relname ~ '^v[0-9]+_[0-9]+_'
+                order by v.relname
+            """
+        ):
+            version = '_'.join(row[0][1:].split('_')[:2])
+            views.setdefault(version, []).append(row[0])
+        return views
+
+    def _getViewsVersions(self):
+        result = self._execute(
+            """
+                select var_value
+                from history_configuration
+                where var_name = 'viewsVersions'
+            """
+        )
+        return result[0][0] if result else None
+
+    def _setViewsVersions(self, versions):
+        # sync with dbfunc-custom.sh
+        self._execute(
+            """
+                delete from history_configuration
+                where var_name = 'viewsVersions';
+                insert into history_configuration(var_name, var_value)
+                values ('viewsVersions', %(versions)s);
+            """,
+            dict(
+                versions=versions,
+            ),
+        )
+
+    def _inspectViews(self):
+        """Chooses the views API versions to create, before the views
+        are dropped. Returns True when they differ from the ones created
+        last time."""
+        previous = self._getViewsVersions()
+        views = self._getVersionedViews()
+        if self._viewsVersions is None and previous is None:
+            # the versions created last time are not known yet, it is the
+            # first upgrade to choose them, keep all the existing ones
+            requested = [
+                v for v in views if v in self.VIEWS_ALL_VERSIONS
+            ]
+        elif self._viewsVersions is None:
+            requested = previous.split() + self._getViewsVersionsInUse()
+        else:
+            requested = self._viewsVersions.replace(',', ' ').split()
+        requested = set(v.replace('.', '_') for v in requested)
+        unknown = requested - set(self.VIEWS_ALL_VERSIONS)
+        if unknown:
+            raise RuntimeError(
+                _('Invalid views API versions: {versions}').format(
+                    versions=', '.join(sorted(unknown)),
+                )
+            )
+        requested.add(self.VIEWS_CURRENT_VERSION)
+        self._viewsVersions = ' '.join(
+            v for v in self.VIEWS_ALL_VERSIONS if v in requested
+        )
+        self.logger.debug(
+            "Creating views API versions '%s'",
+            self._viewsVersions,
+        )
+        dropped = [
+            view
+            for version in sorted(views)
+            if version not in requested
+            for view in views[version]
+        ]
+        if dropped:
+            self.logger.warning(
+                _(
+                    'Dropping the views of the views API versions not in '
+                    'use: {views}'
+                ).format(
+                    views=', '.join(dropped),
+                )
+            )
+        return self._viewsVersions != previous
+
+    def _runRequiredScripts(self, path):
+        """Runs the helper functions listed at the top of a script."""
+        with open(path) as f:
+            for line in f:
+                fields = line.split()
+                if not fields or fields[0] != '--#source':
+                    break
+                sql = fields[1]
+                if not sql.endswith('_sp.sql'):
+                    raise RuntimeError(
+                        _(
+                            "Invalid source file {sql} in {file}, source "
+                            "files must end with '_sp.sql'"
+                        ).format(
+                            sql=sql,
+                            file=path,
+                        )
+                    )
+                self._runFile(self._path(sql))
+
+    def _dropViewsAndSps(self):
+        # common stored procedures provide the generate_drop_* functions
+        self._runFile(self._path('common_sp.sql'))
+        statements = [
+            row[0]
+            for row in self._execute(
+                'select * from generate_drop_all_views_syntax()'
+            ) + self._execute(
+                'select * from generate_drop_all_functions_syntax()'
+            )
+        ]
+        if statements:
+            self._execute('\n'.join(statements))
+        self._runFile(self._path('create_functions.sql'))
+        self._runFile(self._path('common_sp.sql'))
+
+    def _createViewsAndSps(self):
+        self.logger.info(_('Creating DWH views and stored procedures'))
+        for version in self._viewsVersions.split():
+            self._runFile(self._path(self.VIEWS_VERSION_FILE % version))
+        for name in self.VIEWS_FILES:
+            self._runFile(self._path(name))
+        self._setViewsVersions(self._viewsVersions)
+        for path in self._findFiles(lambda name: name.endswith('sp.sql')):
+            self._runFile(path)
+        self._runFile(self._path('common_sp.sql'))
+
+    def _preUpgrade(self):
+        self.logger.info(_('Dropping DWH views and stored procedures'))
+        # not known to match the scripts until post upgrade
+        self._setScriptsChecksum('')
+        self._dropViewsAndSps()
+        for path in self._getFiles(os.path.join('upgrade', 'pre_upgrade'), 1):
+            self._runScript(path)
+        # materialized views follow the views, which may change
+        self._runFile(self._path(self.MATERIALIZED_VIEWS_SP))
+        self._execute('select materialized_views_drop()')
+        self._connection.commit()
+
+    def _postUpgrade(self):
+        self._createViewsAndSps()
+        for path in self._getFiles(
+            os.path.join('upgrade', 'post_upgrade'),
+            1,
+        ):
+            self._runScript(path)
+        self._connection.commit()
+
+        custom = self._path(self.CUSTOM_MATERIALIZED_VIEWS)
+        if os.path.exists(custom):
+            self.logger.info(
+                _("Running custom materialized views from '{file}'").format(
+                    file=custom,
+                )
+            )
+            self._execute('savepoint custom')
+            try:
+                self._runFile(custom)
+            except psycopg2.Error:
+                self.logger.debug('Custom materialized views', exc_info=True)
+                self._execute('rollback to savepoint custom')
+                try:
+                    self._execute('select DropAllCustomMaterializedViews()')
+                except psycopg2.Error:
+                    self._execute('rollback to savepoint custom')
+                self.logger.warning(
+                    _(
+                        'Illegal syntax in custom Materialized Views, Custom '
+                        'Materialized Views were dropped.'
+                    )
+                )
+
+        for statement in self.MATERIALIZED_VIEWS_REFRESH:
+            self._execute(statement)
+        self._connection.commit()
+
+    def _setLastVersion(self):
+        self._execute(
+            """
+                update schema_version
+                set current = (
+                    id = (
+                        select max(id)
+                        from schema_version
+                        where state in ('INSTALLED', 'SKIPPED')
+                    )
+                )
+            """
+        )
+        self._connection.commit()
+
+    def _insertVersion(self, version, path, checksum, state, comment=''):
+        self._execute(
+            """
+                insert into schema_version(
+                    version,
+                    script,
+                    checksum,
+                    installed_by,
+                    started_at,
+                    ended_at,
+                    state,
+                    current,
+                    comment
+                )
+                values (
+                    %(version)s,
+                    %(script)s,
+                    %(checksum)s,
+                    current_user,
+                    now(),
+                    clock_timestamp(),
+                    %(state)s,
+                    false,
+                    %(comment)s
+                )
+            """,
+            dict(
+                version=version,
+                script=self._relative(path),
+                checksum=checksum,
+                state=state,
+                comment=comment,
+            ),
+        )
+
+    def _upgrade(self, digest, updated):
+        files = self._getFiles('upgrade', 1)
+        versions = [self._getFileVersion(path) for path in files]
+        for previous, version in zip(versions, versions[1:]):
+            if previous == version:
+                raise RuntimeError(
+                    _(
+                        'Operation aborted, found duplicate version: '
+                        '{version}'
+                    ).format(
+                        version=version,
+                    )
+                )
+
+        current = None
+        installed = {}
+        for version, checksum, state, is_current in self._execute(
+            """
+                select version, checksum, state, current
+                from schema_version
+                order by id
+            """
+        ):
+            if is_current and current is None:
+                current = int(version)
+            if state == 'INSTALLED':
+                installed.setdefault(checksum, version)
+        self._connection.commit()
+        if current is None:
+            raise RuntimeError(_('Cannot find the current schema version'))
+
+        if updated:
+            self._preUpgrade()
+
+        last = current
+        for path, version in zip(files, versions):
+            if int(version) <= current:
+                continue
+            # within a major version, scripts are at most 10 apart
+            if (
+                int(version) // 10000 == last // 10000 and
+                int(version) - last > 10
+            ):
+                self._setLastVersion()
+                raise RuntimeError(
+                    _(
+                        'Illegal script version number {version}, version '
+                        'should be in max 10 gap from last installed '
+                        'version: 0{last}'
+                    ).format(
+                        version=version,
+                        last=last,
+                    )
+                )
+
+            checksum = self._checksum(path)
+            if checksum in installed:
+                self.logger.debug(
+                    'Skipping upgrade script %s, already installed by %s',
+                    self._relative(path),
+                    installed[checksum],
+                )
+                self._insertVersion(
+                    version,
+                    path,
+                    checksum,
+                    'SKIPPED',
+                    'Installed already by %s' % installed[checksum],
+                )
+            else:
+                # pre upgrade also runs when the views and SPs did not
+                # change but the schema is upgraded, like in db restore
+                if not updated:
+                    self._preUpgrade()
+                    updated = True
+                self.logger.info(
+                    _("Running upgrade script '{script}'").format(
+                        script=self._relative(path),
+                    )
+                )
+                try:
+                    self._runRequiredScripts(path)
+                    self._runScript(path)
+                    self._insertVersion(version, path, checksum, 'INSTALLED')
+                except Exception:
+                    self._connection.rollback()
+                    self._setLastVersion()
+                    raise
+            self._connection.commit()
+            last = int(version)
+
+        self._setLastVersion()
+        if updated:
+            self._postUpgrade()
+            self._setScriptsChecksum(
+                hashlib.md5(digest.encode('utf-8')).hexdigest()
+            )
+            self._connection.commit()
+        else:
+            self.logger.info(_('DWH database is up to date'))
+
+    def apply(self):
+        self._connection = database.Statement(
+            dbenvkeys=self._dbenvkeys,
+            environment=self.environment,
+        ).connect()
+        try:
+            if self._schema is not None:
+                self._execute(
+                    'create schema if not exists "{schema}"'.format(
+                        schema=self._schema,
+                    )
+                )
+                self._execute(
+                    'set search_path to "{schema}"'.format(
+                        schema=self._schema,
+                    )
+                )
+                self._connection.commit()
+
+            if not self._schemaExists():
+                self._createSchema()
+
+            permissions = self._getCustomPermissions()
+            viewsChanged = self._inspectViews()
+            self._connection.commit()
+
+            digest = self._scriptsDigest()
+            self._upgrade(
+                digest=digest,
+                updated=viewsChanged or self._isViewOrSpChanged(digest),
+            )
+            if self._md5File is not None:
+                with open(self._md5File, 'w') as f:
+                    f.write(digest)
+
+            self._restorePermissions(permissions)
+        finally:
+            self._connection.close()
+            self._connection = None
+
+
+# vim: expandtab tabstop=4 shiftwidth=4
@@ -69,8 +69,31 @@ class Plugin(plugin.PluginBase):
     _DEFAULT_DWH_SCALE_WITH_ENGINE = _('1')
     _DEFAULT_DWH_SCALE_WITHOUT_ENGINE = _('2')
 
+    @plugin.event(
+        stage=plugin.Stages.STAGE_INIT,
+    )
+    def _init(self):
+        for key in (
+            odwhcons.ConfigEnv.TABLES_KEEP_SAMPLES,
+            odwhcons.ConfigEnv.TABLES_KEEP_HOURLY,
+            odwhcons.ConfigEnv.TABLES_KEEP_DAILY,
+        ):
+            self.environment.setdefault(key, None)
+
+    def _getScale(self):
+        return next(
+            scale
+            for scale in self._DWH_SCALES
+            if scale[
+                'index'
+            ] == self.environment[
+                odwhcons.ConfigEnv.SCALE
+            ]
+        )
+
     @plugin.event(
         stage=plugin.Stages.STAGE_CUSTOMIZATION,
+        name=odwhcons.Stages.SCALE_CUSTOMIZATION,
         condition=lambda self: self.environment[odwhcons.CoreEnv.ENABLE],
         before=(
             osetupcons.Stages.DIALOG_TITLES_E_MISC,
@@ -115,6 +138,30 @@ class Plugin(plugin.PluginBase):
             prompt=True,
         )
 
+        # publish the retention of the chosen scale, unless already
+        # set by a configuration overriding it, so the rows it drops
+        # can be estimated before applying it
+        conf = dict(
+            line.split('=', 1)
+            for line in self._getScale()['conf']
+        )
+        for key, var in (
+            (
+                odwhcons.ConfigEnv.TABLES_KEEP_SAMPLES,
+                'DWH_TABLES_KEEP_SAMPLES',
+            ),
+            (
+                odwhcons.ConfigEnv.TABLES_KEEP_HOURLY,
+                'DWH_TABLES_KEEP_HOURLY',
+            ),
+            (
+                odwhcons.ConfigEnv.TABLES_KEEP_DAILY,
+                'DWH_TABLES_KEEP_DAILY',
+            ),
+        ):
+            if self.environment[key] is None:
+                self.environment[key] = conf[var]
+
     @plugin.event(
         stage=plugin.Stages.STAGE_MISC,
         condition=lambda self: self.environment[odwhcons.CoreEnv.ENABLE],
@@ -136,15 +183,7 @@ class Plugin(plugin.PluginBase):
                 mode=0o600,
                 owner=self.environment[osetupcons.SystemEnv.USER_ENGINE],
                 enforcePermissions=True,
-                content=next(
-                    scale['conf']
-                    for scale in self._DWH_SCALES
-                    if scale[
-                        'index'
-                    ] == self.environment[
-                        odwhcons.ConfigEnv.SCALE
-                    ]
-                ),
+                content=self._getScale()['conf'],
                 modifiedList=uninstall_files,
             )
         )
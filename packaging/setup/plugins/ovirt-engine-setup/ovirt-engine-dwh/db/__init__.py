@@ -23,6 +23,7 @@ from . import connection
 from . import engine_connection
 from . import dbmsupgrade
 from . import schema
+from . import retention
 from . import vacuum
 
 
@@ -32,6 +33,7 @@ def createPlugins(context):
     engine_connection.Plugin(context=context)
     dbmsupgrade.Plugin(context=context)
     schema.Plugin(context=context)
+    retention.Plugin(context=context)
     vacuum.Plugin(context=context)
 
 
@@ -0,0 +1,213 @@
+#
+# ovirt-engine-setup -- ovirt engine setup
+# Copyright (C) 2018 Red Hat, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+"""Retention plugin."""
+
+import datetime
+import gettext
+import glob
+import os
+
+from otopi import plugin
+from otopi import util
+
+from ovirt_engine import configfile
+
+from ovirt_engine_setup import constants as osetupcons
+from ovirt_engine_setup.dwh import constants as odwhcons
+
+from ovirt_setup_lib import dialog
+
+
+def _(m):
+    return gettext.dgettext(message=m, domain='ovirt-engine-dwh')
+
+
+@util.export
+class Plugin(plugin.PluginBase):
+    """Retention plugin.
+
+    Estimates how long the DWH delete job will need to remove the rows
+    outside the configured retention, and offers to purge them at once
+    when that would take too long.
+    """
+
+    # Offer the purge only when the delete job needs longer than this
+    _PURGE_THRESHOLD = datetime.timedelta(days=1)
+
+    def __init__(self, context):
+        super(Plugin, self).__init__(context=context)
+
+    def _getOverrides(self):
+        """Configuration files the service loads after the one of the
+        scale, whose retention is kept over the one setup writes."""
+        scale = os.path.basename(
+            odwhcons.FileLocations.OVIRT_ENGINE_DWHD_SERVICE_CONFIG_SCALE
+        )
+        return configfile.ConfigFile(
+            files=sorted(
+                f for f in glob.glob(
+                    os.path.join(
+                        odwhcons.FileLocations.
+                        OVIRT_ENGINE_DWHD_SERVICE_CONFIGD,
+                        '*.conf',
+                    )
+                )
+                if os.path.basename(f) > scale
+            ),
+        )
+
+    def _toolArgs(self):
+        args = [
+            odwhcons.FileLocations.OVIRT_DWH_RETENTION_TOOL,
+        ]
+        overrides = self._getOverrides()
+        for key, var, option in (
+            (
+                odwhcons.ConfigEnv.TABLES_KEEP_SAMPLES,
+                'DWH_TABLES_KEEP_SAMPLES',
+                '-s',
+            ),
+            (
+                odwhcons.ConfigEnv.TABLES_KEEP_HOURLY,
+                'DWH_TABLES_KEEP_HOURLY',
+                '-H',
+            ),
+            (
+                odwhcons.ConfigEnv.TABLES_KEEP_DAILY,
+                'DWH_TABLES_KEEP_DAILY',
+                '-D',
+            ),
+        ):
+            # without an option the tool loads the configuration of the
+            # service as it does
+            if overrides.get(var):
+                self.logger.debug(
+                    '%s=%s is kept over the retention of the scale',
+                    var,
+                    overrides.get(var),
+                )
+            elif self.environment[key] is not None:
+                args.extend((option, str(self.environment[key])))
+        return args
+
+    @plugin.event(
+        stage=plugin.Stages.STAGE_INIT,
+    )
+    def _init(self):
+        self.environment.setdefault(
+            odwhcons.DBEnv.DWH_RETENTION_PURGE,
+            None
+        )
+
+    @plugin.event(
+        stage=plugin.Stages.STAGE_CUSTOMIZATION,
+        condition=lambda self: (
+            self.environment[
+                odwhcons.CoreEnv.ENABLE
+            ] and not self.environment[
+                odwhcons.DBEnv.NEW_DATABASE
+            ] and self.environment[
+                odwhcons.DBEnv.DWH_RETENTION_PURGE
+            ] is None
+        ),
+        before=(
+            osetupcons.Stages.DIALOG_TITLES_E_MISC,
+        ),
+        after=(
+            osetupcons.Stages.DIALOG_TITLES_S_MISC,
+            odwhcons.Stages.SCALE_CUSTOMIZATION,
+        ),
+    )
+    def _customization(self):
+        rc, stdout, stderr = self.execute(
+            args=self._toolArgs(),
+            raiseOnError=False,
+        )
+        if rc != 0:
+            self.logger.warning(
+                _(
+                    'Cannot estimate the rows outside the DWH retention '
+                    'window, see log for details'
+                )
+            )
+            return
+
+        seconds = 0
+        for line in stdout:
+            fields = line.split()
+            if fields and not line.startswith('#'):
+                seconds = max(seconds, int(fields[-1]))
+        if datetime.timedelta(seconds=seconds) < self._PURGE_THRESHOLD:
+            self.logger.debug(
+                'DWH retention backlog is removed within %s seconds',
+                seconds,
+            )
+            return
+
+        self.dialog.note(text='\n'.join(stdout))
+        self.environment[
+            odwhcons.DBEnv.DWH_RETENTION_PURGE
+        ] = dialog.queryBoolean(
+            dialog=self.dialog,
+            name='DWH_RETENTION_PURGE',
+            note=_(
+                'The DWH delete job will need about {days} days to remove'
+                '\nthe rows outside the retention window of the oVirt'
+                '\nengine history database {db}@{host}.'
+                '\nPurge them now? Large tables are rebuilt, which may'
+                '\ntake a while and requires the DWH service to be stopped.'
+                '\n(@VALUES@) [@DEFAULT@]: '
+            ).format(
+                days=datetime.timedelta(seconds=seconds).days,
+                db=self.environment[
+                    odwhcons.DBEnv.DATABASE
+                ],
+                host=self.environment[
+                    odwhcons.DBEnv.HOST
+                ],
+            ),
+            prompt=True,
+            default=False
+        )
+
+    @plugin.event(
+        stage=plugin.Stages.STAGE_MISC,
+        name=odwhcons.Stages.DB_RETENTION_PURGE,
+        condition=lambda self: self.environment[
+            odwhcons.DBEnv.DWH_RETENTION_PURGE
+        ],
+        after=(
+            odwhcons.Stages.DB_SCHEMA,
+        ),
+    )
+    def _purge(self):
+        self.logger.info(
+            _("Purging rows outside the DWH retention window")
+        )
+        start = datetime.datetime.now()
+        self.execute(args=self._toolArgs() + ['-p'])
+        self.logger.info(
+            _("Purging rows outside the DWH retention window elapsed {secs}")
+            .format(
+                secs=datetime.datetime.now() - start,
+            )
+        )
+
+
+# vim: expandtab tabstop=4 shiftwidth=4
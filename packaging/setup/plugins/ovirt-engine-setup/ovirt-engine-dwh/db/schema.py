@@ -31,6 +31,7 @@ from otopi import transaction
 
 from ovirt_engine_setup import constants as osetupcons
 from ovirt_engine_setup.dwh import constants as odwhcons
+from ovirt_engine_setup.dwh import schema as odwhschema
 from ovirt_engine_setup.engine_common import database
 from ovirt_setup_lib import dialog
 from ovirt_engine_setup.engine_common \
@@ -184,6 +185,51 @@ class Plugin(plugin.PluginBase):
             )
         )
 
+    def _getEngineSchemas(self):
+        statement = database.Statement(
+            dbenvkeys=odwhcons.Const.DWH_DB_ENV_KEYS,
+            environment=self.environment,
+        )
+        result = statement.execute(
+            statement="""
+                select schema_name
+                from dwh_engines
+                where schema_name <> 'public'
+                order by engine_name
+            """,
+            ownConnection=True,
+            transaction=False,
+        )
+        return [row['schema_name'] for row in result]
+
+    def _applySchema(self, schema=None):
+        md5File = None
+        if self.environment[
+            osetupcons.CoreEnv.DEVELOPER_MODE
+        ]:
+            if not os.path.exists(
+                odwhcons.FileLocations.OVIRT_ENGINE_DB_MD5_DIR
+            ):
+                os.makedirs(
+                    odwhcons.FileLocations.OVIRT_ENGINE_DB_MD5_DIR
+                )
+            md5File = os.path.join(
+                odwhcons.FileLocations.OVIRT_ENGINE_DB_MD5_DIR,
+                '%s-%s%s.scripts.md5' % (
+                    self.environment[odwhcons.DBEnv.HOST],
+                    self.environment[odwhcons.DBEnv.DATABASE],
+                    '' if schema is None else '-%s' % schema,
+                ),
+            )
+        odwhschema.SchemaApply(
+            plugin=self,
+            dbenvkeys=odwhcons.Const.DWH_DB_ENV_KEYS,
+            dbscriptsDir=odwhcons.FileLocations.OVIRT_ENGINE_DWH_DB_DIR,
+            md5File=md5File,
+            viewsVersions=self.environment[odwhcons.DBEnv.VIEWS_VERSIONS],
+            schema=schema,
+        ).apply()
+
     @plugin.event(
         stage=plugin.Stages.STAGE_INIT,
     )
@@ -196,6 +242,10 @@ class Plugin(plugin.PluginBase):
             odwhcons.DBEnv.RESTORE_BACKUP_LATE,
             True
         )
+        self.environment.setdefault(
+            odwhcons.DBEnv.VIEWS_VERSIONS,
+            None
+        )
         self._needRollback = False
 
     @plugin.event(
@@ -337,44 +387,17 @@ class Plugin(plugin.PluginBase):
             )
 
         self.logger.info(_('Creating/refreshing DWH database schema'))
-        args = [
-            odwhcons.FileLocations.OVIRT_ENGINE_DWH_DB_SCHMA_TOOL,
-            '-s', self.environment[odwhcons.DBEnv.HOST],
-            '-p', str(self.environment[odwhcons.DBEnv.PORT]),
-            '-u', self.environment[odwhcons.DBEnv.USER],
-            '-d', self.environment[odwhcons.DBEnv.DATABASE],
-            '-l', self.environment[otopicons.CoreEnv.LOG_FILE_NAME],
-            '-c', 'apply',
-        ]
-        if self.environment[
-            osetupcons.CoreEnv.DEVELOPER_MODE
-        ]:
-            if not os.path.exists(
-                odwhcons.FileLocations.OVIRT_ENGINE_DB_MD5_DIR
-            ):
-                os.makedirs(
-                    odwhcons.FileLocations.OVIRT_ENGINE_DB_MD5_DIR
+        self._applySchema()
+
+        # the engines added with dwh-engine, whose statistics are kept
+        # in schemas of their own
+        for schema in self._getEngineSchemas():
+            self.logger.info(
+                _('Creating/refreshing DWH database schema {schema}').format(
+                    schema=schema,
                 )
-            args.extend(
-                [
-                    '-m',
-                    os.path.join(
-                        odwhcons.FileLocations.OVIRT_ENGINE_DB_MD5_DIR,
-                        '%s-%s.scripts.md5' % (
-                            self.environment[odwhcons.DBEnv.HOST],
-                            self.environment[odwhcons.DBEnv.DATABASE],
-                        ),
-                    ),
-                ]
             )
-        self.execute(
-            args=args,
-            envAppend={
-                'DBFUNC_DB_PGPASSFILE': self.environment[
-                    odwhcons.DBEnv.PGPASS_FILE
-                ]
-            },
-        )
+            self._applySchema(schema=schema)
 
     @plugin.event(
         stage=plugin.Stages.STAGE_CLEANUP,
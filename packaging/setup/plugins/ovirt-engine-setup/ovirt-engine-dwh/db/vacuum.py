@@ -111,6 +111,7 @@ class Plugin(plugin.PluginBase):
         ],
         after=(
             odwhcons.Stages.DB_SCHEMA,
+            odwhcons.Stages.DB_RETENTION_PURGE,
         ),
     )
     def _vacuum(self):
@@ -105,6 +105,22 @@ class Plugin(plugin.PluginBase):
             ):
                 if legacy.get(old) != current.get(new):
                     fixups.append('%s="%s"' % (new, legacy.get(old)))
+            for key, old in (
+                (
+                    odwhcons.ConfigEnv.TABLES_KEEP_SAMPLES,
+                    'hoursToKeepSamples',
+                ),
+                (
+                    odwhcons.ConfigEnv.TABLES_KEEP_HOURLY,
+                    'hoursToKeepHourly',
+                ),
+                (
+                    odwhcons.ConfigEnv.TABLES_KEEP_DAILY,
+                    'hoursToKeepDaily',
+                ),
+            ):
+                if legacy.get(old):
+                    self.environment[key] = legacy.get(old)
             if fixups:
                 uninstall_files = []
                 self.environment[